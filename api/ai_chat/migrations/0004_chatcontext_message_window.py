@@ -0,0 +1,47 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:31
+
+from django.db import migrations, models
+
+CONTEXT_WINDOW_SIZE = 15
+
+
+def backfill_message_windows(apps, schema_editor):
+    """Seed the message counter and rolling window from existing messages."""
+    ChatContext = apps.get_model('ai_chat', 'ChatContext')
+    ChatMessage = apps.get_model('ai_chat', 'ChatMessage')
+
+    for context in ChatContext.objects.iterator(chunk_size=500):
+        messages = ChatMessage.objects.filter(session_id=context.session_id)
+        recent = messages.order_by('-created_at')[:CONTEXT_WINDOW_SIZE]
+        context.message_count = messages.count()
+        context.recent_messages = [
+            {
+                'id': str(message.id),
+                'role': message.role,
+                'content': message.content,
+                'timestamp': message.created_at.isoformat(),
+            }
+            for message in reversed(recent)
+        ]
+        context.save(update_fields=['message_count', 'recent_messages'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('ai_chat', '0003_add_enhanced_context_fields'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='chatcontext',
+            name='message_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='chatcontext',
+            name='recent_messages',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.RunPython(backfill_message_windows, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,11 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.core.cache import cache
 import uuid
 from typing import Dict, Any
+from asgiref.sync import sync_to_async
 
 User = get_user_model()
 
@@ -124,6 +126,11 @@ class ChatContext(models.Model):
     Stores contextual information for chat sessions to maintain conversation state.
     Enhanced with better context tracking and conversation memory.
     """
+    CONTEXT_WINDOW_SIZE = 15  # Recent messages kept for AI prompts
+    
+    # Written only by record_message(), never by a full save of the context
+    WINDOW_FIELDS = ('recent_messages', 'message_count')
+    
     session = models.OneToOneField(ChatSession, on_delete=models.CASCADE, related_name='context')
     user_profile_data = models.JSONField(default=dict, blank=True)
     conversation_summary = models.TextField(blank=True)
@@ -143,6 +150,8 @@ class ChatContext(models.Model):
     key_insights = models.JSONField(default=list, blank=True)  # Important insights about user
     conversation_goals = models.JSONField(default=list, blank=True)  # User's stated goals
     previous_recommendations = models.JSONField(default=list, blank=True)  # Past recommendations given
+    recent_messages = models.JSONField(default=list, blank=True)  # Rolling window of recent messages
+    message_count = models.PositiveIntegerField(default=0)  # Messages recorded for the session
     
     # Context metadata
     context_confidence = models.FloatField(default=0.0)  # Confidence in context understanding
@@ -259,6 +268,59 @@ class ChatContext(models.Model):
         if len(self.key_insights) > 10:
             self.key_insights = self.key_insights[-10:]
     
+    def record_message(self, message: 'ChatMessage'):
+        """
+        Add a written message to the stored rolling window and bump the counter.
+        
+        The window is appended under a row lock and the counter incremented
+        with F(), so concurrent turns in one session don't drop each other's
+        messages. Recording the same message twice is a no-op, so callers can
+        record on both success and error paths.
+        """
+        message_id = str(message.id)
+        with transaction.atomic():
+            window, count = (
+                ChatContext.objects.select_for_update()
+                .values_list('recent_messages', 'message_count')
+                .get(pk=self.pk)
+            )
+            window = list(window or [])
+            if any(entry.get('id') == message_id for entry in window):
+                self.recent_messages, self.message_count = window, count
+                return
+            
+            window.append({
+                'id': message_id,
+                'role': message.role,
+                'content': message.content,
+                'timestamp': message.created_at.isoformat()
+            })
+            window = window[-self.CONTEXT_WINDOW_SIZE:]
+            ChatContext.objects.filter(pk=self.pk).update(
+                recent_messages=window,
+                message_count=F('message_count') + 1
+            )
+        # The row stays locked until commit, so the stored count is now count + 1
+        self.recent_messages, self.message_count = window, count + 1
+    
+    async def arecord_message(self, message: 'ChatMessage'):
+        """Async variant of record_message()."""
+        await sync_to_async(self.record_message)(message)
+    
+    def _context_fields(self):
+        return [
+            field.name for field in self._meta.concrete_fields
+            if not field.primary_key and field.name not in self.WINDOW_FIELDS
+        ]
+    
+    def save_context(self):
+        """Save the conversation analysis without touching the message window."""
+        self.save(update_fields=self._context_fields())
+    
+    async def asave_context(self):
+        """Async variant of save_context()."""
+        await self.asave(update_fields=self._context_fields())
+    
     def get_context_summary(self) -> Dict[str, Any]:
         """Get a summary of the current context for AI processing."""
         return {
@@ -7,12 +7,14 @@ with platform features.
 """
 
 import logging
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, AsyncIterator, Iterator, List, Optional, Tuple
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from django.conf import settings
 from koroh_platform.utils.ai_services import AIServiceFactory, ConversationalAIService
+from koroh_platform.utils.cv_analysis_store import load_profile_cv_analysis
 from .models import ChatSession, ChatMessage, ChatContext, AnonymousChatLimit
+from .turn_analysis import TurnMatches, turn_patterns
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
@@ -39,7 +41,9 @@ class ChatService:
         """
         if session_id:
             try:
-                session = ChatSession.objects.get(id=session_id, user=user, is_active=True)
+                session = ChatSession.objects.select_related('context').get(
+                    id=session_id, user=user, is_active=True
+                )
                 return session
             except ChatSession.DoesNotExist:
                 logger.warning(f"Session {session_id} not found for user {user.id}, creating new session")
@@ -77,6 +81,7 @@ class ChatService:
         """
         # Get or create session
         session = self.get_or_create_session(user, session_id)
+        session_context = self._get_session_context(session)
         
         # Create user message
         user_message = ChatMessage.objects.create(
@@ -85,6 +90,7 @@ class ChatService:
             content=message,
             status='completed'
         )
+        session_context.record_message(user_message)
         
         # Create AI response message (initially pending)
         ai_message = ChatMessage.objects.create(
@@ -105,6 +111,7 @@ class ChatService:
             ai_message.content = ai_response
             ai_message.status = 'completed'
             ai_message.save()
+            session_context.record_message(ai_message)
             
             # Update session context
             self._update_session_context(session, message, ai_response, additional_context)
@@ -120,9 +127,116 @@ class ChatService:
             ai_message.content = "I apologize, but I'm experiencing technical difficulties. Please try again in a moment."
             ai_message.status = 'failed'
             ai_message.save()
+            session_context.record_message(ai_message)
         
         return user_message, ai_message
     
+    def prepare_message(
+        self,
+        user: User,
+        message: str,
+        session_id: Optional[str] = None,
+        additional_context: Optional[Dict[str, Any]] = None
+    ) -> Tuple[ChatMessage, Dict[str, Any]]:
+        """
+        Persist the user's message and build the context for a streamed reply.
+        
+        The assistant message is not created here; complete_message() stores
+        it once the stream has finished.
+        
+        Args:
+            user: The user sending the message
+            message: The message content
+            session_id: Optional session ID
+            additional_context: Additional context for the conversation
+            
+        Returns:
+            Tuple of (user_message, conversation context)
+        """
+        session = self.get_or_create_session(user, session_id)
+        
+        user_message = ChatMessage.objects.create(
+            session=session,
+            role='user',
+            content=message,
+            status='completed'
+        )
+        self._get_session_context(session).record_message(user_message)
+        
+        context = self._build_conversation_context(session, additional_context)
+        return user_message, context
+    
+    def stream_ai_response(self, message: str, context: Dict[str, Any]) -> Iterator[str]:
+        """
+        Stream the raw AI response for a message as text chunks.
+        
+        Args:
+            message: The user's message
+            context: Context returned by prepare_message()
+            
+        Yields:
+            Response text chunks as they are generated
+        """
+        yield from self.ai_service.process_stream(self._build_ai_input(message, context))
+    
+    def complete_message(
+        self,
+        user_message: ChatMessage,
+        response_text: str,
+        context: Dict[str, Any],
+        additional_context: Optional[Dict[str, Any]] = None
+    ) -> ChatMessage:
+        """
+        Store the final assistant message for a streamed reply.
+        
+        Args:
+            user_message: The message returned by prepare_message()
+            response_text: The concatenated streamed response
+            context: Context returned by prepare_message()
+            additional_context: Additional context for the conversation
+            
+        Returns:
+            The persisted assistant ChatMessage
+        """
+        session = user_message.session
+        content, status = self._finalize_streamed_response(user_message, response_text, context)
+        
+        ai_message = ChatMessage.objects.create(
+            session=session,
+            role='assistant',
+            content=content,
+            status=status,
+            metadata={'streamed': True}
+        )
+        session_context = self._get_session_context(session)
+        session_context.record_message(ai_message)
+        
+        if status == 'completed':
+            self._update_session_context(session, user_message.content, content, additional_context)
+        
+        session.updated_at = timezone.now()
+        session.save()
+        
+        logger.info(f"Completed streamed message in session {session.id}")
+        return ai_message
+    
+    def _finalize_streamed_response(
+        self,
+        user_message: ChatMessage,
+        response_text: str,
+        context: Dict[str, Any]
+    ) -> Tuple[str, str]:
+        """Return the (content, status) to store for a streamed reply."""
+        response_text = (response_text or '').strip()
+        if response_text:
+            return self._finalize_ai_response(user_message.content, response_text, context), 'completed'
+        
+        logger.error(f"Streamed response for session {user_message.session_id} was empty")
+        return (
+            "I apologize, but I'm experiencing technical difficulties. Please try again in a moment.",
+            'failed'
+        )
+    
     def get_session_history(self, user: User, session_id: str) -> Optional[ChatSession]:
         """
         Get chat session with message history.
@@ -179,10 +293,25 @@ class ChatService:
         except ChatSession.DoesNotExist:
             return False
     
+    def _get_session_context(self, session: ChatSession) -> ChatContext:
+        """Return the session's context, creating it for legacy sessions without one."""
+        try:
+            return session.context
+        except ChatContext.DoesNotExist:
+            context, created = ChatContext.objects.get_or_create(session=session)
+            return context
+    
     def _get_user_profile_data(self, user: User) -> Dict[str, Any]:
         """Get user profile data for context."""
         try:
-            profile = user.profile
+            return self._serialize_profile_data(user, user.profile)
+        except Exception as e:
+            logger.warning(f"Could not get profile data for user {user.id}: {e}")
+            return self._serialize_profile_data(user, None)
+    
+    def _serialize_profile_data(self, user: User, profile) -> Dict[str, Any]:
+        """Build the profile snapshot stored on the chat context."""
+        if profile is not None:
             return {
                 'name': f"{user.first_name} {user.last_name}",
                 'email': user.email,
@@ -195,14 +324,12 @@ class ChatService:
                 'has_cv': bool(getattr(profile, 'cv_file', None)),
                 'has_portfolio': bool(getattr(profile, 'portfolio_url', None))
             }
-        except Exception as e:
-            logger.warning(f"Could not get profile data for user {user.id}: {e}")
-            return {
-                'name': f"{user.first_name} {user.last_name}",
-                'email': user.email,
-                'has_cv': False,
-                'has_portfolio': False
-            }
+        return {
+            'name': f"{user.first_name} {user.last_name}",
+            'email': user.email,
+            'has_cv': False,
+            'has_portfolio': False
+        }
     
     def _build_conversation_context(
         self, 
@@ -210,19 +337,27 @@ class ChatService:
         additional_context: Optional[Dict[str, Any]] = None
     ) -> Dict[str, Any]:
         """Build enhanced conversation context for AI service with context awareness."""
-        # Get recent messages for context (increased for better context)
-        recent_messages = session.messages.order_by('-created_at')[:15]
-        context_messages = []
-        
-        for msg in reversed(recent_messages):
-            context_messages.append({
-                'role': msg.role,
-                'content': msg.content,
-                'timestamp': msg.created_at.isoformat()
-            })
+        return self._compose_conversation_context(
+            session, self._get_session_context(session), additional_context
+        )
+    
+    def _compose_conversation_context(
+        self,
+        session: ChatSession,
+        session_context: Optional[ChatContext],
+        additional_context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """Assemble the AI context from the session's rolling message window."""
+        context_messages = [
+            {
+                'role': msg.get('role'),
+                'content': msg.get('content'),
+                'timestamp': msg.get('timestamp')
+            }
+            for msg in (session_context.recent_messages or [] if session_context else [])
+        ]
         
         # Get enhanced session context
-        session_context = getattr(session, 'context', None)
         user_profile = session_context.user_profile_data if session_context else {}
         
         # Build enhanced context with conversation awareness
@@ -270,29 +405,32 @@ class ChatService:
     def _generate_ai_response(self, message: str, context: Dict[str, Any]) -> str:
         """Generate context-aware AI response using the enhanced conversational service."""
         try:
-            input_data = {
-                'message': message,
-                'context': context.get('conversation_history', []),
-                'user_profile': context.get('user_profile', {}),
-                'conversation_context': context.get('conversation_context', {}),
-                'conversation_memory': context.get('conversation_memory', {}),
-                'concise_mode': True  # Enable concise response mode
-            }
-            
-            response = self.ai_service.process(input_data)
-            
-            # Post-process to ensure conciseness while maintaining context awareness
-            response = self._ensure_response_conciseness(response)
-            
-            # Optimize based on query type and conversation context
-            response = self._optimize_response_for_query_type(message, response, context)
-            
-            return response
+            response = self.ai_service.process(self._build_ai_input(message, context))
+            return self._finalize_ai_response(message, response, context)
             
         except Exception as e:
             logger.error(f"Error generating AI response: {e}")
             return "I'm having trouble processing your request. Please try again."
     
+    def _build_ai_input(self, message: str, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Build the AI service input from the conversation context."""
+        return {
+            'message': message,
+            'context': context.get('conversation_history', []),
+            'user_profile': context.get('user_profile', {}),
+            'conversation_context': context.get('conversation_context', {}),
+            'conversation_memory': context.get('conversation_memory', {}),
+            'concise_mode': True  # Enable concise response mode
+        }
+    
+    def _finalize_ai_response(self, message: str, response: str, context: Dict[str, Any]) -> str:
+        """Apply conciseness and query-type limits to a generated response."""
+        # Post-process to ensure conciseness while maintaining context awareness
+        response = self._ensure_response_conciseness(response)
+        
+        # Optimize based on query type and conversation context
+        return self._optimize_response_for_query_type(message, response, context)
+    
     def _ensure_response_conciseness(self, response: str) -> str:
         """Ensure the response meets conciseness standards based on configuration."""
         if not response:
@@ -404,90 +542,119 @@ class ChatService:
     ):
         """Update session context with enhanced conversation analysis."""
         try:
-            context, created = ChatContext.objects.get_or_create(session=session)
-            
-            # Analyze and update conversation context
-            self._analyze_conversation_turn(context, user_message, ai_response)
+            context = self._get_session_context(session)
             
             # Update conversation summary if needed (every 8 messages for better tracking)
-            message_count = session.messages.count()
-            if message_count % 8 == 0:
-                context.conversation_summary = self._generate_conversation_summary(session)
+            message_count = context.message_count
+            if message_count and message_count % 8 == 0:
+                context.conversation_summary = self._generate_conversation_summary(context)
             
-            # Detect active features being discussed
-            active_features = self._detect_active_features(user_message, ai_response)
-            if active_features:
-                context.active_features = list(set((context.active_features or []) + active_features))
-            
-            # Update conversation stage based on interaction patterns
-            context.conversation_stage = self._determine_conversation_stage(context, user_message, ai_response)
-            
-            # Update context confidence based on conversation quality
-            context.context_confidence = self._calculate_context_confidence(context, session)
-            
-            # Update context data
-            if additional_context:
-                if not context.context_data:
-                    context.context_data = {}
-                context.context_data.update(additional_context)
-            
-            # Increment context version for tracking
-            context.context_version += 1
-            
-            context.save()
+            self._apply_turn_to_context(
+                context, session, user_message, ai_response, message_count, additional_context
+            )
+            context.save_context()
             
         except Exception as e:
             logger.error(f"Error updating session context: {e}")
     
-    def _generate_conversation_summary(self, session: ChatSession) -> str:
+    def _apply_turn_to_context(
+        self,
+        context: ChatContext,
+        session: ChatSession,
+        user_message: str,
+        ai_response: str,
+        message_count: int,
+        additional_context: Optional[Dict[str, Any]] = None
+    ):
+        """Apply the analysis of one conversation turn to an in-memory context."""
+        # Match the whole pattern vocabulary against the turn once
+        matches = turn_patterns.analyze(user_message, ai_response)
+        
+        # Analyze and update conversation context
+        self._analyze_conversation_turn(context, user_message, ai_response, matches)
+        
+        # Detect active features being discussed
+        active_features = self._detect_active_features(user_message, ai_response, matches)
+        if active_features:
+            context.active_features = list(set((context.active_features or []) + active_features))
+        
+        # Update conversation stage based on interaction patterns
+        context.conversation_stage = self._determine_conversation_stage(
+            context, user_message, ai_response, message_count
+        )
+        
+        # Update context confidence based on conversation quality
+        context.context_confidence = self._calculate_context_confidence(context, session, message_count)
+        
+        # Update context data
+        if additional_context:
+            if not context.context_data:
+                context.context_data = {}
+            context.context_data.update(additional_context)
+        
+        # Increment context version for tracking
+        context.context_version += 1
+    
+    def _generate_conversation_summary(self, context: ChatContext) -> str:
         """Generate a concise summary of the conversation for context."""
         try:
-            # Limit to fewer messages for more focused summary
-            recent_messages = session.messages.order_by('-created_at')[:10]
-            conversation_text = "\n".join([
-                f"{msg.role}: {msg.content[:100]}..." if len(msg.content) > 100 else f"{msg.role}: {msg.content}"
-                for msg in reversed(recent_messages)
-            ])
-            
-            # Use AI to generate concise summary
-            summary_input = {
-                'message': f"Summarize this conversation in 1-2 sentences:\n\n{conversation_text}",
-                'context': [],
-                'user_profile': {}
-            }
-            
-            summary = self.ai_service.process(summary_input)
+            summary = self.ai_service.process(self._build_summary_input(context))
             return summary[:200]  # Reduced from 500 to 200 characters
             
         except Exception as e:
             logger.error(f"Error generating conversation summary: {e}")
             return "Career discussion."
     
-    def _analyze_conversation_turn(self, context: 'ChatContext', user_message: str, ai_response: str):
+    def _build_summary_input(self, context: ChatContext) -> Dict[str, Any]:
+        """Build the summarization request from the context's message window."""
+        # Limit to fewer messages for more focused summary
+        recent_messages = (context.recent_messages or [])[-10:]
+        conversation_text = "\n".join([
+            f"{msg['role']}: {msg['content'][:100]}..." if len(msg['content']) > 100 else f"{msg['role']}: {msg['content']}"
+            for msg in recent_messages
+        ])
+        
+        # Use AI to generate concise summary
+        return {
+            'message': f"Summarize this conversation in 1-2 sentences:\n\n{conversation_text}",
+            'context': [],
+            'user_profile': {}
+        }
+    
+    def _analyze_conversation_turn(
+        self,
+        context: 'ChatContext',
+        user_message: str,
+        ai_response: str,
+        matches: Optional[TurnMatches] = None
+    ):
         """Analyze a single conversation turn and update context accordingly."""
+        if matches is None:
+            matches = turn_patterns.analyze(user_message, ai_response)
+        
         # Detect topics
-        topics = self._extract_topics(user_message)
+        topics = self._extract_topics(user_message, matches)
         for topic in topics:
             context.add_topic(topic)
         
         # Detect user intents
-        intents = self._detect_user_intents(user_message)
+        intents = self._detect_user_intents(user_message, matches)
         for intent in intents:
             context.add_user_intent(intent)
         
         # Extract entities (companies, skills, etc.)
-        entities = self._extract_entities(user_message)
+        entities = self._extract_entities(user_message, matches)
         for entity_type, entity_values in entities.items():
             for entity_value in entity_values:
                 context.add_entity(entity_type, entity_value)
         
         # Detect key insights about the user
-        insights = self._extract_user_insights(user_message, ai_response)
+        insights = self._extract_user_insights(user_message, ai_response, matches)
         for insight in insights:
             context.add_key_insight(insight['text'], insight['category'])
         
         # Update user goals if mentioned
-        goals = self._extract_user_goals(user_message)
+        goals = self._extract_user_goals(user_message, matches)
         if goals:
             if not context.conversation_goals:
                 context.conversation_goals = []
@@ -495,135 +662,64 @@ class ChatService:
                 if goal not in context.conversation_goals:
                     context.conversation_goals.append(goal)
     
-    def _extract_topics(self, message: str) -> List[str]:
+    def _extract_topics(self, message: str, matches: Optional[TurnMatches] = None) -> List[str]:
         """Extract conversation topics from user message."""
-        topics = []
-        message_lower = message.lower()
-        
-        # Define topic patterns
-        topic_patterns = {
-            'career_change': ['career change', 'switch career', 'new career', 'career transition'],
-            'job_search': ['job search', 'looking for job', 'find job', 'job hunting'],
-            'skill_development': ['learn', 'skill', 'training', 'course', 'certification'],
-            'networking': ['network', 'connect', 'meet people', 'professional contacts'],
-            'salary_negotiation': ['salary', 'negotiate', 'compensation', 'pay raise'],
-            'interview_prep': ['interview', 'interview preparation', 'job interview'],
-            'resume_help': ['resume', 'cv', 'curriculum vitae'],
-            'portfolio_creation': ['portfolio', 'showcase', 'personal website'],
-            'company_research': ['company', 'employer', 'organization research'],
-            'industry_insights': ['industry', 'market trends', 'sector analysis']
-        }
-        
-        for topic, patterns in topic_patterns.items():
-            if any(pattern in message_lower for pattern in patterns):
-                topics.append(topic)
-        
-        return topics
+        return (matches or turn_patterns.analyze(message)).topics
     
-    def _detect_user_intents(self, message: str) -> List[str]:
+    def _detect_user_intents(self, message: str, matches: Optional[TurnMatches] = None) -> List[str]:
         """Detect user intents from the message."""
-        intents = []
-        message_lower = message.lower()
-        
-        # Define intent patterns
-        intent_patterns = {
-            'seeking_advice': ['help', 'advice', 'suggest', 'recommend', 'what should'],
-            'requesting_information': ['what is', 'how to', 'tell me about', 'explain'],
-            'expressing_frustration': ['frustrated', 'stuck', 'difficult', 'hard', 'struggling'],
-            'showing_interest': ['interested', 'sounds good', 'tell me more', 'that looks'],
-            'making_decision': ['should I', 'which one', 'better option', 'decide'],
-            'requesting_action': ['can you', 'please', 'help me', 'do this'],
-            'providing_feedback': ['good', 'bad', 'like', 'dislike', 'prefer'],
-            'asking_clarification': ['what do you mean', 'clarify', 'explain more', 'confused']
-        }
-        
-        for intent, patterns in intent_patterns.items():
-            if any(pattern in message_lower for pattern in patterns):
-                intents.append(intent)
-        
-        return intents
+        return (matches or turn_patterns.analyze(message)).intents
     
-    def _extract_entities(self, message: str) -> Dict[str, List[str]]:
+    def _extract_entities(self, message: str, matches: Optional[TurnMatches] = None) -> Dict[str, List[str]]:
         """Extract named entities from the message."""
-        entities = {
-            'companies': [],
-            'skills': [],
-            'locations': [],
-            'job_titles': [],
-            'industries': []
-        }
-        
-        message_lower = message.lower()
-        
-        # Common company names (simplified - in production, use NER)
-        company_patterns = ['google', 'microsoft', 'apple', 'amazon', 'facebook', 'meta', 'netflix', 'tesla', 'uber', 'airbnb']
-        for company in company_patterns:
-            if company in message_lower:
-                entities['companies'].append(company.title())
-        
-        # Common skills
-        skill_patterns = ['python', 'javascript', 'java', 'react', 'node.js', 'sql', 'aws', 'docker', 'kubernetes', 'machine learning', 'data science']
-        for skill in skill_patterns:
-            if skill in message_lower:
-                entities['skills'].append(skill)
-        
-        # Common job titles
-        job_title_patterns = ['developer', 'engineer', 'manager', 'analyst', 'designer', 'consultant', 'director', 'specialist']
-        for title in job_title_patterns:
-            if title in message_lower:
-                entities['job_titles'].append(title)
-        
-        # Remove empty lists
-        return {k: v for k, v in entities.items() if v}
+        # Vocabulary matching only (simplified - in production, use NER)
+        return (matches or turn_patterns.analyze(message)).entities
     
-    def _extract_user_insights(self, user_message: str, ai_response: str) -> List[Dict[str, str]]:
+    def _extract_user_insights(
+        self,
+        user_message: str,
+        ai_response: str,
+        matches: Optional[TurnMatches] = None
+    ) -> List[Dict[str, str]]:
         """Extract key insights about the user from the conversation."""
         insights = []
-        message_lower = user_message.lower()
+        matches = matches or turn_patterns.analyze(user_message)
         
         # Experience level insights
-        if any(phrase in message_lower for phrase in ['new to', 'beginner', 'just started', 'no experience']):
+        if matches.has('insights', 'beginner'):
             insights.append({'text': 'User is a beginner in their field', 'category': 'experience_level'})
-        elif any(phrase in message_lower for phrase in ['experienced', 'senior', 'years of experience', 'expert']):
+        elif matches.has('insights', 'experienced'):
             insights.append({'text': 'User has significant experience', 'category': 'experience_level'})
         
         # Career stage insights
-        if any(phrase in message_lower for phrase in ['recent graduate', 'just graduated', 'fresh out of']):
+        if matches.has('insights', 'recent_graduate'):
             insights.append({'text': 'User is a recent graduate', 'category': 'career_stage'})
-        elif any(phrase in message_lower for phrase in ['career change', 'switching careers', 'new field']):
+        elif matches.has('insights', 'career_change'):
             insights.append({'text': 'User is considering a career change', 'category': 'career_stage'})
         
         # Motivation insights
-        if any(phrase in message_lower for phrase in ['passionate about', 'love', 'enjoy', 'excited']):
+        if matches.has('insights', 'passionate'):
             insights.append({'text': 'User shows passion for their field', 'category': 'motivation'})
-        elif any(phrase in message_lower for phrase in ['burned out', 'tired', 'stressed', 'overwhelmed']):
+        elif matches.has('insights', 'burnout'):
             insights.append({'text': 'User may be experiencing burnout', 'category': 'motivation'})
         
         return insights
     
-    def _extract_user_goals(self, message: str) -> List[str]:
+    def _extract_user_goals(self, message: str, matches: Optional[TurnMatches] = None) -> List[str]:
         """Extract user goals from the message."""
-        goals = []
-        message_lower = message.lower()
-        
-        goal_patterns = {
-            'find_new_job': ['find a job', 'get a job', 'job search', 'looking for work'],
-            'career_advancement': ['promotion', 'advance career', 'move up', 'next level'],
-            'skill_improvement': ['improve skills', 'learn new skills', 'get better at'],
-            'salary_increase': ['higher salary', 'more money', 'better pay', 'increase income'],
-            'work_life_balance': ['work life balance', 'flexible work', 'remote work'],
-            'industry_change': ['change industry', 'different field', 'new sector']
-        }
-        
-        for goal, patterns in goal_patterns.items():
-            if any(pattern in message_lower for pattern in patterns):
-                goals.append(goal.replace('_', ' ').title())
-        
-        return goals
+        goals = (matches or turn_patterns.analyze(message)).goals
+        return [goal.replace('_', ' ').title() for goal in goals]
     
-    def _determine_conversation_stage(self, context: 'ChatContext', user_message: str, ai_response: str) -> str:
+    def _determine_conversation_stage(
+        self,
+        context: 'ChatContext',
+        user_message: str,
+        ai_response: str,
+        message_count: Optional[int] = None
+    ) -> str:
         """Determine the current stage of the conversation."""
-        message_count = context.session.messages.count()
+        if message_count is None:
+            message_count = context.session.messages.count()
         message_lower = user_message.lower()
         
         # Initial stage (first few messages)
@@ -649,12 +745,18 @@ class ChatService:
         # Default to exploration if unclear
         return 'exploration'
     
-    def _calculate_context_confidence(self, context: 'ChatContext', session: ChatSession) -> float:
+    def _calculate_context_confidence(
+        self,
+        context: 'ChatContext',
+        session: ChatSession,
+        message_count: Optional[int] = None
+    ) -> float:
         """Calculate confidence in the current context understanding."""
         confidence_factors = []
         
         # Message count factor (more messages = better context)
-        message_count = session.messages.count()
+        if message_count is None:
+            message_count = session.messages.count()
         message_factor = min(message_count / 10.0, 1.0)  # Max confidence at 10+ messages
         confidence_factors.append(message_factor)
         
@@ -683,24 +785,216 @@ class ChatService:
         else:
             return 0.0
     
-    def _detect_active_features(self, user_message: str, ai_response: str) -> List[str]:
+    def _detect_active_features(
+        self,
+        user_message: str,
+        ai_response: str,
+        matches: Optional[TurnMatches] = None
+    ) -> List[str]:
         """Detect which platform features are being discussed."""
-        features = []
-        combined_text = (user_message + " " + ai_response).lower()
-        
-        feature_keywords = {
-            'cv_upload': ['cv', 'resume', 'upload', 'curriculum vitae'],
-            'portfolio_generation': ['portfolio', 'website', 'showcase', 'generate'],
-            'job_search': ['job', 'position', 'career', 'employment', 'hiring'],
-            'company_discovery': ['company', 'employer', 'organization', 'follow'],
-            'peer_groups': ['network', 'group', 'peer', 'connect', 'community']
-        }
+        return (matches or turn_patterns.analyze(user_message, ai_response)).features
+
+
+class AsyncChatService(ChatService):
+    """
+    asyncio-native chat pipeline for WebSocket consumers.
+    
+    Bedrock calls are awaited on the event loop and persistence uses the
+    async ORM, so a chat turn only touches Django's sync thread for the
+    individual queries instead of for the whole model round-trip. The
+    context analysis helpers are shared with ChatService.
+    """
+    
+    async def aget_or_create_session(self, user: User, session_id: Optional[str] = None) -> ChatSession:
+        """Async variant of get_or_create_session()."""
+        from profiles.models import Profile
+        
+        if session_id:
+            try:
+                return await ChatSession.objects.select_related('context').aget(
+                    id=session_id, user=user, is_active=True
+                )
+            except ChatSession.DoesNotExist:
+                logger.warning(f"Session {session_id} not found for user {user.id}, creating new session")
+        
+        session = await ChatSession.objects.acreate(user=user)
+        
+        profile = await Profile.objects.filter(user=user).afirst()
+        await ChatContext.objects.acreate(
+            session=session,
+            user_profile_data=self._serialize_profile_data(user, profile)
+        )
+        
+        logger.info(f"Created new chat session {session.id} for user {user.id}")
+        return session
+    
+    async def asend_message(
+        self,
+        user: User,
+        message: str,
+        session_id: Optional[str] = None,
+        additional_context: Optional[Dict[str, Any]] = None
+    ) -> Tuple[ChatMessage, ChatMessage]:
+        """
+        Async variant of send_message().
+        
+        Returns:
+            Tuple of (user_message, ai_response)
+        """
+        user_message, context = await self.aprepare_message(user, message, session_id, additional_context)
+        session = user_message.session
+        session_context = await self._aget_session_context(session)
+        
+        try:
+            ai_response = await self._agenerate_ai_response(message, context)
+            status = 'completed'
+        except Exception as e:
+            logger.error(f"Error processing message in session {session.id}: {e}")
+            ai_response = "I apologize, but I'm experiencing technical difficulties. Please try again in a moment."
+            status = 'failed'
+        
+        ai_message = await ChatMessage.objects.acreate(
+            session=session,
+            role='assistant',
+            content=ai_response,
+            status=status
+        )
+        await session_context.arecord_message(ai_message)
+        
+        if status == 'completed':
+            await self._aupdate_session_context(session, message, ai_response, additional_context)
+        await self._atouch_session(session)
         
-        for feature, keywords in feature_keywords.items():
-            if any(keyword in combined_text for keyword in keywords):
-                features.append(feature)
+        logger.info(f"Successfully processed message in session {session.id}")
+        return user_message, ai_message
+    
+    async def aprepare_message(
+        self,
+        user: User,
+        message: str,
+        session_id: Optional[str] = None,
+        additional_context: Optional[Dict[str, Any]] = None
+    ) -> Tuple[ChatMessage, Dict[str, Any]]:
+        """Async variant of prepare_message()."""
+        session = await self.aget_or_create_session(user, session_id)
+        
+        user_message = await ChatMessage.objects.acreate(
+            session=session,
+            role='user',
+            content=message,
+            status='completed'
+        )
+        
+        session_context = await self._aget_session_context(session)
+        await session_context.arecord_message(user_message)
+        
+        context = self._compose_conversation_context(session, session_context, additional_context)
+        return user_message, context
+    
+    async def astream_ai_response(self, message: str, context: Dict[str, Any]) -> AsyncIterator[str]:
+        """Async variant of stream_ai_response()."""
+        async for chunk in self.ai_service.aprocess_stream(self._build_ai_input(message, context)):
+            yield chunk
+    
+    async def acomplete_message(
+        self,
+        user_message: ChatMessage,
+        response_text: str,
+        context: Dict[str, Any],
+        additional_context: Optional[Dict[str, Any]] = None
+    ) -> ChatMessage:
+        """Async variant of complete_message()."""
+        session = user_message.session
+        content, status = self._finalize_streamed_response(user_message, response_text, context)
+        
+        ai_message = await ChatMessage.objects.acreate(
+            session=session,
+            role='assistant',
+            content=content,
+            status=status,
+            metadata={'streamed': True}
+        )
+        session_context = await self._aget_session_context(session)
+        await session_context.arecord_message(ai_message)
+        
+        if status == 'completed':
+            await self._aupdate_session_context(session, user_message.content, content, additional_context)
+        await self._atouch_session(session)
+        
+        logger.info(f"Completed streamed message in session {session.id}")
+        return ai_message
+    
+    async def _agenerate_ai_response(self, message: str, context: Dict[str, Any]) -> str:
+        """Async variant of _generate_ai_response()."""
+        try:
+            response = await self.ai_service.aprocess(self._build_ai_input(message, context))
+            return self._finalize_ai_response(message, response, context)
+            
+        except Exception as e:
+            logger.error(f"Error generating AI response: {e}")
+            return "I'm having trouble processing your request. Please try again."
+    
+    async def _aupdate_session_context(
+        self,
+        session: ChatSession,
+        user_message: str,
+        ai_response: str,
+        additional_context: Optional[Dict[str, Any]] = None
+    ):
+        """Async variant of _update_session_context()."""
+        try:
+            context = await self._aget_session_context(session)
+            
+            # Update conversation summary if needed (every 8 messages for better tracking)
+            message_count = context.message_count
+            if message_count and message_count % 8 == 0:
+                context.conversation_summary = await self._agenerate_conversation_summary(context)
+            
+            self._apply_turn_to_context(
+                context, session, user_message, ai_response, message_count, additional_context
+            )
+            await context.asave_context()
+            
+        except Exception as e:
+            logger.error(f"Error updating session context: {e}")
+    
+    async def _agenerate_conversation_summary(self, context: ChatContext) -> str:
+        """Async variant of _generate_conversation_summary()."""
+        try:
+            summary = await self.ai_service.aprocess(self._build_summary_input(context))
+            return summary[:200]
+            
+        except Exception as e:
+            logger.error(f"Error generating conversation summary: {e}")
+            return "Career discussion."
+    
+    async def _aget_session_context(self, session: ChatSession) -> ChatContext:
+        """Async variant of _get_session_context()."""
+        try:
+            return session.context
+        except ChatContext.DoesNotExist:
+            context, created = await ChatContext.objects.aget_or_create(session=session)
+            return context
+    
+    async def _atouch_session(self, session: ChatSession):
+        """Bump the session timestamp, titling it from the first message if needed."""
+        session.updated_at = timezone.now()
+        updates = {'updated_at': session.updated_at}
+        
+        if not session.title:
+            context = await self._aget_session_context(session)
+            window = context.recent_messages or []
+            if window and context.message_count <= len(window):
+                # The window still holds the whole conversation
+                content = window[0]['content']
+            else:
+                first_message = await session.messages.order_by('created_at').afirst()
+                content = first_message.content if first_message else ''
+            if content:
+                session.title = content[:50] + "..." if len(content) > 50 else content
+                updates['title'] = session.title
         
-        return features
+        await ChatSession.objects.filter(pk=session.pk).aupdate(**updates)
 
 
 class AnonymousChatService:
@@ -871,10 +1165,16 @@ class PlatformIntegrationService:
                     'message': "You haven't uploaded a CV yet. Would you like me to guide you through the upload process?"
                 }
             
-            # Trigger CV analysis (this would typically be done asynchronously)
-            from koroh_platform.utils.cv_analysis_service import analyze_cv_file
-            
-            analysis_result = analyze_cv_file(profile.cv_file.path)
+            # Reuse the stored analysis; only queue a new one if there is none
+            analysis_result = load_profile_cv_analysis(profile)
+            if analysis_result is None:
+                from profiles.tasks import analyze_cv_async
+                
+                analyze_cv_async.delay(profile.id, profile.cv_file.name)
+                return {
+                    'success': True,
+                    'message': "I've started analyzing your CV. Ask me again in a minute and I'll share what I found!"
+                }
             
             return {
                 'success': True,
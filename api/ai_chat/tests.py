@@ -17,6 +17,7 @@ from rest_framework_simplejwt.tokens import RefreshToken
 
 from .models import ChatSession, ChatMessage, ChatContext
 from .services import ChatService, PlatformIntegrationService
+from .turn_analysis import DEFAULT_PATTERNS_FILE, TurnPatterns, turn_patterns
 from .serializers import ChatSessionSerializer, ChatMessageSerializer
 
 User = get_user_model()
@@ -341,6 +342,455 @@ class ChatServiceTests(TestCase):
         self.assertEqual(context.context_data['feature_request'], 'cv_upload')
 
 
+class ChatContextWindowTests(TestCase):
+    """Test the incrementally maintained message window on ChatContext."""
+    
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email='window@example.com',
+            password='testpass123',
+            first_name='Window',
+            last_name='User'
+        )
+        self.chat_service = ChatService()
+        self.chat_service.ai_service = Mock()
+        self.chat_service.ai_service.process.return_value = "Let's work on that together."
+    
+    def test_window_and_counter_track_messages(self):
+        """Test each turn records both messages and trims the window."""
+        user_message, _ = self.chat_service.send_message(self.user, 'Turn 0')
+        session_id = str(user_message.session_id)
+        for turn in range(1, 10):
+            self.chat_service.send_message(self.user, f'Turn {turn}', session_id=session_id)
+        
+        context = ChatContext.objects.get(session_id=session_id)
+        self.assertEqual(context.message_count, 20)
+        self.assertEqual(len(context.recent_messages), ChatContext.CONTEXT_WINDOW_SIZE)
+        self.assertEqual(context.recent_messages[-2]['content'], 'Turn 9')
+        self.assertEqual(context.recent_messages[-1]['role'], 'assistant')
+    
+    def test_prompt_history_comes_from_window(self):
+        """Test the AI prompt history is read from the stored window."""
+        user_message, _ = self.chat_service.send_message(self.user, 'First question')
+        self.chat_service.send_message(
+            self.user, 'Second question', session_id=str(user_message.session_id)
+        )
+        
+        history = self.chat_service.ai_service.process.call_args.args[0]['context']
+        self.assertEqual(
+            [msg['content'] for msg in history],
+            ['First question', "Let's work on that together.", 'Second question']
+        )
+    
+    def test_turn_queries_do_not_grow_with_session_length(self):
+        """Test per-turn queries stay constant as the session grows."""
+        user_message, _ = self.chat_service.send_message(self.user, 'Hello there')
+        session_id = str(user_message.session_id)
+        self.chat_service.send_message(self.user, 'Second turn', session_id=session_id)
+        
+        # Each recorded message locks and updates the context row inside a savepoint
+        with self.assertNumQueries(14):
+            self.chat_service.send_message(self.user, 'Third turn', session_id=session_id)
+        
+        for turn in range(20):
+            self.chat_service.send_message(self.user, f'Filler {turn}', session_id=session_id)
+        
+        with self.assertNumQueries(14):
+            self.chat_service.send_message(self.user, 'Late turn', session_id=session_id)
+    
+    def test_stale_context_instances_keep_every_message(self):
+        """Test two copies of one context both append to the stored window."""
+        user_message, ai_message = self.chat_service.send_message(self.user, 'Hello')
+        first = ChatContext.objects.get(session_id=user_message.session_id)
+        second = ChatContext.objects.get(session_id=user_message.session_id)
+        
+        for instance, content in ((first, 'From tab one'), (second, 'From tab two')):
+            instance.record_message(ChatMessage.objects.create(
+                session=user_message.session, role='user', content=content, status='completed'
+            ))
+        second.record_message(ai_message)
+        
+        context = ChatContext.objects.get(session_id=user_message.session_id)
+        self.assertEqual(context.message_count, 4)
+        self.assertEqual(
+            [msg['content'] for msg in context.recent_messages[-2:]],
+            ['From tab one', 'From tab two']
+        )
+
+
+class TurnPatternTests(TestCase):
+    """Test the precompiled single-pass turn pattern matcher."""
+    
+    def test_overlapping_phrases_all_match(self):
+        """Test phrases nested inside other phrases are all reported."""
+        matches = turn_patterns.analyze('Can you help me find a job at Google as a Python developer?')
+        
+        self.assertIn('seeking_advice', matches.intents)
+        self.assertIn('requesting_action', matches.intents)
+        self.assertEqual(matches.goals, ['find_new_job'])
+        self.assertEqual(matches.entities, {
+            'companies': ['Google'],
+            'skills': ['python'],
+            'job_titles': ['developer'],
+        })
+    
+    def test_response_only_counts_for_features(self):
+        """Test AI response text feeds feature detection but not user analysis."""
+        matches = turn_patterns.analyze('Hi there', 'Upload your CV to your portfolio')
+        
+        self.assertEqual(matches.features, ['cv_upload', 'portfolio_generation'])
+        self.assertEqual(matches.topics, [])
+    
+    def test_matches_per_phrase_substring_checks(self):
+        """Test the automaton agrees with naive substring checks over the vocabulary."""
+        message = 'I am passionate about machine learning and want better pay, should I negotiate my salary?'
+        matches = turn_patterns.analyze(message)
+        
+        with open(DEFAULT_PATTERNS_FILE) as patterns_file:
+            data = json.load(patterns_file)
+        
+        message_lower = message.lower()
+        for group, labels in turn_patterns.labels.items():
+            if group == 'features':
+                continue
+            if group.startswith('entities.'):
+                phrases = data['entities'][group.split('.', 1)[1]]
+            else:
+                phrases = data[group]
+            expected = [
+                label for label in labels
+                if any(phrase.lower() in message_lower for phrase in phrases[label])
+            ]
+            self.assertEqual(matches.labels(group), expected, group)
+    
+    def test_vocabulary_is_data_driven(self):
+        """Test a custom vocabulary is compiled from plain data."""
+        patterns = TurnPatterns({
+            'topics': {'remote_work': ['remote', 'work from home']},
+            'entities': {'companies': {'Koroh': ['koroh']}},
+        })
+        matches = patterns.analyze('Does Koroh let me work from home?')
+        
+        self.assertEqual(matches.topics, ['remote_work'])
+        self.assertEqual(matches.entities, {'companies': ['Koroh']})
+        self.assertEqual(matches.intents, [])
+
+
+class FakeBedrockStreamingClient:
+    """Local stand-in for the bedrock-runtime response-stream API."""
+    
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.calls = 0
+    
+    def invoke_model_with_response_stream(self, **kwargs):
+        self.calls += 1
+        events = [{'type': 'message_start'}]
+        events += [
+            {'type': 'content_block_delta', 'index': 0, 'delta': {'type': 'text_delta', 'text': chunk}}
+            for chunk in self.chunks
+        ]
+        events.append({'type': 'message_stop'})
+        return {'body': ({'chunk': {'bytes': json.dumps(event).encode()}} for event in events)}
+    
+    def invoke_model(self, **kwargs):
+        import io
+        
+        self.calls += 1
+        body = {'content': [{'type': 'text', 'text': ''.join(self.chunks)}]}
+        return {'body': io.BytesIO(json.dumps(body).encode())}
+
+
+class FakeAsyncBedrockClient(FakeBedrockStreamingClient):
+    """Local stand-in for an aiobotocore bedrock-runtime client."""
+    
+    class Body:
+        def __init__(self, data):
+            self.data = data
+        
+        async def __aenter__(self):
+            return self
+        
+        async def __aexit__(self, *exc_info):
+            return False
+        
+        async def read(self):
+            return self.data
+    
+    async def invoke_model(self, **kwargs):
+        response = super().invoke_model(**kwargs)
+        return {'body': self.Body(response['body'].read())}
+    
+    async def invoke_model_with_response_stream(self, **kwargs):
+        events = super().invoke_model_with_response_stream(**kwargs)['body']
+        
+        async def stream():
+            for event in events:
+                yield event
+        
+        return {'body': stream()}
+
+
+def patch_async_bedrock(test_case, chunks):
+    """Route the async Bedrock client to a fake aiobotocore client for one test."""
+    from koroh_platform.utils.aws_bedrock import async_bedrock_client
+    
+    fake_async_client = FakeAsyncBedrockClient(chunks)
+    
+    async def get_client():
+        return fake_async_client
+    
+    for patcher in (
+        patch.object(async_bedrock_client, '_session', object()),
+        patch.object(async_bedrock_client, '_get_client', get_client),
+    ):
+        patcher.start()
+        test_case.addCleanup(patcher.stop)
+    return fake_async_client
+
+
+class ChatStreamingTests(TestCase):
+    """Test streamed AI chat responses."""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        from koroh_platform.utils.aws_bedrock import bedrock_client
+        
+        self.user = User.objects.create_user(
+            email='test@example.com',
+            password='testpass123',
+            first_name='Test',
+            last_name='User'
+        )
+        self.bedrock = bedrock_client
+        self.bedrock.response_cache.local.clear()
+        cache.clear()
+        self.fake_client = FakeBedrockStreamingClient(['You can ', 'upload your ', 'CV from ', 'your profile.'])
+        patcher = patch.object(self.bedrock, 'client', self.fake_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+    
+    def test_invoke_model_stream_yields_deltas(self):
+        """Test the response-stream API is consumed chunk by chunk and cached."""
+        model_id = 'anthropic.claude-3-haiku-20240307-v1:0'
+        
+        chunks = list(self.bedrock.invoke_model_stream(
+            model_id, 'How do I upload?', 100, 0.4, cache_template='analysis'
+        ))
+        cached = list(self.bedrock.invoke_model_stream(
+            model_id, 'How do I upload?', 100, 0.4, cache_template='analysis'
+        ))
+        
+        self.assertEqual(chunks, self.fake_client.chunks)
+        self.assertEqual(cached, [''.join(chunks)])
+        self.assertEqual(self.fake_client.calls, 1)
+    
+    def test_concise_stream_stops_at_word_limit(self):
+        """Test the concise chat stream ends once the word limit is reached."""
+        from koroh_platform.utils.ai_services import ConciseChatService
+        
+        self.fake_client.chunks = ['word ' * 30, 'word ' * 30]
+        service = ConciseChatService()
+        
+        streamed = ''.join(service.process_stream({'message': 'Tell me everything'}))
+        
+        self.assertEqual(len(streamed.split()), ConciseChatService.MAX_WORDS)
+        self.assertTrue(streamed.endswith('...'))
+    
+    def test_streamed_message_persisted_once(self):
+        """Test a streamed reply stores a single completed assistant message."""
+        chat_service = ChatService()
+        
+        user_message, context = chat_service.prepare_message(self.user, 'How do I upload my CV?')
+        self.assertFalse(user_message.session.messages.filter(role='assistant').exists())
+        
+        chunks = list(chat_service.stream_ai_response('How do I upload my CV?', context))
+        ai_message = chat_service.complete_message(user_message, ''.join(chunks), context)
+        
+        self.assertEqual(chunks, self.fake_client.chunks)
+        self.assertEqual(ai_message.status, 'completed')
+        self.assertEqual(ai_message.content, 'You can upload your CV from your profile.')
+        self.assertEqual(user_message.session.messages.filter(role='assistant').count(), 1)
+    
+    def test_empty_stream_marks_message_failed(self):
+        """Test an empty stream stores a failed assistant message."""
+        chat_service = ChatService()
+        user_message, context = chat_service.prepare_message(self.user, 'Hello')
+        
+        ai_message = chat_service.complete_message(user_message, '', context)
+        
+        self.assertEqual(ai_message.status, 'failed')
+        self.assertIn("technical difficulties", ai_message.content)
+
+
+class AsyncChatServiceTests(TestCase):
+    """Test the asyncio-native chat pipeline."""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        from koroh_platform.utils.aws_bedrock import async_bedrock_client, bedrock_client
+        
+        self.user = User.objects.create_user(
+            email='async@example.com',
+            password='testpass123',
+            first_name='Async',
+            last_name='User'
+        )
+        self.async_bedrock = async_bedrock_client
+        bedrock_client.response_cache.local.clear()
+        cache.clear()
+        self.fake_client = FakeBedrockStreamingClient(['Happy ', 'to help ', 'with that.'])
+        patcher = patch.object(bedrock_client, 'client', self.fake_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.fake_async_client = patch_async_bedrock(self, ['Happy ', 'to help ', 'with that.'])
+    
+    def test_asend_message_persists_turn(self):
+        """Test an async chat turn stores both messages and updates context."""
+        from asgiref.sync import async_to_sync
+        from .services import AsyncChatService
+        
+        user_message, ai_message = async_to_sync(AsyncChatService().asend_message)(
+            user=self.user,
+            message='I need help with my job search'
+        )
+        
+        session = ChatSession.objects.get(id=user_message.session_id)
+        self.assertEqual(ai_message.status, 'completed')
+        self.assertEqual(ai_message.content, 'Happy to help with that.')
+        self.assertEqual(session.messages.count(), 2)
+        self.assertEqual(self.fake_client.calls, 0)
+        self.assertEqual(session.title, 'I need help with my job search')
+        self.assertEqual(session.context.context_version, 2)
+        self.assertIn('job_search', [t['topic'] for t in session.context.conversation_topics])
+    
+    def test_asend_message_reuses_session(self):
+        """Test an existing session id continues the same conversation."""
+        from asgiref.sync import async_to_sync
+        from .services import AsyncChatService
+        
+        service = AsyncChatService()
+        first, _ = async_to_sync(service.asend_message)(user=self.user, message='Hello')
+        second, _ = async_to_sync(service.asend_message)(
+            user=self.user, message='Hello again', session_id=str(first.session_id)
+        )
+        
+        self.assertEqual(first.session_id, second.session_id)
+        self.assertEqual(ChatMessage.objects.filter(session_id=first.session_id).count(), 4)
+    
+    def test_native_client_stream(self):
+        """Test the aiobotocore path streams and invokes without worker threads."""
+        from asgiref.sync import async_to_sync
+        from koroh_platform.utils.ai_services import ConciseChatService
+        
+        fake_async_client = FakeAsyncBedrockClient(['Native ', 'stream.'])
+        
+        async def get_client():
+            return fake_async_client
+        
+        service = ConciseChatService()
+        
+        async def run():
+            chunks = [chunk async for chunk in service.aprocess_stream({'message': 'Stream please'})]
+            reply = await service.aprocess({'message': 'Reply please'})
+            return chunks, reply
+        
+        with patch.object(self.async_bedrock, '_session', object()), \
+                patch.object(self.async_bedrock, '_get_client', get_client):
+            chunks, reply = async_to_sync(run)()
+        
+        self.assertEqual(chunks, ['Native ', 'stream.'])
+        self.assertEqual(reply, 'Native stream.')
+        self.assertEqual(fake_async_client.calls, 2)
+        self.assertEqual(self.fake_client.calls, 0)
+    
+    def test_close_exits_client_context(self):
+        """Test closing the async client exits the aiobotocore client context."""
+        from asgiref.sync import async_to_sync
+        from koroh_platform.utils.aws_bedrock import AsyncBedrockClient, bedrock_client
+        
+        class FakeContext:
+            exited = False
+            
+            async def __aenter__(self):
+                return FakeAsyncBedrockClient([])
+            
+            async def __aexit__(self, *exc_info):
+                FakeContext.exited = True
+                return False
+        
+        class FakeSession:
+            def create_client(self, *args, **kwargs):
+                return FakeContext()
+        
+        client = AsyncBedrockClient(bedrock_client)
+        client._session = FakeSession()
+        
+        async def run():
+            await client._get_client()
+            await client.close()
+        
+        with patch('koroh_platform.utils.aws_bedrock.AioConfig', MagicMock(), create=True):
+            async_to_sync(run)()
+        
+        self.assertTrue(FakeContext.exited)
+        self.assertIsNone(client._client)
+
+
+class AIChatConsumerStreamingTests(TransactionTestCase):
+    """Test the AI chat WebSocket consumer forwards streamed chunks."""
+    
+    def setUp(self):
+        from koroh_platform.utils.aws_bedrock import bedrock_client
+        
+        self.user = User.objects.create_user(
+            email='stream@example.com',
+            password='testpass123',
+            first_name='Stream',
+            last_name='User'
+        )
+        self.fake_client = FakeBedrockStreamingClient(['Sure, ', 'let me ', 'help.'])
+        bedrock_client.response_cache.local.clear()
+        patcher = patch.object(bedrock_client, 'client', self.fake_client)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        patch_async_bedrock(self, ['Sure, ', 'let me ', 'help.'])
+    
+    def test_chunks_forwarded_before_final_response(self):
+        """Test chunks reach the socket before the persisted final message."""
+        from asgiref.sync import async_to_sync
+        from channels.testing import WebsocketCommunicator
+        from koroh_platform.consumers import AIChatConsumer
+        
+        async def run_chat():
+            communicator = WebsocketCommunicator(AIChatConsumer.as_asgi(), '/ws/chat/')
+            communicator.scope['user'] = self.user
+            communicator.scope['url_route'] = {'kwargs': {}}
+            connected, _ = await communicator.connect()
+            self.assertTrue(connected)
+            await communicator.receive_json_from()  # connection confirmation
+            
+            await communicator.send_json_to({'type': 'send_message', 'message': 'Can you help me?'})
+            received = []
+            while True:
+                payload = await communicator.receive_json_from(timeout=5)
+                received.append(payload)
+                if payload['type'] != 'ai_response_stream':
+                    break
+            await communicator.disconnect()
+            return received
+        
+        received = async_to_sync(run_chat)()
+        
+        self.assertEqual(
+            [payload['data']['chunk'] for payload in received[:-1]],
+            ['Sure, ', 'let me ', 'help.']
+        )
+        self.assertEqual(received[-1]['type'], 'message_response')
+        self.assertEqual(received[-1]['data']['ai_response']['content'], 'Sure, let me help.')
+        self.assertEqual(ChatMessage.objects.filter(role='assistant').count(), 1)
+
+
 class PlatformIntegrationServiceTests(TestCase):
     """Test platform integration service."""
     
@@ -367,7 +817,7 @@ class PlatformIntegrationServiceTests(TestCase):
         self.assertFalse(result['success'])
         self.assertIn("haven't uploaded a CV", result['message'])
     
-    @patch('ai_chat.services.analyze_cv_file')
+    @patch('ai_chat.services.load_profile_cv_analysis')
     def test_cv_analysis_success(self, mock_analyze_cv):
         """Test successful CV analysis."""
         from profiles.models import Profile
@@ -395,6 +845,23 @@ class PlatformIntegrationServiceTests(TestCase):
         self.assertEqual(result['data']['experience_years'], 1)
         self.assertEqual(result['data']['education_count'], 1)
     
+    @patch('profiles.tasks.analyze_cv_async')
+    @patch('ai_chat.services.load_profile_cv_analysis', return_value=None)
+    def test_cv_analysis_queued_when_not_stored(self, mock_load, mock_task):
+        """Test a CV without a stored analysis is queued for analysis."""
+        profile = self.user.profile
+        profile.cv_file = 'test_cv.pdf'
+        profile.save()
+        
+        result = self.integration_service.handle_cv_analysis_request(
+            self.user, 
+            'session-id'
+        )
+        
+        self.assertTrue(result['success'])
+        self.assertIn("started analyzing", result['message'])
+        mock_task.delay.assert_called_once_with(profile.id, 'test_cv.pdf')
+    
     def test_portfolio_generation_no_cv(self):
         """Test portfolio generation request when no CV uploaded."""
         from profiles.models import Profile
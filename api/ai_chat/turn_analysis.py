@@ -0,0 +1,188 @@
+"""
+Single-pass phrase matching for chat turn analysis.
+
+Every topic, intent, entity, goal, insight and feature phrase is compiled
+into one Aho-Corasick automaton when the module is imported, so a turn is
+scanned once no matter how large the vocabulary grows. The vocabulary is
+loaded from data/turn_patterns.json, or from the file named by the
+AI_CHAT_TURN_PATTERNS_FILE setting.
+"""
+
+import json
+import logging
+from collections import deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PATTERNS_FILE = Path(__file__).resolve().parent / 'data' / 'turn_patterns.json'
+
+# Groups matched against the whole turn (user message and AI response);
+# every other group only looks at the user message.
+TURN_GROUPS = frozenset({'features'})
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton reporting every phrase occurrence in a text."""
+
+    def __init__(self, phrases: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[int]] = [[]]
+
+        for phrase_id, phrase in enumerate(phrases):
+            state = 0
+            for char in phrase:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append(phrase_id)
+
+        # Breadth-first so a state's failure link is resolved before its children's.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._output[next_state] = (
+                    self._output[next_state] + self._output[self._fail[next_state]]
+                )
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Yield (end index, phrase id) for every match, overlaps included."""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for phrase_id in output[state]:
+                yield index, phrase_id
+
+
+class TurnMatches:
+    """Labels matched in one conversation turn, in vocabulary order."""
+
+    def __init__(self, patterns: 'TurnPatterns', hits: Set[Tuple[str, str]]):
+        self.patterns = patterns
+        self.hits = hits
+
+    def labels(self, group: str) -> List[str]:
+        return [
+            label for label in self.patterns.labels.get(group, [])
+            if (group, label) in self.hits
+        ]
+
+    def has(self, group: str, label: str) -> bool:
+        return (group, label) in self.hits
+
+    @property
+    def topics(self) -> List[str]:
+        return self.labels('topics')
+
+    @property
+    def intents(self) -> List[str]:
+        return self.labels('intents')
+
+    @property
+    def goals(self) -> List[str]:
+        return self.labels('goals')
+
+    @property
+    def features(self) -> List[str]:
+        return self.labels('features')
+
+    @property
+    def entities(self) -> Dict[str, List[str]]:
+        entities = {
+            entity_type: self.labels(f'entities.{entity_type}')
+            for entity_type in self.patterns.entity_types
+        }
+        return {k: v for k, v in entities.items() if v}
+
+
+class TurnPatterns:
+    """
+    Compiled pattern vocabulary for chat turn analysis.
+
+    The data maps group -> label -> phrases. The nested 'entities' group
+    maps entity type -> entity value -> phrases. Matching is
+    case-insensitive substring matching, the same as the per-extractor
+    keyword checks it replaces.
+    """
+
+    def __init__(self, data: Dict[str, Any]):
+        self.labels: Dict[str, List[str]] = {}
+        self.entity_types: List[str] = list(data.get('entities', {}))
+
+        groups = {
+            group: labels for group, labels in data.items() if group != 'entities'
+        }
+        for entity_type, values in data.get('entities', {}).items():
+            groups[f'entities.{entity_type}'] = values
+
+        phrase_ids: Dict[str, int] = {}
+        self._targets: List[List[Tuple[str, str]]] = []
+        for group, labels in groups.items():
+            self.labels[group] = list(labels)
+            for label, phrases in labels.items():
+                for phrase in phrases:
+                    phrase = phrase.lower()
+                    if not phrase:
+                        continue
+                    if phrase not in phrase_ids:
+                        phrase_ids[phrase] = len(self._targets)
+                        self._targets.append([])
+                    self._targets[phrase_ids[phrase]].append((group, label))
+
+        self.matcher = PhraseMatcher(phrase_ids)
+
+    @classmethod
+    def from_file(cls, path) -> 'TurnPatterns':
+        with open(path, encoding='utf-8') as patterns_file:
+            return cls(json.load(patterns_file))
+
+    def analyze(self, user_message: str, ai_response: str = '') -> TurnMatches:
+        """
+        Match the whole vocabulary against a turn in one scan.
+
+        The user message and AI response are scanned as one text; only
+        TURN_GROUPS accept matches that end inside the AI response.
+        """
+        user_text = user_message.lower()
+        text = f"{user_text} {ai_response.lower()}" if ai_response else user_text
+        user_end = len(user_text)
+
+        hits: Set[Tuple[str, str]] = set()
+        for end, phrase_id in self.matcher.iter_matches(text):
+            for target in self._targets[phrase_id]:
+                if end < user_end or target[0] in TURN_GROUPS:
+                    hits.add(target)
+        return TurnMatches(self, hits)
+
+
+def load_turn_patterns(path: Optional[str] = None) -> TurnPatterns:
+    """Load the configured vocabulary, falling back to the bundled one."""
+    path = path or getattr(settings, 'AI_CHAT_TURN_PATTERNS_FILE', None) or DEFAULT_PATTERNS_FILE
+    try:
+        return TurnPatterns.from_file(path)
+    except (OSError, ValueError) as e:
+        if Path(path) == DEFAULT_PATTERNS_FILE:
+            raise
+        logger.error(f"Failed to load chat turn patterns from {path}: {e}")
+        return TurnPatterns.from_file(DEFAULT_PATTERNS_FILE)
+
+
+turn_patterns = load_turn_patterns()
@@ -6,11 +6,12 @@ including registration confirmation, password reset, and account verification.
 """
 
 from django.conf import settings
-from django.template.loader import render_to_string
-from django.core.mail import EmailMultiAlternatives
+from django.template.loader import get_template, render_to_string
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.utils.html import strip_tags
 from django.utils import timezone
 import logging
+import smtplib
 
 logger = logging.getLogger(__name__)
 
@@ -176,13 +177,9 @@ def send_job_recommendation_email(user, recommended_jobs, match_percentage=85):
     
     return send_professional_email('job_recommendation', user.email, context)
 
-def send_company_update_email(user, company, update_type, update_message, job=None):
-    """Send company update notification email."""
-    # Dynamic subject with company name
-    template_config = EMAIL_TEMPLATES['company_update'].copy()
-    template_config['subject'] = template_config['subject'].format(company_name=company.name)
-    
-    context = {
+def _company_update_context(user, company, update_type, update_message, job=None):
+    """Template context for a company update email."""
+    return {
         'user': user,
         'company': company,
         'update_type': update_type,
@@ -192,20 +189,32 @@ def send_company_update_email(user, company, update_type, update_message, job=No
         'company_url': f"{settings.FRONTEND_URL}/companies/{company.id}",
         'companies_url': f"{settings.FRONTEND_URL}/companies",
     }
+
+def _build_company_update_email(subject, html_content, user, connection=None):
+    """Build the multipart company update message for one user."""
+    email = EmailMultiAlternatives(
+        subject=subject,
+        body=strip_tags(html_content),
+        from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@koroh.com'),
+        to=[user.email],
+        connection=connection,
+    )
+    email.attach_alternative(html_content, "text/html")
+    return email
+
+def send_company_update_email(user, company, update_type, update_message, job=None):
+    """Send company update notification email."""
+    # Dynamic subject with company name
+    template_config = EMAIL_TEMPLATES['company_update'].copy()
+    template_config['subject'] = template_config['subject'].format(company_name=company.name)
+    
+    context = _company_update_context(user, company, update_type, update_message, job)
     
     # Use custom subject
     html_content = render_to_string(template_config['template'], context)
-    text_content = strip_tags(html_content)
     
     try:
-        from django.core.mail import EmailMultiAlternatives
-        email = EmailMultiAlternatives(
-            subject=template_config['subject'],
-            body=text_content,
-            from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@koroh.com'),
-            to=[user.email],
-        )
-        email.attach_alternative(html_content, "text/html")
+        email = _build_company_update_email(template_config['subject'], html_content, user)
         email.send()
         
         logger.info(f"Company update email sent to {user.email} for {company.name}")
@@ -214,6 +223,60 @@ def send_company_update_email(user, company, update_type, update_message, job=No
         logger.error(f"Failed to send company update email to {user.email}: {str(e)}")
         return False
 
+def send_company_update_emails(users, company, update_type, update_message, job=None):
+    """
+    Send a company update email to many users over one mail connection.
+    
+    The template is loaded once and the connection opened once for the
+    whole batch, like send_mass_mail, but messages are sent one at a time
+    so a rejected recipient doesn't stop the rest. Connection failures
+    are not per-recipient and are raised, so the caller can retry.
+    
+    Args:
+        users: Recipients
+        company: Company the update is about
+        update_type: Type of update
+        update_message: Update message
+        job: Job for new job updates
+        
+    Returns:
+        Tuple of (users sent to, users whose email failed)
+        
+    Raises:
+        Exception: If the mail connection can't be opened or is lost part-way
+    """
+    subject = EMAIL_TEMPLATES['company_update']['subject'].format(company_name=company.name)
+    template = get_template(EMAIL_TEMPLATES['company_update']['template'])
+    
+    sent, failed = [], []
+    connection = get_connection()
+    connection.open()
+    try:
+        for user in users:
+            try:
+                html_content = template.render(
+                    _company_update_context(user, company, update_type, update_message, job)
+                )
+                email = _build_company_update_email(subject, html_content, user, connection)
+            except Exception as e:
+                logger.error(f"Failed to build company update email for {user.email}: {str(e)}")
+                failed.append(user)
+                continue
+            try:
+                if connection.send_messages([email]):
+                    sent.append(user)
+                else:
+                    failed.append(user)
+            except (smtplib.SMTPRecipientsRefused, smtplib.SMTPDataError) as e:
+                # The server rejected this message; the connection is still usable
+                logger.error(f"Failed to send company update email to {user.email}: {str(e)}")
+                failed.append(user)
+    finally:
+        connection.close()
+    
+    logger.info(f"Company update emails for {company.name}: {len(sent)} sent, {len(failed)} failed")
+    return sent, failed
+
 def send_peer_group_invitation_email(user, group, inviter, recent_posts=None):
     """Send peer group invitation email."""
     # Dynamic subject with group name
@@ -305,8 +305,8 @@ class Company(models.Model):
     
     def increment_view_count(self):
         """Increment the view count."""
-        self.view_count += 1
-        self.save(update_fields=['view_count'])
+        Company.objects.filter(pk=self.pk).update(view_count=models.F('view_count') + 1)
+        self.refresh_from_db(fields=['view_count'])
     
     def add_benefit(self, benefit):
         """Add a benefit to the benefits list."""
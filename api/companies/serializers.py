@@ -25,6 +25,11 @@ class CompanyListSerializer(serializers.ModelSerializer):
     
     def get_is_following(self, obj):
         """Check if current user is following this company."""
+        # Job list pages preload follows for every listed company
+        viewer_state = self.context.get('viewer_state')
+        if viewer_state is not None:
+            return viewer_state.is_following(obj)
+        
         request = self.context.get('request')
         if request and request.user.is_authenticated:
             return CompanyFollow.objects.filter(
@@ -68,7 +73,7 @@ class CompanyDetailSerializer(serializers.ModelSerializer):
         from jobs.serializers import JobListSerializer
         recent_jobs = obj.jobs.filter(
             is_active=True, status='published'
-        ).order_by('-posted_date')[:5]
+        ).select_related('company').order_by('-posted_date')[:5]
         return JobListSerializer(recent_jobs, many=True, context=self.context).data
 
 
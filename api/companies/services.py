@@ -2,14 +2,16 @@
 Services for Companies app including tracking, insights, and notifications.
 """
 
+import hashlib
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from django.db.models import Q, Count, Avg, F
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta, datetime
 from django.core.mail import send_mail
 from django.conf import settings
+from django.core.cache import cache
 from .models import Company, CompanyFollow, CompanyInsight
 
 User = get_user_model()
@@ -338,186 +340,322 @@ class CompanyInsightService:
             }
 
 
+class WeeklyDigestBuilder:
+    """
+    Builds weekly digests from one snapshot of the week's company activity.
+    
+    New job counts, featured jobs and public insights are loaded for all
+    companies (or the given ones) in three grouped queries when the builder
+    is created. Each digest is then assembled from in-memory maps keyed by
+    company id, so building digests for many users costs no further queries.
+    """
+    
+    FEATURED_JOBS_PER_COMPANY = 3
+    UPDATES_PER_COMPANY = 2
+    
+    RECOMMENDATIONS = [
+        "Update your profile with recent achievements",
+        "Apply to jobs that match your skills",
+        "Connect with professionals in your network",
+        "Follow companies in emerging industries"
+    ]
+    
+    def __init__(self, company_ids: Optional[List[int]] = None, since: Optional[datetime] = None):
+        """
+        Load the week's activity.
+        
+        Args:
+            company_ids: Restrict to these companies (all companies if None)
+            since: Start of the digest period, a week ago by default
+        """
+        from django.db.models import Window
+        from django.db.models.functions import RowNumber
+        from jobs.models import Job
+        
+        self.since = since or timezone.now() - timedelta(days=7)
+        
+        jobs = Job.objects.filter(posted_date__gte=self.since, is_active=True)
+        insights = CompanyInsight.objects.filter(created_at__gte=self.since, is_public=True)
+        if company_ids is not None:
+            jobs = jobs.filter(company_id__in=company_ids)
+            insights = insights.filter(company_id__in=company_ids)
+        
+        self.new_job_counts: Dict[int, int] = dict(
+            jobs.order_by().values('company_id').annotate(total=Count('id')).values_list('company_id', 'total')
+        )
+        
+        # Top jobs and insights per company, using each model's default ordering
+        self.featured_jobs: Dict[int, list] = {}
+        for job in jobs.select_related('company').annotate(
+            company_rank=Window(RowNumber(), partition_by=[F('company_id')], order_by=F('posted_date').desc())
+        ).filter(company_rank__lte=self.FEATURED_JOBS_PER_COMPANY).order_by('company_id', 'company_rank'):
+            self.featured_jobs.setdefault(job.company_id, []).append(job)
+        
+        self.company_updates: Dict[int, list] = {}
+        for insight in insights.select_related('company').annotate(
+            company_rank=Window(RowNumber(), partition_by=[F('company_id')], order_by=F('created_at').desc())
+        ).filter(company_rank__lte=self.UPDATES_PER_COMPANY).order_by('company_id', 'company_rank'):
+            self.company_updates.setdefault(insight.company_id, []).append({
+                'company': insight.company,
+                'update_type': insight.insight_type,
+                'message': insight.title,
+                'created_at': insight.created_at
+            })
+    
+    def build(self, company_ids: List[int]) -> Dict[str, Any]:
+        """
+        Assemble digest data for a user following the given companies.
+        
+        Args:
+            company_ids: Followed company ids, in display order
+            
+        Returns:
+            Digest data for send_weekly_digest_email
+        """
+        digest_data = {
+            'new_jobs_count': 0,
+            'featured_jobs': [],
+            'company_updates': [],
+            'peer_group_activity': [],
+            'profile_views': 0,  # Would need to be tracked separately
+            'job_applications': 0,  # Would need to be tracked separately
+            'new_connections': 0,  # Would need to be tracked separately
+            'portfolio_views': 0,  # Would need to be tracked separately
+            'recommendations': list(self.RECOMMENDATIONS),
+            'trending_skills': [],
+            'action_items': []
+        }
+        
+        for company_id in company_ids:
+            digest_data['new_jobs_count'] += self.new_job_counts.get(company_id, 0)
+            digest_data['featured_jobs'].extend(self.featured_jobs.get(company_id, []))
+            digest_data['company_updates'].extend(self.company_updates.get(company_id, []))
+        
+        return digest_data
+
+
 class CompanyNotificationService:
     """Service for company-related notifications."""
     
     @staticmethod
     def notify_followers_of_new_job(company: Company, job) -> Dict[str, Any]:
-        """Notify company followers of a new job posting."""
-        from jobs.models import Job
-        from authentication.email_templates import send_company_update_email
+        """
+        Notify company followers of a new job posting.
         
-        # Get followers with notifications enabled
-        followers = CompanyFollow.objects.filter(
-            company=company,
-            notifications_enabled=True
-        ).select_related('user')
+        Followers are fanned out in batches; see _fan_out_to_followers.
+        """
+        return CompanyNotificationService._fan_out_to_followers(
+            company,
+            event_key=f"company:{company.id}:new_job:{job.id}",
+            update_type="new_job",
+            message=f"New job opening: {job.title}",
+            job_id=job.id
+        )
+    
+    @staticmethod
+    def notify_followers_of_company_update(company: Company, update_type: str, message: str) -> Dict[str, Any]:
+        """
+        Notify company followers of general company updates.
         
-        if not followers.exists():
-            return {'notifications_sent': 0, 'message': 'No followers with notifications enabled'}
+        Followers are fanned out in batches; see _fan_out_to_followers.
+        """
+        message_hash = hashlib.sha256(message.encode('utf-8')).hexdigest()[:16]
+        return CompanyNotificationService._fan_out_to_followers(
+            company,
+            event_key=f"company:{company.id}:{update_type}:{message_hash}",
+            update_type=update_type,
+            message=message
+        )
+    
+    @staticmethod
+    def follower_id_chunks(company: Company, chunk_size: int):
+        """
+        Stream the user ids of followers with notifications enabled.
         
-        notification_count = 0
-        failed_notifications = []
+        Uses keyset pagination on the follow id, so each chunk is one
+        indexed query and no follower rows are held in memory.
         
-        for follow in followers:
-            try:
-                # Send professional email notification
-                success = send_company_update_email(
-                    user=follow.user,
+        Yields:
+            Tuples of (first follow id, last follow id, user ids), with at
+            most chunk_size user ids each
+        """
+        last_follow_id = 0
+        while True:
+            rows = list(
+                CompanyFollow.objects.filter(
                     company=company,
-                    update_type="new_job",
-                    update_message=f"New job opening: {job.title}",
-                    job=job
-                )
-                
-                if success:
-                    notification_count += 1
-                    # Send real-time notification to user's dashboard
-                    CompanyNotificationService._send_realtime_job_notification(
-                        follow.user.id, company, job
-                    )
-                else:
-                    failed_notifications.append(follow.user.email)
-                
-            except Exception as e:
-                logger.error(f"Failed to send notification to {follow.user.email}: {e}")
-                failed_notifications.append(follow.user.email)
+                    notifications_enabled=True,
+                    id__gt=last_follow_id
+                ).order_by('id').values_list('id', 'user_id')[:chunk_size]
+            )
+            if not rows:
+                return
+            yield rows[0][0], rows[-1][0], [user_id for _, user_id in rows]
+            last_follow_id = rows[-1][0]
+    
+    @staticmethod
+    def _fan_out_to_followers(
+        company: Company,
+        event_key: str,
+        update_type: str,
+        message: str,
+        job_id=None
+    ) -> Dict[str, Any]:
+        """
+        Queue one delivery task per chunk of followers.
+        
+        Each chunk's task sends its emails over a single mail connection and
+        its realtime pushes in a single channel-layer call, and is retried on
+        its own. The chunk's idempotency key is the event plus the chunk's
+        follow id range, so a retried or re-run fan-out doesn't notify anyone
+        twice.
+        """
+        from .tasks import deliver_follower_notifications
+        
+        chunk_size = getattr(settings, 'COMPANY_NOTIFICATION_CHUNK_SIZE', 500)
+        total_followers = 0
+        batches = 0
+        
+        chunks = CompanyNotificationService.follower_id_chunks(company, chunk_size)
+        for first_follow_id, last_follow_id, user_ids in chunks:
+            deliver_follower_notifications.delay(
+                company.id, user_ids, update_type, message,
+                job_id=job_id, idempotency_key=f"{event_key}:{first_follow_id}-{last_follow_id}"
+            )
+            total_followers += len(user_ids)
+            batches += 1
+        
+        if not total_followers:
+            return {
+                'notifications_queued': 0,
+                'total_followers': 0,
+                'message': 'No followers with notifications enabled'
+            }
         
         return {
-            'notifications_sent': notification_count,
-            'failed_notifications': failed_notifications,
-            'total_followers': followers.count()
+            'notifications_queued': total_followers,
+            'batches': batches,
+            'total_followers': total_followers
         }
     
     @staticmethod
-    def notify_followers_of_company_update(company: Company, update_type: str, message: str) -> Dict[str, Any]:
-        """Notify company followers of general company updates."""
-        from authentication.email_templates import send_company_update_email
+    def deliver_notification_batch(
+        company: Company,
+        user_ids: List[int],
+        update_type: str,
+        message: str,
+        job=None,
+        idempotency_key: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Send one chunk of follower notifications.
         
-        followers = CompanyFollow.objects.filter(
-            company=company,
-            notifications_enabled=True
-        ).select_related('user')
+        Emails and realtime pushes are recorded as done separately under the
+        idempotency key, so a retry after a failed push doesn't resend the
+        emails. Emails are also recorded after every sub-batch, so a retry
+        after a failure part-way through the chunk skips the users already
+        emailed. Connection-level failures are raised for the caller to retry;
+        individual rejected recipients are reported, not retried.
         
-        if not followers.exists():
-            return {'notifications_sent': 0, 'message': 'No followers with notifications enabled'}
+        Args:
+            company: Company the notification is about
+            user_ids: Followers in this chunk
+            update_type: Type of update
+            message: Update message
+            job: Job for new job notifications (also pushed in realtime)
+            idempotency_key: Key identifying this chunk of this event
+            
+        Returns:
+            Dictionary with sent and failed counts
+        """
+        key_prefix = f"follower_notifications:{idempotency_key}" if idempotency_key else None
+        ttl = getattr(settings, 'COMPANY_NOTIFICATION_IDEMPOTENCY_TTL', 86400)
         
-        notification_count = 0
+        sent_user_ids = cache.get(f"{key_prefix}:email") if key_prefix else None
         failed_notifications = []
+        if sent_user_ids is None:
+            sent_user_ids, failed_notifications = CompanyNotificationService._send_update_emails(
+                company, user_ids, update_type, message, job, key_prefix, ttl
+            )
         
-        for follow in followers:
-            try:
-                # Send professional email notification
-                success = send_company_update_email(
-                    user=follow.user,
-                    company=company,
-                    update_type=update_type,
-                    update_message=message
-                )
-                
-                if success:
-                    notification_count += 1
-                else:
-                    failed_notifications.append(follow.user.email)
-                
-            except Exception as e:
-                logger.error(f"Failed to send notification to {follow.user.email}: {e}")
-                failed_notifications.append(follow.user.email)
+        if job is not None and sent_user_ids and not (key_prefix and cache.get(f"{key_prefix}:push")):
+            CompanyNotificationService._send_realtime_job_notifications(sent_user_ids, company, job)
+            if key_prefix:
+                cache.set(f"{key_prefix}:push", True, ttl)
         
         return {
-            'notifications_sent': notification_count,
-            'failed_notifications': failed_notifications,
-            'total_followers': followers.count()
+            'notifications_sent': len(sent_user_ids),
+            'failed_notifications': failed_notifications
         }
     
     @staticmethod
-    def send_weekly_digest(user: User) -> Dict[str, Any]:
-        """Send weekly digest of followed companies' activities."""
-        from authentication.email_templates import send_weekly_digest_email
+    def _send_update_emails(
+        company: Company,
+        user_ids: List[int],
+        update_type: str,
+        message: str,
+        job,
+        key_prefix: Optional[str],
+        ttl: int
+    ) -> Tuple[List[int], List[str]]:
+        """
+        Email a chunk of followers in sub-batches, recording progress after each.
         
-        followed_companies = CompanyTrackingService.get_user_followed_companies(user)
+        Users attempted by an earlier run of the same chunk are skipped. Once
+        every sub-batch is done the chunk's email key is written and the
+        progress record dropped.
         
-        if not followed_companies:
-            return {'digest_sent': False, 'message': 'User is not following any companies'}
+        Returns:
+            Tuple of (ids of users emailed, emails that failed in this run)
+        """
+        from authentication.email_templates import send_company_update_emails
         
-        # Collect activities from the last week
-        week_ago = timezone.now() - timedelta(days=7)
+        batch_size = getattr(settings, 'COMPANY_NOTIFICATION_EMAIL_BATCH_SIZE', 50)
+        progress_key = f"{key_prefix}:email_progress" if key_prefix else None
+        progress = (cache.get(progress_key) if progress_key else None) or {'sent': [], 'attempted': []}
         
-        # Prepare digest data
-        digest_data = {
-            'new_jobs_count': 0,
-            'featured_jobs': [],
-            'company_updates': [],
-            'peer_group_activity': [],
-            'profile_views': 0,  # Would need to be tracked separately
-            'job_applications': 0,  # Would need to be tracked separately
-            'new_connections': 0,  # Would need to be tracked separately
-            'portfolio_views': 0,  # Would need to be tracked separately
-            'recommendations': [],
-            'trending_skills': [],
-            'action_items': []
-        }
+        attempted = set(progress['attempted'])
+        users = list(
+            User.objects.filter(id__in=user_ids, is_active=True)
+            .exclude(id__in=attempted)
+            .order_by('id')
+        )
+        failed_notifications = []
+        for start in range(0, len(users), batch_size):
+            batch = users[start:start + batch_size]
+            sent, failed = send_company_update_emails(batch, company, update_type, message, job)
+            progress['sent'].extend(user.id for user in sent)
+            progress['attempted'].extend(user.id for user in batch)
+            failed_notifications.extend(user.email for user in failed)
+            if progress_key:
+                cache.set(progress_key, progress, ttl)
+        
+        if key_prefix:
+            cache.set(f"{key_prefix}:email", progress['sent'], ttl)
+            cache.delete(progress_key)
+        return progress['sent'], failed_notifications
+    
+    @staticmethod
+    def send_weekly_digest(user: User, builder: Optional[WeeklyDigestBuilder] = None) -> Dict[str, Any]:
+        """
+        Send weekly digest of followed companies' activities.
         
-        # Collect company activities
-        for company in followed_companies:
-            # New jobs
-            from jobs.models import Job
-            new_jobs = Job.objects.filter(
-                company=company,
-                posted_date__gte=week_ago,
-                is_active=True
-            )
-            
-            if new_jobs.exists():
-                digest_data['new_jobs_count'] += new_jobs.count()
-                # Add top 3 jobs to featured jobs
-                for job in new_jobs[:3]:
-                    digest_data['featured_jobs'].append(job)
-            
-            # Company updates (insights)
-            new_insights = CompanyInsight.objects.filter(
-                company=company,
-                created_at__gte=week_ago,
-                is_public=True
-            )
-            
-            if new_insights.exists():
-                for insight in new_insights[:2]:  # Top 2 insights per company
-                    digest_data['company_updates'].append({
-                        'company': company,
-                        'update_type': insight.insight_type,
-                        'message': insight.title,
-                        'created_at': insight.created_at
-                    })
-        
-        # Add some default recommendations if no specific data
-        if not digest_data['company_updates'] and not digest_data['featured_jobs']:
-            return {'digest_sent': False, 'message': 'No activities to report'}
+        Args:
+            user: User to send the digest to
+            builder: Digest builder shared across a batch run; one scoped
+                to the user's followed companies is created if not given
+        """
+        company_ids = list(
+            CompanyFollow.objects.filter(user=user).values_list('company_id', flat=True)
+        )
         
-        # Add personalized recommendations
-        digest_data['recommendations'] = [
-            "Update your profile with recent achievements",
-            "Apply to jobs that match your skills",
-            "Connect with professionals in your network",
-            "Follow companies in emerging industries"
-        ]
+        if not company_ids:
+            return {'digest_sent': False, 'message': 'User is not following any companies'}
+        
+        builder = builder or WeeklyDigestBuilder(company_ids=company_ids)
         
-        # Send professional digest email
         try:
-            success = send_weekly_digest_email(user, digest_data)
-            
-            if success:
-                return {
-                    'digest_sent': True,
-                    'activities_count': len(digest_data['company_updates']) + len(digest_data['featured_jobs']),
-                    'companies_count': len(followed_companies)
-                }
-            else:
-                return {
-                    'digest_sent': False,
-                    'error': 'Failed to send email'
-                }
-            
+            return CompanyNotificationService._send_built_digest(user, company_ids, builder)
         except Exception as e:
             logger.error(f"Failed to send weekly digest to {user.email}: {e}")
             return {
@@ -526,31 +664,109 @@ class CompanyNotificationService:
             }
     
     @staticmethod
-    def _send_realtime_job_notification(user_id: int, company: Company, job) -> None:
-        """Send real-time job notification to user's dashboard."""
-        try:
-            from koroh_platform.realtime import send_dashboard_update
+    def send_weekly_digests(notifications_enabled_only: bool = False, chunk_size: int = 500) -> Dict[str, int]:
+        """
+        Send the weekly digest to every user following a company.
+        
+        The week's activity is loaded once for all companies; each user's
+        digest is then assembled in memory from their followed company ids,
+        which are streamed from CompanyFollow in user order.
+        
+        Args:
+            notifications_enabled_only: Only count follows with notifications enabled
+            chunk_size: Users loaded per query
             
-            job_data = {
-                'id': str(job.id),
-                'title': job.title,
-                'company': {
-                    'id': str(company.id),
-                    'name': company.name,
-                    'logo': company.logo.url if company.logo else None
-                },
-                'location': job.location,
-                'job_type': job.job_type,
-                'posted_date': job.posted_date.isoformat(),
-                'salary_range': job.salary_range_display,
-                'notification_type': 'new_job_from_followed_company'
+        Returns:
+            Dictionary with total, sent and failed digest counts
+        """
+        builder = WeeklyDigestBuilder()
+        results = {'total_users': 0, 'digests_sent': 0, 'failed_digests': 0}
+        
+        follows = CompanyFollow.objects.all()
+        if notifications_enabled_only:
+            follows = follows.filter(notifications_enabled=True)
+        follow_rows = follows.order_by('user_id', '-followed_at').values_list('user_id', 'company_id')
+        
+        def send_chunk(companies_by_user):
+            users = User.objects.in_bulk(list(companies_by_user))
+            for user_id, company_ids in companies_by_user.items():
+                user = users.get(user_id)
+                if user is None:
+                    continue
+                results['total_users'] += 1
+                try:
+                    result = CompanyNotificationService._send_built_digest(user, company_ids, builder)
+                    if result.get('digest_sent'):
+                        results['digests_sent'] += 1
+                    else:
+                        results['failed_digests'] += 1
+                except Exception as e:
+                    logger.error(f"Error sending weekly digest to {user.email}: {e}")
+                    results['failed_digests'] += 1
+        
+        companies_by_user: Dict[int, List[int]] = {}
+        for user_id, company_id in follow_rows.iterator(chunk_size=2000):
+            if user_id not in companies_by_user and len(companies_by_user) >= chunk_size:
+                send_chunk(companies_by_user)
+                companies_by_user = {}
+            companies_by_user.setdefault(user_id, []).append(company_id)
+        if companies_by_user:
+            send_chunk(companies_by_user)
+        
+        return results
+    
+    @staticmethod
+    def _send_built_digest(user: User, company_ids: List[int], builder: WeeklyDigestBuilder) -> Dict[str, Any]:
+        """Send a digest for the given followed companies from a prepared builder."""
+        from authentication.email_templates import send_weekly_digest_email
+        
+        digest_data = builder.build(company_ids)
+        
+        if not digest_data['company_updates'] and not digest_data['featured_jobs']:
+            return {'digest_sent': False, 'message': 'No activities to report'}
+        
+        # Send professional digest email
+        if not send_weekly_digest_email(user, digest_data):
+            return {
+                'digest_sent': False,
+                'error': 'Failed to send email'
             }
-            
-            send_dashboard_update(user_id, 'company_update', {
-                'type': 'new_job',
-                'job': job_data,
-                'timestamp': timezone.now().isoformat()
-            })
-            
-        except Exception as e:
-            logger.error(f"Failed to send real-time job notification: {e}")
\ No newline at end of file
+        
+        return {
+            'digest_sent': True,
+            'activities_count': len(digest_data['company_updates']) + len(digest_data['featured_jobs']),
+            'companies_count': len(company_ids)
+        }
+    
+    @staticmethod
+    def _realtime_job_update(company: Company, job) -> Dict[str, Any]:
+        """Dashboard payload announcing a new job at a followed company."""
+        job_data = {
+            'id': str(job.id),
+            'title': job.title,
+            'company': {
+                'id': str(company.id),
+                'name': company.name,
+                'logo': company.logo.url if company.logo else None
+            },
+            'location': job.location,
+            'job_type': job.job_type,
+            'posted_date': job.posted_date.isoformat(),
+            'salary_range': job.salary_range_display,
+            'notification_type': 'new_job_from_followed_company'
+        }
+        
+        return {
+            'type': 'new_job',
+            'job': job_data,
+            'timestamp': timezone.now().isoformat()
+        }
+    
+    @staticmethod
+    def _send_realtime_job_notifications(user_ids: List[int], company: Company, job) -> None:
+        """Push a new job to many users' dashboards in one channel-layer call; errors are raised."""
+        from koroh_platform.realtime import dashboard_service
+        
+        dashboard_service.send_company_update_to_users(
+            user_ids, CompanyNotificationService._realtime_job_update(company, job)
+        )
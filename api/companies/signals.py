@@ -7,6 +7,7 @@ from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from .models import Company, CompanyFollow
 from .tasks import update_company_insights, notify_followers_new_job
+from koroh_platform.utils.search_indexing import enqueue_search_update
 
 logger = logging.getLogger(__name__)
 
@@ -60,4 +61,22 @@ def company_follow_post_delete(sender, instance, **kwargs):
         instance.company.update_follower_count()
         logger.info(f"Updated follower count for company {instance.company.name}")
     except Exception as e:
-        logger.error(f"Error updating follower count for company {instance.company.id}: {e}")
\ No newline at end of file
+        logger.error(f"Error updating follower count for company {instance.company.id}: {e}")
+
+
+@receiver(post_save, sender=Company)
+def company_search_index_post_save(sender, instance, created, update_fields=None, **kwargs):
+    """Queue the company for MeiliSearch indexing."""
+    try:
+        enqueue_search_update('companies', [instance.pk], update_fields)
+    except Exception as e:
+        logger.error(f"Error queueing search index update for company {instance.pk}: {e}")
+
+
+@receiver(post_delete, sender=Company)
+def company_search_index_post_delete(sender, instance, **kwargs):
+    """Queue the company for removal from MeiliSearch."""
+    try:
+        enqueue_search_update('companies', [instance.pk])
+    except Exception as e:
+        logger.error(f"Error queueing search index removal for company {instance.pk}: {e}")
@@ -5,6 +5,7 @@ Celery tasks for Companies app.
 import logging
 from celery import shared_task
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ObjectDoesNotExist
 from .models import Company, CompanyFollow
 from .services import CompanyInsightService, CompanyNotificationService
 
@@ -73,6 +74,48 @@ def notify_followers_new_job(self, company_id, job_id):
         return {'success': False, 'error': str(e)}
 
 
+@shared_task(bind=True, max_retries=3)
+def deliver_follower_notifications(self, company_id, user_ids, update_type, message,
+                                   job_id=None, idempotency_key=None):
+    """
+    Background task to notify one chunk of company followers.
+    
+    Queued by CompanyNotificationService for each chunk of followers, so a
+    failure only retries this chunk.
+    
+    Args:
+        company_id: ID of the company
+        user_ids: IDs of the followers in this chunk
+        update_type: Type of update
+        message: Update message
+        job_id: ID of the new job, for job notifications
+        idempotency_key: Key identifying this chunk of this event
+    """
+    try:
+        company = Company.objects.get(id=company_id)
+        
+        job = None
+        if job_id is not None:
+            from jobs.models import Job
+            job = Job.objects.get(id=job_id)
+        
+        return CompanyNotificationService.deliver_notification_batch(
+            company, user_ids, update_type, message, job=job, idempotency_key=idempotency_key
+        )
+        
+    except ObjectDoesNotExist as e:
+        logger.error(f"Company or Job not found: {e}")
+        return {'success': False, 'error': str(e)}
+    except Exception as e:
+        logger.error(f"Error delivering follower notifications for {idempotency_key}: {e}")
+        
+        # Retry the chunk
+        if self.request.retries < self.max_retries:
+            raise self.retry(countdown=60 * (2 ** self.request.retries))
+        
+        return {'success': False, 'error': str(e)}
+
+
 @shared_task(bind=True, max_retries=3)
 def notify_followers_company_update(self, company_id, update_type, message):
     """
@@ -113,27 +156,7 @@ def send_weekly_digests():
     
     This task should be scheduled to run weekly.
     """
-    users_with_follows = User.objects.filter(
-        company_follows__isnull=False
-    ).distinct()
-    
-    results = {
-        'total_users': users_with_follows.count(),
-        'digests_sent': 0,
-        'failed_digests': 0
-    }
-    
-    for user in users_with_follows:
-        try:
-            result = CompanyNotificationService.send_weekly_digest(user)
-            if result.get('digest_sent'):
-                results['digests_sent'] += 1
-            else:
-                results['failed_digests'] += 1
-                
-        except Exception as e:
-            logger.error(f"Error sending weekly digest to {user.email}: {e}")
-            results['failed_digests'] += 1
+    results = CompanyNotificationService.send_weekly_digests()
     
     logger.info(f"Weekly digest task completed: {results}")
     return results
@@ -460,6 +460,9 @@ class CompanyNotificationServiceTest(TestCase):
     
     def setUp(self):
         """Set up test data."""
+        from django.core.cache import cache
+        cache.clear()
+        
         self.user = User.objects.create_user(
             email='notification_test@example.com',
             first_name='Notification',
@@ -507,9 +510,8 @@ class CompanyNotificationServiceTest(TestCase):
                 self.company, job
             )
             
-            self.assertEqual(result['notifications_sent'], 1)
+            self.assertEqual(result['notifications_queued'], 1)
             self.assertEqual(result['total_followers'], 1)
-            self.assertEqual(len(result['failed_notifications']), 0)
             
             # Verify email was sent
             self.assertEqual(len(mail.outbox), 1)
@@ -539,7 +541,7 @@ class CompanyNotificationServiceTest(TestCase):
             self.company, job
         )
         
-        self.assertEqual(result['notifications_sent'], 0)
+        self.assertEqual(result['notifications_queued'], 0)
         self.assertIn('No followers with notifications enabled', result['message'])
     
     def test_notify_followers_of_company_update(self):
@@ -555,13 +557,169 @@ class CompanyNotificationServiceTest(TestCase):
                 'We have exciting news to share!'
             )
             
-            self.assertEqual(result['notifications_sent'], 1)
+            self.assertEqual(result['notifications_queued'], 1)
             self.assertEqual(result['total_followers'], 1)
             
             # Verify email was sent
             self.assertEqual(len(mail.outbox), 1)
             self.assertIn('Update from', mail.outbox[0].subject)
     
+    def _add_followers(self, count):
+        """Create followers with notifications enabled."""
+        for index in range(count):
+            user = User.objects.create_user(
+                email=f'follower{index}@example.com',
+                password='testpass123'
+            )
+            CompanyFollow.objects.create(user=user, company=self.company, notifications_enabled=True)
+    
+    def test_new_job_fans_out_in_chunks(self):
+        """Followers are notified in batches with one realtime call per batch."""
+        from unittest import mock
+        from django.core import mail
+        from django.test import override_settings
+        from jobs.models import Job
+        from .services import CompanyNotificationService
+        
+        self._add_followers(4)
+        with override_settings(COMPANY_NOTIFICATION_CHUNK_SIZE=2), \
+                mock.patch('koroh_platform.realtime.dashboard_service.send_to_groups') as push:
+            job = Job.objects.create(
+                title='Chunked Job',
+                company=self.company,
+                description='A test job',
+                job_type='full_time',
+                experience_level='mid',
+                location='Remote',
+                status='published'
+            )
+            # Creating the job fans out through the post_save signal
+            self.assertEqual(len(mail.outbox), 5)
+            self.assertEqual(push.call_count, 3)
+            mail.outbox.clear()
+            push.reset_mock()
+            
+            # Re-running the fan-out for the same job notifies nobody twice
+            result = CompanyNotificationService.notify_followers_of_new_job(self.company, job)
+        
+        self.assertEqual(result['notifications_queued'], 5)
+        self.assertEqual(result['batches'], 3)
+        self.assertEqual(len(mail.outbox), 0)
+        push.assert_not_called()
+    
+    def test_chunk_retry_does_not_resend_emails(self):
+        """A batch whose realtime push failed only repeats the push on retry."""
+        from unittest import mock
+        from django.core import mail
+        from jobs.models import Job
+        from .services import CompanyNotificationService
+        
+        self._add_followers(2)
+        with mock.patch('companies.signals.notify_followers_new_job'):
+            job = Job.objects.create(
+                title='Retry Job',
+                company=self.company,
+                description='A test job',
+                job_type='full_time',
+                experience_level='mid',
+                location='Remote',
+                status='published'
+            )
+        user_ids = list(CompanyFollow.objects.values_list('user_id', flat=True))
+        
+        with mock.patch('koroh_platform.realtime.dashboard_service.send_to_groups',
+                        side_effect=[RuntimeError('channel layer down'), None]) as push:
+            with self.assertRaises(RuntimeError):
+                CompanyNotificationService.deliver_notification_batch(
+                    self.company, user_ids, 'new_job', 'New job', job=job, idempotency_key='retry'
+                )
+            result = CompanyNotificationService.deliver_notification_batch(
+                self.company, user_ids, 'new_job', 'New job', job=job, idempotency_key='retry'
+            )
+        
+        self.assertEqual(result['notifications_sent'], 3)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(push.call_count, 2)
+        self.assertEqual(len(push.call_args.args[0]), 3)
+    
+    def test_retry_skips_users_emailed_before_failure(self):
+        """A batch that failed part-way only emails the remaining users on retry."""
+        from unittest import mock
+        from django.core import mail
+        from django.test import override_settings
+        from authentication.email_templates import send_company_update_emails
+        from .services import CompanyNotificationService
+        
+        self._add_followers(2)
+        user_ids = list(CompanyFollow.objects.values_list('user_id', flat=True))
+        
+        def fail_second_batch(users, *args):
+            if flaky.call_count == 2:
+                raise ConnectionError('SMTP connection dropped')
+            return send_company_update_emails(users, *args)
+        
+        with override_settings(COMPANY_NOTIFICATION_EMAIL_BATCH_SIZE=2), \
+                mock.patch('authentication.email_templates.send_company_update_emails',
+                           side_effect=fail_second_batch) as flaky:
+            with self.assertRaises(ConnectionError):
+                CompanyNotificationService.deliver_notification_batch(
+                    self.company, user_ids, 'update', 'News', idempotency_key='partial'
+                )
+            self.assertEqual(len(mail.outbox), 2)
+            
+            result = CompanyNotificationService.deliver_notification_batch(
+                self.company, user_ids, 'update', 'News', idempotency_key='partial'
+            )
+        
+        self.assertEqual(result['notifications_sent'], 3)
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(len({message.to[0] for message in mail.outbox}), 3)
+    
+    def test_chunk_keys_use_follow_id_ranges(self):
+        """Chunks are keyed by their follow id range, not by a hash of their members."""
+        from unittest import mock
+        from django.test import override_settings
+        from .services import CompanyNotificationService
+        
+        self._add_followers(2)
+        follow_ids = list(
+            CompanyFollow.objects.filter(company=self.company, notifications_enabled=True)
+            .order_by('id').values_list('id', flat=True)
+        )
+        
+        with override_settings(COMPANY_NOTIFICATION_CHUNK_SIZE=2), \
+                mock.patch('companies.tasks.deliver_follower_notifications.delay') as delay:
+            CompanyNotificationService.notify_followers_of_company_update(self.company, 'update', 'News')
+        
+        keys = [call.kwargs['idempotency_key'].rsplit(':', 1)[1] for call in delay.call_args_list]
+        self.assertEqual(keys, [
+            f'{follow_ids[0]}-{follow_ids[1]}', f'{follow_ids[2]}-{follow_ids[2]}'
+        ])
+    
+    def test_connection_failure_is_raised_for_retry(self):
+        """A dropped SMTP connection fails the batch instead of marking users as attempted."""
+        import smtplib
+        from unittest import mock
+        from django.core import mail
+        from .services import CompanyNotificationService
+        
+        self._add_followers(1)
+        user_ids = list(CompanyFollow.objects.values_list('user_id', flat=True))
+        refused = smtplib.SMTPRecipientsRefused({'follower0@example.com': (550, b'No such user')})
+        
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages',
+                        side_effect=[refused, smtplib.SMTPServerDisconnected('gone')]):
+            with self.assertRaises(smtplib.SMTPServerDisconnected):
+                CompanyNotificationService.deliver_notification_batch(
+                    self.company, user_ids, 'update', 'News', idempotency_key='dropped'
+                )
+        
+        result = CompanyNotificationService.deliver_notification_batch(
+            self.company, user_ids, 'update', 'News', idempotency_key='dropped'
+        )
+        self.assertEqual(result['notifications_sent'], 2)
+        self.assertEqual(len(mail.outbox), 2)
+    
     def test_send_weekly_digest(self):
         """Test sending weekly digest to users."""
         from .services import CompanyNotificationService
@@ -594,6 +752,43 @@ class CompanyNotificationServiceTest(TestCase):
             self.assertEqual(len(mail.outbox), 1)
             self.assertIn('Weekly Company Updates', mail.outbox[0].subject)
     
+    def test_weekly_digests_built_from_shared_snapshot(self):
+        """The batch digest run costs the same queries however many users follow."""
+        from unittest import mock
+        from django.core import mail
+        from jobs.models import Job
+        from .services import CompanyNotificationService, WeeklyDigestBuilder
+        
+        with mock.patch('companies.signals.notify_followers_new_job'):
+            for index in range(4):
+                Job.objects.create(
+                    title=f'Digest Job {index}',
+                    company=self.company,
+                    description='A recent job',
+                    job_type='full_time',
+                    experience_level='mid',
+                    location='Remote',
+                    status='published'
+                )
+        CompanyInsight.objects.create(
+            company=self.company, insight_type='growth', title='Big news', description='Details'
+        )
+        self._add_followers(3)
+        
+        builder = WeeklyDigestBuilder()
+        digest = builder.build([self.company.id])
+        self.assertEqual(digest['new_jobs_count'], 4)
+        self.assertEqual(len(digest['featured_jobs']), WeeklyDigestBuilder.FEATURED_JOBS_PER_COMPANY)
+        self.assertEqual(digest['company_updates'][0]['message'], 'Big news')
+        
+        mail.outbox.clear()
+        # Three activity queries, the follow stream and one user lookup
+        with self.assertNumQueries(5):
+            results = CompanyNotificationService.send_weekly_digests()
+        
+        self.assertEqual(results, {'total_users': 4, 'digests_sent': 4, 'failed_digests': 0})
+        self.assertEqual(len(mail.outbox), 4)
+    
     def test_send_weekly_digest_no_activities(self):
         """Test weekly digest when there are no activities."""
         from .services import CompanyNotificationService
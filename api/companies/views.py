@@ -164,7 +164,7 @@ class CompanyViewSet(viewsets.ModelViewSet):
             company=company,
             is_active=True,
             status='published'
-        ).order_by('-posted_date')
+        ).select_related('company').order_by('-posted_date')
         
         page = self.paginate_queryset(jobs)
         if page is not None:
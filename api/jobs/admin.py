@@ -6,7 +6,7 @@ from django.contrib import admin
 from django.utils.html import format_html
 from django.urls import reverse
 from django.utils.safestring import mark_safe
-from .models import Job, JobApplication, JobSavedByUser
+from .models import Job, JobApplication, JobSavedByUser, JobMatchScore
 
 
 @admin.register(Job)
@@ -28,7 +28,7 @@ class JobAdmin(admin.ModelAdmin):
         'skills_required', 'skills_preferred'
     ]
     readonly_fields = [
-        'slug', 'view_count', 'application_count', 'ai_match_score',
+        'slug', 'view_count', 'application_count',
         'posted_date', 'updated_at'
     ]
     prepopulated_fields = {'slug': ('title',)}
@@ -75,7 +75,7 @@ class JobAdmin(admin.ModelAdmin):
         }),
         ('AI & Analytics', {
             'fields': (
-                'ai_match_score', 'ai_tags', 'view_count', 
+                'ai_tags', 'view_count', 
                 'application_count'
             ),
             'classes': ('collapse',)
@@ -178,4 +178,19 @@ class JobSavedByUserAdmin(admin.ModelAdmin):
         """Display job company name."""
         return obj.job.company.name
     job_company.short_description = 'Company'
-    job_company.admin_order_field = 'job__company__name'
\ No newline at end of file
+    job_company.admin_order_field = 'job__company__name'
+
+@admin.register(JobMatchScore)
+class JobMatchScoreAdmin(admin.ModelAdmin):
+    """Admin interface for JobMatchScore model."""
+    
+    list_display = ['user', 'job', 'score', 'source', 'computed_at']
+    list_filter = ['source', 'computed_at']
+    search_fields = ['user__email', 'job__title', 'job__company__name']
+    readonly_fields = ['profile_updated_at', 'job_updated_at', 'computed_at']
+    
+    def get_queryset(self, request):
+        """Optimize queryset with select_related."""
+        return super().get_queryset(request).select_related(
+            'user', 'job', 'job__company'
+        )
@@ -0,0 +1,277 @@
+"""
+Local vectorized job matching engine for Jobs app.
+
+Encodes the active job catalog into precomputed NumPy feature arrays
+(skill bitsets, experience ordinals, industry ids, location/remote flags)
+so a user profile can be scored against every candidate job in one pass,
+using the same weights as the AI matching prompt.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from django.db.models import Count, Max, Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Weights mirror JobRecommendationService._create_matching_prompt and
+# _calculate_fallback_score: skills 40% (30% required, 10% preferred),
+# experience 25%, industry 20%, location 15%.
+REQUIRED_SKILLS_WEIGHT = 0.30
+PREFERRED_SKILLS_WEIGHT = 0.10
+EXPERIENCE_WEIGHT = 0.25
+INDUSTRY_WEIGHT = 0.20
+LOCATION_WEIGHT = 0.15
+
+EXPERIENCE_ORDINALS = {
+    code: ordinal for ordinal, (code, _label) in enumerate(Job.EXPERIENCE_LEVELS)
+}
+
+# Number of set bits for every possible byte value, used to popcount packed bitsets.
+_POPCOUNT_TABLE = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
+_UNKNOWN = -1
+_NO_MATCH = -2
+
+
+def _normalize(value: Optional[str]) -> str:
+    return (value or '').strip().lower()
+
+
+class JobFeatureIndex:
+    """
+    Precomputed feature arrays for a set of jobs.
+
+    Each row corresponds to one job id. Skills are stored as packed
+    bitsets over a shared skill vocabulary so overlap with a user's skills
+    is a bitwise AND plus a popcount.
+    """
+
+    def __init__(self, rows: Sequence[Tuple]):
+        """
+        Build the index from job value rows.
+
+        Args:
+            rows: Tuples of (id, skills_required, skills_preferred,
+                experience_level, company industry, location,
+                is_remote_friendly, expires_at)
+        """
+        self.skill_vocabulary: Dict[str, int] = {}
+        self.industry_vocabulary: Dict[str, int] = {}
+
+        count = len(rows)
+        required_sets = []
+        preferred_sets = []
+        industries = np.full(count, _UNKNOWN, dtype=np.int32)
+        experience = np.full(count, _UNKNOWN, dtype=np.int8)
+        remote = np.zeros(count, dtype=bool)
+        expires = np.full(count, np.inf, dtype=np.float64)
+        locations = []
+        ids = []
+
+        for row_index, row in enumerate(rows):
+            (job_id, required, preferred, experience_level,
+             industry, location, is_remote, expires_at) = row
+            ids.append(job_id)
+            required_sets.append(self._encode_skills(required))
+            preferred_sets.append(self._encode_skills(preferred))
+            experience[row_index] = EXPERIENCE_ORDINALS.get(experience_level, _UNKNOWN)
+            industries[row_index] = self.industry_vocabulary.setdefault(
+                _normalize(industry), len(self.industry_vocabulary)
+            )
+            remote[row_index] = bool(is_remote)
+            if expires_at is not None:
+                expires[row_index] = expires_at.timestamp()
+            locations.append(_normalize(location))
+
+        self.job_ids = np.array(ids, dtype=np.int64)
+        self.required_bits, self.required_counts = self._pack(required_sets, count)
+        self.preferred_bits, self.preferred_counts = self._pack(preferred_sets, count)
+        self.experience = experience
+        self.industries = industries
+        self.remote = remote
+        self.expires = expires
+
+        # Location compatibility is a substring test, so evaluate it once per
+        # distinct location string instead of once per job.
+        self.location_values, self.location_codes = np.unique(
+            np.array(locations, dtype=object), return_inverse=True
+        ) if count else (np.array([], dtype=object), np.array([], dtype=np.int64))
+
+    def __len__(self) -> int:
+        return len(self.job_ids)
+
+    @classmethod
+    def from_queryset(cls, queryset) -> 'JobFeatureIndex':
+        """Build an index from a Job queryset without instantiating models."""
+        rows = list(queryset.values_list(
+            'id', 'skills_required', 'skills_preferred', 'experience_level',
+            'company__industry', 'location', 'is_remote_friendly', 'expires_at'
+        ))
+        return cls(rows)
+
+    def _encode_skills(self, skills: Optional[Iterable[str]]) -> List[int]:
+        positions = set()
+        for skill in skills or []:
+            if not isinstance(skill, str):
+                continue
+            key = _normalize(skill)
+            if key:
+                positions.add(self.skill_vocabulary.setdefault(key, len(self.skill_vocabulary)))
+        return sorted(positions)
+
+    def _pack(self, skill_sets: List[List[int]], count: int) -> Tuple[np.ndarray, np.ndarray]:
+        width = max(len(self.skill_vocabulary), 1)
+        dense = np.zeros((count, width), dtype=bool)
+        for row_index, positions in enumerate(skill_sets):
+            dense[row_index, positions] = True
+        return np.packbits(dense, axis=1), dense.sum(axis=1).astype(np.float64)
+
+    def _user_skill_bits(self, skills: Iterable[str]) -> np.ndarray:
+        width = max(len(self.skill_vocabulary), 1)
+        dense = np.zeros(width, dtype=bool)
+        for skill in skills or []:
+            if not isinstance(skill, str):
+                continue
+            position = self.skill_vocabulary.get(_normalize(skill))
+            if position is not None:
+                dense[position] = True
+        return np.packbits(dense)
+
+    def _skill_overlap(self, job_bits: np.ndarray, job_counts: np.ndarray, user_bits: np.ndarray) -> np.ndarray:
+        matched = _POPCOUNT_TABLE[job_bits & user_bits].sum(axis=1, dtype=np.float64)
+        ratio = np.zeros(len(job_counts), dtype=np.float64)
+        np.divide(matched, job_counts, out=ratio, where=job_counts > 0)
+        return ratio
+
+    def score(self, user_context: Dict[str, Any]) -> np.ndarray:
+        """
+        Score every job in the index against a user context.
+
+        Args:
+            user_context: Context built by JobRecommendationService._build_user_context
+
+        Returns:
+            Array of match scores between 0.0 and 1.0, aligned with job_ids
+        """
+        if not len(self):
+            return np.zeros(0, dtype=np.float64)
+
+        user_bits = self._user_skill_bits(user_context.get('skills', []))
+        scores = (
+            self._skill_overlap(self.required_bits, self.required_counts, user_bits) * REQUIRED_SKILLS_WEIGHT
+            + self._skill_overlap(self.preferred_bits, self.preferred_counts, user_bits) * PREFERRED_SKILLS_WEIGHT
+        )
+
+        user_experience = EXPERIENCE_ORDINALS.get(user_context.get('experience_level'), _NO_MATCH)
+        scores += (self.experience == user_experience) * EXPERIENCE_WEIGHT
+
+        user_industry = self.industry_vocabulary.get(
+            _normalize(user_context.get('industry', '')), _NO_MATCH
+        )
+        scores += (self.industries == user_industry) * INDUSTRY_WEIGHT
+
+        user_location = _normalize(user_context.get('location', ''))
+        location_match = np.fromiter(
+            (user_location in value or value in user_location for value in self.location_values),
+            dtype=bool,
+            count=len(self.location_values)
+        )
+        scores += (self.remote | location_match[self.location_codes]) * LOCATION_WEIGHT
+
+        return np.minimum(scores, 1.0)
+
+    def top_matches(
+        self,
+        user_context: Dict[str, Any],
+        limit: int,
+        min_score: float = 0.0,
+        exclude_ids: Optional[Iterable[int]] = None
+    ) -> List[Tuple[int, float]]:
+        """
+        Return the best (job_id, score) pairs for a user, highest first.
+
+        Expired jobs, excluded ids and scores below min_score are dropped.
+        """
+        scores = self.score(user_context)
+        if not len(scores) or limit <= 0:
+            return []
+
+        mask = (scores >= min_score) & (self.expires > time.time())
+        if exclude_ids:
+            mask &= ~np.isin(self.job_ids, np.fromiter(exclude_ids, dtype=np.int64))
+
+        candidates = np.flatnonzero(mask)
+        if len(candidates) > limit:
+            best = np.argpartition(-scores[candidates], limit - 1)[:limit]
+            candidates = candidates[best]
+
+        # Stable sort keeps catalog order (most recent first) for equal scores.
+        order = candidates[np.argsort(-scores[candidates], kind='stable')]
+        return [(int(self.job_ids[i]), float(scores[i])) for i in order]
+
+
+class JobFeatureIndexCache:
+    """
+    Process-local cache of the feature index for the active job catalog.
+
+    The index is rebuilt when the catalog signature (active job count and
+    latest job update) changes, or after max_age seconds as a safety net.
+    """
+
+    def __init__(self, max_age: int = 300):
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._index: Optional[JobFeatureIndex] = None
+        self._signature = None
+        self._built_at = 0.0
+
+    @staticmethod
+    def active_jobs():
+        """Queryset of jobs eligible for recommendations, newest first."""
+        return Job.objects.filter(
+            is_active=True,
+            status='published'
+        ).filter(
+            Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now())
+        ).order_by('-posted_date')
+
+    def _catalog_signature(self):
+        latest = Job.objects.aggregate(latest=Max('updated_at'))['latest']
+        active = self.active_jobs().aggregate(total=Count('id'))['total']
+        return active, latest
+
+    def get(self) -> JobFeatureIndex:
+        """Return an up-to-date index, rebuilding it if the catalog changed."""
+        signature = self._catalog_signature()
+        with self._lock:
+            is_fresh = (
+                self._index is not None
+                and signature == self._signature
+                and time.monotonic() - self._built_at < self.max_age
+            )
+            if not is_fresh:
+                started = time.monotonic()
+                self._index = JobFeatureIndex.from_queryset(self.active_jobs())
+                self._signature = signature
+                self._built_at = time.monotonic()
+                logger.info(
+                    f"Built job feature index for {len(self._index)} jobs "
+                    f"in {(self._built_at - started) * 1000:.1f}ms"
+                )
+            return self._index
+
+    def invalidate(self) -> None:
+        """Drop the cached index so the next call rebuilds it."""
+        with self._lock:
+            self._index = None
+            self._signature = None
+
+
+job_feature_index = JobFeatureIndexCache()
@@ -0,0 +1,111 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:14
+
+from django.conf import settings
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ("jobs", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="JobMatchScore",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "score",
+                    models.FloatField(
+                        help_text="Match score between the user and the job",
+                        validators=[
+                            django.core.validators.MinValueValidator(0.0),
+                            django.core.validators.MaxValueValidator(1.0),
+                        ],
+                        verbose_name="match score",
+                    ),
+                ),
+                (
+                    "source",
+                    models.CharField(
+                        choices=[
+                            ("local", "Local Matching Engine"),
+                            ("ai", "AI Re-ranked"),
+                        ],
+                        default="local",
+                        help_text="How the score was computed",
+                        max_length=10,
+                        verbose_name="score source",
+                    ),
+                ),
+                (
+                    "profile_updated_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="Profile updated_at the score was computed from",
+                        null=True,
+                        verbose_name="profile version",
+                    ),
+                ),
+                (
+                    "job_updated_at",
+                    models.DateTimeField(
+                        help_text="Job updated_at the score was computed from",
+                        verbose_name="job version",
+                    ),
+                ),
+                (
+                    "computed_at",
+                    models.DateTimeField(
+                        help_text="When the score was computed",
+                        verbose_name="computed at",
+                    ),
+                ),
+                (
+                    "job",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="match_scores",
+                        to="jobs.job",
+                        verbose_name="job",
+                    ),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="job_match_scores",
+                        to=settings.AUTH_USER_MODEL,
+                        verbose_name="user",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Job Match Score",
+                "verbose_name_plural": "Job Match Scores",
+                "ordering": ["-score"],
+                "indexes": [
+                    models.Index(
+                        fields=["user", "-score"], name="jobs_jobmat_user_id_0d9d1c_idx"
+                    ),
+                    models.Index(
+                        fields=["user", "computed_at"],
+                        name="jobs_jobmat_user_id_84959b_idx",
+                    ),
+                ],
+                "unique_together": {("user", "job")},
+            },
+        ),
+    ]
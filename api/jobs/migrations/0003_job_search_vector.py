@@ -0,0 +1,65 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:42
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+# GIN indexes are created with raw SQL so the migration stays a no-op on
+# databases without tsvector/pg_trgm support (e.g. SQLite in tests).
+CREATE_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS jobs_job_search_vector_gin ON jobs_job USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS jobs_job_title_trgm ON jobs_job USING gin (title gin_trgm_ops)",
+]
+
+DROP_INDEXES = [
+    "DROP INDEX IF EXISTS jobs_job_title_trgm",
+    "DROP INDEX IF EXISTS jobs_job_search_vector_gin",
+]
+
+# Mirrors jobs.search.job_search_vector() with the default 'english' config.
+BACKFILL_SEARCH_VECTORS = """
+    UPDATE jobs_job SET search_vector =
+        setweight(to_tsvector('english', coalesce(jobs_job.title, '') || ' ' || coalesce(company.name, '')), 'A')
+        || setweight(to_tsvector('english',
+            coalesce(jobs_job.skills_required::text, '') || ' '
+            || coalesce(jobs_job.skills_preferred::text, '') || ' '
+            || coalesce(jobs_job.search_keywords::text, '')), 'B')
+        || setweight(to_tsvector('english', coalesce(jobs_job.summary, '') || ' ' || coalesce(jobs_job.location, '')), 'C')
+        || setweight(to_tsvector('english', coalesce(jobs_job.description, '')), 'D')
+    FROM companies_company AS company
+    WHERE company.id = jobs_job.company_id
+"""
+
+
+def create_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in CREATE_INDEXES:
+        schema_editor.execute(statement)
+    schema_editor.execute(BACKFILL_SEARCH_VECTORS)
+
+
+def drop_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for statement in DROP_INDEXES:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('companies', '0001_initial'),
+        ('jobs', '0002_job_match_score'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Weighted full-text document maintained by jobs.search', null=True, verbose_name='search vector'),
+        ),
+        migrations.RunPython(create_search_indexes, drop_search_indexes),
+    ]
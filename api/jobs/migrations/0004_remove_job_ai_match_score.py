@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:10
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0003_job_search_vector'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='job',
+            name='jobs_job_ai_matc_b5bc9a_idx',
+        ),
+        migrations.RemoveField(
+            model_name='job',
+            name='ai_match_score',
+        ),
+    ]
@@ -5,6 +5,7 @@ This module defines the Job model and related functionality for
 job postings, applications, and search optimization.
 """
 
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
@@ -253,6 +254,12 @@ class Job(models.Model):
         blank=True,
         help_text=_('Keywords for search optimization')
     )
+    search_vector = SearchVectorField(
+        _('search vector'),
+        null=True,
+        editable=False,
+        help_text=_('Weighted full-text document maintained by jobs.search')
+    )
     
     # Analytics and tracking
     view_count = models.PositiveIntegerField(
@@ -266,13 +273,7 @@ class Job(models.Model):
         help_text=_('Number of applications received')
     )
     
-    # AI and recommendation data
-    ai_match_score = models.FloatField(
-        _('AI match score'),
-        default=0.0,
-        validators=[MinValueValidator(0.0), MaxValueValidator(1.0)],
-        help_text=_('AI-generated relevance score for recommendations')
-    )
+    # AI and recommendation data; match scores are per user, see JobMatchScore
     ai_tags = models.JSONField(
         _('AI tags'),
         default=list,
@@ -312,8 +313,9 @@ class Job(models.Model):
             models.Index(fields=['posted_date']),
             models.Index(fields=['status', 'is_active']),
             models.Index(fields=['is_featured', 'is_urgent']),
-            models.Index(fields=['ai_match_score']),
             models.Index(fields=['expires_at']),
+            # GIN indexes on search_vector and title (gin_trgm_ops) are
+            # created by migration 0003 on PostgreSQL only.
         ]
     
     def __str__(self):
@@ -378,13 +380,13 @@ class Job(models.Model):
     
     def increment_view_count(self):
         """Increment the view count."""
-        self.view_count += 1
-        self.save(update_fields=['view_count'])
+        Job.objects.filter(pk=self.pk).update(view_count=models.F('view_count') + 1)
+        self.refresh_from_db(fields=['view_count'])
     
     def increment_application_count(self):
         """Increment the application count."""
-        self.application_count += 1
-        self.save(update_fields=['application_count'])
+        Job.objects.filter(pk=self.pk).update(application_count=models.F('application_count') + 1)
+        self.refresh_from_db(fields=['application_count'])
     
     def add_requirement(self, requirement):
         """Add a requirement to the requirements list."""
@@ -612,4 +614,140 @@ class JobSavedByUser(models.Model):
         ]
     
     def __str__(self):
-        return f"{self.user.get_full_name()} saved {self.job.title}"
\ No newline at end of file
+        return f"{self.user.get_full_name()} saved {self.job.title}"
+
+class JobMatchScoreQuerySet(models.QuerySet):
+    """QuerySet helpers for per-user job match scores."""
+    
+    def fresh_for(self, user, profile_updated_at, max_age_seconds):
+        """
+        Scores for a user that are still valid.
+        
+        A score is valid while the profile and job it was computed from are
+        unchanged and it is younger than max_age_seconds.
+        """
+        from django.utils import timezone
+        from datetime import timedelta
+        
+        return self.filter(
+            user=user,
+            profile_updated_at=profile_updated_at,
+            job_updated_at=models.F('job__updated_at'),
+            computed_at__gte=timezone.now() - timedelta(seconds=max_age_seconds)
+        )
+    
+    def ranked(self):
+        """Scores for active, published and unexpired jobs, best match first."""
+        from django.utils import timezone
+        
+        return self.filter(
+            job__is_active=True,
+            job__status='published'
+        ).filter(
+            models.Q(job__expires_at__isnull=True) |
+            models.Q(job__expires_at__gt=timezone.now())
+        ).select_related('job', 'job__company').order_by('-score', '-job__posted_date')
+
+
+class JobMatchScore(models.Model):
+    """
+    Per-user match score for a job.
+    
+    Stores recommendation scores per (user, job) pair instead of on the
+    shared Job row, stamped with the profile and job versions they were
+    computed from so unchanged pairs can be served without rescoring.
+    """
+    
+    SOURCES = [
+        ('local', _('Local Matching Engine')),
+        ('ai', _('AI Re-ranked')),
+    ]
+    
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='job_match_scores',
+        verbose_name=_('user')
+    )
+    job = models.ForeignKey(
+        Job,
+        on_delete=models.CASCADE,
+        related_name='match_scores',
+        verbose_name=_('job')
+    )
+    score = models.FloatField(
+        _('match score'),
+        validators=[MinValueValidator(0.0), MaxValueValidator(1.0)],
+        help_text=_('Match score between the user and the job')
+    )
+    source = models.CharField(
+        _('score source'),
+        max_length=10,
+        choices=SOURCES,
+        default='local',
+        help_text=_('How the score was computed')
+    )
+    
+    # Version stamps
+    profile_updated_at = models.DateTimeField(
+        _('profile version'),
+        blank=True,
+        null=True,
+        help_text=_('Profile updated_at the score was computed from')
+    )
+    job_updated_at = models.DateTimeField(
+        _('job version'),
+        help_text=_('Job updated_at the score was computed from')
+    )
+    computed_at = models.DateTimeField(
+        _('computed at'),
+        help_text=_('When the score was computed')
+    )
+    
+    objects = JobMatchScoreQuerySet.as_manager()
+    
+    class Meta:
+        verbose_name = _('Job Match Score')
+        verbose_name_plural = _('Job Match Scores')
+        unique_together = ['user', 'job']
+        ordering = ['-score']
+        indexes = [
+            models.Index(fields=['user', '-score']),
+            models.Index(fields=['user', 'computed_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id} -> {self.job_id}: {self.score:.2f}"
+    
+    @classmethod
+    def bulk_upsert(cls, user, profile_updated_at, jobs, source='local'):
+        """
+        Insert or update scores for many jobs in a single statement.
+        
+        Args:
+            user: User the scores belong to
+            profile_updated_at: Profile version the scores were computed from
+            jobs: Jobs carrying an ai_match_score attribute
+            source: How the scores were computed
+        """
+        from django.utils import timezone
+        
+        now = timezone.now()
+        rows = [
+            cls(
+                user=user,
+                job=job,
+                score=job.ai_match_score,
+                source=getattr(job, 'match_score_source', source),
+                profile_updated_at=profile_updated_at,
+                job_updated_at=job.updated_at,
+                computed_at=now
+            )
+            for job in jobs
+        ]
+        return cls.objects.bulk_create(
+            rows,
+            update_conflicts=True,
+            unique_fields=['user', 'job'],
+            update_fields=['score', 'source', 'profile_updated_at', 'job_updated_at', 'computed_at']
+        )
@@ -0,0 +1,181 @@
+"""
+Pluggable full-text search backends for Jobs app.
+
+The default backend searches a weighted tsvector column (kept up to date
+by jobs.signals) through its GIN index, matches fuzzy titles through a
+pg_trgm index and ranks results with SearchRank. On databases without
+Postgres full-text search it falls back to icontains filters. Setting
+JOB_SEARCH_BACKEND to 'meilisearch' routes queries to the Meilisearch
+jobs index instead.
+"""
+
+import logging
+from typing import Dict, Type
+
+from django.conf import settings
+from django.contrib.postgres.search import (
+    SearchQuery, SearchRank, SearchVector, TrigramSimilarity
+)
+from django.db import connections
+from django.db.models import (
+    Case, F, FloatField, OuterRef, Q, QuerySet, Subquery, Value, When
+)
+
+from companies.models import Company
+
+logger = logging.getLogger(__name__)
+
+# Job fields that feed the search vector; saves touching none of them skip the refresh.
+SEARCHABLE_FIELDS = frozenset({
+    'title', 'company', 'skills_required', 'skills_preferred',
+    'search_keywords', 'summary', 'location', 'description',
+})
+
+
+def get_search_config() -> str:
+    return getattr(settings, 'JOB_SEARCH_CONFIG', 'english')
+
+
+def job_search_vector() -> SearchVector:
+    """
+    Weighted search vector expression for Job rows.
+
+    Title and company name rank highest, then skills and keywords,
+    then summary and location, then the full description.
+    """
+    config = get_search_config()
+    company_name = Subquery(
+        Company.objects.filter(pk=OuterRef('company_id')).order_by().values('name')[:1]
+    )
+    return (
+        SearchVector('title', company_name, weight='A', config=config)
+        + SearchVector(
+            'skills_required', 'skills_preferred', 'search_keywords',
+            weight='B', config=config
+        )
+        + SearchVector('summary', 'location', weight='C', config=config)
+        + SearchVector('description', weight='D', config=config)
+    )
+
+
+def supports_full_text_search(using: str = 'default') -> bool:
+    return connections[using].vendor == 'postgresql'
+
+
+def refresh_search_vectors(queryset: QuerySet) -> int:
+    """
+    Recompute the stored search vector for the jobs in a queryset.
+
+    Returns:
+        Number of rows updated (0 on databases without full-text search)
+    """
+    if not supports_full_text_search(queryset.db):
+        return 0
+    return queryset.order_by().update(search_vector=job_search_vector())
+
+
+class JobSearchBackend:
+    """
+    Base class for job search backends.
+
+    filter() restricts a Job queryset to jobs matching the query and
+    annotates each row with a `search_rank` float, higher is better.
+    """
+
+    name = ''
+
+    def filter(self, queryset: QuerySet, query: str) -> QuerySet:
+        raise NotImplementedError
+
+
+class SubstringJobSearchBackend(JobSearchBackend):
+    """Unranked icontains matching, for databases without full-text search."""
+
+    name = 'substring'
+
+    def filter(self, queryset: QuerySet, query: str) -> QuerySet:
+        return queryset.filter(
+            Q(title__icontains=query) |
+            Q(description__icontains=query) |
+            Q(skills_required__icontains=query) |
+            Q(skills_preferred__icontains=query) |
+            Q(company__name__icontains=query) |
+            Q(search_keywords__icontains=query)
+        ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+class PostgresJobSearchBackend(JobSearchBackend):
+    """Ranked tsvector search plus trigram matching on titles."""
+
+    name = 'postgres'
+
+    def filter(self, queryset: QuerySet, query: str) -> QuerySet:
+        if not supports_full_text_search(queryset.db):
+            return SubstringJobSearchBackend().filter(queryset, query)
+
+        search_query = SearchQuery(query, search_type='websearch', config=get_search_config())
+        # Both predicates are served by GIN indexes; `%` uses pg_trgm.similarity_threshold.
+        return queryset.filter(
+            Q(search_vector=search_query) | Q(title__trigram_similar=query)
+        ).annotate(
+            search_rank=SearchRank(F('search_vector'), search_query)
+            + TrigramSimilarity('title', query)
+        )
+
+
+class MeilisearchJobSearchBackend(JobSearchBackend):
+    """
+    Meilisearch-backed search.
+
+    Meilisearch returns ranked job ids; the database applies the remaining
+    filters and visibility rules. Falls back to the Postgres backend when
+    Meilisearch is unavailable.
+    """
+
+    name = 'meilisearch'
+
+    def filter(self, queryset: QuerySet, query: str) -> QuerySet:
+        from koroh_platform.utils import meilisearch_client
+
+        max_hits = int(getattr(settings, 'JOB_SEARCH_MEILISEARCH_MAX_HITS', 1000))
+        # Only published, active jobs are indexed (see utils.search_indexing)
+        results = meilisearch_client.search_jobs(query, limit=max_hits)
+        if results is None:
+            logger.warning("Meilisearch job search unavailable, falling back to database search")
+            return PostgresJobSearchBackend().filter(queryset, query)
+
+        job_ids = []
+        for hit in results.get('hits', []):
+            try:
+                job_ids.append(int(hit['id']))
+            except (KeyError, TypeError, ValueError):
+                continue
+
+        if not job_ids:
+            return queryset.none().annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+        hit_count = len(job_ids)
+        return queryset.filter(id__in=job_ids).annotate(
+            search_rank=Case(
+                *[When(id=job_id, then=Value(float(hit_count - position)))
+                  for position, job_id in enumerate(job_ids)],
+                default=Value(0.0),
+                output_field=FloatField(),
+            )
+        )
+
+
+SEARCH_BACKENDS: Dict[str, Type[JobSearchBackend]] = {
+    backend.name: backend
+    for backend in (PostgresJobSearchBackend, MeilisearchJobSearchBackend, SubstringJobSearchBackend)
+}
+
+
+def get_job_search_backend() -> JobSearchBackend:
+    """Return the backend selected by the JOB_SEARCH_BACKEND setting."""
+    name = getattr(settings, 'JOB_SEARCH_BACKEND', 'postgres')
+    backend_class = SEARCH_BACKENDS.get(name)
+    if backend_class is None:
+        logger.error(f"Unknown JOB_SEARCH_BACKEND '{name}', using postgres")
+        backend_class = PostgresJobSearchBackend
+    return backend_class()
@@ -3,13 +3,24 @@ Serializers for Jobs app.
 """
 
 from rest_framework import serializers
+from django.db import models
 from django.contrib.auth import get_user_model
 from companies.serializers import CompanyListSerializer
-from .models import Job, JobApplication, JobSavedByUser
+from .models import Job, JobApplication, JobSavedByUser, JobMatchScore
+from .services import JobViewerState
 
 User = get_user_model()
 
 
+class JobListPageSerializer(serializers.ListSerializer):
+    """List serializer that loads the viewer's state for the whole page at once."""
+    
+    def to_representation(self, data):
+        jobs = list(data.all() if isinstance(data, models.Manager) else data)
+        JobViewerState.from_context(self.context).load(jobs)
+        return super().to_representation(jobs)
+
+
 class JobListSerializer(serializers.ModelSerializer):
     """Serializer for job list view."""
     
@@ -20,6 +31,7 @@ class JobListSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Job
+        list_serializer_class = JobListPageSerializer
         fields = [
             'id', 'title', 'slug', 'company', 'summary', 'job_type',
             'experience_level', 'work_arrangement', 'location',
@@ -30,21 +42,11 @@ class JobListSerializer(serializers.ModelSerializer):
     
     def get_is_saved(self, obj):
         """Check if current user has saved this job."""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return JobSavedByUser.objects.filter(
-                user=request.user, job=obj
-            ).exists()
-        return False
+        return JobViewerState.from_context(self.context).is_saved(obj)
     
     def get_has_applied(self, obj):
         """Check if current user has applied to this job."""
-        request = self.context.get('request')
-        if request and request.user.is_authenticated:
-            return JobApplication.objects.filter(
-                user=request.user, job=obj
-            ).exists()
-        return False
+        return JobViewerState.from_context(self.context).has_applied(obj)
 
 
 class JobDetailSerializer(serializers.ModelSerializer):
@@ -70,7 +72,7 @@ class JobDetailSerializer(serializers.ModelSerializer):
             'application_url', 'application_email', 'application_instructions',
             'is_featured', 'is_urgent', 'is_published', 'is_expired',
             'posted_date', 'expires_at', 'view_count', 'application_count',
-            'ai_match_score', 'ai_tags', 'is_saved', 'has_applied', 'application_status'
+            'ai_tags', 'is_saved', 'has_applied', 'application_status'
         ]
     
     def get_is_saved(self, obj):
@@ -179,6 +181,27 @@ class JobSavedSerializer(serializers.ModelSerializer):
         return super().create(validated_data)
 
 
+class JobMatchScorePageSerializer(serializers.ListSerializer):
+    """List serializer that loads the viewer's state for the page's jobs at once."""
+    
+    def to_representation(self, data):
+        scores = list(data.all() if isinstance(data, models.Manager) else data)
+        JobViewerState.from_context(self.context).load([score.job for score in scores])
+        return super().to_representation(scores)
+
+
+class JobMatchScoreSerializer(serializers.ModelSerializer):
+    """Serializer for stored per-user job recommendation scores."""
+    
+    job = JobListSerializer(read_only=True)
+    
+    class Meta:
+        model = JobMatchScore
+        list_serializer_class = JobMatchScorePageSerializer
+        fields = ['job', 'score', 'source', 'computed_at']
+        read_only_fields = fields
+
+
 class JobSearchSerializer(serializers.Serializer):
     """Serializer for job search parameters."""
     
@@ -202,12 +225,12 @@ class JobSearchSerializer(serializers.Serializer):
     )
     ordering = serializers.ChoiceField(
         choices=[
-            'title', '-title', 'posted_date', '-posted_date',
+            'relevance', 'title', '-title', 'posted_date', '-posted_date',
             'salary_min', '-salary_min', 'application_count', '-application_count',
-            'view_count', '-view_count', 'ai_match_score', '-ai_match_score'
+            'view_count', '-view_count'
         ],
         required=False,
-        default='-posted_date'
+        default='relevance'
     )
     
     def validate(self, data):
@@ -5,19 +5,95 @@ Services for Jobs app including AI-powered recommendations and search.
 import json
 import logging
 from typing import List, Dict, Any, Optional
-from django.db.models import Q, F, Count, Avg, Case, When, FloatField
+from django.db.models import Q, F, Count, Avg, Case, When, FloatField, QuerySet
+from django.conf import settings
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta
 from koroh_platform.utils.ai_services import ContentGenerationService, AIServiceConfig, ModelType
 from profiles.models import Profile
-from companies.models import Company
-from .models import Job, JobApplication, JobSavedByUser
+from companies.models import Company, CompanyFollow
+from .models import Job, JobApplication, JobSavedByUser, JobMatchScore
+from .matching import job_feature_index
+from .search import get_job_search_backend
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
 
+class JobViewerState:
+    """
+    Request-scoped saved/applied/following lookups for the viewing user.
+    
+    List serializers load a whole page of jobs up front so the viewer's
+    state costs one query per relation instead of one per row. Jobs that
+    were not part of a loaded page are fetched on first lookup.
+    """
+    
+    CONTEXT_KEY = 'viewer_state'
+    
+    def __init__(self, user=None):
+        self.user = user if user is not None and user.is_authenticated else None
+        self.saved_job_ids = set()
+        self.applied_job_ids = set()
+        self.followed_company_ids = set()
+        self._loaded_job_ids = set()
+        self._loaded_company_ids = set()
+    
+    @classmethod
+    def from_context(cls, context: Dict[str, Any]) -> 'JobViewerState':
+        """Return the state stored in a serializer context, creating it once."""
+        state = context.get(cls.CONTEXT_KEY)
+        if state is None:
+            request = context.get('request')
+            state = cls(getattr(request, 'user', None))
+            context[cls.CONTEXT_KEY] = state
+        return state
+    
+    def load(self, jobs) -> 'JobViewerState':
+        """Fetch the viewer's state for any jobs not loaded yet."""
+        if self.user is None:
+            return self
+        
+        job_ids = {job.id for job in jobs} - self._loaded_job_ids
+        if job_ids:
+            self.saved_job_ids.update(JobSavedByUser.objects.filter(
+                user=self.user, job_id__in=job_ids
+            ).order_by().values_list('job_id', flat=True))
+            self.applied_job_ids.update(JobApplication.objects.filter(
+                user=self.user, job_id__in=job_ids
+            ).order_by().values_list('job_id', flat=True))
+            self._loaded_job_ids |= job_ids
+        
+        self.load_companies(job.company_id for job in jobs)
+        return self
+    
+    def load_companies(self, company_ids) -> 'JobViewerState':
+        """Fetch which of the given companies the viewer follows."""
+        if self.user is None:
+            return self
+        
+        company_ids = set(company_ids) - self._loaded_company_ids
+        if company_ids:
+            self.followed_company_ids.update(CompanyFollow.objects.filter(
+                user=self.user, company_id__in=company_ids
+            ).order_by().values_list('company_id', flat=True))
+            self._loaded_company_ids |= company_ids
+        return self
+    
+    def is_saved(self, job) -> bool:
+        self.load([job])
+        return job.id in self.saved_job_ids
+    
+    def has_applied(self, job) -> bool:
+        self.load([job])
+        return job.id in self.applied_job_ids
+    
+    def is_following(self, company) -> bool:
+        self.load_companies([company.id])
+        return company.id in self.followed_company_ids
+
+
 class JobSearchService:
     """Service for job search functionality."""
     
@@ -28,7 +104,8 @@ class JobSearchService:
         
         Args:
             search_params: Dictionary of search parameters
-            user: Optional user for personalized results
+            user: Optional user for personalized results. Saved/applied
+                flags are resolved per page by JobViewerState.
             
         Returns:
             Dictionary with queryset and metadata
@@ -36,19 +113,12 @@ class JobSearchService:
         queryset = Job.objects.filter(
             is_active=True,
             status='published'
-        ).select_related('company').prefetch_related('applications', 'saved_by_users')
+        ).select_related('company')
         
-        # Text search
+        # Text search through the configured backend (annotates search_rank)
         query = search_params.get('query', '').strip()
         if query:
-            queryset = queryset.filter(
-                Q(title__icontains=query) |
-                Q(description__icontains=query) |
-                Q(skills_required__icontains=query) |
-                Q(skills_preferred__icontains=query) |
-                Q(company__name__icontains=query) |
-                Q(search_keywords__icontains=query)
-            )
+            queryset = get_job_search_backend().filter(queryset, query)
         
         # Location filter
         location = search_params.get('location', '').strip()
@@ -123,24 +193,12 @@ class JobSearchService:
                 )
             queryset = queryset.filter(skill_queries)
         
-        # Ordering
-        ordering = search_params.get('ordering', '-posted_date')
-        queryset = queryset.order_by(ordering)
-        
-        # Add user-specific annotations if user is provided
-        if user and user.is_authenticated:
-            queryset = queryset.annotate(
-                is_saved=Case(
-                    When(saved_by_users__user=user, then=True),
-                    default=False,
-                    output_field=FloatField()
-                ),
-                has_applied=Case(
-                    When(applications__user=user, then=True),
-                    default=False,
-                    output_field=FloatField()
-                )
-            )
+        # Ordering; relevance falls back to recency when there is no query
+        ordering = search_params.get('ordering') or 'relevance'
+        if ordering == 'relevance':
+            queryset = queryset.order_by(*(['-search_rank', '-posted_date'] if query else ['-posted_date']))
+        else:
+            queryset = queryset.order_by(ordering)
         
         return {
             'queryset': queryset,
@@ -152,31 +210,55 @@ class JobSearchService:
 class JobRecommendationService:
     """Service for AI-powered job recommendations."""
     
+    # Number of jobs packed into a single Bedrock prompt
+    AI_BATCH_SIZE = 10
+    
     def __init__(self):
         config = AIServiceConfig(
             model_type=ModelType.CLAUDE_3_SONNET,
             max_tokens=1000,
-            temperature=0.3
+            temperature=0.3,
+            cache_template='analysis'
         )
         self.ai_service = ContentGenerationService(config)
     
+    def get_stored_recommendations(self, user: User) -> 'QuerySet[JobMatchScore]':
+        """
+        Get the user's stored recommendation scores, best match first.
+        
+        Serves previously computed scores without rescoring so callers can
+        page through them cheaply. Scores computed from an older version of
+        the user's profile are left out.
+        """
+        queryset = JobMatchScore.objects.filter(user=user)
+        profile = getattr(user, 'profile', None)
+        if profile:
+            queryset = queryset.filter(profile_updated_at=profile.updated_at)
+        return queryset.ranked()
+    
     def get_recommendations_for_user(
         self, 
         user: User, 
         limit: int = 10,
         include_applied: bool = False,
         include_saved: bool = True,
-        min_match_score: float = 0.3
+        min_match_score: float = 0.3,
+        ai_rerank_top_n: Optional[int] = None
     ) -> List[Job]:
         """
         Get AI-powered job recommendations for a user.
         
+        Jobs are scored locally against precomputed catalog features; Bedrock
+        is only consulted to re-rank the top matches when enabled.
+        
         Args:
             user: User to get recommendations for
             limit: Maximum number of recommendations
             include_applied: Whether to include jobs user has applied to
             include_saved: Whether to include jobs user has saved
             min_match_score: Minimum AI match score threshold
+            ai_rerank_top_n: Number of top matches to re-rank with Bedrock
+                (defaults to settings.JOB_RECOMMENDATION_AI_RERANK_TOP_N)
             
         Returns:
             List of recommended Job objects
@@ -191,31 +273,65 @@ class JobRecommendationService:
             # Build user context for AI
             user_context = self._build_user_context(profile)
             
-            # Get candidate jobs
-            candidate_jobs = self._get_candidate_jobs(
-                user, include_applied, include_saved
+            # Score the whole active catalog locally in one vectorized pass
+            excluded_ids = self._get_excluded_job_ids(user, include_applied, include_saved)
+            index = job_feature_index.get()
+            matches = index.top_matches(
+                user_context,
+                limit=limit * 3,  # Get more candidates for better filtering
+                min_score=min_match_score,
+                exclude_ids=excluded_ids
             )
             
-            if not candidate_jobs.exists():
+            if not matches:
                 logger.info(f"No candidate jobs found for user {user.id}")
                 return []
             
-            # Calculate AI match scores
+            # Reuse stored scores for pairs whose profile and job are unchanged
+            candidate_ids = [job_id for job_id, _ in matches]
+            stored_scores = {
+                job_id: (score, source)
+                for job_id, score, source in JobMatchScore.objects.fresh_for(
+                    user,
+                    profile.updated_at,
+                    int(getattr(settings, 'JOB_RECOMMENDATION_SCORE_TTL', 21600))
+                ).filter(job_id__in=candidate_ids).values_list('job_id', 'score', 'source')
+            }
+            
+            jobs_by_id = Job.objects.select_related('company').in_bulk(candidate_ids)
             recommended_jobs = []
-            for job in candidate_jobs[:limit * 3]:  # Get more candidates for better filtering
-                try:
-                    match_score = self._calculate_ai_match_score(user_context, job)
-                    if match_score >= min_match_score:
-                        job.ai_match_score = match_score
-                        job.save(update_fields=['ai_match_score'])
-                        recommended_jobs.append(job)
-                except Exception as e:
-                    logger.error(f"Error calculating match score for job {job.id}: {e}")
+            scored_jobs = []
+            for job_id, match_score in matches:
+                job = jobs_by_id.get(job_id)
+                if job is None:
                     continue
+                if job_id in stored_scores:
+                    job.ai_match_score, job.match_score_source = stored_scores[job_id]
+                else:
+                    job.ai_match_score, job.match_score_source = match_score, 'local'
+                    scored_jobs.append(job)
+                recommended_jobs.append(job)
             
-            # Sort by match score and return top results
             recommended_jobs.sort(key=lambda x: x.ai_match_score, reverse=True)
             
+            # Optionally let Bedrock re-rank the strongest local matches
+            if ai_rerank_top_n is None:
+                ai_rerank_top_n = getattr(settings, 'JOB_RECOMMENDATION_AI_RERANK_TOP_N', 0)
+            if ai_rerank_top_n:
+                reranked_jobs = self._rerank_with_ai(
+                    user_context, recommended_jobs[:int(ai_rerank_top_n)]
+                )
+                scored_jobs.extend(job for job in reranked_jobs if job not in scored_jobs)
+                recommended_jobs = [
+                    job for job in recommended_jobs
+                    if job.ai_match_score >= min_match_score
+                ]
+                recommended_jobs.sort(key=lambda x: x.ai_match_score, reverse=True)
+            
+            # Persist new scores per user instead of on the shared Job rows
+            if scored_jobs:
+                JobMatchScore.bulk_upsert(user, profile.updated_at, scored_jobs)
+            
             # Send real-time notification about new recommendations
             if recommended_jobs:
                 self._send_realtime_job_recommendations(user.id, recommended_jobs[:3])
@@ -238,54 +354,123 @@ class JobRecommendationService:
             'cv_metadata': profile.cv_metadata or {}
         }
     
-    def _get_candidate_jobs(
+    def _get_excluded_job_ids(
         self, 
         user: User, 
         include_applied: bool, 
         include_saved: bool
-    ) -> 'QuerySet[Job]':
-        """Get candidate jobs for recommendation."""
-        queryset = Job.objects.filter(
-            is_active=True,
-            status='published'
-        ).select_related('company')
-        
-        # Exclude expired jobs
-        queryset = queryset.filter(
-            Q(expires_at__isnull=True) | Q(expires_at__gt=timezone.now())
-        )
-        
-        # Filter based on user preferences
+    ) -> List[int]:
+        """Get ids of jobs the user should not be recommended."""
+        excluded_ids = []
         if not include_applied:
-            applied_job_ids = JobApplication.objects.filter(
+            excluded_ids.extend(JobApplication.objects.filter(
                 user=user
-            ).values_list('job_id', flat=True)
-            queryset = queryset.exclude(id__in=applied_job_ids)
-        
+            ).values_list('job_id', flat=True))
         if not include_saved:
-            saved_job_ids = JobSavedByUser.objects.filter(
+            excluded_ids.extend(JobSavedByUser.objects.filter(
                 user=user
-            ).values_list('job_id', flat=True)
-            queryset = queryset.exclude(id__in=saved_job_ids)
+            ).values_list('job_id', flat=True))
+        return excluded_ids
+    
+    def _rerank_with_ai(
+        self, 
+        user_context: Dict[str, Any], 
+        jobs: List[Job]
+    ) -> List[Job]:
+        """Re-score local matches with Bedrock, returning the jobs that changed."""
+        pending = [
+            job for job in jobs
+            if getattr(job, 'match_score_source', 'local') != 'ai'
+        ]
+        if not pending:
+            return []
         
-        # Prioritize recent jobs
-        return queryset.order_by('-posted_date')
+        scores = self._calculate_ai_match_scores(user_context, pending)
+        for job in pending:
+            job.ai_match_score = scores[job.id]
+            job.match_score_source = 'ai'
+        return pending
+    
+    def _build_job_context(self, job: Job) -> Dict[str, Any]:
+        """Build job context for AI matching."""
+        return {
+            'title': job.title,
+            'description': job.description,
+            'skills_required': job.skills_required or [],
+            'skills_preferred': job.skills_preferred or [],
+            'experience_level': job.experience_level,
+            'industry': job.company.industry,
+            'location': job.location,
+            'work_arrangement': job.work_arrangement,
+            'requirements': job.requirements or []
+        }
+    
+    def _calculate_ai_match_scores(
+        self, 
+        user_context: Dict[str, Any], 
+        jobs: List[Job]
+    ) -> Dict[int, float]:
+        """
+        Calculate AI match scores for several jobs with batched prompts.
+        
+        The user context is sent once per batch instead of once per job.
+        Jobs the model fails to score fall back to the local score.
+        """
+        items = []
+        for job in jobs:
+            job_context = self._build_job_context(job)
+            items.append({
+                'id': job.id,
+                'title': job_context['title'],
+                'skills_required': job_context['skills_required'],
+                'skills_preferred': job_context['skills_preferred'],
+                'experience_level': job_context['experience_level'],
+                'industry': job_context['industry'],
+                'location': job_context['location'],
+                'work_arrangement': job_context['work_arrangement']
+            })
+        
+        try:
+            results = self.ai_service.process_batch(
+                items,
+                instructions=(
+                    "Analyze the compatibility between the user profile in the shared "
+                    "context and each job posting. Consider skill alignment (40% weight), "
+                    "experience level match (25% weight), industry relevance (20% weight) "
+                    "and location compatibility (15% weight)."
+                ),
+                shared_context={
+                    'skills': user_context.get('skills', []),
+                    'experience_level': user_context.get('experience_level') or 'Not specified',
+                    'industry': user_context.get('industry') or 'Not specified',
+                    'location': user_context.get('location') or 'Not specified',
+                    'summary': (user_context.get('summary') or 'Not provided')[:200]
+                },
+                result_format='<match score between 0.0 and 1.0>',
+                validate_result=self._validate_batch_score,
+                batch_size=self.AI_BATCH_SIZE
+            )
+        except Exception as e:
+            logger.error(f"Error calculating batched AI match scores: {e}")
+            results = {}
+        
+        return {
+            job.id: results.get(str(job.id), self._calculate_fallback_score(user_context, job))
+            for job in jobs
+        }
+    
+    @staticmethod
+    def _validate_batch_score(value: Any) -> float:
+        """Normalize a batched match score, rejecting non-numeric values."""
+        if isinstance(value, bool):
+            raise ValueError(f"Invalid match score: {value!r}")
+        return max(0.0, min(1.0, float(value)))
     
     def _calculate_ai_match_score(self, user_context: Dict[str, Any], job: Job) -> float:
         """Calculate AI match score between user and job."""
         try:
             # Build job context
-            job_context = {
-                'title': job.title,
-                'description': job.description,
-                'skills_required': job.skills_required or [],
-                'skills_preferred': job.skills_preferred or [],
-                'experience_level': job.experience_level,
-                'industry': job.company.industry,
-                'location': job.location,
-                'work_arrangement': job.work_arrangement,
-                'requirements': job.requirements or []
-            }
+            job_context = self._build_job_context(job)
             
             # Create AI prompt for matching
             prompt = self._create_matching_prompt(user_context, job_context)
@@ -402,51 +587,68 @@ class JobRecommendationService:
     
     def update_job_recommendations(self, job: Job) -> None:
         """Update AI recommendations for a specific job."""
+        self.update_jobs_recommendations([job])
+    
+    def update_jobs_recommendations(self, jobs: List[Job]) -> None:
+        """Update AI recommendations for several jobs with batched prompts."""
         try:
-            # Get job context for AI tagging
-            job_context = {
-                'title': job.title,
-                'description': job.description,
-                'skills_required': job.skills_required or [],
-                'skills_preferred': job.skills_preferred or [],
-                'requirements': job.requirements or []
-            }
-            
             # Generate AI tags
-            tags = self._generate_ai_tags(job_context)
-            job.ai_tags = tags
-            job.save(update_fields=['ai_tags'])
+            tags_by_job = self._generate_ai_tags_batch(jobs)
+            updated_jobs = []
+            for job in jobs:
+                if job.id in tags_by_job:
+                    job.ai_tags = tags_by_job[job.id]
+                    updated_jobs.append(job)
+            
+            if updated_jobs:
+                Job.objects.bulk_update(updated_jobs, ['ai_tags'])
             
         except Exception as e:
-            logger.error(f"Error updating recommendations for job {job.id}: {e}")
+            logger.error(f"Error updating recommendations for {len(jobs)} jobs: {e}")
     
-    def _generate_ai_tags(self, job_context: Dict[str, Any]) -> List[str]:
-        """Generate AI tags for better job matching."""
+    def _generate_ai_tags_batch(self, jobs: List[Job]) -> Dict[int, List[str]]:
+        """Generate AI tags for several jobs with batched prompts."""
+        items = [
+            {
+                'id': job.id,
+                'title': job.title,
+                'description': (job.description or '')[:500],
+                'skills_required': job.skills_required or []
+            }
+            for job in jobs
+        ]
+        
         try:
-            prompt = f"""
-            Analyze this job posting and generate 5-10 relevant tags for better matching.
-            Focus on key skills, technologies, and job characteristics.
-
-            Job Title: {job_context.get('title', '')}
-            Description: {job_context.get('description', '')[:500]}
-            Required Skills: {', '.join(job_context.get('skills_required', []))}
-
-            Generate tags as a comma-separated list:
-            """
-            
-            response = self.ai_service.process({
-                'data': {'prompt': prompt},
-                'template_type': 'tags',
-                'style': 'concise'
-            })
-            
-            # Parse tags from response
-            tags = [tag.strip() for tag in response.split(',')]
-            return [tag for tag in tags if tag and len(tag) > 2][:10]
-            
+            results = self.ai_service.process_batch(
+                items,
+                instructions=(
+                    "Analyze each job posting and generate 5-10 relevant tags for "
+                    "better matching. Focus on key skills, technologies, and job "
+                    "characteristics."
+                ),
+                result_format='["tag1", "tag2", ...]',
+                validate_result=self._validate_batch_tags,
+                batch_size=self.AI_BATCH_SIZE
+            )
         except Exception as e:
             logger.error(f"Error generating AI tags: {e}")
-            return []
+            return {}
+        
+        return {
+            job.id: results[str(job.id)]
+            for job in jobs
+            if str(job.id) in results
+        }
+    
+    @staticmethod
+    def _validate_batch_tags(value: Any) -> List[str]:
+        """Normalize a batched tag list, rejecting non-list values."""
+        if isinstance(value, str):
+            value = value.split(',')
+        if not isinstance(value, list):
+            raise ValueError(f"Invalid tags: {value!r}")
+        tags = [str(tag).strip() for tag in value]
+        return [tag for tag in tags if tag and len(tag) > 2][:10]
     
     def _send_realtime_job_recommendations(self, user_id: int, jobs: List[Job]) -> None:
         """Send real-time job recommendation updates to user."""
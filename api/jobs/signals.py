@@ -0,0 +1,56 @@
+"""
+Signals for Jobs app.
+"""
+
+import logging
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from companies.models import Company
+from koroh_platform.utils.search_indexing import enqueue_search_update
+from .models import Job
+from .search import SEARCHABLE_FIELDS, refresh_search_vectors
+
+logger = logging.getLogger(__name__)
+
+
+@receiver(post_save, sender=Job)
+def job_search_vector_post_save(sender, instance, created, update_fields=None, **kwargs):
+    """Keep the job's search vector in sync with its searchable fields."""
+    if update_fields is not None and not SEARCHABLE_FIELDS.intersection(update_fields):
+        return
+    try:
+        refresh_search_vectors(Job.objects.filter(pk=instance.pk))
+    except Exception as e:
+        logger.error(f"Error refreshing search vector for job {instance.pk}: {e}")
+
+
+@receiver(post_save, sender=Company)
+def company_search_vector_post_save(sender, instance, created, update_fields=None, **kwargs):
+    """Refresh a company's job search data when its name may have changed."""
+    if created or (update_fields is not None and 'name' not in update_fields):
+        return
+    try:
+        refresh_search_vectors(Job.objects.filter(company=instance))
+        enqueue_search_update(
+            'jobs', Job.objects.filter(company=instance).values_list('pk', flat=True)
+        )
+    except Exception as e:
+        logger.error(f"Error refreshing job search vectors for company {instance.pk}: {e}")
+
+
+@receiver(post_save, sender=Job)
+def job_search_index_post_save(sender, instance, created, update_fields=None, **kwargs):
+    """Queue the job for MeiliSearch indexing."""
+    try:
+        enqueue_search_update('jobs', [instance.pk], update_fields)
+    except Exception as e:
+        logger.error(f"Error queueing search index update for job {instance.pk}: {e}")
+
+
+@receiver(post_delete, sender=Job)
+def job_search_index_post_delete(sender, instance, **kwargs):
+    """Queue the job for removal from MeiliSearch."""
+    try:
+        enqueue_search_update('jobs', [instance.pk])
+    except Exception as e:
+        logger.error(f"Error queueing search index removal for job {instance.pk}: {e}")
@@ -331,6 +331,135 @@ class JobSearchServiceTest(TestCase):
         self.assertIn(self.job2, result['queryset'])
 
 
+    def test_meilisearch_backend_ranks_by_hits(self):
+        """Test the Meilisearch backend keeps the engine's ranking."""
+        from unittest.mock import patch
+        from django.test import override_settings
+        from .services import JobSearchService
+        
+        hits = {'hits': [{'id': self.job2.id}, {'id': self.job1.id}]}
+        with override_settings(JOB_SEARCH_BACKEND='meilisearch'), \
+                patch('koroh_platform.utils.meilisearch_client.search_jobs', return_value=hits) as search:
+            result = JobSearchService.search_jobs({'query': 'developer'})
+            jobs = list(result['queryset'])
+        
+        search.assert_called_once()
+        self.assertEqual(jobs, [self.job2, self.job1])
+        self.assertEqual(result['total_count'], 2)
+    
+    def test_meilisearch_backend_falls_back_to_database(self):
+        """Test search still works when Meilisearch is unavailable."""
+        from unittest.mock import patch
+        from django.test import override_settings
+        from .services import JobSearchService
+        
+        with override_settings(JOB_SEARCH_BACKEND='meilisearch'), \
+                patch('koroh_platform.utils.meilisearch_client.search_jobs', return_value=None):
+            result = JobSearchService.search_jobs({'query': 'Python'})
+            jobs = list(result['queryset'])
+        
+        self.assertEqual(jobs, [self.job1])
+
+
+class SearchIndexingTest(TestCase):
+    """Test cases for the MeiliSearch indexing outbox."""
+    
+    def setUp(self):
+        """Set up test data."""
+        from koroh_platform.models import SearchIndexOutbox
+        
+        self.company = Company.objects.create(
+            name='Index Company',
+            description='A company for indexing tests',
+            industry='Technology',
+            company_size='small',
+            company_type='startup',
+            headquarters='Berlin',
+        )
+        self.jobs = [
+            Job.objects.create(
+                title=f'Indexed Job {index}',
+                company=self.company,
+                description='Indexed job description',
+                job_type='full_time',
+                experience_level='mid',
+                location='Berlin',
+                status='published'
+            )
+            for index in range(3)
+        ]
+        self.outbox = SearchIndexOutbox.objects
+    
+    def test_saves_coalesce_in_outbox(self):
+        """Test repeated saves leave one pending entry and counter updates none."""
+        job = self.jobs[0]
+        self.outbox.all().delete()
+        
+        job.title = 'Renamed Job'
+        job.save()
+        job.save()
+        Job.objects.get(pk=job.pk).save(update_fields=['view_count'])
+        
+        self.assertEqual(
+            list(self.outbox.values_list('index_name', 'object_id')),
+            [('jobs', str(job.pk))]
+        )
+    
+    def test_drain_batches_adds_and_deletes(self):
+        """Test one drain sends a single add and a single delete call per index."""
+        from unittest.mock import patch
+        from koroh_platform.utils import search_indexing
+        
+        self.jobs[2].status = 'closed'
+        self.jobs[2].save()
+        
+        client = search_indexing.search_client
+        with patch.object(client, 'add_documents', return_value=True) as add_documents, \
+                patch.object(client, 'delete_documents', return_value=True) as delete_documents:
+            result = search_indexing.drain_search_outbox()
+        
+        job_calls = [call for call in add_documents.call_args_list if call.args[0] == 'jobs']
+        self.assertEqual(len(job_calls), 1)
+        self.assertEqual(
+            sorted(doc['id'] for doc in job_calls[0].args[1]),
+            [self.jobs[0].pk, self.jobs[1].pk]
+        )
+        delete_documents.assert_called_once_with('jobs', [str(self.jobs[2].pk)])
+        self.assertEqual(result['failed'], 0)
+        self.assertFalse(self.outbox.exists())
+    
+    def test_failed_drain_requeues_entries(self):
+        """Test entries go back to the outbox when MeiliSearch rejects them."""
+        from unittest.mock import patch
+        from koroh_platform.utils import search_indexing
+        
+        with patch.object(search_indexing.search_client, 'add_documents', return_value=False):
+            result = search_indexing.drain_search_outbox()
+        
+        self.assertGreater(result['failed'], 0)
+        self.assertTrue(self.outbox.filter(index_name='jobs').exists())
+    
+    def test_reindex_command_streams_chunks_and_resumes(self):
+        """Test bulk reindexing sends fixed-size chunks and honours checkpoints."""
+        from io import StringIO
+        from unittest.mock import patch
+        from django.core.management import call_command
+        from koroh_platform.utils import search_indexing
+        
+        with patch.object(search_indexing.search_client, 'add_documents', return_value=True) as add_documents:
+            call_command('reindex_search', 'jobs', chunk_size=2, stdout=StringIO())
+            self.assertEqual([len(call.args[1]) for call in add_documents.call_args_list], [2, 1])
+            
+            add_documents.reset_mock()
+            call_command(
+                'reindex_search', 'jobs', start_after=self.jobs[1].pk, stdout=StringIO()
+            )
+            self.assertEqual(
+                [doc['id'] for doc in add_documents.call_args.args[1]],
+                [self.jobs[2].pk]
+            )
+
+
 class JobRecommendationServiceTest(TestCase):
     """Test cases for JobRecommendationService."""
     
@@ -436,29 +565,344 @@ class JobRecommendationServiceTest(TestCase):
         self.assertEqual(context['skills'], ['Python', 'Django', 'JavaScript'])
         self.assertEqual(context['experience_level'], 'mid')
         self.assertEqual(context['industry'], 'Technology')
+
+
+class JobMatchingEngineTest(TestCase):
+    """Test cases for the vectorized job matching engine."""
     
-    def test_get_candidate_jobs(self):
-        """Test getting candidate jobs for recommendation."""
+    def setUp(self):
+        """Set up test data."""
+        self.company = Company.objects.create(
+            name='Matching Company',
+            description='A company for matching tests',
+            industry='Technology',
+            company_size='medium',
+            company_type='private',
+            headquarters='San Francisco, CA',
+            website='https://matchingcompany.com',
+        )
+        
+        self.python_job = Job.objects.create(
+            title='Python Developer',
+            company=self.company,
+            description='Python and Django role',
+            job_type='full_time',
+            experience_level='mid',
+            location='San Francisco, CA',
+            skills_required=['Python', 'Django'],
+            skills_preferred=['AWS'],
+            status='published'
+        )
+        self.frontend_job = Job.objects.create(
+            title='Frontend Developer',
+            company=self.company,
+            description='React role',
+            job_type='full_time',
+            experience_level='senior',
+            location='Berlin, Germany',
+            skills_required=['JavaScript', 'React'],
+            status='published'
+        )
+        self.remote_job = Job.objects.create(
+            title='Remote Data Engineer',
+            company=self.company,
+            description='Data pipelines',
+            job_type='contract',
+            experience_level='mid',
+            location='Remote',
+            skills_required=['python', 'SQL'],
+            is_remote_friendly=True,
+            status='published'
+        )
+        
+        self.user_context = {
+            'skills': ['Python', 'Django', 'AWS', 'SQL'],
+            'experience_level': 'mid',
+            'industry': 'Technology',
+            'location': 'San Francisco'
+        }
+    
+    def test_scores_match_fallback_calculation(self):
+        """Test vectorized scores agree with the per-job fallback score."""
+        from .matching import JobFeatureIndex
         from .services import JobRecommendationService
         
         service = JobRecommendationService()
-        candidates = service._get_candidate_jobs(
-            user=self.user,
-            include_applied=False,
-            include_saved=True
+        index = JobFeatureIndex.from_queryset(Job.objects.all())
+        scores = dict(zip(index.job_ids.tolist(), index.score(self.user_context).tolist()))
+        
+        for job in (self.python_job, self.frontend_job, self.remote_job):
+            self.assertAlmostEqual(
+                scores[job.id],
+                service._calculate_fallback_score(self.user_context, job)
+            )
+    
+    def test_top_matches_ordering_and_exclusions(self):
+        """Test top matches are sorted, thresholded and honour exclusions."""
+        from .matching import JobFeatureIndex
+        
+        index = JobFeatureIndex.from_queryset(Job.objects.all())
+        
+        matches = index.top_matches(self.user_context, limit=10, min_score=0.5)
+        match_ids = [job_id for job_id, _ in matches]
+        self.assertEqual(match_ids[0], self.python_job.id)
+        self.assertNotIn(self.frontend_job.id, match_ids)
+        self.assertEqual([score for _, score in matches], sorted((score for _, score in matches), reverse=True))
+        
+        matches = index.top_matches(
+            self.user_context, limit=1, exclude_ids=[self.python_job.id]
         )
+        self.assertEqual(matches[0][0], self.remote_job.id)
+    
+    def test_recommendations_skip_bedrock_without_rerank(self):
+        """Test recommendations are scored locally unless re-ranking is enabled."""
+        from unittest.mock import patch
+        from profiles.models import Profile
+        from .services import JobRecommendationService
         
-        self.assertIn(self.job, candidates)
+        user = User.objects.create_user(
+            email='matching_test@example.com',
+            first_name='Match',
+            last_name='User',
+            password='testpass123'
+        )
+        profile, created = Profile.objects.get_or_create(user=user)
+        user.profile = profile
+        profile.experience_level = 'mid'
+        profile.industry = 'Technology'
+        profile.location = 'San Francisco'
+        profile.skills = ['Python', 'Django', 'AWS', 'SQL']
+        profile.save()
         
-        # Test excluding applied jobs
-        JobApplication.objects.create(user=self.user, job=self.job)
-        candidates_no_applied = service._get_candidate_jobs(
-            user=self.user,
-            include_applied=False,
-            include_saved=True
+        service = JobRecommendationService()
+        with patch.object(service.ai_service, 'process') as mock_process:
+            recommendations = service.get_recommendations_for_user(
+                user=user, limit=2, ai_rerank_top_n=0
+            )
+        
+        mock_process.assert_not_called()
+        self.assertEqual(recommendations[0], self.python_job)
+        self.assertLessEqual(len(recommendations), 2)
+        
+        with patch.object(
+            service.ai_service, 'process_batch',
+            side_effect=lambda items, **kwargs: {str(item['id']): 0.95 for item in items}
+        ) as mock_batch:
+            recommendations = service.get_recommendations_for_user(
+                user=user, limit=2, ai_rerank_top_n=1
+            )
+        
+        self.assertEqual(mock_batch.call_count, 1)
+        self.assertAlmostEqual(recommendations[0].ai_match_score, 0.95)
+    
+    def test_recommendation_scores_stored_per_user(self):
+        """Test scores are stored per user and reused instead of rescored."""
+        from unittest.mock import patch
+        from rest_framework.test import APIClient
+        from profiles.models import Profile
+        from .models import JobMatchScore
+        from .services import JobRecommendationService
+        
+        user = User.objects.create_user(
+            email='score_store_test@example.com',
+            first_name='Score',
+            last_name='User',
+            password='testpass123'
+        )
+        profile, created = Profile.objects.get_or_create(user=user)
+        user.profile = profile
+        profile.experience_level = 'mid'
+        profile.industry = 'Technology'
+        profile.skills = ['Python', 'Django', 'AWS', 'SQL']
+        profile.save()
+        
+        service = JobRecommendationService()
+        with patch.object(
+            service.ai_service, 'process_batch',
+            side_effect=lambda items, **kwargs: {str(item['id']): 1.0 for item in items}
+        ) as mock_batch:
+            service.get_recommendations_for_user(user=user, limit=5, ai_rerank_top_n=1)
+            service.get_recommendations_for_user(user=user, limit=5, ai_rerank_top_n=1)
+        
+        # The re-ranked pair is served from the store on the second run
+        self.assertEqual(mock_batch.call_count, 1)
+        self.assertEqual(
+            JobMatchScore.objects.filter(user=user, source='ai').count(), 1
+        )
+        self.assertTrue(JobMatchScore.objects.filter(user=user, job=self.python_job).exists())
+        
+        client = APIClient()
+        client.force_authenticate(user=user)
+        response = client.get('/api/v1/jobs/jobs/recommendations/')
+        
+        self.assertEqual(response.status_code, 200)
+        scores = [item['score'] for item in response.data['results']]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        
+        # Viewer flags for the whole page come from one lookup per relation
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+        
+        with CaptureQueriesContext(connection) as queries:
+            client.get('/api/v1/jobs/jobs/recommendations/')
+        saved_lookups = [q for q in queries.captured_queries if 'jobs_jobsavedbyuser' in q['sql']]
+        self.assertLessEqual(len(saved_lookups), 1)
+
+
+class BatchedAIPromptTest(TestCase):
+    """Test cases for batched multi-job Bedrock prompts."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.company = Company.objects.create(
+            name='Batch Company',
+            description='A company for batch tests',
+            industry='Technology',
+            company_size='medium',
+            company_type='private',
+            headquarters='Austin, TX',
+            website='https://batchcompany.com',
         )
+        self.jobs = [
+            Job.objects.create(
+                title=f'Engineer {index}',
+                company=self.company,
+                description='Build things',
+                job_type='full_time',
+                experience_level='mid',
+                location='Austin, TX',
+                skills_required=['Python'],
+                status='published'
+            )
+            for index in range(3)
+        ]
+    
+    def _mock_responses(self, service, texts):
+        """Make the AI service return the given raw texts in order."""
+        from unittest.mock import patch
+        
+        invoke = patch.object(
+            service.ai_service, '_invoke_model_with_retry',
+            side_effect=[{'text': text} for text in texts]
+        )
+        extract = patch.object(
+            service.ai_service, '_extract_response_text',
+            side_effect=lambda response: response['text']
+        )
+        return invoke, extract
+    
+    def test_batch_scores_retry_only_failed_items(self):
+        """Test a partial batch response only retries the missing jobs."""
+        import json
+        from .services import JobRecommendationService
+        
+        service = JobRecommendationService()
+        first, second, third = self.jobs
+        invoke, extract = self._mock_responses(service, [
+            json.dumps([{'id': first.id, 'result': 0.8}, {'id': second.id, 'result': 'n/a'}]),
+            json.dumps([{'id': second.id, 'result': 0.6}]),
+            'Sorry, I cannot help with that.',
+        ])
+        
+        with invoke as mock_invoke, extract:
+            scores = service._calculate_ai_match_scores({'skills': ['Python']}, self.jobs)
+        
+        self.assertEqual(mock_invoke.call_count, 3)
+        retried_prompt = mock_invoke.call_args_list[1].args[0]
+        self.assertIn(f'"id": {second.id}', retried_prompt)
+        self.assertNotIn(f'"id": {first.id}', retried_prompt)
+        self.assertAlmostEqual(scores[first.id], 0.8)
+        self.assertAlmostEqual(scores[second.id], 0.6)
+        # Unparseable single item falls back to the local score
+        self.assertAlmostEqual(
+            scores[third.id],
+            service._calculate_fallback_score({'skills': ['Python']}, third)
+        )
+    
+    def test_batch_tags_single_prompt(self):
+        """Test tags for several jobs are generated with one prompt."""
+        import json
+        from .services import JobRecommendationService
         
-        self.assertNotIn(self.job, candidates_no_applied)
+        service = JobRecommendationService()
+        invoke, extract = self._mock_responses(service, [
+            '```json\n' + json.dumps([
+                {'id': job.id, 'result': ['python', 'backend', f'team-{index}']}
+                for index, job in enumerate(self.jobs)
+            ]) + '\n```',
+        ])
+        
+        with invoke as mock_invoke, extract:
+            service.update_jobs_recommendations(self.jobs)
+        
+        self.assertEqual(mock_invoke.call_count, 1)
+        self.jobs[2].refresh_from_db()
+        self.assertEqual(self.jobs[2].ai_tags, ['python', 'backend', 'team-2'])
+
+
+class AIResponseCacheTest(TestCase):
+    """Test cases for the content-addressed Bedrock response cache."""
+    
+    def setUp(self):
+        """Set up a Bedrock client with a mocked boto3 runtime."""
+        import io
+        import json
+        from unittest.mock import MagicMock
+        from koroh_platform.utils.aws_bedrock import BedrockClient
+        
+        self.bedrock = BedrockClient()
+        self.bedrock.response_cache.shared.clear()
+        self.bedrock.client = MagicMock()
+        self.bedrock.client.invoke_model.side_effect = lambda **kwargs: {
+            'body': io.BytesIO(json.dumps({'content': [{'text': 'cached'}]}).encode())
+        }
+    
+    def test_key_is_stable_across_whitespace(self):
+        """Test prompts differing only in whitespace share a key."""
+        cache = self.bedrock.response_cache
+        
+        key = cache.make_key('model', 'Hello\n    world', 100, 0.5, 0.9)
+        self.assertEqual(key, cache.make_key('model', '  Hello world ', 100, 0.5, 0.9))
+        self.assertNotEqual(key, cache.make_key('model', 'Hello world', 100, 0.6, 0.9))
+        self.assertNotEqual(key, cache.make_key('other', 'Hello world', 100, 0.5, 0.9))
+    
+    def test_identical_invocations_hit_cache(self):
+        """Test repeated prompts call Bedrock once, from either tier."""
+        first = self.bedrock.invoke_model('model', 'Summarize this', 100, 0.5, cache_template='tags')
+        second = self.bedrock.invoke_model('model', 'Summarize this', 100, 0.5, cache_template='tags')
+        
+        self.bedrock.response_cache.local.clear()
+        third = self.bedrock.invoke_model('model', 'Summarize this', 100, 0.5, cache_template='tags')
+        
+        self.assertEqual(first, second)
+        self.assertEqual(first, third)
+        self.assertEqual(self.bedrock.client.invoke_model.call_count, 1)
+    
+    def test_bypass_cache(self):
+        """Test bypass_cache always reaches the model."""
+        self.bedrock.invoke_model('model', 'Summarize this', 100, 0.5, cache_template='tags')
+        self.bedrock.invoke_model(
+            'model', 'Summarize this', 100, 0.5, cache_template='tags', bypass_cache=True
+        )
+        
+        self.assertEqual(self.bedrock.client.invoke_model.call_count, 2)
+    
+    def test_sampled_templates_are_not_cached(self):
+        """Test chat, portfolio and unlisted templates always reach the model."""
+        for template in ('chat', 'portfolio', 'default'):
+            self.bedrock.invoke_model('model', 'Hi', 100, 0.5, cache_template=template)
+            self.bedrock.invoke_model('model', 'Hi', 100, 0.5, cache_template=template)
+        
+        self.assertEqual(self.bedrock.client.invoke_model.call_count, 6)
+    
+    def test_local_tier_returns_copies(self):
+        """Test mutating a cached response doesn't change later reads."""
+        cache = self.bedrock.response_cache
+        cache.set('key', {'content': [{'text': 'cached'}]}, 'tags')
+        
+        cache.get('key', 'tags')['content'].append({'text': 'mutated'})
+        
+        self.assertEqual(cache.get('key', 'tags'), {'content': [{'text': 'cached'}]})
 
 
 class JobAPIViewTest(TestCase):
@@ -608,6 +1052,50 @@ class JobAPIViewTest(TestCase):
             JobSavedByUser.objects.filter(user=self.user, job=self.job).exists()
         )
     
+    def test_job_search_viewer_state_queries(self):
+        """Test saved/applied/following flags cost a fixed number of queries per page."""
+        from unittest.mock import Mock
+        from companies.models import CompanyFollow
+        from .serializers import JobListSerializer
+        from .services import JobSearchService
+        
+        request = Mock(user=self.user)
+        
+        def serialize_search():
+            queryset = JobSearchService.search_jobs({'query': 'API'}, user=self.user)['queryset']
+            return JobListSerializer(queryset, many=True, context={'request': request}).data
+        
+        JobSavedByUser.objects.create(user=self.user, job=self.job)
+        CompanyFollow.objects.create(user=self.user, company=self.company)
+        
+        # Count, job page, saved ids, applied ids and followed companies
+        with self.assertNumQueries(5):
+            serialize_search()
+        
+        for index in range(15):
+            job = Job.objects.create(
+                title=f'API Engineer {index}',
+                company=self.company,
+                description='Another API job',
+                job_type='full_time',
+                experience_level='mid',
+                location='Remote',
+                status='published'
+            )
+            if index % 5 == 0:
+                JobApplication.objects.create(user=self.user, job=job, status='pending')
+        
+        with self.assertNumQueries(5):
+            data = serialize_search()
+        
+        results = {job['title']: job for job in data}
+        self.assertEqual(len(results), 16)
+        self.assertTrue(results['API Test Job']['is_saved'])
+        self.assertFalse(results['API Engineer 1']['is_saved'])
+        self.assertTrue(results['API Engineer 5']['has_applied'])
+        self.assertFalse(results['API Engineer 6']['has_applied'])
+        self.assertTrue(all(job['company']['is_following'] for job in results.values()))
+    
     def test_job_view_count_increment(self):
         """Test that job view count increments on retrieve."""
         from rest_framework.test import APIClient
@@ -15,7 +15,7 @@ from .models import Job, JobApplication, JobSavedByUser
 from .serializers import (
     JobListSerializer, JobDetailSerializer, JobCreateUpdateSerializer,
     JobApplicationSerializer, JobSavedSerializer, JobSearchSerializer,
-    JobRecommendationSerializer
+    JobRecommendationSerializer, JobMatchScoreSerializer
 )
 from .services import JobSearchService, JobRecommendationService
 from koroh_platform.permissions import (
@@ -45,7 +45,7 @@ class JobViewSet(viewsets.ModelViewSet):
     ]
     ordering_fields = [
         'title', 'posted_date', 'salary_min', 'application_count',
-        'view_count', 'ai_match_score'
+        'view_count'
     ]
     ordering = ['-posted_date']
     
@@ -68,14 +68,9 @@ class JobViewSet(viewsets.ModelViewSet):
             models.Q(expires_at__gt=timezone.now())
         )
         
-        if self.action == 'list':
-            queryset = queryset.select_related('company').prefetch_related(
-                'applications', 'saved_by_users'
-            )
-        elif self.action == 'retrieve':
-            queryset = queryset.select_related('company').prefetch_related(
-                'applications', 'saved_by_users'
-            )
+        if self.action in ['list', 'retrieve']:
+            # Viewer-specific flags are loaded per page by JobViewerState
+            queryset = queryset.select_related('company')
         
         return queryset
     
@@ -120,9 +115,17 @@ class JobViewSet(viewsets.ModelViewSet):
             'search_params': search_result['search_params']
         })
     
-    @action(detail=False, methods=['post'], permission_classes=[IsAuthenticated])
+    @action(detail=False, methods=['get', 'post'], permission_classes=[IsAuthenticated])
     def recommendations(self, request):
-        """Get AI-powered job recommendations."""
+        """
+        Get AI-powered job recommendations.
+        
+        POST scores jobs for the user; GET pages through the scores stored
+        by earlier runs without rescoring.
+        """
+        if request.method == 'GET':
+            return self._stored_recommendations(request)
+        
         serializer = JobRecommendationSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         
@@ -158,6 +161,22 @@ class JobViewSet(viewsets.ModelViewSet):
             'user_id': user.id
         })
     
+    def _stored_recommendations(self, request):
+        """Page through previously computed recommendations."""
+        queryset = JobRecommendationService().get_stored_recommendations(request.user)
+        
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = JobMatchScoreSerializer(
+                page, many=True, context={'request': request}
+            )
+            return self.get_paginated_response(serializer.data)
+        
+        serializer = JobMatchScoreSerializer(
+            queryset, many=True, context={'request': request}
+        )
+        return Response(serializer.data)
+    
     @action(detail=True, methods=['post'], permission_classes=[IsAuthenticated])
     def apply(self, request, pk=None):
         """Apply to a job."""
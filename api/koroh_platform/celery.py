@@ -49,6 +49,18 @@ app.conf.beat_schedule = {
         'task': 'koroh_platform.tasks.run_periodic_updates',
         'schedule': 3600.0,  # Run every hour
     },
+    'drain-search-index-outbox': {
+        'task': 'koroh_platform.tasks.drain_search_index_outbox',
+        'schedule': 5.0,  # Keep MeiliSearch within seconds of the database
+    },
+    'flush-peer-group-counter-buffer': {
+        'task': 'peer_groups.tasks.flush_counter_buffer',
+        'schedule': 5.0,  # Group counters lag saves by a few seconds at most
+    },
+    'refresh-trending-peer-groups': {
+        'task': 'peer_groups.tasks.refresh_trending_groups',
+        'schedule': 300.0,  # Run every 5 minutes
+    },
     
     # Authentication and user management tasks
     'cleanup-expired-tokens': {
@@ -98,6 +110,8 @@ app.conf.update(
         'koroh_platform.tasks.notify_company_followers_new_job': {'queue': 'notifications'},
         'koroh_platform.tasks.process_cv_analysis_completion': {'queue': 'ai_processing'},
         'koroh_platform.tasks.process_portfolio_generation_completion': {'queue': 'ai_processing'},
+        'koroh_platform.tasks.drain_search_index_outbox': {'queue': 'realtime_updates'},
+        'peer_groups.tasks.flush_counter_buffer': {'queue': 'realtime_updates'},
         'koroh_platform.tasks.*': {'queue': 'background_tasks'},
         'authentication.tasks.*': {'queue': 'user_management'},
         'profiles.tasks.*': {'queue': 'file_processing'},
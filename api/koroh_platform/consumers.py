@@ -9,6 +9,7 @@ import json
 import logging
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
+from django.conf import settings
 from django.contrib.auth.models import AnonymousUser
 from django.core.serializers.json import DjangoJSONEncoder
 from asgiref.sync import sync_to_async
@@ -142,7 +143,10 @@ class AIChatConsumer(BaseConsumer):
         try:
             # Process AI message (this would typically be done via Celery)
             if self.user.is_authenticated:
-                result = await self.process_authenticated_message(message)
+                if getattr(settings, 'AI_CHAT_STREAMING_ENABLED', True):
+                    result = await self.stream_authenticated_message(message)
+                else:
+                    result = await self.process_authenticated_message(message)
             else:
                 result = await self.process_anonymous_message(message)
             
@@ -175,18 +179,53 @@ class AIChatConsumer(BaseConsumer):
             }
         )
     
-    @database_sync_to_async
-    def process_authenticated_message(self, message):
+    async def stream_authenticated_message(self, message):
+        """
+        Process message for authenticated user, forwarding the AI reply as it streams.
+        
+        Each chunk is sent as an 'ai_response_stream' message; the assistant
+        ChatMessage is persisted once, after the stream has finished.
+        """
+        from ai_chat.services import AsyncChatService
+        
+        chat_service = AsyncChatService()
+        user_message, context = await chat_service.aprepare_message(
+            user=self.user,
+            message=message,
+            session_id=self.session_id
+        )
+        session_id = str(user_message.session_id)
+        
+        chunks = []
+        try:
+            async for chunk in chat_service.astream_ai_response(message, context):
+                chunks.append(chunk)
+                await self.send_message('ai_response_stream', {
+                    'session_id': session_id,
+                    'chunk': chunk
+                })
+        except Exception as e:
+            logger.error(f"Error streaming AI response in session {session_id}: {e}")
+        
+        ai_message = await chat_service.acomplete_message(user_message, ''.join(chunks), context)
+        
+        return self.serialize_chat_turn(user_message, ai_message)
+    
+    async def process_authenticated_message(self, message):
         """Process message for authenticated user."""
-        from ai_chat.services import ChatService
+        from ai_chat.services import AsyncChatService
         
-        chat_service = ChatService()
-        user_message, ai_message = chat_service.send_message(
+        chat_service = AsyncChatService()
+        user_message, ai_message = await chat_service.asend_message(
             user=self.user,
             message=message,
             session_id=self.session_id
         )
         
+        return self.serialize_chat_turn(user_message, ai_message)
+    
+    def serialize_chat_turn(self, user_message, ai_message):
+        """Build the message_response payload for a user message and its reply."""
         return {
             'session_id': str(user_message.session.id),
             'user_message': {
@@ -255,6 +294,20 @@ class AIChatConsumer(BaseConsumer):
             'user_id': event['user_id'],
             'is_typing': event['is_typing']
         })
+    
+    async def ai_response_stream(self, event):
+        """Send streamed AI response chunk to WebSocket."""
+        await self.send_message('ai_response_stream', {
+            'session_id': event['session_id'],
+            'chunk': event['chunk']
+        })
+    
+    async def ai_response_complete(self, event):
+        """Send complete AI response to WebSocket."""
+        await self.send_message('ai_response_complete', {
+            'session_id': event['session_id'],
+            'response': event['response']
+        })
 
 
 class NotificationConsumer(BaseConsumer):
@@ -0,0 +1,43 @@
+"""
+Django management command to rebuild the user data manifest.
+
+Walks MEDIA_ROOT/user_data once per user and re-indexes every stored CV,
+portfolio, analysis session and export. Only needed for data written
+before the manifest existed or modified outside UserDataManager.
+
+Usage: python manage.py rebuild_user_data_manifest [user_id ...]
+"""
+
+from django.core.management.base import BaseCommand
+
+from koroh_platform.services.user_data_manager import UserDataManager, UserDataManagerFactory
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the user data manifest from the files on disk'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'user_ids',
+            nargs='*',
+            type=int,
+            help='Users to re-index (default: every user directory on disk)'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the rebuild command."""
+        user_ids = options['user_ids'] or UserDataManagerFactory.get_user_ids_on_disk()
+
+        total = 0
+        for user_id in user_ids:
+            try:
+                count = UserDataManager(user_id=user_id).rebuild_manifest()
+            except Exception as e:
+                self.stdout.write(self.style.ERROR(f'user_{user_id}: {e}'))
+                continue
+            total += count
+            self.stdout.write(f'user_{user_id}: {count} entries')
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Indexed {total} entries for {len(user_ids)} users')
+        )
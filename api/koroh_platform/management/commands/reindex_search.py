@@ -0,0 +1,83 @@
+"""
+Django management command to bulk (re)index MeiliSearch.
+
+Streams each table in primary key order and records a checkpoint after
+every accepted chunk, so an interrupted run can continue with --resume.
+
+Usage: python manage.py reindex_search [jobs companies peer_groups] [--resume]
+"""
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+
+from koroh_platform.utils.meilisearch_client import setup_search_indexes
+from koroh_platform.utils.search_indexing import SEARCH_INDEXES, reindex
+
+CHECKPOINT_KEY = 'search_reindex_checkpoint:{index_name}'
+
+
+class Command(BaseCommand):
+    help = 'Bulk index jobs, companies and peer groups into MeiliSearch'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'indexes',
+            nargs='*',
+            choices=sorted(SEARCH_INDEXES),
+            help='Indexes to rebuild (default: all)'
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Rows fetched and documents sent per batch (default: 500)'
+        )
+        parser.add_argument(
+            '--start-after',
+            type=int,
+            help='Only index objects with a primary key greater than this'
+        )
+        parser.add_argument(
+            '--resume',
+            action='store_true',
+            help='Continue each index from its last recorded checkpoint'
+        )
+        parser.add_argument(
+            '--setup',
+            action='store_true',
+            help='Create and configure the indexes before indexing'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the reindex command."""
+        index_names = options['indexes'] or list(SEARCH_INDEXES)
+        if options['start_after'] is not None and len(index_names) != 1:
+            raise CommandError('--start-after requires exactly one index')
+
+        if options['setup']:
+            setup_search_indexes()
+
+        for index_name in index_names:
+            checkpoint_key = CHECKPOINT_KEY.format(index_name=index_name)
+            start_after = options['start_after']
+            if start_after is None and options['resume']:
+                start_after = cache.get(checkpoint_key)
+
+            if start_after is not None:
+                self.stdout.write(f'Indexing {index_name} after pk {start_after}...')
+            else:
+                self.stdout.write(f'Indexing {index_name}...')
+
+            total = 0
+            try:
+                for last_pk, count in reindex(index_name, options['chunk_size'], start_after):
+                    total += count
+                    cache.set(checkpoint_key, last_pk, None)
+                    self.stdout.write(f'  {total} documents (last pk {last_pk})')
+            except RuntimeError as e:
+                raise CommandError(f'{e}. Re-run with --resume to continue.')
+
+            cache.delete(checkpoint_key)
+            self.stdout.write(
+                self.style.SUCCESS(f'Indexed {total} {index_name} documents')
+            )
@@ -89,8 +89,8 @@ class PerformanceMiddleware(MiddlewareMixin):
             response['Cache-Control'] = 'public, max-age=31536000'  # 1 year
             response['Expires'] = 'Thu, 31 Dec 2025 23:59:59 GMT'
         
-        # Add cache headers for API responses
-        elif request.path.startswith('/api/'):
+        # Add cache headers for API responses, unless the view set its own
+        elif request.path.startswith('/api/') and not response.has_header('Cache-Control'):
             if request.method == 'GET' and response.status_code == 200:
                 # Cache GET requests for 5 minutes by default
                 response['Cache-Control'] = 'private, max-age=300'
@@ -241,8 +241,8 @@ class CacheOptimizationMiddleware(MiddlewareMixin):
     def process_response(self, request, response):
         """Cache successful GET responses."""
         
-        # Only cache successful GET requests
-        if request.method != 'GET' or response.status_code != 200:
+        # Only cache successful, non-streaming GET requests
+        if request.method != 'GET' or response.status_code != 200 or response.streaming:
             return response
         
         # Check if this endpoint should be cached
@@ -0,0 +1,32 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchIndexOutbox',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('index_name', models.CharField(max_length=50, verbose_name='index name')),
+                ('object_id', models.CharField(max_length=64, verbose_name='object id')),
+                ('enqueued_at', models.DateTimeField(auto_now_add=True, verbose_name='enqueued at')),
+            ],
+            options={
+                'verbose_name': 'Search Index Outbox Entry',
+                'verbose_name_plural': 'Search Index Outbox',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='searchindexoutbox',
+            constraint=models.UniqueConstraint(fields=('index_name', 'object_id'), name='unique_search_outbox_entry'),
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 4.2.7 on 2026-10-16 20:59
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('koroh_platform', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserDataManifestEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('user_id', models.PositiveIntegerField(verbose_name='user id')),
+                ('kind', models.CharField(choices=[('cv', 'CV'), ('portfolio', 'Portfolio'), ('analysis_session', 'Analysis Session'), ('export', 'Export')], max_length=20, verbose_name='kind')),
+                ('entry_id', models.CharField(max_length=255, verbose_name='entry id')),
+                ('metadata', models.JSONField(blank=True, default=dict, verbose_name='metadata')),
+                ('size', models.BigIntegerField(default=0, help_text='Bytes on disk', verbose_name='size')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+            ],
+            options={
+                'verbose_name': 'User Data Manifest Entry',
+                'verbose_name_plural': 'User Data Manifest',
+                'ordering': ['-created_at', '-id'],
+                'indexes': [models.Index(fields=['user_id', 'kind', '-created_at'], name='user_data_manifest_listing')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='userdatamanifestentry',
+            constraint=models.UniqueConstraint(fields=('user_id', 'kind', 'entry_id'), name='unique_user_data_manifest_entry'),
+        ),
+    ]
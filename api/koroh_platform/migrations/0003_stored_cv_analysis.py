@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-16 21:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('koroh_platform', '0002_user_data_manifest'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StoredCVAnalysis',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('cv_hash', models.CharField(help_text='SHA-256 of the CV file', max_length=64, unique=True, verbose_name='CV hash')),
+                ('format_version', models.PositiveSmallIntegerField(verbose_name='format version')),
+                ('payload', models.BinaryField(verbose_name='payload')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='created at')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='updated at')),
+            ],
+            options={
+                'verbose_name': 'Stored CV Analysis',
+                'verbose_name_plural': 'Stored CV Analyses',
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 4.2.7 on 2026-10-16 23:20
+
+from django.db import migrations, models
+
+EXPORT_KEYS = ('export_fingerprint', 'export_content_hash')
+
+
+def move_export_hashes(apps, schema_editor):
+    """Move cached export hashes out of portfolio metadata into their own columns."""
+    UserDataManifestEntry = apps.get_model('koroh_platform', 'UserDataManifestEntry')
+    for entry in UserDataManifestEntry.objects.filter(
+        kind='portfolio', metadata__has_key='export_fingerprint'
+    ).iterator():
+        entry.export_fingerprint = entry.metadata.get('export_fingerprint') or ''
+        entry.export_content_hash = entry.metadata.get('export_content_hash') or ''
+        entry.metadata = {key: value for key, value in entry.metadata.items() if key not in EXPORT_KEYS}
+        entry.save(update_fields=['metadata', 'export_fingerprint', 'export_content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('koroh_platform', '0003_stored_cv_analysis'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userdatamanifestentry',
+            name='export_fingerprint',
+            field=models.CharField(blank=True, help_text='Hash of file names, sizes and mtimes when export_content_hash was computed', max_length=64, verbose_name='export fingerprint'),
+        ),
+        migrations.AddField(
+            model_name='userdatamanifestentry',
+            name='export_content_hash',
+            field=models.CharField(blank=True, max_length=64, verbose_name='export content hash'),
+        ),
+        migrations.RunPython(move_export_hashes, migrations.RunPython.noop),
+    ]
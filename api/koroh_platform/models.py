@@ -0,0 +1,114 @@
+"""
+Platform-wide models for Koroh.
+"""
+
+from django.db import models
+from django.utils import timezone
+from django.utils.translation import gettext_lazy as _
+
+
+class SearchIndexOutbox(models.Model):
+    """
+    Pending search index change for one object.
+
+    Rows are written in the same transaction as the model change and are
+    unique per (index, object), so repeated saves before the next drain
+    coalesce into one entry. The drain task indexes or deletes each object
+    based on its current database state.
+    """
+
+    index_name = models.CharField(_('index name'), max_length=50)
+    object_id = models.CharField(_('object id'), max_length=64)
+    enqueued_at = models.DateTimeField(_('enqueued at'), auto_now_add=True)
+
+    class Meta:
+        verbose_name = _('Search Index Outbox Entry')
+        verbose_name_plural = _('Search Index Outbox')
+        ordering = ['id']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['index_name', 'object_id'],
+                name='unique_search_outbox_entry'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.index_name}:{self.object_id}"
+
+
+class UserDataManifestEntry(models.Model):
+    """
+    Index entry for one item UserDataManager stores under user_data/.
+
+    There is one row per CV session, portfolio, analysis session and
+    export, holding its metadata and size on disk. Listings and storage
+    statistics read these rows instead of walking the user's directory
+    tree and re-reading every metadata.json.
+    """
+
+    KIND_CV = 'cv'
+    KIND_PORTFOLIO = 'portfolio'
+    KIND_ANALYSIS_SESSION = 'analysis_session'
+    KIND_EXPORT = 'export'
+
+    KIND_CHOICES = [
+        (KIND_CV, _('CV')),
+        (KIND_PORTFOLIO, _('Portfolio')),
+        (KIND_ANALYSIS_SESSION, _('Analysis Session')),
+        (KIND_EXPORT, _('Export')),
+    ]
+
+    # Plain id: the data directory is keyed by id and may outlive the user row
+    user_id = models.PositiveIntegerField(_('user id'))
+    kind = models.CharField(_('kind'), max_length=20, choices=KIND_CHOICES)
+    entry_id = models.CharField(_('entry id'), max_length=255)
+    metadata = models.JSONField(_('metadata'), default=dict, blank=True)
+    size = models.BigIntegerField(_('size'), default=0, help_text=_('Bytes on disk'))
+    # Portfolio export ETag cache; kept out of metadata, which is returned to clients
+    export_fingerprint = models.CharField(
+        _('export fingerprint'), max_length=64, blank=True,
+        help_text=_('Hash of file names, sizes and mtimes when export_content_hash was computed')
+    )
+    export_content_hash = models.CharField(_('export content hash'), max_length=64, blank=True)
+    created_at = models.DateTimeField(_('created at'), default=timezone.now)
+    updated_at = models.DateTimeField(_('updated at'), auto_now=True)
+
+    class Meta:
+        verbose_name = _('User Data Manifest Entry')
+        verbose_name_plural = _('User Data Manifest')
+        ordering = ['-created_at', '-id']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user_id', 'kind', 'entry_id'],
+                name='unique_user_data_manifest_entry'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['user_id', 'kind', '-created_at'], name='user_data_manifest_listing'),
+        ]
+
+    def __str__(self):
+        return f"user_{self.user_id}/{self.kind}/{self.entry_id}"
+
+
+class StoredCVAnalysis(models.Model):
+    """
+    Full CVAnalysisResult for one CV, stored once per content hash.
+
+    The payload is a compact, versioned serialization written by
+    koroh_platform.utils.cv_analysis_store. Portfolio generation and chat
+    load it on demand instead of calling Bedrock again.
+    """
+
+    cv_hash = models.CharField(_('CV hash'), max_length=64, unique=True, help_text=_('SHA-256 of the CV file'))
+    format_version = models.PositiveSmallIntegerField(_('format version'))
+    payload = models.BinaryField(_('payload'))
+    created_at = models.DateTimeField(_('created at'), auto_now_add=True)
+    updated_at = models.DateTimeField(_('updated at'), auto_now=True)
+
+    class Meta:
+        verbose_name = _('Stored CV Analysis')
+        verbose_name_plural = _('Stored CV Analyses')
+
+    def __str__(self):
+        return self.cv_hash
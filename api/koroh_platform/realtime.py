@@ -5,6 +5,7 @@ This module provides services for sending real-time updates via WebSockets
 for various platform features including AI chat, peer groups, and notifications.
 """
 
+import asyncio
 import json
 import logging
 from channels.layers import get_channel_layer
@@ -41,6 +42,27 @@ class RealtimeService:
         """Send a message to a specific user."""
         group_name = f"notifications_user_{user_id}"
         self.send_to_group(group_name, message_type, data)
+    
+    def send_to_groups(self, group_names, message_type, data):
+        """
+        Send the same message to many WebSocket groups in one channel-layer call.
+        
+        Unlike send_to_group, errors are raised so the caller can retry the
+        whole batch.
+        """
+        if not self.channel_layer:
+            logger.warning("Channel layer not configured, skipping real-time message")
+            return
+        
+        message = {'type': message_type, **data}
+        
+        async def send_all():
+            await asyncio.gather(*(
+                self.channel_layer.group_send(group_name, message)
+                for group_name in group_names
+            ))
+        
+        async_to_sync(send_all)()
 
 
 class NotificationRealtimeService(RealtimeService):
@@ -114,6 +136,14 @@ class DashboardRealtimeService(RealtimeService):
             'update': company_data
         })
     
+    def send_company_update_to_users(self, user_ids, company_data):
+        """Send the same company update to many users' dashboards at once."""
+        self.send_to_groups(
+            [f"dashboard_user_{user_id}" for user_id in user_ids],
+            'company_update',
+            {'update': company_data}
+        )
+    
     def send_dashboard_refresh(self, user_id, refresh_data=None):
         """Send dashboard refresh signal to user."""
         group_name = f"dashboard_user_{user_id}"
@@ -220,7 +220,7 @@ def schedule_company_job_notifications(company_id: int, job_id: int):
         
         # Send notifications to followers
         result = CompanyNotificationService.notify_followers_of_new_job(company, job)
-        logger.info(f"Sent {result['notifications_sent']} job notifications for company {company.name}")
+        logger.info(f"Queued {result['notifications_queued']} job notifications for company {company.name}")
         
     except Exception as e:
         logger.error(f"Failed to schedule company job notifications: {e}")
@@ -4,6 +4,11 @@ User Data Management Service for Koroh Platform
 This service provides comprehensive user data organization, storage, and retrieval
 for AI analysis results, portfolios, and related files. It ensures proper data
 isolation, security, and easy access while maintaining data integrity.
+
+Every stored item is also recorded in the UserDataManifestEntry table, so
+listings and storage statistics are database lookups rather than walks of
+the user's directory tree. Data written before the manifest existed is
+indexed with the rebuild_user_data_manifest management command.
 """
 
 import os
@@ -11,17 +16,85 @@ import json
 import logging
 import shutil
 from pathlib import Path
-from typing import Dict, Any, Optional, List, Union
-from datetime import datetime
+from typing import Dict, Any, Iterator, Optional, List, Union
+from datetime import datetime, timezone as dt_timezone
 from django.conf import settings
-from django.contrib.auth.models import User
+from django.contrib.auth import get_user_model
 from django.core.files.storage import default_storage
 from django.core.files.base import ContentFile
+from django.db import transaction
+from django.db.models import Count, Max, Sum
 import uuid
 
+from koroh_platform.models import UserDataManifestEntry
+from koroh_platform.utils.zip_streaming import (
+    directory_entries, entries_content_hash, entries_fingerprint, stream_zip
+)
+
+User = get_user_model()
 logger = logging.getLogger(__name__)
 
 
+def _dir_size(path: Path) -> int:
+    """Total size of the files under one directory."""
+    if not path.exists():
+        return 0
+    return sum(item.stat().st_size for item in path.rglob('*') if item.is_file())
+
+
+def _empty_storage_stats(user_id: int) -> Dict[str, Any]:
+    return {
+        'user_id': user_id,
+        'total_size': 0,
+        'cvs_size': 0,
+        'portfolios_size': 0,
+        'exports_size': 0,
+        'cvs_count': 0,
+        'portfolios_count': 0,
+        'analysis_sessions_count': 0,
+        'last_activity': None
+    }
+
+
+def summarize_storage(user_ids: Optional[List[int]] = None) -> Dict[int, Dict[str, Any]]:
+    """
+    Storage statistics per user from the manifest, in one grouped query.
+    
+    Args:
+        user_ids: Restrict to these users (default: every user with data)
+        
+    Returns:
+        Dict of user_id -> stats in the get_user_storage_stats format
+    """
+    entries = UserDataManifestEntry.objects.all()
+    if user_ids is not None:
+        entries = entries.filter(user_id__in=user_ids)
+    
+    rows = entries.order_by().values('user_id', 'kind').annotate(
+        total=Sum('size'), count=Count('id'), latest=Max('created_at')
+    )
+    
+    stats: Dict[int, Dict[str, Any]] = {}
+    for row in rows:
+        user_stats = stats.setdefault(row['user_id'], _empty_storage_stats(row['user_id']))
+        size = row['total'] or 0
+        user_stats['total_size'] += size
+        
+        kind = row['kind']
+        if kind == UserDataManifestEntry.KIND_CV:
+            user_stats['cvs_size'] = size
+            user_stats['cvs_count'] = row['count']
+        elif kind == UserDataManifestEntry.KIND_PORTFOLIO:
+            user_stats['portfolios_size'] = size
+            user_stats['portfolios_count'] = row['count']
+        elif kind == UserDataManifestEntry.KIND_EXPORT:
+            user_stats['exports_size'] = size
+        elif kind == UserDataManifestEntry.KIND_ANALYSIS_SESSION:
+            user_stats['analysis_sessions_count'] = row['count']
+            user_stats['last_activity'] = row['latest'].isoformat() if row['latest'] else None
+    return stats
+
+
 class UserDataManager:
     """
     Comprehensive user data management system for AI analysis and portfolio generation.
@@ -164,6 +237,10 @@ class UserDataManager:
         with open(metadata_file, 'w') as f:
             json.dump(metadata, f, indent=2)
         
+        self._record_entry(
+            UserDataManifestEntry.KIND_CV, cv_session_id, metadata, _dir_size(cv_session_path)
+        )
+        
         logger.info(f"CV uploaded for user {self.user_id}: {cv_session_id}")
         
         return {
@@ -236,6 +313,7 @@ class UserDataManager:
             json.dump(analysis_with_metadata, f, indent=2)
         
         # Update CV metadata
+        metadata = None
         original_metadata_file = cv_session_path / "original" / "metadata.json"
         if original_metadata_file.exists():
             with open(original_metadata_file, 'r') as f:
@@ -248,6 +326,12 @@ class UserDataManager:
             with open(original_metadata_file, 'w') as f:
                 json.dump(metadata, f, indent=2)
         
+        size = _dir_size(cv_session_path)
+        if metadata is not None:
+            self._record_entry(UserDataManifestEntry.KIND_CV, cv_session_id, metadata, size)
+        else:
+            self._entries(UserDataManifestEntry.KIND_CV).filter(entry_id=cv_session_id).update(size=size)
+        
         logger.info(f"CV analysis stored for user {self.user_id}, session {cv_session_id}")
         
         return {
@@ -331,8 +415,12 @@ class UserDataManager:
         with open(metadata_file, 'w') as f:
             json.dump(metadata, f, indent=2)
         
-        # Store in analysis history
-        self._store_analysis_session(cv_session_id, portfolio_id, analysis_data)
+        # Index the portfolio and its history entry together
+        with transaction.atomic():
+            self._record_entry(
+                UserDataManifestEntry.KIND_PORTFOLIO, portfolio_id, metadata, _dir_size(portfolio_path)
+            )
+            self._store_analysis_session(cv_session_id, portfolio_id, analysis_data)
         
         logger.info(f"Portfolio stored for user {self.user_id}: {portfolio_id}")
         
@@ -366,60 +454,38 @@ class UserDataManager:
         
         with open(session_file, 'w') as f:
             json.dump(session_data, f, indent=2)
+        
+        self._record_entry(
+            UserDataManifestEntry.KIND_ANALYSIS_SESSION, session_id, session_data,
+            session_file.stat().st_size
+        )
+    
+    def _entries(self, kind: str):
+        """Manifest entries of one kind for this user, newest first."""
+        return UserDataManifestEntry.objects.filter(user_id=self.user_id, kind=kind)
+    
+    def _record_entry(self, kind: str, entry_id: str, metadata: Dict[str, Any], size: int):
+        """Insert or update this user's manifest entry for a stored item."""
+        UserDataManifestEntry.objects.update_or_create(
+            user_id=self.user_id,
+            kind=kind,
+            entry_id=entry_id,
+            defaults={'metadata': metadata, 'size': size}
+        )
     
     def get_user_cvs(self) -> List[Dict[str, Any]]:
-        """Get list of all CVs for the user."""
-        cvs = []
-        
-        if not self.cvs_path.exists():
-            return cvs
-        
-        for cv_dir in self.cvs_path.iterdir():
-            if cv_dir.is_dir() and cv_dir.name.startswith('cv_'):
-                metadata_file = cv_dir / "original" / "metadata.json"
-                if metadata_file.exists():
-                    with open(metadata_file, 'r') as f:
-                        metadata = json.load(f)
-                    cvs.append(metadata)
-        
-        # Sort by upload timestamp (newest first)
-        cvs.sort(key=lambda x: x.get('upload_timestamp', ''), reverse=True)
-        return cvs
+        """Get list of all CVs for the user (newest first)."""
+        return list(self._entries(UserDataManifestEntry.KIND_CV).values_list('metadata', flat=True))
     
     def get_user_portfolios(self) -> List[Dict[str, Any]]:
-        """Get list of all portfolios for the user."""
-        portfolios = []
-        
-        if not self.portfolios_path.exists():
-            return portfolios
-        
-        for portfolio_dir in self.portfolios_path.iterdir():
-            if portfolio_dir.is_dir() and portfolio_dir.name.startswith('portfolio_'):
-                metadata_file = portfolio_dir / "metadata.json"
-                if metadata_file.exists():
-                    with open(metadata_file, 'r') as f:
-                        metadata = json.load(f)
-                    portfolios.append(metadata)
-        
-        # Sort by creation timestamp (newest first)
-        portfolios.sort(key=lambda x: x.get('creation_timestamp', ''), reverse=True)
-        return portfolios
+        """Get list of all portfolios for the user (newest first)."""
+        return list(self._entries(UserDataManifestEntry.KIND_PORTFOLIO).values_list('metadata', flat=True))
     
     def get_analysis_history(self) -> List[Dict[str, Any]]:
-        """Get analysis history for the user."""
-        history = []
-        
-        if not self.analysis_history_path.exists():
-            return history
-        
-        for session_file in self.analysis_history_path.glob("session_*.json"):
-            with open(session_file, 'r') as f:
-                session_data = json.load(f)
-            history.append(session_data)
-        
-        # Sort by timestamp (newest first)
-        history.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-        return history
+        """Get analysis history for the user (newest first)."""
+        return list(
+            self._entries(UserDataManifestEntry.KIND_ANALYSIS_SESSION).values_list('metadata', flat=True)
+        )
     
     def get_cv_analysis(self, cv_session_id: str) -> Optional[Dict[str, Any]]:
         """Get CV analysis results."""
@@ -461,19 +527,91 @@ class UserDataManager:
             'website_url': f"/media/user_data/user_{self.user_id}/portfolios/{portfolio_id}/website/index.html"
         }
     
-    def create_portfolio_export(self, portfolio_id: str) -> Optional[str]:
-        """Create a ZIP export of a portfolio."""
+    def _portfolio_dir(self, portfolio_id: str) -> Optional[Path]:
+        """Directory of one of this user's portfolios, or None if there isn't one."""
+        if not portfolio_id.startswith('portfolio_') or Path(portfolio_id).name != portfolio_id:
+            return None
         portfolio_path = self.portfolios_path / portfolio_id
+        return portfolio_path if portfolio_path.is_dir() else None
+    
+    def get_portfolio_etag(self, portfolio_id: str) -> Optional[str]:
+        """
+        Content-hash ETag for a portfolio export.
         
-        if not portfolio_path.exists():
+        The hash is kept on the portfolio's manifest entry, outside the
+        metadata returned to clients, together with a fingerprint of file
+        names, sizes and mtimes, so the files are only re-read after they
+        change.
+        
+        Returns:
+            Quoted ETag, or None if the portfolio doesn't exist
+        """
+        portfolio_path = self._portfolio_dir(portfolio_id)
+        if portfolio_path is None:
+            return None
+        
+        entries = directory_entries(portfolio_path)
+        fingerprint = entries_fingerprint(entries)
+        manifest_entry = self._entries(UserDataManifestEntry.KIND_PORTFOLIO).filter(
+            entry_id=portfolio_id
+        ).first()
+        
+        if manifest_entry and manifest_entry.export_fingerprint == fingerprint:
+            content_hash = manifest_entry.export_content_hash
+        else:
+            content_hash = entries_content_hash(entries)
+            if manifest_entry:
+                manifest_entry.export_fingerprint = fingerprint
+                manifest_entry.export_content_hash = content_hash
+                manifest_entry.save(update_fields=['export_fingerprint', 'export_content_hash', 'updated_at'])
+        
+        return f'"{content_hash}"'
+    
+    def stream_portfolio_export(self, portfolio_id: str) -> Optional[Iterator[bytes]]:
+        """
+        Stream a ZIP export of a portfolio.
+        
+        Chunks are produced as files are read, so exports use constant
+        memory and never touch the disk; images are stored uncompressed.
+        
+        Returns:
+            Iterator of archive chunks, or None if the portfolio doesn't exist
+        """
+        portfolio_path = self._portfolio_dir(portfolio_id)
+        if portfolio_path is None:
+            return None
+        return stream_zip(directory_entries(portfolio_path))
+    
+    def create_portfolio_export(self, portfolio_id: str) -> Optional[str]:
+        """
+        Write a ZIP export of a portfolio to the exports directory.
+        
+        Downloads should use stream_portfolio_export; this is only for
+        keeping an offline copy.
+        """
+        chunks = self.stream_portfolio_export(portfolio_id)
+        if chunks is None:
             return None
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         export_filename = f"portfolio_export_{portfolio_id}_{timestamp}.zip"
         export_path = self.exports_path / export_filename
         
-        # Create ZIP file
-        shutil.make_archive(str(export_path.with_suffix('')), 'zip', str(portfolio_path))
+        with open(export_path, 'wb') as f:
+            for chunk in chunks:
+                f.write(chunk)
+        
+        self._record_entry(
+            UserDataManifestEntry.KIND_EXPORT,
+            export_filename,
+            {
+                'export_filename': export_filename,
+                'portfolio_id': portfolio_id,
+                'file_path': str(export_path),
+                'export_timestamp': timestamp
+            },
+            export_path.stat().st_size
+        )
         
         logger.info(f"Portfolio export created for user {self.user_id}: {export_filename}")
         
@@ -484,12 +622,15 @@ class UserDataManager:
         cutoff_date = datetime.now().timestamp() - (days_old * 24 * 60 * 60)
         
         cleaned_items = []
+        removed_exports = []
+        removed_sessions = []
         
         # Clean old exports
         if self.exports_path.exists():
             for export_file in self.exports_path.glob("*.zip"):
                 if export_file.stat().st_mtime < cutoff_date:
                     export_file.unlink()
+                    removed_exports.append(export_file.name)
                     cleaned_items.append(f"Export: {export_file.name}")
         
         # Clean old analysis sessions (keep metadata but remove large files)
@@ -497,42 +638,74 @@ class UserDataManager:
             for session_file in self.analysis_history_path.glob("session_*.json"):
                 if session_file.stat().st_mtime < cutoff_date:
                     session_file.unlink()
+                    removed_sessions.append(session_file.stem)
                     cleaned_items.append(f"Session: {session_file.name}")
         
+        with transaction.atomic():
+            self._entries(UserDataManifestEntry.KIND_EXPORT).filter(entry_id__in=removed_exports).delete()
+            self._entries(UserDataManifestEntry.KIND_ANALYSIS_SESSION).filter(
+                entry_id__in=removed_sessions
+            ).delete()
+        
         logger.info(f"Cleaned {len(cleaned_items)} old items for user {self.user_id}")
         return cleaned_items
     
     def get_user_storage_stats(self) -> Dict[str, Any]:
         """Get storage statistics for the user."""
-        def get_dir_size(path: Path) -> int:
-            """Get total size of directory."""
-            if not path.exists():
-                return 0
-            
-            total_size = 0
-            for item in path.rglob('*'):
-                if item.is_file():
-                    total_size += item.stat().st_size
-            return total_size
+        return summarize_storage([self.user_id]).get(self.user_id) or _empty_storage_stats(self.user_id)
+    
+    def rebuild_manifest(self) -> int:
+        """
+        Re-index this user's directory tree into the manifest.
         
-        stats = {
-            'user_id': self.user_id,
-            'total_size': get_dir_size(self.user_path),
-            'cvs_size': get_dir_size(self.cvs_path),
-            'portfolios_size': get_dir_size(self.portfolios_path),
-            'exports_size': get_dir_size(self.exports_path),
-            'cvs_count': len(self.get_user_cvs()),
-            'portfolios_count': len(self.get_user_portfolios()),
-            'analysis_sessions_count': len(self.get_analysis_history()),
-            'last_activity': None
-        }
+        Walks the tree once; only needed for data written before the
+        manifest existed or changed outside this class.
+        
+        Returns:
+            Number of manifest entries written
+        """
+        def modified_at(path: Path) -> datetime:
+            return datetime.fromtimestamp(path.stat().st_mtime, tz=dt_timezone.utc)
+        
+        def read_json(path: Path) -> Dict[str, Any]:
+            with open(path, 'r') as f:
+                return json.load(f)
         
-        # Get last activity
-        history = self.get_analysis_history()
-        if history:
-            stats['last_activity'] = history[0].get('timestamp')
+        entries = []
         
-        return stats
+        def add(kind: str, entry_id: str, metadata: Dict[str, Any], size: int, path: Path):
+            entries.append(UserDataManifestEntry(
+                user_id=self.user_id, kind=kind, entry_id=entry_id,
+                metadata=metadata, size=size, created_at=modified_at(path)
+            ))
+        
+        for cv_dir in self.cvs_path.iterdir():
+            metadata_file = cv_dir / "original" / "metadata.json"
+            if cv_dir.is_dir() and cv_dir.name.startswith('cv_') and metadata_file.exists():
+                add(UserDataManifestEntry.KIND_CV, cv_dir.name, read_json(metadata_file),
+                    _dir_size(cv_dir), metadata_file)
+        
+        for portfolio_dir in self.portfolios_path.iterdir():
+            metadata_file = portfolio_dir / "metadata.json"
+            if portfolio_dir.is_dir() and portfolio_dir.name.startswith('portfolio_') and metadata_file.exists():
+                add(UserDataManifestEntry.KIND_PORTFOLIO, portfolio_dir.name, read_json(metadata_file),
+                    _dir_size(portfolio_dir), metadata_file)
+        
+        for session_file in self.analysis_history_path.glob("session_*.json"):
+            add(UserDataManifestEntry.KIND_ANALYSIS_SESSION, session_file.stem, read_json(session_file),
+                session_file.stat().st_size, session_file)
+        
+        for export_file in self.exports_path.glob("*.zip"):
+            add(UserDataManifestEntry.KIND_EXPORT, export_file.name,
+                {'export_filename': export_file.name, 'file_path': str(export_file)},
+                export_file.stat().st_size, export_file)
+        
+        with transaction.atomic():
+            UserDataManifestEntry.objects.filter(user_id=self.user_id).delete()
+            UserDataManifestEntry.objects.bulk_create(entries)
+        
+        logger.info(f"Rebuilt user data manifest for user {self.user_id}: {len(entries)} entries")
+        return len(entries)
 
 
 class UserDataManagerFactory:
@@ -550,21 +723,23 @@ class UserDataManagerFactory:
     
     @staticmethod
     def get_all_users_stats() -> List[Dict[str, Any]]:
-        """Get storage statistics for all users."""
+        """Get storage statistics for all users with stored data."""
+        stats = summarize_storage()
+        return [stats[user_id] for user_id in sorted(stats)]
+    
+    @staticmethod
+    def get_user_ids_on_disk() -> List[int]:
+        """User ids that have a data directory under MEDIA_ROOT/user_data."""
         base_path = Path(settings.MEDIA_ROOT) / "user_data"
         
         if not base_path.exists():
             return []
         
-        stats = []
+        user_ids = []
         for user_dir in base_path.iterdir():
             if user_dir.is_dir() and user_dir.name.startswith('user_'):
                 try:
-                    user_id = int(user_dir.name.split('_')[1])
-                    manager = UserDataManager(user_id=user_id)
-                    user_stats = manager.get_user_storage_stats()
-                    stats.append(user_stats)
-                except (ValueError, Exception) as e:
-                    logger.warning(f"Could not get stats for {user_dir.name}: {e}")
-        
-        return stats
\ No newline at end of file
+                    user_ids.append(int(user_dir.name.split('_')[1]))
+                except ValueError:
+                    logger.warning(f"Skipping unexpected user data directory {user_dir.name}")
+        return sorted(user_ids)
@@ -95,6 +95,7 @@ DJANGO_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
 
 THIRD_PARTY_APPS = [
@@ -110,6 +111,7 @@ THIRD_PARTY_APPS = [
 ]
 
 LOCAL_APPS = [
+    'koroh_platform',
     'authentication',
     'profiles',
     'companies',
@@ -384,16 +386,52 @@ AWS_BEDROCK_RETRY_DELAY = env('AWS_BEDROCK_RETRY_DELAY', default=1.0)
 AWS_BEDROCK_ENABLE_LOGGING = env('AWS_BEDROCK_ENABLE_LOGGING', default=True)
 AWS_BEDROCK_LOG_LEVEL = env('AWS_BEDROCK_LOG_LEVEL', default='INFO')
 
+# AI Response Cache Configuration
+# Identical Bedrock prompts are served from a local LRU tier in front of the shared cache.
+# Only deterministic extraction and tagging templates are cached; sampled output
+# (chat, portfolio) must stay fresh, so templates missing here use 'default' (0 = off).
+AI_RESPONSE_CACHE_ENABLED = env.bool('AI_RESPONSE_CACHE_ENABLED', default=True)
+AI_RESPONSE_CACHE_ALIAS = env('AI_RESPONSE_CACHE_ALIAS', default='default')
+AI_RESPONSE_CACHE_LOCAL_MAX_ENTRIES = env.int('AI_RESPONSE_CACHE_LOCAL_MAX_ENTRIES', default=512)
+AI_RESPONSE_CACHE_TTLS = {
+    'default': 0,  # not cached
+    'chat': 0,  # not cached, sampled at temperature 0.4-0.6
+    'portfolio': 0,  # not cached, sampled at temperature 0.7
+    'analysis': 86400,  # 1 day
+    'cv_analysis': 604800,  # 7 days, keyed by CV text
+    'tags': 604800,  # 7 days
+}
+
 # AI Chat Response Configuration
 AI_CHAT_CONCISE_MODE = env('AI_CHAT_CONCISE_MODE', default=True)
 AI_CHAT_MAX_RESPONSE_WORDS = env('AI_CHAT_MAX_RESPONSE_WORDS', default=50)
 AI_CHAT_MAX_RESPONSE_CHARS = env('AI_CHAT_MAX_RESPONSE_CHARS', default=500)
 AI_CHAT_ENABLE_CONTEXT_OPTIMIZATION = env('AI_CHAT_ENABLE_CONTEXT_OPTIMIZATION', default=True)
+AI_CHAT_STREAMING_ENABLED = env('AI_CHAT_STREAMING_ENABLED', default=True)
+# JSON vocabulary for chat turn analysis; defaults to ai_chat/data/turn_patterns.json
+AI_CHAT_TURN_PATTERNS_FILE = env('AI_CHAT_TURN_PATTERNS_FILE', default=None)
+
+# Job Recommendation Configuration
+# Jobs are scored locally; Bedrock only re-ranks this many top matches (0 disables it)
+JOB_RECOMMENDATION_AI_RERANK_TOP_N = env('JOB_RECOMMENDATION_AI_RERANK_TOP_N', default=0)
+# Stored per-user match scores are reused for this many seconds (6 hours)
+JOB_RECOMMENDATION_SCORE_TTL = env('JOB_RECOMMENDATION_SCORE_TTL', default=21600)
 
 # MeiliSearch Configuration
 MEILISEARCH_URL = env('MEILISEARCH_URL', default='http://localhost:7700')
 MEILISEARCH_MASTER_KEY = env('MEILISEARCH_MASTER_KEY', default='')
 
+# Job Search Configuration
+# 'postgres' (tsvector + trigram, icontains on other databases) or 'meilisearch'
+JOB_SEARCH_BACKEND = env('JOB_SEARCH_BACKEND', default='postgres')
+JOB_SEARCH_CONFIG = env('JOB_SEARCH_CONFIG', default='english')
+JOB_SEARCH_MEILISEARCH_MAX_HITS = env.int('JOB_SEARCH_MEILISEARCH_MAX_HITS', default=1000)
+
+# Search Indexing Configuration
+# Model changes are queued in SearchIndexOutbox and drained by Celery beat
+SEARCH_INDEXING_ENABLED = env.bool('SEARCH_INDEXING_ENABLED', default=True)
+SEARCH_OUTBOX_BATCH_SIZE = env.int('SEARCH_OUTBOX_BATCH_SIZE', default=500)
+
 # Celery Configuration
 CELERY_BROKER_URL = env('CELERY_BROKER_URL', default=REDIS_URL)
 CELERY_RESULT_BACKEND = env('CELERY_RESULT_BACKEND', default=REDIS_URL)
@@ -413,6 +451,23 @@ EMAIL_HOST_USER = env('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = env('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = 'noreply@koroh.com'
 
+# Company follower notifications are sent in batches of this many followers
+COMPANY_NOTIFICATION_CHUNK_SIZE = env.int('COMPANY_NOTIFICATION_CHUNK_SIZE', default=500)
+# Emails in a batch are sent, and recorded as sent, this many at a time
+COMPANY_NOTIFICATION_EMAIL_BATCH_SIZE = env.int('COMPANY_NOTIFICATION_EMAIL_BATCH_SIZE', default=50)
+# How long a delivered batch is remembered, so retries don't notify anyone twice
+COMPANY_NOTIFICATION_IDEMPOTENCY_TTL = 86400  # 1 day
+
+# New peer group members see this many recent group posts and comments in their feed
+PEER_GROUP_FEED_BACKFILL_SIZE = env.int('PEER_GROUP_FEED_BACKFILL_SIZE', default=50)
+
+# Peer group activity points lose half their weight in activity_score over this many days
+PEER_GROUP_ACTIVITY_HALF_LIFE_DAYS = env.int('PEER_GROUP_ACTIVITY_HALF_LIFE_DAYS', default=15)
+
+# Trending peer groups rank joins within this window; each leaderboard keeps this many groups
+PEER_GROUP_TRENDING_WINDOW_DAYS = env.int('PEER_GROUP_TRENDING_WINDOW_DAYS', default=7)
+PEER_GROUP_TRENDING_SIZE = env.int('PEER_GROUP_TRENDING_SIZE', default=100)
+
 # Frontend URL for email links
 FRONTEND_URL = env('FRONTEND_URL', default='http://localhost:3000')
 SUPPORT_EMAIL = env('SUPPORT_EMAIL', default='support@koroh.com')
@@ -421,6 +476,12 @@ SUPPORT_EMAIL = env('SUPPORT_EMAIL', default='support@koroh.com')
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 FILE_UPLOAD_PERMISSIONS = 0o644
+# CV text beyond this many (estimated) tokens is not sent for AI analysis
+CV_EXTRACTION_MAX_TOKENS = env('CV_EXTRACTION_MAX_TOKENS', default=6000)
+# Long CVs are extracted section by section in parallel ('single', 'sectioned' or 'auto')
+CV_ANALYSIS_EXTRACTION_MODE = env('CV_ANALYSIS_EXTRACTION_MODE', default='auto')
+CV_ANALYSIS_SECTIONED_MIN_CHARS = env.int('CV_ANALYSIS_SECTIONED_MIN_CHARS', default=8000)
+CV_ANALYSIS_MAX_WORKERS = env.int('CV_ANALYSIS_MAX_WORKERS', default=4)
 
 # Security Settings
 SECURE_BROWSER_XSS_FILTER = True
@@ -110,7 +110,7 @@ def notify_company_followers_new_job(company_id: int, job_id: int):
         # Send email notifications
         result = CompanyNotificationService.notify_followers_of_new_job(company, job)
         
-        logger.info(f"Notified {result['notifications_sent']} followers of {company.name} about job: {job.title}")
+        logger.info(f"Queued notifications to {result['notifications_queued']} followers of {company.name} about job: {job.title}")
         return result
         
     except (Company.DoesNotExist, Job.DoesNotExist) as e:
@@ -170,19 +170,12 @@ def process_portfolio_generation_completion(user_id: int, portfolio_data: Dict[s
 
 @shared_task
 def update_peer_group_activity_scores():
-    """Update activity scores for all peer groups."""
+    """Decay activity scores for all peer groups."""
     try:
-        from peer_groups.models import PeerGroup
+        from peer_groups.scoring import decay_all_scores
         
-        groups = PeerGroup.objects.filter(is_active=True)
-        updated_count = 0
-        
-        for group in groups:
-            try:
-                group.update_activity_score()
-                updated_count += 1
-            except Exception as e:
-                logger.error(f"Failed to update activity score for group {group.id}: {e}")
+        # New activity is scored as it happens; this only lets idle groups cool down
+        updated_count = decay_all_scores()
         
         logger.info(f"Updated activity scores for {updated_count} peer groups")
         return {'updated_count': updated_count}
@@ -192,35 +185,35 @@ def update_peer_group_activity_scores():
         return {'error': str(e)}
 
 
+@shared_task
+def drain_search_index_outbox():
+    """Push queued model changes to MeiliSearch in batches."""
+    try:
+        from django.conf import settings
+        from koroh_platform.utils.search_indexing import drain_search_outbox
+        
+        result = drain_search_outbox(
+            batch_size=getattr(settings, 'SEARCH_OUTBOX_BATCH_SIZE', 500)
+        )
+        if any(result.values()):
+            logger.info(f"Drained search index outbox: {result}")
+        return result
+        
+    except Exception as e:
+        logger.error(f"Failed to drain search index outbox: {e}")
+        return {'error': str(e)}
+
+
 @shared_task
 def send_weekly_digest_emails():
     """Send weekly digest emails to all users."""
     try:
         from companies.services import CompanyNotificationService
         
-        # Get users who have followed companies and want notifications
-        from companies.models import CompanyFollow
-        
-        user_ids = CompanyFollow.objects.filter(
-            notifications_enabled=True
-        ).values_list('user_id', flat=True).distinct()
-        
-        sent_count = 0
-        failed_count = 0
-        
-        for user_id in user_ids:
-            try:
-                user = User.objects.get(id=user_id)
-                result = CompanyNotificationService.send_weekly_digest(user)
-                
-                if result.get('digest_sent'):
-                    sent_count += 1
-                else:
-                    failed_count += 1
-                    
-            except Exception as e:
-                logger.error(f"Failed to send weekly digest to user {user_id}: {e}")
-                failed_count += 1
+        # Users who have followed companies and want notifications
+        results = CompanyNotificationService.send_weekly_digests(notifications_enabled_only=True)
+        sent_count = results['digests_sent']
+        failed_count = results['failed_digests']
         
         logger.info(f"Sent weekly digests: {sent_count} successful, {failed_count} failed")
         return {'sent_count': sent_count, 'failed_count': failed_count}
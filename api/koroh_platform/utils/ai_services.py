@@ -6,15 +6,17 @@ using AWS Bedrock. It implements proper error handling, retry logic, and service
 abstraction for various AI tasks.
 """
 
+import asyncio
 import json
 import logging
+import re
 import time
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional, List, Union
+from typing import Dict, Any, Optional, List, Union, Callable, Iterator, AsyncIterator
 from enum import Enum
 from dataclasses import dataclass
 from django.conf import settings
-from .aws_bedrock import bedrock_client
+from .aws_bedrock import bedrock_client, async_bedrock_client
 
 logger = logging.getLogger(__name__)
 
@@ -52,6 +54,8 @@ class AIServiceConfig:
     max_retries: int = 3
     retry_delay: float = 1.0
     timeout: int = 30
+    cache_template: str = 'default'
+    use_response_cache: bool = True
 
 
 class BaseAIService(ABC):
@@ -74,6 +78,7 @@ class BaseAIService(ABC):
         """
         self.config = config
         self.client = bedrock_client
+        self.async_client = async_bedrock_client
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
     
     def _validate_client(self) -> None:
@@ -105,12 +110,7 @@ class BaseAIService(ABC):
         for attempt in range(self.config.max_retries):
             try:
                 response = self.client.invoke_model(
-                    model_id=self.config.model_type.value,
-                    prompt=prompt,
-                    max_tokens=self.config.max_tokens,
-                    temperature=self.config.temperature,
-                    top_p=self.config.top_p,
-                    **kwargs
+                    prompt=prompt, **self._invocation_params(), **kwargs
                 )
                 
                 if response:
@@ -133,6 +133,133 @@ class BaseAIService(ABC):
             f"Last error: {last_error}"
         )
     
+    def _stream_model_with_retry(
+        self,
+        prompt: str,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Stream model output, retrying only until the first chunk arrives.
+        
+        Once text has been yielded to the caller a retry would duplicate it,
+        so a stream that breaks mid-way simply ends early.
+        
+        Args:
+            prompt: The input prompt for the model
+            **kwargs: Additional parameters for model invocation
+            
+        Yields:
+            Text chunks as generated by the model
+            
+        Raises:
+            ModelInvocationError: If no output was produced after retries
+        """
+        self._validate_client()
+        
+        for attempt in range(self.config.max_retries):
+            produced = False
+            for chunk in self.client.invoke_model_stream(
+                prompt=prompt, **self._invocation_params(), **kwargs
+            ):
+                produced = True
+                yield chunk
+            
+            if produced:
+                self.logger.info(f"Model stream successful on attempt {attempt + 1}")
+                return
+            
+            self.logger.warning(f"Model stream attempt {attempt + 1} produced no output")
+            if attempt < self.config.max_retries - 1:
+                time.sleep(self.config.retry_delay * (2 ** attempt))  # Exponential backoff
+        
+        raise ModelInvocationError(
+            f"Model stream produced no output after {self.config.max_retries} attempts"
+        )
+    
+    def _invocation_params(self) -> Dict[str, Any]:
+        """Model parameters shared by every invocation path."""
+        return {
+            'model_id': self.config.model_type.value,
+            'max_tokens': self.config.max_tokens,
+            'temperature': self.config.temperature,
+            'top_p': self.config.top_p,
+            'cache_template': self.config.cache_template,
+            'bypass_cache': not self.config.use_response_cache,
+        }
+    
+    async def _ainvoke_model_with_retry(
+        self,
+        prompt: str,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """
+        Async variant of _invoke_model_with_retry that never blocks the event loop.
+        
+        Raises:
+            ModelInvocationError: If model invocation fails after retries
+        """
+        self._validate_client()
+        
+        last_error = None
+        for attempt in range(self.config.max_retries):
+            try:
+                response = await self.async_client.invoke_model(
+                    prompt=prompt, **self._invocation_params(), **kwargs
+                )
+                
+                if response:
+                    self.logger.info(f"Async model invocation successful on attempt {attempt + 1}")
+                    return response
+                else:
+                    raise ModelInvocationError("Model returned empty response")
+                    
+            except Exception as e:
+                last_error = e
+                self.logger.warning(
+                    f"Async model invocation attempt {attempt + 1} failed: {e}"
+                )
+                
+                if attempt < self.config.max_retries - 1:
+                    await asyncio.sleep(self.config.retry_delay * (2 ** attempt))
+                    
+        raise ModelInvocationError(
+            f"Model invocation failed after {self.config.max_retries} attempts. "
+            f"Last error: {last_error}"
+        )
+    
+    async def _astream_model_with_retry(
+        self,
+        prompt: str,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Async variant of _stream_model_with_retry.
+        
+        Raises:
+            ModelInvocationError: If no output was produced after retries
+        """
+        self._validate_client()
+        
+        for attempt in range(self.config.max_retries):
+            produced = False
+            async for chunk in self.async_client.invoke_model_stream(
+                prompt=prompt, **self._invocation_params(), **kwargs
+            ):
+                produced = True
+                yield chunk
+            
+            if produced:
+                self.logger.info(f"Async model stream successful on attempt {attempt + 1}")
+                return
+            
+            self.logger.warning(f"Async model stream attempt {attempt + 1} produced no output")
+            if attempt < self.config.max_retries - 1:
+                await asyncio.sleep(self.config.retry_delay * (2 ** attempt))
+        
+        raise ModelInvocationError(
+            f"Model stream produced no output after {self.config.max_retries} attempts"
+        )
+    
     def _extract_response_text(self, response: Dict[str, Any]) -> str:
         """
         Extract text from model response.
@@ -188,6 +315,152 @@ class BaseAIService(ABC):
             self.logger.error(f"JSON parsing failed for text: {text[:200]}...")
             raise ResponseParsingError(f"Failed to parse JSON response: {e}")
     
+    def process_batch(
+        self,
+        items: List[Dict[str, Any]],
+        instructions: str,
+        shared_context: Optional[Dict[str, Any]] = None,
+        result_format: str = '<result>',
+        validate_result: Optional[Callable[[Any], Any]] = None,
+        batch_size: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Process many items with one prompt per batch instead of one per item.
+        
+        Items are packed into a single structured prompt together with the
+        shared context, and the model answers with a JSON array of results
+        keyed by item id. Items missing from a partially parsed response are
+        split into smaller batches and retried on their own, while a failed
+        model invocation leaves the whole batch out.
+        
+        Args:
+            items: Item dictionaries, each with a unique 'id'
+            instructions: Task description applied to every item
+            shared_context: Context sent once per batch rather than per item
+            result_format: Description of the expected 'result' value
+            validate_result: Optional callable normalizing a result, raising
+                ValueError or TypeError for invalid results
+            batch_size: Maximum number of items per prompt
+            
+        Returns:
+            Dictionary mapping item id (as string) to its result. Items that
+            still fail on their own are left out.
+        """
+        results: Dict[str, Any] = {}
+        for start in range(0, len(items), batch_size):
+            self._process_batch_chunk(
+                items[start:start + batch_size],
+                instructions,
+                shared_context,
+                result_format,
+                validate_result,
+                results
+            )
+        return results
+    
+    def _process_batch_chunk(
+        self,
+        items: List[Dict[str, Any]],
+        instructions: str,
+        shared_context: Optional[Dict[str, Any]],
+        result_format: str,
+        validate_result: Optional[Callable[[Any], Any]],
+        results: Dict[str, Any]
+    ) -> None:
+        """Process one batch, splitting and retrying only the failed items."""
+        if not items:
+            return
+        
+        prompt = self._build_batch_prompt(items, instructions, shared_context, result_format)
+        try:
+            response = self._invoke_model_with_retry(prompt)
+            parsed = self._parse_batch_response(self._extract_response_text(response))
+        except ResponseParsingError as e:
+            self.logger.warning(f"Could not parse batch of {len(items)} items: {e}")
+            parsed = {}
+        except AIServiceError as e:
+            # Invocation itself failed after retries; splitting would only
+            # multiply the failing requests.
+            self.logger.error(f"Batch of {len(items)} items failed: {e}")
+            return
+        
+        failed = []
+        for item in items:
+            item_id = str(item['id'])
+            if item_id not in parsed:
+                failed.append(item)
+                continue
+            try:
+                value = parsed[item_id]
+                results[item_id] = validate_result(value) if validate_result else value
+            except (ValueError, TypeError) as e:
+                self.logger.warning(f"Invalid batch result for item {item_id}: {e}")
+                failed.append(item)
+        
+        if not failed:
+            return
+        if len(items) == 1:
+            self.logger.error(f"Batch item {items[0]['id']} could not be processed")
+            return
+        
+        # Retry only the failed items, in halves, so one bad item cannot
+        # sink the rest of the batch.
+        middle = max(1, len(failed) // 2)
+        for part in (failed[:middle], failed[middle:]):
+            self._process_batch_chunk(
+                part, instructions, shared_context, result_format, validate_result, results
+            )
+    
+    def _build_batch_prompt(
+        self,
+        items: List[Dict[str, Any]],
+        instructions: str,
+        shared_context: Optional[Dict[str, Any]],
+        result_format: str
+    ) -> str:
+        """Build a structured prompt covering several items."""
+        context_section = ""
+        if shared_context:
+            context_section = f"""
+        Shared Context:
+        {json.dumps(shared_context, indent=2, default=str)}
+        """
+        
+        return f"""
+        {instructions}
+        {context_section}
+        Items:
+        {json.dumps(items, indent=2, default=str)}
+        
+        Respond with a JSON array only, containing exactly one entry per item:
+        [
+            {{"id": "<item id>", "result": {result_format}}}
+        ]
+        Please respond with valid JSON only, no additional text or formatting.
+        """
+    
+    def _parse_batch_response(self, text: str) -> Dict[str, Any]:
+        """
+        Parse a batch response into a mapping of item id to result.
+        
+        Raises:
+            ResponseParsingError: If the response is not a JSON array
+        """
+        cleaned_text = text.strip()
+        start, end = cleaned_text.find('['), cleaned_text.rfind(']')
+        if start != -1 and end > start:
+            cleaned_text = cleaned_text[start:end + 1]
+        
+        data = self._parse_json_response(cleaned_text)
+        if not isinstance(data, list):
+            raise ResponseParsingError("Batch response is not a JSON array")
+        
+        parsed = {}
+        for entry in data:
+            if isinstance(entry, dict) and 'id' in entry and 'result' in entry:
+                parsed[str(entry['id'])] = entry['result']
+        return parsed
+    
     @abstractmethod
     def process(self, input_data: Any) -> Any:
         """
@@ -216,7 +489,8 @@ class TextAnalysisService(BaseAIService):
                 model_type=ModelType.CLAUDE_3_SONNET,
                 max_tokens=2000,
                 temperature=0.3,  # Lower temperature for consistent structured output
-                max_retries=3
+                max_retries=3,
+                cache_template='analysis'
             )
         super().__init__(config)
     
@@ -413,7 +687,8 @@ class ConversationalAIService(BaseAIService):
                 model_type=ModelType.CLAUDE_3_HAIKU,  # Faster model for conversations
                 max_tokens=800,  # Reduced from 1500 for more concise responses
                 temperature=0.6,  # Reduced from 0.8 for more focused responses
-                max_retries=2
+                max_retries=2,
+                cache_template='chat'
             )
         super().__init__(config)
     
@@ -427,6 +702,39 @@ class ConversationalAIService(BaseAIService):
         Returns:
             AI response as string
         """
+        prompt = self._build_prompt_from_input(input_data)
+        response = self._invoke_model_with_retry(prompt)
+        
+        return self._extract_response_text(response)
+    
+    def process_stream(self, input_data: Dict[str, Any]) -> Iterator[str]:
+        """
+        Stream a context-aware response as text chunks.
+        
+        Args:
+            input_data: Same structure as accepted by process()
+            
+        Yields:
+            Response text chunks in generation order
+        """
+        prompt = self._build_prompt_from_input(input_data)
+        yield from self._stream_model_with_retry(prompt)
+    
+    async def aprocess(self, input_data: Dict[str, Any]) -> str:
+        """Async variant of process() for use from ASGI consumers."""
+        prompt = self._build_prompt_from_input(input_data)
+        response = await self._ainvoke_model_with_retry(prompt)
+        
+        return self._extract_response_text(response)
+    
+    async def aprocess_stream(self, input_data: Dict[str, Any]) -> AsyncIterator[str]:
+        """Async variant of process_stream() for use from ASGI consumers."""
+        prompt = self._build_prompt_from_input(input_data)
+        async for chunk in self._astream_model_with_retry(prompt):
+            yield chunk
+    
+    def _build_prompt_from_input(self, input_data: Dict[str, Any]) -> str:
+        """Build the conversation prompt from process() input data."""
         message = input_data.get('message', '')
         context = input_data.get('context', [])
         user_profile = input_data.get('user_profile', {})
@@ -437,12 +745,9 @@ class ConversationalAIService(BaseAIService):
             raise ValueError("Message is required for conversational AI")
         
         # Build enhanced prompt with context awareness
-        prompt = self._build_enhanced_conversation_prompt(
+        return self._build_enhanced_conversation_prompt(
             message, context, user_profile, conversation_context, conversation_memory
         )
-        response = self._invoke_model_with_retry(prompt)
-        
-        return self._extract_response_text(response)
     
     def _build_enhanced_conversation_prompt(
         self, 
@@ -608,6 +913,8 @@ class ConciseChatService(ConversationalAIService):
     Optimized for brief, actionable responses with minimal context.
     """
     
+    MAX_WORDS = 50  # Approximately 1-2 sentences
+    
     def __init__(self, config: Optional[AIServiceConfig] = None):
         """Initialize concise chat service with strict limits."""
         if config is None:
@@ -615,7 +922,8 @@ class ConciseChatService(ConversationalAIService):
                 model_type=ModelType.CLAUDE_3_HAIKU,  # Fastest model
                 max_tokens=400,  # Very limited for conciseness
                 temperature=0.4,  # Low temperature for focused responses
-                max_retries=2
+                max_retries=2,
+                cache_template='chat'
             )
         super().__init__(config)
     
@@ -646,14 +954,51 @@ Brief response:"""
     
     def process(self, input_data: Dict[str, Any]) -> str:
         """Process input with additional conciseness enforcement."""
-        response = super().process(input_data)
-        
-        # Enforce strict word limit
+        return self._limit_words(super().process(input_data))
+    
+    async def aprocess(self, input_data: Dict[str, Any]) -> str:
+        """Async variant of process() with the same conciseness enforcement."""
+        return self._limit_words(await super().aprocess(input_data))
+    
+    def process_stream(self, input_data: Dict[str, Any]) -> Iterator[str]:
+        """Stream a response, ending the stream once the word limit is reached."""
+        streamed = ''
+        for chunk in super().process_stream(input_data):
+            text = streamed + chunk
+            overflow = self._word_limit_overflow(streamed, text)
+            if overflow is not None:
+                yield overflow
+                return
+            streamed = text
+            yield chunk
+    
+    async def aprocess_stream(self, input_data: Dict[str, Any]) -> AsyncIterator[str]:
+        """Async variant of process_stream() with the same word limit."""
+        streamed = ''
+        async for chunk in super().aprocess_stream(input_data):
+            text = streamed + chunk
+            overflow = self._word_limit_overflow(streamed, text)
+            if overflow is not None:
+                yield overflow
+                return
+            streamed = text
+            yield chunk
+    
+    def _limit_words(self, response: str) -> str:
+        """Enforce the strict word limit on a complete response."""
         words = response.split()
-        if len(words) > 50:  # Approximately 1-2 sentences
-            response = ' '.join(words[:50]) + '...'
+        if len(words) > self.MAX_WORDS:
+            response = ' '.join(words[:self.MAX_WORDS]) + '...'
         
         return response
+    
+    def _word_limit_overflow(self, streamed: str, text: str) -> Optional[str]:
+        """Return the final chunk if text passes the word limit, else None."""
+        words = list(re.finditer(r'\S+', text))
+        if len(words) <= self.MAX_WORDS:
+            return None
+        cutoff = words[self.MAX_WORDS - 1].end()
+        return text[len(streamed):cutoff] + '...'
 
 
 # Service factory for easy instantiation
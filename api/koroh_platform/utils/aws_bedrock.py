@@ -9,14 +9,25 @@ AWS Bedrock foundation models for various AI tasks including:
 - Peer group matching
 """
 
+import asyncio
 import json
 import logging
 import os
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Iterator, AsyncIterator
 import boto3
+from asgiref.sync import sync_to_async
 from botocore.exceptions import ClientError, BotoCoreError, NoCredentialsError
 from botocore.config import Config
 from django.conf import settings
+from .llm_cache import LLMResponseCache
+
+# aiobotocore is optional; without it async calls run the boto3 client in a worker thread
+try:
+    from aiobotocore.config import AioConfig
+    from aiobotocore.session import get_session
+    HAS_AIOBOTOCORE = True
+except ImportError:
+    HAS_AIOBOTOCORE = False
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +45,7 @@ class BedrockClient:
         """Initialize the Bedrock client with AWS credentials or IAM role."""
         self.client = None
         self.region = getattr(settings, 'AWS_BEDROCK_REGION', 'us-east-1')
+        self.response_cache = LLMResponseCache()
         
         try:
             # Configure retry and timeout settings
@@ -129,25 +141,27 @@ class BedrockClient:
         prompt: str,
         max_tokens: int = 1000,
         temperature: float = 0.7,
+        cache_template: str = 'default',
+        bypass_cache: bool = False,
         **kwargs
     ) -> Optional[Dict[str, Any]]:
         """
         Invoke a Bedrock foundation model with the given prompt.
         
+        Identical invocations are served from the shared response cache.
+        
         Args:
             model_id: The ID of the foundation model to use
             prompt: The input prompt for the model
             max_tokens: Maximum number of tokens to generate
             temperature: Sampling temperature (0.0 to 1.0)
+            cache_template: Template name selecting the response cache TTL
+            bypass_cache: Skip the response cache for non-deterministic calls
             **kwargs: Additional model-specific parameters
             
         Returns:
             Dict containing the model response or None if failed
         """
-        if not self.is_available():
-            logger.error("Bedrock client not available - check AWS configuration")
-            return None
-        
         # Validate input parameters
         if not model_id or not prompt:
             logger.error("Model ID and prompt are required")
@@ -161,6 +175,21 @@ class BedrockClient:
             logger.warning(f"Invalid max_tokens {max_tokens}, using default 1000")
             max_tokens = 1000
         
+        cache_key = None
+        if not bypass_cache:
+            cache_key = self.response_cache.make_key(
+                model_id, prompt, max_tokens, temperature,
+                kwargs.get('top_p', 0.9), kwargs.get('stop_sequences')
+            )
+            cached_response = self.response_cache.get(cache_key, cache_template)
+            if cached_response is not None:
+                logger.debug(f"Serving cached response for model {model_id}")
+                return cached_response
+        
+        if not self.is_available():
+            logger.error("Bedrock client not available - check AWS configuration")
+            return None
+        
         try:
             # Prepare the request body based on model type
             body = self._prepare_model_body(model_id, prompt, max_tokens, temperature, **kwargs)
@@ -176,6 +205,9 @@ class BedrockClient:
             
             response_body = json.loads(response['body'].read())
             logger.info(f"Successfully invoked model {model_id}")
+            
+            if cache_key:
+                self.response_cache.set(cache_key, response_body, cache_template)
             return response_body
             
         except ClientError as e:
@@ -205,6 +237,143 @@ class BedrockClient:
             logger.error(f"Unexpected error invoking Bedrock model {model_id}: {e}")
             return None
     
+    def invoke_model_stream(
+        self,
+        model_id: str,
+        prompt: str,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        cache_template: str = 'default',
+        bypass_cache: bool = False,
+        **kwargs
+    ) -> Iterator[str]:
+        """
+        Invoke a Bedrock foundation model and yield text chunks as they arrive.
+        
+        Uses the response-stream API so callers can forward tokens before the
+        completion has finished. A cached response is yielded as one chunk, and
+        a completed stream is written back to the response cache.
+        
+        Args:
+            model_id: The ID of the foundation model to use
+            prompt: The input prompt for the model
+            max_tokens: Maximum number of tokens to generate
+            temperature: Sampling temperature (0.0 to 1.0)
+            cache_template: Template name selecting the response cache TTL
+            bypass_cache: Skip the response cache for non-deterministic calls
+            **kwargs: Additional model-specific parameters
+            
+        Yields:
+            Text chunks in generation order; nothing if the invocation failed
+        """
+        if not model_id or not prompt:
+            logger.error("Model ID and prompt are required")
+            return
+        
+        temperature = max(0.0, min(1.0, temperature))
+        if max_tokens <= 0:
+            max_tokens = 1000
+        
+        cache_key = None
+        if not bypass_cache:
+            cache_key = self.response_cache.make_key(
+                model_id, prompt, max_tokens, temperature,
+                kwargs.get('top_p', 0.9), kwargs.get('stop_sequences')
+            )
+            cached_response = self.response_cache.get(cache_key, cache_template)
+            if cached_response is not None:
+                text = self.extract_text_from_response(cached_response, model_id)
+                if text:
+                    yield text
+                    return
+        
+        if not self.is_available():
+            logger.error("Bedrock client not available - check AWS configuration")
+            return
+        
+        chunks = []
+        try:
+            body = self._prepare_model_body(model_id, prompt, max_tokens, temperature, **kwargs)
+            
+            logger.debug(f"Streaming model {model_id} with {len(prompt)} character prompt")
+            
+            response = self.client.invoke_model_with_response_stream(
+                modelId=model_id,
+                body=json.dumps(body),
+                contentType='application/json',
+                accept='application/json'
+            )
+            
+            for event in response['body']:
+                chunk = event.get('chunk')
+                if not chunk:
+                    continue
+                text = self._extract_text_from_stream_event(
+                    json.loads(chunk['bytes']), model_id
+                )
+                if text:
+                    chunks.append(text)
+                    yield text
+            
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            logger.error(
+                f"AWS Bedrock ClientError ({error_code}) streaming model {model_id}: "
+                f"{e.response['Error']['Message']}"
+            )
+            return
+        except BotoCoreError as e:
+            logger.error(f"AWS Bedrock BotoCoreError while streaming: {e}")
+            return
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse stream event JSON: {e}")
+            return
+        except Exception as e:
+            logger.error(f"Unexpected error streaming Bedrock model {model_id}: {e}")
+            return
+        
+        logger.info(f"Successfully streamed model {model_id} in {len(chunks)} chunks")
+        if cache_key and chunks:
+            self.response_cache.set(
+                cache_key,
+                self._build_response_body(model_id, ''.join(chunks)),
+                cache_template
+            )
+    
+    def _extract_text_from_stream_event(self, event: Dict[str, Any], model_id: str) -> Optional[str]:
+        """Extract the text delta from a single response-stream event."""
+        model_lower = model_id.lower()
+        
+        if 'claude' in model_lower:
+            if 'claude-3' in model_lower:
+                # Messages API streams typed events; only deltas carry text
+                if event.get('type') == 'content_block_delta':
+                    return event.get('delta', {}).get('text')
+                return None
+            return event.get('completion')
+        
+        if 'titan' in model_lower:
+            return event.get('outputText')
+        
+        for key in ['text', 'completion', 'generated_text', 'output']:
+            if isinstance(event.get(key), str):
+                return event[key]
+        return None
+    
+    def _build_response_body(self, model_id: str, text: str) -> Dict[str, Any]:
+        """Build a non-streaming response body for text assembled from a stream."""
+        model_lower = model_id.lower()
+        
+        if 'claude' in model_lower:
+            if 'claude-3' in model_lower:
+                return {'content': [{'type': 'text', 'text': text}]}
+            return {'completion': text}
+        
+        if 'titan' in model_lower:
+            return {'results': [{'outputText': text}]}
+        
+        return {'text': text}
+    
     def _prepare_model_body(
         self, 
         model_id: str, 
@@ -313,8 +482,269 @@ class BedrockClient:
             return None
 
 
+class AsyncBedrockClient:
+    """
+    asyncio interface to AWS Bedrock for ASGI consumers.
+    
+    Uses aiobotocore when installed so a model round-trip never occupies a
+    thread; otherwise the blocking BedrockClient call runs in a worker
+    thread outside Django's sync thread. Request building, response parsing
+    and the response cache are shared with the wrapped BedrockClient.
+    """
+    
+    def __init__(self, sync_client: BedrockClient):
+        self.sync_client = sync_client
+        self.response_cache = sync_client.response_cache
+        self._session = get_session() if HAS_AIOBOTOCORE else None
+        self._client = None
+        self._client_context = None
+        self._client_loop = None
+        self._client_lock = None
+    
+    def is_available(self) -> bool:
+        """Check if Bedrock is configured (credentials resolved by the sync client)."""
+        return self.sync_client.is_available()
+    
+    @property
+    def is_native(self) -> bool:
+        """Whether calls are made with aiobotocore rather than a worker thread."""
+        return self._session is not None
+    
+    async def _get_client(self):
+        """Return the aiobotocore client for the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._client_loop is not loop:
+            self._release_stale_client()
+            self._client_loop = loop
+            self._client_lock = asyncio.Lock()
+        
+        async with self._client_lock:
+            if self._client is None:
+                client_kwargs = {
+                    'region_name': self.sync_client.region,
+                    'config': AioConfig(
+                        retries={'max_attempts': 3, 'mode': 'adaptive'},
+                        max_pool_connections=50,
+                        read_timeout=60,
+                        connect_timeout=10
+                    ),
+                }
+                access_key = getattr(settings, 'AWS_ACCESS_KEY_ID', None)
+                secret_key = getattr(settings, 'AWS_SECRET_ACCESS_KEY', None)
+                if access_key and secret_key:
+                    client_kwargs.update(
+                        aws_access_key_id=access_key,
+                        aws_secret_access_key=secret_key
+                    )
+                context = self._session.create_client('bedrock-runtime', **client_kwargs)
+                self._client = await context.__aenter__()
+                self._client_context = context
+            return self._client
+    
+    def _release_stale_client(self):
+        """Close a client created on another event loop, on that loop if it still runs."""
+        context, loop = self._client_context, self._client_loop
+        self._client = None
+        self._client_context = None
+        if context is None:
+            return
+        if loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(context.__aexit__(None, None, None), loop)
+        else:
+            logger.debug("Dropping Bedrock async client whose event loop has closed")
+    
+    async def close(self):
+        """Close the aiobotocore client and its connection pool."""
+        context = self._client_context
+        self._client = None
+        self._client_context = None
+        if context is not None:
+            await context.__aexit__(None, None, None)
+    
+    def _cache_key(self, model_id, prompt, max_tokens, temperature, kwargs) -> str:
+        return self.response_cache.make_key(
+            model_id, prompt, max_tokens, temperature,
+            kwargs.get('top_p', 0.9), kwargs.get('stop_sequences')
+        )
+    
+    async def invoke_model(
+        self,
+        model_id: str,
+        prompt: str,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        cache_template: str = 'default',
+        bypass_cache: bool = False,
+        **kwargs
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Async equivalent of BedrockClient.invoke_model.
+        
+        Returns:
+            Dict containing the model response or None if failed
+        """
+        if not self.is_native:
+            return await sync_to_async(self.sync_client.invoke_model, thread_sensitive=False)(
+                model_id, prompt, max_tokens, temperature,
+                cache_template=cache_template, bypass_cache=bypass_cache, **kwargs
+            )
+        
+        if not model_id or not prompt:
+            logger.error("Model ID and prompt are required")
+            return None
+        
+        temperature = max(0.0, min(1.0, temperature))
+        if max_tokens <= 0:
+            max_tokens = 1000
+        
+        cache_key = None
+        if not bypass_cache:
+            cache_key = self._cache_key(model_id, prompt, max_tokens, temperature, kwargs)
+            cached_response = await self.response_cache.aget(cache_key, cache_template)
+            if cached_response is not None:
+                logger.debug(f"Serving cached response for model {model_id}")
+                return cached_response
+        
+        if not self.is_available():
+            logger.error("Bedrock client not available - check AWS configuration")
+            return None
+        
+        try:
+            body = self.sync_client._prepare_model_body(model_id, prompt, max_tokens, temperature, **kwargs)
+            client = await self._get_client()
+            
+            logger.debug(f"Invoking model {model_id} asynchronously with {len(prompt)} character prompt")
+            
+            response = await client.invoke_model(
+                modelId=model_id,
+                body=json.dumps(body),
+                contentType='application/json',
+                accept='application/json'
+            )
+            async with response['body'] as stream:
+                response_body = json.loads(await stream.read())
+            logger.info(f"Successfully invoked model {model_id}")
+            
+            if cache_key:
+                await self.response_cache.aset(cache_key, response_body, cache_template)
+            return response_body
+            
+        except ClientError as e:
+            logger.error(
+                f"AWS Bedrock ClientError ({e.response['Error']['Code']}) invoking model {model_id}: "
+                f"{e.response['Error']['Message']}"
+            )
+            return None
+        except BotoCoreError as e:
+            logger.error(f"AWS Bedrock BotoCoreError: {e}")
+            return None
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse response JSON: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Unexpected error invoking Bedrock model {model_id}: {e}")
+            return None
+    
+    async def invoke_model_stream(
+        self,
+        model_id: str,
+        prompt: str,
+        max_tokens: int = 1000,
+        temperature: float = 0.7,
+        cache_template: str = 'default',
+        bypass_cache: bool = False,
+        **kwargs
+    ) -> AsyncIterator[str]:
+        """
+        Async equivalent of BedrockClient.invoke_model_stream.
+        
+        Yields:
+            Text chunks in generation order; nothing if the invocation failed
+        """
+        if not self.is_native:
+            stream = self.sync_client.invoke_model_stream(
+                model_id, prompt, max_tokens, temperature,
+                cache_template=cache_template, bypass_cache=bypass_cache, **kwargs
+            )
+            next_chunk = sync_to_async(next, thread_sensitive=False)
+            while True:
+                chunk = await next_chunk(stream, None)
+                if chunk is None:
+                    return
+                yield chunk
+        
+        if not model_id or not prompt:
+            logger.error("Model ID and prompt are required")
+            return
+        
+        temperature = max(0.0, min(1.0, temperature))
+        if max_tokens <= 0:
+            max_tokens = 1000
+        
+        cache_key = None
+        if not bypass_cache:
+            cache_key = self._cache_key(model_id, prompt, max_tokens, temperature, kwargs)
+            cached_response = await self.response_cache.aget(cache_key, cache_template)
+            if cached_response is not None:
+                text = self.sync_client.extract_text_from_response(cached_response, model_id)
+                if text:
+                    yield text
+                    return
+        
+        if not self.is_available():
+            logger.error("Bedrock client not available - check AWS configuration")
+            return
+        
+        chunks = []
+        try:
+            body = self.sync_client._prepare_model_body(model_id, prompt, max_tokens, temperature, **kwargs)
+            client = await self._get_client()
+            
+            response = await client.invoke_model_with_response_stream(
+                modelId=model_id,
+                body=json.dumps(body),
+                contentType='application/json',
+                accept='application/json'
+            )
+            
+            async for event in response['body']:
+                chunk = event.get('chunk')
+                if not chunk:
+                    continue
+                text = self.sync_client._extract_text_from_stream_event(
+                    json.loads(chunk['bytes']), model_id
+                )
+                if text:
+                    chunks.append(text)
+                    yield text
+            
+        except ClientError as e:
+            logger.error(
+                f"AWS Bedrock ClientError ({e.response['Error']['Code']}) streaming model {model_id}: "
+                f"{e.response['Error']['Message']}"
+            )
+            return
+        except BotoCoreError as e:
+            logger.error(f"AWS Bedrock BotoCoreError while streaming: {e}")
+            return
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse stream event JSON: {e}")
+            return
+        except Exception as e:
+            logger.error(f"Unexpected error streaming Bedrock model {model_id}: {e}")
+            return
+        
+        if cache_key and chunks:
+            await self.response_cache.aset(
+                cache_key,
+                self.sync_client._build_response_body(model_id, ''.join(chunks)),
+                cache_template
+            )
+
+
 # Global instance for use throughout the application
 bedrock_client = BedrockClient()
+async_bedrock_client = AsyncBedrockClient(bedrock_client)
 
 
 def analyze_cv_content(cv_text: str) -> Optional[Dict[str, Any]]:
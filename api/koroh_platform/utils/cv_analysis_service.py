@@ -11,13 +11,19 @@ It extracts structured information from unstructured CV content including:
 - Languages and additional qualifications
 """
 
+import copy
+import hashlib
 import json
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, List, Union
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from datetime import datetime
 
+from django.conf import settings
+from django.core.cache import cache
+
 from .ai_services import TextAnalysisService, AIServiceConfig, ModelType
 from .bedrock_config import get_model_for_task
 from .metrics import track_ai_request, track_user_activity
@@ -25,6 +31,129 @@ from .logging import ai_services_logger, performance_logger
 
 logger = logging.getLogger(__name__)
 
+# Full schema requested when the CV is extracted in a single prompt
+EXTRACTION_SCHEMA = {
+    "personal_info": {
+        "name": "Full name of the person",
+        "email": "Email address",
+        "phone": "Phone number",
+        "location": "Current location/address",
+        "linkedin": "LinkedIn profile URL",
+        "website": "Personal website URL",
+        "github": "GitHub profile URL"
+    },
+    "professional_summary": "Professional summary or objective statement",
+    "skills": {
+        "technical_skills": "List of technical skills, programming languages, tools, frameworks",
+        "soft_skills": "List of soft skills and interpersonal abilities",
+        "all_skills": "Complete list of all mentioned skills"
+    },
+    "work_experience": [
+        {
+            "company": "Company name",
+            "position": "Job title/position",
+            "start_date": "Start date (format: YYYY-MM or Month YYYY)",
+            "end_date": "End date (format: YYYY-MM or Month YYYY or 'Present')",
+            "duration": "Duration of employment",
+            "description": "Job description and responsibilities",
+            "achievements": "List of key achievements and accomplishments",
+            "technologies": "Technologies and tools used in this role"
+        }
+    ],
+    "education": [
+        {
+            "institution": "Educational institution name",
+            "degree": "Degree type (Bachelor's, Master's, PhD, etc.)",
+            "field_of_study": "Major or field of study",
+            "start_date": "Start date",
+            "end_date": "End date or graduation date",
+            "gpa": "GPA if mentioned",
+            "honors": "Academic honors or distinctions",
+            "relevant_coursework": "Relevant courses or subjects"
+        }
+    ],
+    "certifications": [
+        {
+            "name": "Certification name",
+            "issuer": "Issuing organization",
+            "issue_date": "Date issued",
+            "expiry_date": "Expiry date if applicable",
+            "credential_id": "Credential ID if provided"
+        }
+    ],
+    "languages": [
+        {
+            "language": "Language name",
+            "proficiency": "Proficiency level (Native, Fluent, Intermediate, Basic)"
+        }
+    ],
+    "projects": [
+        {
+            "name": "Project name",
+            "description": "Project description",
+            "technologies": "Technologies used",
+            "url": "Project URL if available",
+            "date": "Project date or duration"
+        }
+    ],
+    "awards": "List of awards and recognitions",
+    "volunteer_experience": [
+        {
+            "organization": "Organization name",
+            "role": "Volunteer role",
+            "description": "Description of volunteer work",
+            "date": "Date or duration"
+        }
+    ],
+    "interests": "List of personal interests and hobbies"
+}
+
+# Bump when the schema or extraction prompt changes so cached section results are discarded
+EXTRACTION_SCHEMA_VERSION = 1
+
+# Keywords marking each CV section, used for detection and for splitting on headings
+SECTION_PATTERNS = {
+    'personal_info': ['contact', 'personal', 'profile'],
+    'summary': ['summary', 'objective', 'profile', 'about'],
+    'experience': ['experience', 'employment', 'work', 'career'],
+    'education': ['education', 'academic', 'qualification'],
+    'skills': ['skills', 'competencies', 'expertise', 'technologies'],
+    'certifications': ['certification', 'license', 'credential'],
+    'projects': ['projects', 'portfolio'],
+    'awards': ['awards', 'honors', 'recognition'],
+    'languages': ['languages', 'linguistic'],
+    'interests': ['interests', 'hobbies', 'activities'],
+    'volunteer': ['volunteer', 'community'],
+    'publications': ['publications'],
+}
+
+# Keywords that qualify another section noun ("Personal Projects", "Career
+# Summary"); they only decide a heading that names no other section
+SECTION_MODIFIERS = frozenset({'personal', 'academic', 'career', 'work', 'community'})
+
+# Schema keys requested for each section in sectioned extraction; 'header' is
+# the text before the first recognised heading (name, contact details, intro)
+SECTION_SCHEMA_KEYS = {
+    'header': ['personal_info', 'professional_summary'],
+    'personal_info': ['personal_info', 'professional_summary'],
+    'summary': ['professional_summary'],
+    'experience': ['work_experience'],
+    'education': ['education'],
+    'skills': ['skills'],
+    'certifications': ['certifications'],
+    'projects': ['projects'],
+    'awards': ['awards'],
+    'languages': ['languages'],
+    'interests': ['interests'],
+    'volunteer': ['volunteer_experience'],
+    # The schema has no publications list; papers are extracted as projects
+    'publications': ['projects'],
+}
+
+# Words allowed in lower case within a title-cased heading
+_HEADING_CONNECTORS = frozenset({'and', 'of', '&', '/', 'the', 'in'})
+_HEADING_MAX_WORDS = 5
+
 
 @dataclass
 class PersonalInfo:
@@ -116,6 +245,20 @@ class CVAnalysisResult:
                           'extracted_sections', 'processing_notes']:
             if getattr(self, field_name) is None:
                 setattr(self, field_name, [])
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serialisable dict (see from_dict)."""
+        return asdict(self)
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'CVAnalysisResult':
+        """Rebuild a result produced by to_dict, e.g. from a cache."""
+        data = dict(data)
+        data['personal_info'] = PersonalInfo(**(data.get('personal_info') or {}))
+        data['work_experience'] = [WorkExperience(**exp) for exp in data.get('work_experience') or []]
+        data['education'] = [Education(**edu) for edu in data.get('education') or []]
+        data['certifications'] = [Certification(**cert) for cert in data.get('certifications') or []]
+        return cls(**data)
 
 
 class CVAnalysisService:
@@ -134,7 +277,8 @@ class CVAnalysisService:
                 model_type=ModelType.CLAUDE_3_SONNET,
                 max_tokens=4000,  # Larger token limit for comprehensive analysis
                 temperature=0.2,  # Lower temperature for consistent extraction
-                max_retries=3
+                max_retries=3,
+                cache_template='cv_analysis'
             )
         
         self.text_service = TextAnalysisService(config)
@@ -214,90 +358,18 @@ class CVAnalysisService:
     def _extract_structured_data(self, cv_text: str, options: Dict[str, Any]) -> Dict[str, Any]:
         """Extract structured data using AI text analysis."""
         
-        # Define comprehensive extraction schema
-        extraction_schema = {
-            "personal_info": {
-                "name": "Full name of the person",
-                "email": "Email address",
-                "phone": "Phone number",
-                "location": "Current location/address",
-                "linkedin": "LinkedIn profile URL",
-                "website": "Personal website URL",
-                "github": "GitHub profile URL"
-            },
-            "professional_summary": "Professional summary or objective statement",
-            "skills": {
-                "technical_skills": "List of technical skills, programming languages, tools, frameworks",
-                "soft_skills": "List of soft skills and interpersonal abilities",
-                "all_skills": "Complete list of all mentioned skills"
-            },
-            "work_experience": [
-                {
-                    "company": "Company name",
-                    "position": "Job title/position",
-                    "start_date": "Start date (format: YYYY-MM or Month YYYY)",
-                    "end_date": "End date (format: YYYY-MM or Month YYYY or 'Present')",
-                    "duration": "Duration of employment",
-                    "description": "Job description and responsibilities",
-                    "achievements": "List of key achievements and accomplishments",
-                    "technologies": "Technologies and tools used in this role"
-                }
-            ],
-            "education": [
-                {
-                    "institution": "Educational institution name",
-                    "degree": "Degree type (Bachelor's, Master's, PhD, etc.)",
-                    "field_of_study": "Major or field of study",
-                    "start_date": "Start date",
-                    "end_date": "End date or graduation date",
-                    "gpa": "GPA if mentioned",
-                    "honors": "Academic honors or distinctions",
-                    "relevant_coursework": "Relevant courses or subjects"
-                }
-            ],
-            "certifications": [
-                {
-                    "name": "Certification name",
-                    "issuer": "Issuing organization",
-                    "issue_date": "Date issued",
-                    "expiry_date": "Expiry date if applicable",
-                    "credential_id": "Credential ID if provided"
-                }
-            ],
-            "languages": [
-                {
-                    "language": "Language name",
-                    "proficiency": "Proficiency level (Native, Fluent, Intermediate, Basic)"
-                }
-            ],
-            "projects": [
-                {
-                    "name": "Project name",
-                    "description": "Project description",
-                    "technologies": "Technologies used",
-                    "url": "Project URL if available",
-                    "date": "Project date or duration"
-                }
-            ],
-            "awards": "List of awards and recognitions",
-            "volunteer_experience": [
-                {
-                    "organization": "Organization name",
-                    "role": "Volunteer role",
-                    "description": "Description of volunteer work",
-                    "date": "Date or duration"
-                }
-            ],
-            "interests": "List of personal interests and hobbies"
-        }
+        if self._use_sectioned_extraction(cv_text, options):
+            sectioned_data = self._extract_sectioned_data(cv_text, options)
+            if sectioned_data is not None:
+                return sectioned_data
         
         # Create analysis prompt
-        prompt = self._build_extraction_prompt(cv_text, extraction_schema, options)
+        prompt = self._build_extraction_prompt(cv_text, EXTRACTION_SCHEMA, options)
         
         # Use text analysis service
         input_data = {
             "text": cv_text,
-            "extraction_schema": extraction_schema
+            "extraction_schema": EXTRACTION_SCHEMA
         }
         
         # Override the process method to use our custom prompt
@@ -306,6 +378,183 @@ class CVAnalysisService:
         
         return self.text_service._parse_json_response(response_text)
     
+    def _use_sectioned_extraction(self, cv_text: str, options: Dict[str, Any]) -> bool:
+        """
+        Decide whether to extract the CV section by section.
+        
+        The 'extraction_mode' option (or CV_ANALYSIS_EXTRACTION_MODE setting)
+        is 'single', 'sectioned' or 'auto'; auto sections documents of at
+        least CV_ANALYSIS_SECTIONED_MIN_CHARS characters.
+        """
+        mode = options.get('extraction_mode') or getattr(settings, 'CV_ANALYSIS_EXTRACTION_MODE', 'auto')
+        if mode == 'sectioned':
+            return True
+        if mode == 'auto':
+            return len(cv_text) >= int(getattr(settings, 'CV_ANALYSIS_SECTIONED_MIN_CHARS', 8000))
+        return False
+    
+    def _extract_sectioned_data(self, cv_text: str, options: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Extract each CV section with only the sub-schema it needs, in parallel.
+        
+        Section results are cached by a hash of the section text, so an
+        edited CV only re-extracts the sections that changed. If any section
+        fails the error is raised; sections that succeeded stay cached, so a
+        retry only repeats the failures.
+        
+        Args:
+            cv_text: Raw text content of the CV
+            options: Analysis options
+            
+        Returns:
+            Merged extraction data, or None when the CV has fewer than two
+            recognisable sections and should be extracted in one prompt
+        """
+        segments = self._segment_sections(cv_text)
+        if len(segments) < 2:
+            return None
+        
+        results: Dict[str, Dict[str, Any]] = {}
+        pending = []
+        for section, text in segments.items():
+            cached = cache.get(self._section_cache_key(section, text))
+            if cached is not None:
+                results[section] = cached
+            else:
+                pending.append(section)
+        
+        if pending:
+            max_workers = int(getattr(settings, 'CV_ANALYSIS_MAX_WORKERS', 4))
+            with ThreadPoolExecutor(
+                max_workers=max(1, min(max_workers, len(pending))),
+                thread_name_prefix='cv-section'
+            ) as executor:
+                futures = {
+                    section: executor.submit(self._extract_section, section, segments[section], options)
+                    for section in pending
+                }
+            
+            errors = []
+            ttl = getattr(settings, 'AI_RESPONSE_CACHE_TTLS', {}).get('cv_analysis', 604800)
+            for section, future in futures.items():
+                try:
+                    data = future.result()
+                except Exception as e:
+                    self.logger.warning(f"Extraction of CV section '{section}' failed: {e}")
+                    errors.append(e)
+                    continue
+                cache.set(self._section_cache_key(section, segments[section]), data, ttl)
+                results[section] = data
+            
+            if errors:
+                raise errors[0]
+        
+        self.logger.info(
+            f"Sectioned CV extraction: {len(segments)} sections, "
+            f"{len(segments) - len(pending)} from cache"
+        )
+        return self._merge_section_data([results[section] for section in segments])
+    
+    def _extract_section(self, section: str, text: str, options: Dict[str, Any]) -> Dict[str, Any]:
+        """Extract one CV section using only its part of the schema."""
+        keys = SECTION_SCHEMA_KEYS[section]
+        schema = {key: EXTRACTION_SCHEMA[key] for key in keys}
+        prompt = self._build_extraction_prompt(text, schema, options)
+        
+        response = self.text_service._invoke_model_with_retry(prompt)
+        response_text = self.text_service._extract_response_text(response)
+        data = self.text_service._parse_json_response(response_text)
+        
+        # Ignore anything outside the requested sub-schema
+        return {key: data.get(key) for key in keys}
+    
+    def _section_cache_key(self, section: str, text: str) -> str:
+        """Cache key for a section result; whitespace changes don't invalidate it."""
+        normalized = ' '.join(text.split())
+        digest = hashlib.sha256(
+            f"{self.text_service.config.model_type.value}\0{section}\0{normalized}".encode('utf-8')
+        ).hexdigest()
+        return f"cv_section:v{EXTRACTION_SCHEMA_VERSION}:{digest}"
+    
+    def _segment_sections(self, cv_text: str) -> Dict[str, str]:
+        """
+        Split CV text into sections at recognised headings.
+        
+        Text before the first heading becomes the 'header' section. Repeated
+        headings of the same kind are joined into one section.
+        
+        Returns:
+            Mapping of section name to its text, in document order
+        """
+        segments: Dict[str, List[str]] = {}
+        current = 'header'
+        for line in cv_text.splitlines():
+            section = self._classify_heading(line)
+            if section:
+                current = section
+            segments.setdefault(current, []).append(line)
+        
+        return {
+            section: '\n'.join(lines).strip()
+            for section, lines in segments.items()
+            if '\n'.join(lines).strip()
+        }
+    
+    def _classify_heading(self, line: str) -> Optional[str]:
+        """Return the section a heading line starts, or None for body text."""
+        stripped = line.strip()
+        clean = stripped.strip('#*_=-:| \t')
+        words = clean.split()
+        if not words or len(words) > _HEADING_MAX_WORDS or clean.endswith('.'):
+            return None
+        
+        # Headings are marked up, end with a colon, or are upper/title case
+        looks_like_heading = (
+            stripped.startswith('#')
+            or stripped.endswith(':')
+            or clean.isupper()
+            or all(word[0].isupper() or word.lower() in _HEADING_CONNECTORS for word in words)
+        )
+        if not looks_like_heading:
+            return None
+        
+        # Section nouns outrank modifiers, so "Personal Projects" is projects;
+        # among nouns the earliest decides, so "Volunteer Experience" is volunteering
+        lowered = clean.lower()
+        best = None
+        for section, patterns in SECTION_PATTERNS.items():
+            for pattern in patterns:
+                position = lowered.find(pattern)
+                if position == -1:
+                    continue
+                rank = (pattern in SECTION_MODIFIERS, position)
+                if best is None or rank < best[0]:
+                    best = (rank, section)
+        return best[1] if best else None
+    
+    def _merge_section_data(self, parts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Merge per-section extraction results into a single schema-shaped dict."""
+        merged: Dict[str, Any] = {}
+        for part in parts:
+            for key, value in part.items():
+                if value in (None, '', [], {}):
+                    continue
+                current = merged.get(key)
+                if current is None:
+                    merged[key] = copy.deepcopy(value)
+                elif isinstance(current, list) and isinstance(value, list):
+                    current.extend(value)
+                elif isinstance(current, dict) and isinstance(value, dict):
+                    for field_name, field_value in value.items():
+                        existing = current.get(field_name)
+                        if isinstance(existing, list) and isinstance(field_value, list):
+                            current[field_name] = existing + [v for v in field_value if v not in existing]
+                        elif not existing:
+                            current[field_name] = field_value
+                elif isinstance(current, str) and isinstance(value, str) and value not in current:
+                    merged[key] = f"{current}\n\n{value}"
+        return merged
+    
     def _build_extraction_prompt(
         self, 
         cv_text: str, 
@@ -520,20 +769,7 @@ Focus on extracting:
         sections = []
         text_lower = cv_text.lower()
         
-        section_patterns = {
-            'personal_info': ['contact', 'personal', 'profile'],
-            'summary': ['summary', 'objective', 'profile', 'about'],
-            'experience': ['experience', 'employment', 'work', 'career'],
-            'education': ['education', 'academic', 'qualification'],
-            'skills': ['skills', 'competencies', 'expertise', 'technologies'],
-            'certifications': ['certification', 'license', 'credential'],
-            'projects': ['projects', 'portfolio'],
-            'awards': ['awards', 'honors', 'recognition'],
-            'languages': ['languages', 'linguistic'],
-            'interests': ['interests', 'hobbies', 'activities']
-        }
-        
-        for section, patterns in section_patterns.items():
+        for section, patterns in SECTION_PATTERNS.items():
             if any(pattern in text_lower for pattern in patterns):
                 sections.append(section)
         
@@ -0,0 +1,97 @@
+"""
+Persistent storage of CV analysis results for Koroh platform.
+
+A CVAnalysisResult is stored once per CV content hash as compressed JSON,
+with empty fields dropped and a format version recorded alongside. CV
+analysis writes it; portfolio generation and chat load it on demand, so
+downstream features reuse the analysis instead of calling Bedrock again.
+"""
+
+import json
+import logging
+import zlib
+from typing import Any, Optional
+
+from .cv_analysis_service import CVAnalysisResult
+
+logger = logging.getLogger(__name__)
+
+# Bump when the serialized layout changes; older payloads are then ignored
+FORMAT_VERSION = 1
+
+
+def _compact(value: Any) -> Any:
+    """Recursively drop None, empty strings and empty containers from dicts."""
+    if isinstance(value, dict):
+        compacted = {key: _compact(item) for key, item in value.items()}
+        return {key: item for key, item in compacted.items() if item not in (None, '', [], {})}
+    if isinstance(value, list):
+        return [_compact(item) for item in value]
+    return value
+
+
+def serialize_analysis(result: CVAnalysisResult) -> bytes:
+    """Serialize a result to the compact stored form (see deserialize_analysis)."""
+    data = json.dumps(_compact(result.to_dict()), separators=(',', ':'), ensure_ascii=False)
+    return zlib.compress(data.encode('utf-8'), 6)
+
+
+def deserialize_analysis(payload: bytes) -> CVAnalysisResult:
+    """Rebuild a result from serialize_analysis output."""
+    return CVAnalysisResult.from_dict(json.loads(zlib.decompress(bytes(payload)).decode('utf-8')))
+
+
+def save_cv_analysis(cv_hash: str, result: CVAnalysisResult) -> None:
+    """
+    Store the analysis for a CV, replacing any previous one.
+
+    Args:
+        cv_hash: SHA-256 of the CV file content
+        result: Analysis to store
+    """
+    from koroh_platform.models import StoredCVAnalysis
+
+    StoredCVAnalysis.objects.update_or_create(
+        cv_hash=cv_hash,
+        defaults={'format_version': FORMAT_VERSION, 'payload': serialize_analysis(result)}
+    )
+
+
+def load_cv_analysis(cv_hash: Optional[str]) -> Optional[CVAnalysisResult]:
+    """
+    Load the stored analysis for a CV.
+
+    Args:
+        cv_hash: SHA-256 of the CV file content
+
+    Returns:
+        The stored CVAnalysisResult, or None if there is none in the
+        current format
+    """
+    from koroh_platform.models import StoredCVAnalysis
+
+    if not cv_hash:
+        return None
+
+    record = StoredCVAnalysis.objects.filter(
+        cv_hash=cv_hash, format_version=FORMAT_VERSION
+    ).only('payload').first()
+    if record is None:
+        return None
+
+    try:
+        return deserialize_analysis(record.payload)
+    except (zlib.error, ValueError, TypeError) as e:
+        logger.warning(f"Discarding unreadable stored CV analysis {cv_hash}: {e}")
+        return None
+
+
+def get_profile_cv_hash(profile) -> Optional[str]:
+    """Content hash of a profile's current CV, if known."""
+    analysis_info = (profile.preferences or {}).get('cv_analysis') or {}
+    return analysis_info.get('cv_hash') or (profile.cv_metadata or {}).get('file_hash')
+
+
+def load_profile_cv_analysis(profile) -> Optional[CVAnalysisResult]:
+    """Load the stored analysis of a profile's current CV."""
+    return load_cv_analysis(get_profile_cv_hash(profile))
@@ -0,0 +1,196 @@
+"""
+Content-addressed response cache for AWS Bedrock model invocations.
+
+Responses are keyed by a stable SHA-256 hash of the model id, the
+whitespace-normalized prompt and the sampling parameters, so identical
+prompts issued from any process share one cached completion. Lookups go
+through a size-bounded in-process LRU tier before the shared Django cache
+(Redis in production).
+
+Only templates with a positive TTL in settings.AI_RESPONSE_CACHE_TTLS are
+cached, which is limited to deterministic extraction and tagging prompts.
+"""
+
+import copy
+import hashlib
+import json
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+from .metrics import track_ai_cache_lookup
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace so indentation-only prompt changes share a key."""
+    return _WHITESPACE_RE.sub(' ', prompt).strip()
+
+
+class LocalLRUCache:
+    """
+    Thread-safe, size-bounded LRU cache with per-entry expiry.
+
+    Values are copied on the way in and out, so callers that mutate a
+    response can't change what other requests in the process read.
+    """
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        return copy.deepcopy(value)
+
+    def set(self, key: str, value: Any, timeout: int) -> None:
+        if self.max_entries <= 0:
+            return
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + timeout)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache for raw Bedrock response bodies.
+
+    Configured through settings:
+    - AI_RESPONSE_CACHE_ENABLED: master switch
+    - AI_RESPONSE_CACHE_ALIAS: Django cache alias for the shared tier
+    - AI_RESPONSE_CACHE_LOCAL_MAX_ENTRIES: size of the in-process LRU tier
+    - AI_RESPONSE_CACHE_TTLS: per-template timeouts in seconds; templates
+      without an entry use 'default', and a timeout of 0 disables caching
+    """
+
+    KEY_PREFIX = 'llm_response'
+
+    def __init__(self):
+        self.enabled = getattr(settings, 'AI_RESPONSE_CACHE_ENABLED', True)
+        self.cache_alias = getattr(settings, 'AI_RESPONSE_CACHE_ALIAS', 'default')
+        self.ttls = dict(getattr(settings, 'AI_RESPONSE_CACHE_TTLS', {}))
+        self.local = LocalLRUCache(
+            int(getattr(settings, 'AI_RESPONSE_CACHE_LOCAL_MAX_ENTRIES', 512))
+        )
+
+    @property
+    def shared(self):
+        return caches[self.cache_alias]
+
+    def make_key(
+        self,
+        model_id: str,
+        prompt: str,
+        max_tokens: int,
+        temperature: float,
+        top_p: float,
+        stop_sequences: Optional[list] = None
+    ) -> str:
+        """Build a stable, process-independent cache key for an invocation."""
+        payload = json.dumps({
+            'model_id': model_id,
+            'prompt': normalize_prompt(prompt),
+            'max_tokens': int(max_tokens),
+            'temperature': round(float(temperature), 4),
+            'top_p': round(float(top_p), 4),
+            'stop_sequences': list(stop_sequences or []),
+        }, sort_keys=True)
+        digest = hashlib.sha256(payload.encode('utf-8')).hexdigest()
+        return f"{self.KEY_PREFIX}:{digest}"
+
+    def get_ttl(self, template: str) -> int:
+        return int(self.ttls.get(template, self.ttls.get('default', 0)))
+
+    def get(self, key: str, template: str = 'default') -> Optional[Dict[str, Any]]:
+        """Look up a response, promoting shared-tier hits into the local tier."""
+        if not self.enabled or self.get_ttl(template) <= 0:
+            return None
+
+        value = self.local.get(key)
+        track_ai_cache_lookup(template, 'local', value is not None)
+        if value is not None:
+            return value
+
+        try:
+            value = self.shared.get(key)
+        except Exception as e:
+            logger.error(f"LLM response cache read failed: {e}")
+            value = None
+        track_ai_cache_lookup(template, 'shared', value is not None)
+
+        if value is not None:
+            self.local.set(key, value, self.get_ttl(template))
+        return value
+
+    def set(self, key: str, value: Dict[str, Any], template: str = 'default') -> None:
+        """Store a response in both tiers using the template's TTL."""
+        timeout = self.get_ttl(template)
+        if not self.enabled or timeout <= 0:
+            return
+
+        self.local.set(key, value, timeout)
+        try:
+            self.shared.set(key, value, timeout)
+        except Exception as e:
+            logger.error(f"LLM response cache write failed: {e}")
+
+    async def aget(self, key: str, template: str = 'default') -> Optional[Dict[str, Any]]:
+        """Async variant of get() for use from the event loop."""
+        if not self.enabled or self.get_ttl(template) <= 0:
+            return None
+
+        value = self.local.get(key)
+        track_ai_cache_lookup(template, 'local', value is not None)
+        if value is not None:
+            return value
+
+        try:
+            value = await self.shared.aget(key)
+        except Exception as e:
+            logger.error(f"LLM response cache read failed: {e}")
+            value = None
+        track_ai_cache_lookup(template, 'shared', value is not None)
+
+        if value is not None:
+            self.local.set(key, value, self.get_ttl(template))
+        return value
+
+    async def aset(self, key: str, value: Dict[str, Any], template: str = 'default') -> None:
+        """Async variant of set() for use from the event loop."""
+        timeout = self.get_ttl(template)
+        if not self.enabled or timeout <= 0:
+            return
+
+        self.local.set(key, value, timeout)
+        try:
+            await self.shared.aset(key, value, timeout)
+        except Exception as e:
+            logger.error(f"LLM response cache write failed: {e}")
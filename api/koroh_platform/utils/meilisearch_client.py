@@ -113,6 +113,29 @@ class MeiliSearchClient:
             logger.error(f"Failed to add documents to index {index_name}: {e}")
             return False
     
+    def delete_documents(self, index_name: str, document_ids: List[str]) -> bool:
+        """
+        Delete documents from an index in one batch.
+        
+        Args:
+            index_name: Name of the index
+            document_ids: IDs of the documents to delete
+            
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.client or not document_ids:
+            return False
+        
+        try:
+            index = self.client.index(index_name)
+            index.delete_documents(document_ids)
+            logger.info(f"Deleted {len(document_ids)} documents from index {index_name}")
+            return True
+        except Exception as e:
+            logger.error(f"Failed to delete documents from index {index_name}: {e}")
+            return False
+    
     def search(
         self,
         index_name: str,
@@ -30,6 +30,12 @@ ai_tokens_used = Counter(
     ['service_type', 'model', 'token_type']
 )
 
+ai_response_cache_lookups = Counter(
+    'koroh_ai_response_cache_lookups_total',
+    'AI response cache lookups by template, tier and result',
+    ['template', 'tier', 'result']
+)
+
 # User Activity Metrics
 user_registrations_total = Counter(
     'koroh_user_registrations_total',
@@ -247,6 +253,15 @@ def track_celery_task(task_name):
     return decorator
 
 
+def track_ai_cache_lookup(template, tier, hit):
+    """Track an AI response cache lookup as a hit or miss."""
+    ai_response_cache_lookups.labels(
+        template=template,
+        tier=tier,
+        result='hit' if hit else 'miss'
+    ).inc()
+
+
 def update_active_users_count(count):
     """Update the active users gauge."""
     active_users_gauge.set(count)
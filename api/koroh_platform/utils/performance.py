@@ -4,6 +4,7 @@ Performance optimization utilities for the Koroh platform.
 Requirements: 4.3, 4.4
 """
 
+import hashlib
 import time
 import logging
 from functools import wraps
@@ -292,7 +293,8 @@ def optimize_ai_service_calls():
         @wraps(func)
         def wrapper(*args, **kwargs):
             # Extract cache key from arguments
-            cache_key = f"ai_service:{func.__name__}:{hash(str(args) + str(kwargs))}"
+            args_digest = hashlib.sha256((str(args) + str(kwargs)).encode('utf-8')).hexdigest()
+            cache_key = f"ai_service:{func.__name__}:{args_digest}"
             
             # Try cache first
             try:
@@ -9,13 +9,15 @@ customization features, and professional content generation.
 import json
 import logging
 import re
-from typing import Dict, Any, Optional, List, Union
-from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Callable, Dict, Any, Optional, List, Union
+from dataclasses import dataclass, field, replace
 from enum import Enum
 from datetime import datetime
 
 from .ai_services import ContentGenerationService, AIServiceConfig, ModelType
 from .cv_analysis_service import CVAnalysisResult
+from .cv_analysis_store import load_cv_analysis
 from .bedrock_config import get_model_for_task
 from .metrics import track_ai_request, track_user_activity
 
@@ -55,6 +57,33 @@ class ContentSection(Enum):
     BLOG = "blog"
 
 
+class GenerationMode(Enum):
+    """How portfolio sections are generated."""
+    SEQUENTIAL = "sequential"  # One section after another
+    CONCURRENT = "concurrent"  # Independent sections in a bounded thread pool
+    COMBINED = "combined"      # All AI sections from a single JSON prompt
+
+
+# PortfolioContent attribute holding each generated section
+SECTION_ATTRIBUTES = {
+    ContentSection.HERO: "hero_section",
+    ContentSection.ABOUT: "about_section",
+    ContentSection.EXPERIENCE: "experience_section",
+    ContentSection.SKILLS: "skills_section",
+    ContentSection.EDUCATION: "education_section",
+    ContentSection.PROJECTS: "projects_section",
+    ContentSection.CERTIFICATIONS: "certifications_section",
+    ContentSection.CONTACT: "contact_section",
+}
+
+# Keys of the JSON objects the model returns for each object-valued section
+SECTION_KEYS = {
+    ContentSection.HERO: ("headline", "subheadline", "value_proposition", "call_to_action"),
+    ContentSection.ABOUT: ("main_content", "key_highlights", "personal_touch"),
+    ContentSection.SKILLS: ("skill_categories", "top_skills", "skills_summary"),
+}
+
+
 @dataclass
 class PortfolioTheme:
     """Portfolio visual theme configuration."""
@@ -122,6 +151,11 @@ class PortfolioGenerationOptions:
     include_call_to_action: bool = True
     add_social_proof: bool = True
     generate_meta_tags: bool = True
+    
+    # Generation strategy
+    generation_mode: GenerationMode = GenerationMode.CONCURRENT
+    max_workers: int = 8  # Concurrent Bedrock calls; 8 lets every section start at once
+    generation_timeout: float = 90.0  # Seconds to wait for the concurrent sections, all together
 
 
 class PortfolioGenerationService:
@@ -140,7 +174,8 @@ class PortfolioGenerationService:
                 model_type=ModelType.CLAUDE_3_SONNET,
                 max_tokens=4000,  # Larger token limit for comprehensive content
                 temperature=0.7,  # Balanced creativity and consistency
-                max_retries=2
+                max_retries=2,
+                cache_template='portfolio'
             )
         
         self.content_service = ContentGenerationService(config)
@@ -159,6 +194,12 @@ class PortfolioGenerationService:
         """
         Generate complete portfolio content from CV data.
         
+        By default independent sections are generated concurrently, so
+        latency tracks the slowest section; a section that fails or times
+        out is left empty and the rest of the portfolio is still returned.
+        See options.generation_mode for the sequential and single-prompt
+        alternatives.
+        
         Args:
             cv_data: Analyzed CV data from CVAnalysisService
             options: Portfolio generation options
@@ -180,9 +221,8 @@ class PortfolioGenerationService:
                 style_used=options.style.value
             )
             
-            # Generate each requested section
-            for section in options.include_sections:
-                self._generate_section(section, cv_data, options, portfolio)
+            # Generate the requested sections using the configured strategy
+            self._generate_sections(options.include_sections, cv_data, options, portfolio)
             
             # Calculate content quality score
             portfolio.content_quality_score = self._calculate_quality_score(portfolio)
@@ -194,6 +234,48 @@ class PortfolioGenerationService:
             self.logger.error(f"Portfolio generation failed: {e}")
             raise
     
+    def generate_portfolio_for_cv(
+        self,
+        cv_hash: str,
+        options: Optional[PortfolioGenerationOptions] = None
+    ) -> PortfolioContent:
+        """
+        Generate portfolio content from the stored analysis of a CV.
+        
+        The analysis is loaded from the CV analysis store only when this is
+        called; the CV itself is not re-analyzed.
+        
+        Args:
+            cv_hash: SHA-256 of the analyzed CV file
+            options: Portfolio generation options
+            
+        Returns:
+            PortfolioContent with generated sections
+            
+        Raises:
+            ValueError: If no stored analysis exists for the CV
+        """
+        cv_data = load_cv_analysis(cv_hash)
+        if cv_data is None:
+            raise ValueError("No stored CV analysis found. Please analyze CV first.")
+        return self.generate_portfolio(cv_data, options)
+    
+    def _generate_sections(
+        self,
+        sections: List[ContentSection],
+        cv_data: CVAnalysisResult,
+        options: PortfolioGenerationOptions,
+        portfolio: PortfolioContent
+    ):
+        """Generate the given sections using options.generation_mode."""
+        if options.generation_mode == GenerationMode.COMBINED:
+            self._generate_sections_combined(sections, cv_data, options, portfolio)
+        elif options.generation_mode == GenerationMode.CONCURRENT:
+            self._generate_sections_concurrently(sections, cv_data, options, portfolio)
+        else:
+            for section in sections:
+                self._generate_section(section, cv_data, options, portfolio)
+    
     def _generate_section(
         self, 
         section: ContentSection, 
@@ -204,51 +286,193 @@ class PortfolioGenerationService:
         """Generate content for a specific portfolio section."""
         
         try:
-            if section == ContentSection.HERO:
-                portfolio.hero_section = self._generate_hero_section(cv_data, options)
-            elif section == ContentSection.ABOUT:
-                portfolio.about_section = self._generate_about_section(cv_data, options)
-            elif section == ContentSection.EXPERIENCE:
-                portfolio.experience_section = self._generate_experience_section(cv_data, options)
-            elif section == ContentSection.SKILLS:
-                portfolio.skills_section = self._generate_skills_section(cv_data, options)
-            elif section == ContentSection.EDUCATION:
-                portfolio.education_section = self._generate_education_section(cv_data, options)
-            elif section == ContentSection.PROJECTS:
-                portfolio.projects_section = self._generate_projects_section(cv_data, options)
-            elif section == ContentSection.CERTIFICATIONS:
-                portfolio.certifications_section = self._generate_certifications_section(cv_data, options)
-            elif section == ContentSection.CONTACT:
-                portfolio.contact_section = self._generate_contact_section(cv_data, options)
+            content = self._build_section(section, cv_data, options)
+            if content is not None:
+                setattr(portfolio, SECTION_ATTRIBUTES[section], content)
             
             self.logger.debug(f"Generated {section.value} section successfully")
             
         except Exception as e:
             self.logger.warning(f"Failed to generate {section.value} section: {e}")
     
-    def _generate_hero_section(self, cv_data: CVAnalysisResult, options: PortfolioGenerationOptions) -> Dict[str, str]:
-        """Generate hero section content."""
+    def _build_section(
+        self,
+        section: ContentSection,
+        cv_data: CVAnalysisResult,
+        options: PortfolioGenerationOptions
+    ) -> Optional[Union[Dict[str, Any], List[Dict[str, Any]]]]:
+        """Return the content for one section, or None if it has no generator."""
+        builders = {
+            ContentSection.HERO: self._generate_hero_section,
+            ContentSection.ABOUT: self._generate_about_section,
+            ContentSection.EXPERIENCE: self._generate_experience_section,
+            ContentSection.SKILLS: self._generate_skills_section,
+            ContentSection.EDUCATION: self._generate_education_section,
+            ContentSection.PROJECTS: self._generate_projects_section,
+            ContentSection.CERTIFICATIONS: self._generate_certifications_section,
+            ContentSection.CONTACT: self._generate_contact_section,
+        }
+        builder = builders.get(section)
+        return builder(cv_data, options) if builder else None
+    
+    def _generate_sections_concurrently(
+        self,
+        sections: List[ContentSection],
+        cv_data: CVAnalysisResult,
+        options: PortfolioGenerationOptions,
+        portfolio: PortfolioContent
+    ):
+        """
+        Generate independent sections in a bounded thread pool.
         
-        # Prepare data for hero generation
-        hero_data = {
-            "name": cv_data.personal_info.name,
-            "current_role": self._extract_current_role(cv_data),
-            "location": cv_data.personal_info.location,
-            "top_skills": cv_data.technical_skills[:5] if cv_data.technical_skills else cv_data.skills[:5],
-            "years_experience": self._estimate_experience_years(cv_data),
-            "key_achievements": self._extract_key_achievements(cv_data),
-            "professional_summary": cv_data.professional_summary
+        Sections that fail, or are still running once options.generation_timeout
+        has passed since the batch was submitted, are logged and left empty,
+        so the rest of the portfolio is returned.
+        """
+        sections = [section for section in sections if section in SECTION_ATTRIBUTES]
+        if not sections:
+            return
+        
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(options.max_workers, len(sections))),
+            thread_name_prefix="portfolio-section"
+        )
+        futures = {
+            executor.submit(self._build_section, section, cv_data, options): section
+            for section in sections
         }
+        _, pending = wait(futures, timeout=options.generation_timeout)
+        # Don't block on stragglers; their results are discarded.
+        executor.shutdown(wait=False, cancel_futures=True)
+        
+        for future, section in futures.items():
+            if future in pending:
+                self.logger.warning(
+                    f"Timed out generating {section.value} section after {options.generation_timeout}s"
+                )
+                continue
+            try:
+                content = future.result()
+                if content is not None:
+                    setattr(portfolio, SECTION_ATTRIBUTES[section], content)
+                self.logger.debug(f"Generated {section.value} section successfully")
+            except Exception as e:
+                self.logger.warning(f"Failed to generate {section.value} section: {e}")
+    
+    def _generate_sections_combined(
+        self,
+        sections: List[ContentSection],
+        cv_data: CVAnalysisResult,
+        options: PortfolioGenerationOptions,
+        portfolio: PortfolioContent
+    ):
+        """
+        Generate all AI-written sections from one JSON prompt.
         
-        prompt = self._build_hero_prompt(hero_data, options)
+        Sections that need no model call are built locally. Any AI section
+        missing or malformed in the combined response is regenerated on its
+        own, concurrently.
+        """
+        prompt = self._build_combined_prompt(sections, cv_data, options)
+        document = {}
+        if prompt:
+            try:
+                response = self.content_service._invoke_model_with_retry(prompt)
+                document = self._parse_combined_content(
+                    self.content_service._extract_response_text(response)
+                )
+            except Exception as e:
+                self.logger.warning(f"Combined portfolio generation failed, generating sections individually: {e}")
+        
+        missing = []
+        for section in sections:
+            if section not in SECTION_ATTRIBUTES:
+                continue
+            if not self._apply_combined_section(section, document, cv_data, options, portfolio):
+                missing.append(section)
+        
+        if missing:
+            self.logger.info(f"Regenerating sections missing from combined response: {[s.value for s in missing]}")
+            self._generate_sections_concurrently(missing, cv_data, options, portfolio)
+    
+    def _apply_combined_section(
+        self,
+        section: ContentSection,
+        document: Dict[str, Any],
+        cv_data: CVAnalysisResult,
+        options: PortfolioGenerationOptions,
+        portfolio: PortfolioContent
+    ) -> bool:
+        """Fill one section from the combined response; False if it must be regenerated."""
+        if section in SECTION_KEYS:
+            content = self._section_object(section, document.get(section.value))
+            if content is None:
+                return False
+            setattr(portfolio, SECTION_ATTRIBUTES[section], content)
+            return True
+        
+        if section == ContentSection.EXPERIENCE:
+            if not cv_data.work_experience:
+                portfolio.experience_section = []
+                return True
+            entries = document.get("experience")
+            if not isinstance(entries, list) or len(entries) != len(cv_data.work_experience):
+                return False
+            portfolio.experience_section = [
+                {**self._experience_data(exp), **(entry if isinstance(entry, dict) else {})}
+                for exp, entry in zip(cv_data.work_experience, entries)
+            ]
+            return True
+        
+        if section == ContentSection.PROJECTS:
+            projects = self._project_data(cv_data)
+            descriptions = document.get("projects") or {}
+            if any(project["description"] for project in projects) and not isinstance(descriptions, dict):
+                return False
+            for project in projects:
+                if project["description"]:
+                    enhanced = descriptions.get(project["name"])
+                    if not enhanced:
+                        return False
+                    project["enhanced_description"] = enhanced
+            portfolio.projects_section = projects
+            return True
+        
+        if section == ContentSection.CONTACT:
+            call_to_action = document.get("call_to_action")
+            if options.include_call_to_action and not call_to_action:
+                return False
+            portfolio.contact_section = self._generate_contact_section(
+                cv_data, replace(options, include_call_to_action=False)
+            )
+            if options.include_call_to_action:
+                portfolio.contact_section["call_to_action"] = call_to_action
+            return True
         
-        input_data = {
-            "data": hero_data,
-            "template_type": "hero_section",
-            "style": options.style.value
-        }
+        # Education and certifications are formatted locally
+        self._generate_section(section, cv_data, options, portfolio)
+        return True
+    
+    def _map_entries(
+        self,
+        func: Callable[[Any], Any],
+        items: List[Any],
+        options: PortfolioGenerationOptions
+    ) -> List[Any]:
+        """Apply func to each item, concurrently in CONCURRENT mode, keeping order."""
+        if options.generation_mode != GenerationMode.CONCURRENT or len(items) < 2:
+            return [func(item) for item in items]
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(options.max_workers, len(items))),
+            thread_name_prefix="portfolio-entry"
+        ) as executor:
+            return list(executor.map(func, items))
+    
+    def _generate_hero_section(self, cv_data: CVAnalysisResult, options: PortfolioGenerationOptions) -> Dict[str, str]:
+        """Generate hero section content."""
+        
+        prompt = self._build_hero_prompt(self._hero_data(cv_data), options)
         
-        # Override with custom prompt
         response = self.content_service._invoke_model_with_retry(prompt)
         content = self.content_service._extract_response_text(response)
         
@@ -257,16 +481,7 @@ class PortfolioGenerationService:
     def _generate_about_section(self, cv_data: CVAnalysisResult, options: PortfolioGenerationOptions) -> Dict[str, str]:
         """Generate about section content."""
         
-        about_data = {
-            "professional_summary": cv_data.professional_summary,
-            "experience_highlights": self._extract_experience_highlights(cv_data),
-            "core_competencies": cv_data.technical_skills + cv_data.soft_skills,
-            "career_progression": self._analyze_career_progression(cv_data),
-            "unique_value_proposition": self._generate_value_proposition(cv_data),
-            "personal_interests": cv_data.interests
-        }
-        
-        prompt = self._build_about_prompt(about_data, options)
+        prompt = self._build_about_prompt(self._about_data(cv_data), options)
         
         response = self.content_service._invoke_model_with_retry(prompt)
         content = self.content_service._extract_response_text(response)
@@ -279,41 +494,22 @@ class PortfolioGenerationService:
         if not cv_data.work_experience:
             return []
         
-        experience_entries = []
-        
-        for exp in cv_data.work_experience:
-            exp_data = {
-                "company": exp.company,
-                "position": exp.position,
-                "duration": f"{exp.start_date} - {exp.end_date}",
-                "description": exp.description,
-                "achievements": exp.achievements,
-                "technologies": exp.technologies,
-                "impact_metrics": self._extract_impact_metrics(exp.description, exp.achievements)
-            }
-            
+        def enhance_entry(exp) -> Dict[str, Any]:
+            exp_data = self._experience_data(exp)
             prompt = self._build_experience_prompt(exp_data, options)
             
             response = self.content_service._invoke_model_with_retry(prompt)
             content = self.content_service._extract_response_text(response)
             
-            parsed_exp = self._parse_experience_content(content, exp_data)
-            experience_entries.append(parsed_exp)
+            return self._parse_experience_content(content, exp_data)
         
-        return experience_entries
+        # Entries are independent, so they can be enhanced concurrently
+        return self._map_entries(enhance_entry, cv_data.work_experience, options)
     
     def _generate_skills_section(self, cv_data: CVAnalysisResult, options: PortfolioGenerationOptions) -> Dict[str, Any]:
         """Generate skills section content."""
         
-        skills_data = {
-            "technical_skills": cv_data.technical_skills,
-            "soft_skills": cv_data.soft_skills,
-            "all_skills": cv_data.skills,
-            "experience_context": cv_data.work_experience,
-            "skill_categories": self._categorize_skills(cv_data)
-        }
-        
-        prompt = self._build_skills_prompt(skills_data, options)
+        prompt = self._build_skills_prompt(self._skills_data(cv_data), options)
         
         response = self.content_service._invoke_model_with_retry(prompt)
         content = self.content_service._extract_response_text(response)
@@ -361,47 +557,17 @@ class PortfolioGenerationService:
     def _generate_projects_section(self, cv_data: CVAnalysisResult, options: PortfolioGenerationOptions) -> List[Dict[str, Any]]:
         """Generate projects section content."""
         
-        if not cv_data.projects:
-            return []
-        
-        projects_entries = []
-        
-        for project in cv_data.projects:
-            if isinstance(project, dict):
-                project_data = {
-                    "name": project.get("name", ""),
-                    "description": project.get("description", ""),
-                    "technologies": project.get("technologies", []),
-                    "url": project.get("url", ""),
-                    "date": project.get("date", "")
-                }
+        def enhance_entry(project_data: Dict[str, Any]) -> Dict[str, Any]:
+            # Enhance project description
+            if project_data["description"]:
+                prompt = self._build_project_prompt(project_data)
                 
-                # Enhance project description
-                if project_data["description"]:
-                    prompt = f"""
-                    Enhance this project description for a professional portfolio:
-                    
-                    Project: {project_data['name']}
-                    Description: {project_data['description']}
-                    Technologies: {', '.join(project_data['technologies']) if project_data['technologies'] else 'Not specified'}
-                    
-                    Create a compelling, professional description that highlights:
-                    - Technical achievements
-                    - Problem-solving approach
-                    - Impact or results
-                    - Technologies used effectively
-                    
-                    Keep it concise but impactful (2-3 sentences).
-                    """
-                    
-                    response = self.content_service._invoke_model_with_retry(prompt)
-                    enhanced_description = self.content_service._extract_response_text(response)
-                    
-                    project_data["enhanced_description"] = enhanced_description
-                
-                projects_entries.append(project_data)
+                response = self.content_service._invoke_model_with_retry(prompt)
+                project_data["enhanced_description"] = self.content_service._extract_response_text(response)
+            
+            return project_data
         
-        return projects_entries
+        return self._map_entries(enhance_entry, self._project_data(cv_data), options)
     
     def _generate_certifications_section(self, cv_data: CVAnalysisResult, options: PortfolioGenerationOptions) -> List[Dict[str, Any]]:
         """Generate certifications section content."""
@@ -438,17 +604,7 @@ class PortfolioGenerationService:
         
         # Generate call-to-action message
         if options.include_call_to_action:
-            cta_prompt = f"""
-            Create a professional call-to-action message for a portfolio contact section.
-            
-            Context:
-            - Name: {cv_data.personal_info.name}
-            - Role: {self._extract_current_role(cv_data)}
-            - Target audience: {options.target_audience}
-            
-            Generate a compelling, professional message that encourages contact.
-            Keep it warm but professional, 1-2 sentences.
-            """
+            cta_prompt = self._build_call_to_action_prompt(cv_data, options)
             
             response = self.content_service._invoke_model_with_retry(cta_prompt)
             cta_message = self.content_service._extract_response_text(response)
@@ -458,6 +614,65 @@ class PortfolioGenerationService:
     
     # Helper methods for content generation
     
+    def _hero_data(self, cv_data: CVAnalysisResult) -> Dict[str, Any]:
+        """Prepare data for hero generation."""
+        return {
+            "name": cv_data.personal_info.name,
+            "current_role": self._extract_current_role(cv_data),
+            "location": cv_data.personal_info.location,
+            "top_skills": cv_data.technical_skills[:5] if cv_data.technical_skills else cv_data.skills[:5],
+            "years_experience": self._estimate_experience_years(cv_data),
+            "key_achievements": self._extract_key_achievements(cv_data),
+            "professional_summary": cv_data.professional_summary
+        }
+    
+    def _about_data(self, cv_data: CVAnalysisResult) -> Dict[str, Any]:
+        """Prepare data for about generation."""
+        return {
+            "professional_summary": cv_data.professional_summary,
+            "experience_highlights": self._extract_experience_highlights(cv_data),
+            "core_competencies": cv_data.technical_skills + cv_data.soft_skills,
+            "career_progression": self._analyze_career_progression(cv_data),
+            "unique_value_proposition": self._generate_value_proposition(cv_data),
+            "personal_interests": cv_data.interests
+        }
+    
+    def _experience_data(self, exp) -> Dict[str, Any]:
+        """Prepare data for one experience entry."""
+        return {
+            "company": exp.company,
+            "position": exp.position,
+            "duration": f"{exp.start_date} - {exp.end_date}",
+            "description": exp.description,
+            "achievements": exp.achievements,
+            "technologies": exp.technologies,
+            "impact_metrics": self._extract_impact_metrics(exp.description, exp.achievements)
+        }
+    
+    def _skills_data(self, cv_data: CVAnalysisResult) -> Dict[str, Any]:
+        """Prepare data for skills generation."""
+        return {
+            "technical_skills": cv_data.technical_skills,
+            "soft_skills": cv_data.soft_skills,
+            "all_skills": cv_data.skills,
+            "experience_context": cv_data.work_experience,
+            "skill_categories": self._categorize_skills(cv_data)
+        }
+    
+    def _project_data(self, cv_data: CVAnalysisResult) -> List[Dict[str, Any]]:
+        """Prepare data for project entries."""
+        return [
+            {
+                "name": project.get("name", ""),
+                "description": project.get("description", ""),
+                "technologies": project.get("technologies", []),
+                "url": project.get("url", ""),
+                "date": project.get("date", "")
+            }
+            for project in (cv_data.projects or [])
+            if isinstance(project, dict)
+        ]
+    
     def _build_hero_prompt(self, data: Dict[str, Any], options: PortfolioGenerationOptions) -> str:
         """Build prompt for hero section generation."""
         return f"""
@@ -586,6 +801,100 @@ class PortfolioGenerationService:
         }}
         """
     
+    def _build_project_prompt(self, data: Dict[str, Any]) -> str:
+        """Build prompt for project description enhancement."""
+        return f"""
+        Enhance this project description for a professional portfolio:
+        
+        Project: {data['name']}
+        Description: {data['description']}
+        Technologies: {', '.join(data['technologies']) if data['technologies'] else 'Not specified'}
+        
+        Create a compelling, professional description that highlights:
+        - Technical achievements
+        - Problem-solving approach
+        - Impact or results
+        - Technologies used effectively
+        
+        Keep it concise but impactful (2-3 sentences).
+        """
+    
+    def _build_call_to_action_prompt(self, cv_data: CVAnalysisResult, options: PortfolioGenerationOptions) -> str:
+        """Build prompt for the contact section call to action."""
+        return f"""
+        Create a professional call-to-action message for a portfolio contact section.
+        
+        Context:
+        - Name: {cv_data.personal_info.name}
+        - Role: {self._extract_current_role(cv_data)}
+        - Target audience: {options.target_audience}
+        
+        Generate a compelling, professional message that encourages contact.
+        Keep it warm but professional, 1-2 sentences.
+        """
+    
+    def _build_combined_prompt(
+        self,
+        sections: List[ContentSection],
+        cv_data: CVAnalysisResult,
+        options: PortfolioGenerationOptions
+    ) -> Optional[str]:
+        """
+        Build one prompt covering every AI-written section requested.
+        
+        Each section keeps its usual instructions; the response is a single
+        JSON object keyed by section. Returns None if no section needs the model.
+        """
+        tasks = []
+        if ContentSection.HERO in sections:
+            tasks.append(('"hero": the hero section object', self._build_hero_prompt(self._hero_data(cv_data), options)))
+        if ContentSection.ABOUT in sections:
+            tasks.append(('"about": the about section object', self._build_about_prompt(self._about_data(cv_data), options)))
+        if ContentSection.SKILLS in sections:
+            tasks.append(('"skills": the skills section object', self._build_skills_prompt(self._skills_data(cv_data), options)))
+        if ContentSection.EXPERIENCE in sections:
+            for position, exp in enumerate(cv_data.work_experience):
+                tasks.append((
+                    f'"experience"[{position}]: the enhanced entry object',
+                    self._build_experience_prompt(self._experience_data(exp), options)
+                ))
+        if ContentSection.PROJECTS in sections:
+            for project in self._project_data(cv_data):
+                if project["description"]:
+                    tasks.append((
+                        f'"projects"["{project["name"]}"]: the enhanced description string',
+                        self._build_project_prompt(project)
+                    ))
+        if ContentSection.CONTACT in sections and options.include_call_to_action:
+            tasks.append(('"call_to_action": the message string', self._build_call_to_action_prompt(cv_data, options)))
+        
+        if not tasks:
+            return None
+        
+        instructions = "\n".join(
+            f"Task {number} -> {target}:\n{prompt.strip()}"
+            for number, (target, prompt) in enumerate(tasks, 1)
+        )
+        return f"""
+        Generate several sections of a professional portfolio website at once.
+        Complete every task below and return ONE JSON object, with no other text,
+        using these keys: "hero", "about", "skills" (objects), "experience" (array
+        in the order given), "projects" (object mapping project name to description)
+        and "call_to_action" (string). Only include keys that have tasks.
+        
+        {instructions}
+        """
+    
+    def _parse_combined_content(self, content: str) -> Dict[str, Any]:
+        """Parse the JSON document returned for a combined prompt."""
+        start, end = content.find('{'), content.rfind('}')
+        if start == -1 or end <= start:
+            raise ValueError("Combined response contained no JSON object")
+        document = json.loads(content[start:end + 1])
+        if not isinstance(document, dict):
+            raise ValueError("Combined response was not a JSON object")
+        return document
+    
     # Utility methods
     
     def _extract_current_role(self, cv_data: CVAnalysisResult) -> str:
@@ -684,12 +993,28 @@ class PortfolioGenerationService:
         
         return {k: v for k, v in categories.items() if v}  # Remove empty categories
     
-    def _parse_hero_content(self, content: str) -> Dict[str, str]:
-        """Parse hero section content from AI response."""
+    def _section_object(self, section: ContentSection, data: Any) -> Optional[Dict[str, Any]]:
+        """
+        Validate a decoded hero, about or skills object.
+        
+        Returns the section's known keys, or None if data is not an object
+        carrying any of them. Used for both per-section and combined responses.
+        """
+        if not isinstance(data, dict):
+            return None
+        content = {key: data[key] for key in SECTION_KEYS[section] if key in data}
+        return content or None
+    
+    def _load_json(self, content: str) -> Any:
         try:
-            # Try to parse as JSON first
             return json.loads(content)
-        except json.JSONDecodeError:
+        except (json.JSONDecodeError, TypeError):
+            return None
+    
+    def _parse_hero_content(self, content: str) -> Dict[str, str]:
+        """Parse hero section content from AI response."""
+        hero = self._section_object(ContentSection.HERO, self._load_json(content))
+        if hero is None:
             # Fallback parsing
             return {
                 "headline": content.split('\n')[0] if content else "Professional Portfolio",
@@ -697,17 +1022,18 @@ class PortfolioGenerationService:
                 "value_proposition": "Bringing expertise and dedication to every project",
                 "call_to_action": "Let's connect"
             }
+        return hero
     
     def _parse_about_content(self, content: str) -> Dict[str, str]:
         """Parse about section content from AI response."""
-        try:
-            return json.loads(content)
-        except json.JSONDecodeError:
+        about = self._section_object(ContentSection.ABOUT, self._load_json(content))
+        if about is None:
             return {
                 "main_content": content,
                 "key_highlights": [],
                 "personal_touch": ""
             }
+        return about
     
     def _parse_experience_content(self, content: str, original_data: Dict[str, Any]) -> Dict[str, Any]:
         """Parse experience content from AI response."""
@@ -729,14 +1055,14 @@ class PortfolioGenerationService:
     
     def _parse_skills_content(self, content: str) -> Dict[str, Any]:
         """Parse skills section content from AI response."""
-        try:
-            return json.loads(content)
-        except json.JSONDecodeError:
+        skills = self._section_object(ContentSection.SKILLS, self._load_json(content))
+        if skills is None:
             return {
                 "skill_categories": {},
                 "top_skills": [],
                 "skills_summary": content
             }
+        return skills
     
     def _calculate_quality_score(self, portfolio: PortfolioContent) -> float:
         """Calculate content quality score."""
@@ -0,0 +1,298 @@
+"""
+Incremental MeiliSearch indexing for jobs, companies and peer groups.
+
+Model signals record changed object ids in the SearchIndexOutbox table in
+the same transaction as the change. A periodic Celery task drains the
+outbox in batches, sending one add_documents and one delete_documents
+call per index per batch, so request threads never talk to MeiliSearch.
+Bulk reindexing streams each table in primary key order and can resume
+from the last completed chunk.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.apps import apps
+from django.conf import settings
+from django.db import transaction
+
+from koroh_platform.models import SearchIndexOutbox
+from .meilisearch_client import search_client
+
+logger = logging.getLogger(__name__)
+
+
+def _timestamp(value) -> Optional[int]:
+    return int(value.timestamp()) if value else None
+
+
+def build_job_document(job) -> Dict[str, Any]:
+    """Build the 'jobs' index document for a Job (expects company loaded)."""
+    return {
+        'id': job.id,
+        'title': job.title,
+        'summary': job.summary,
+        'description': job.description,
+        'company_id': job.company_id,
+        'company_name': job.company.name,
+        'location': job.location,
+        'job_type': job.job_type,
+        'experience_level': job.experience_level,
+        'work_arrangement': job.work_arrangement,
+        'is_remote_friendly': job.is_remote_friendly,
+        'requirements': job.requirements,
+        'skills': list(job.skills_required or []) + list(job.skills_preferred or []),
+        'salary_min': job.salary_min,
+        'salary_max': job.salary_max,
+        'is_active': job.is_active,
+        'posted_date': _timestamp(job.posted_date),
+    }
+
+
+def build_company_document(company) -> Dict[str, Any]:
+    """Build the 'companies' index document for a Company."""
+    return {
+        'id': company.id,
+        'name': company.name,
+        'tagline': company.tagline,
+        'description': company.description,
+        'industry': company.industry,
+        'size': company.company_size,
+        'location': company.headquarters,
+        'tech_stack': company.tech_stack,
+        'is_verified': company.is_verified,
+        'is_hiring': company.is_hiring,
+    }
+
+
+def build_peer_group_document(group) -> Dict[str, Any]:
+    """Build the 'peer_groups' index document for a PeerGroup."""
+    return {
+        'id': group.id,
+        'name': group.name,
+        'tagline': group.tagline,
+        'description': group.description,
+        'industry': group.industry,
+        'tags': group.skills,
+        'experience_level': group.experience_level,
+        'location': group.location,
+        'is_private': group.privacy_level != 'public',
+        'member_count': group.member_count,
+        'created_at': _timestamp(group.created_at),
+    }
+
+
+class SearchIndexDefinition:
+    """How one model maps onto one MeiliSearch index."""
+
+    def __init__(
+        self,
+        index_name: str,
+        model_label: str,
+        build_document: Callable[[Any], Dict[str, Any]],
+        indexed_fields: Iterable[str],
+        filters: Optional[Dict[str, Any]] = None,
+        select_related: Tuple[str, ...] = ()
+    ):
+        self.index_name = index_name
+        self.model_label = model_label
+        self.build_document = build_document
+        self.indexed_fields = frozenset(indexed_fields)
+        self.filters = filters or {}
+        self.select_related = select_related
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def indexable(self):
+        """Queryset of objects that belong in the index."""
+        queryset = self.model._default_manager.filter(**self.filters)
+        if self.select_related:
+            queryset = queryset.select_related(*self.select_related)
+        return queryset
+
+    def affected_by(self, update_fields: Optional[Iterable[str]]) -> bool:
+        """Whether a save with these update_fields can change the document."""
+        return update_fields is None or bool(self.indexed_fields.intersection(update_fields))
+
+
+SEARCH_INDEXES: Dict[str, SearchIndexDefinition] = {
+    definition.index_name: definition
+    for definition in (
+        SearchIndexDefinition(
+            'jobs', 'jobs.Job', build_job_document,
+            indexed_fields={
+                'title', 'summary', 'description', 'company', 'location', 'job_type',
+                'experience_level', 'work_arrangement', 'is_remote_friendly',
+                'requirements', 'skills_required', 'skills_preferred',
+                'salary_min', 'salary_max', 'is_active', 'status', 'posted_date',
+            },
+            filters={'is_active': True, 'status': 'published'},
+            select_related=('company',),
+        ),
+        SearchIndexDefinition(
+            'companies', 'companies.Company', build_company_document,
+            indexed_fields={
+                'name', 'tagline', 'description', 'industry', 'company_size',
+                'headquarters', 'tech_stack', 'is_verified', 'is_hiring', 'is_active',
+            },
+            filters={'is_active': True},
+        ),
+        SearchIndexDefinition(
+            'peer_groups', 'peer_groups.PeerGroup', build_peer_group_document,
+            indexed_fields={
+                'name', 'tagline', 'description', 'industry', 'skills',
+                'experience_level', 'location', 'privacy_level', 'member_count', 'is_active',
+            },
+            filters={'is_active': True},
+        ),
+    )
+}
+
+
+def indexing_enabled() -> bool:
+    return getattr(settings, 'SEARCH_INDEXING_ENABLED', True)
+
+
+def enqueue_search_update(
+    index_name: str,
+    object_ids: Iterable[Any],
+    update_fields: Optional[Iterable[str]] = None
+) -> int:
+    """
+    Record that objects need re-indexing.
+
+    Called from post_save/post_delete handlers. Duplicate pending entries
+    are ignored, so bursts of saves coalesce into one document update.
+
+    Returns:
+        Number of ids passed to the outbox
+    """
+    definition = SEARCH_INDEXES[index_name]
+    if not indexing_enabled() or not definition.affected_by(update_fields):
+        return 0
+
+    entries = [
+        SearchIndexOutbox(index_name=index_name, object_id=str(object_id))
+        for object_id in object_ids
+    ]
+    if entries:
+        SearchIndexOutbox.objects.bulk_create(entries, ignore_conflicts=True)
+    return len(entries)
+
+
+def _claim_outbox_batch(batch_size: int) -> List[Tuple[str, str]]:
+    """Remove and return up to batch_size pending entries."""
+    with transaction.atomic():
+        claimed = list(
+            SearchIndexOutbox.objects.select_for_update(skip_locked=True)
+            .order_by('id')
+            .values_list('id', 'index_name', 'object_id')[:batch_size]
+        )
+        if claimed:
+            SearchIndexOutbox.objects.filter(id__in=[entry[0] for entry in claimed]).delete()
+    return [(index_name, object_id) for _, index_name, object_id in claimed]
+
+
+def _sync_objects(definition: SearchIndexDefinition, object_ids: List[str]) -> Dict[str, int]:
+    """Push the current state of the given objects to their index."""
+    objects = list(definition.indexable().filter(pk__in=object_ids))
+    documents = [definition.build_document(obj) for obj in objects]
+    present = {str(obj.pk) for obj in objects}
+    removed = [object_id for object_id in object_ids if object_id not in present]
+
+    indexed = deleted = 0
+    failed = []
+    if documents:
+        if search_client.add_documents(definition.index_name, documents):
+            indexed = len(documents)
+        else:
+            failed.extend(present)
+    if removed:
+        if search_client.delete_documents(definition.index_name, removed):
+            deleted = len(removed)
+        else:
+            failed.extend(removed)
+
+    if failed:
+        # Put the entries back so the next drain retries them.
+        enqueue_search_update(definition.index_name, failed)
+
+    return {'indexed': indexed, 'deleted': deleted, 'failed': len(failed)}
+
+
+def drain_search_outbox(batch_size: int = 500, max_batches: int = 20) -> Dict[str, int]:
+    """
+    Apply pending outbox entries to MeiliSearch.
+
+    Each batch is grouped by index. Objects still indexable are sent in one
+    add_documents call and the rest in one delete_documents call.
+
+    Returns:
+        Counts of indexed, deleted and failed documents
+    """
+    totals = {'indexed': 0, 'deleted': 0, 'failed': 0}
+    for _ in range(max_batches):
+        claimed = _claim_outbox_batch(batch_size)
+        if not claimed:
+            break
+
+        ids_by_index: Dict[str, List[str]] = {}
+        for index_name, object_id in claimed:
+            ids_by_index.setdefault(index_name, []).append(object_id)
+
+        batch_failed = 0
+        for index_name, object_ids in ids_by_index.items():
+            definition = SEARCH_INDEXES.get(index_name)
+            if definition is None:
+                logger.warning(f"Dropping outbox entries for unknown index {index_name}")
+                continue
+            result = _sync_objects(definition, object_ids)
+            batch_failed += result['failed']
+            for key, count in result.items():
+                totals[key] += count
+
+        # Failed entries went back into the outbox; leave them for the next run.
+        if batch_failed or len(claimed) < batch_size:
+            break
+    return totals
+
+
+def reindex(
+    index_name: str,
+    chunk_size: int = 500,
+    start_after: Optional[int] = None
+) -> Iterator[Tuple[int, int]]:
+    """
+    Stream every indexable object into an index in primary key order.
+
+    Yields (last primary key, documents sent) after each chunk is accepted,
+    so callers can checkpoint and resume with start_after.
+
+    Raises:
+        RuntimeError: If MeiliSearch rejects a chunk
+    """
+    definition = SEARCH_INDEXES[index_name]
+    queryset = definition.indexable().order_by('pk')
+    if start_after is not None:
+        queryset = queryset.filter(pk__gt=start_after)
+
+    documents = []
+    last_pk = start_after
+    for obj in queryset.iterator(chunk_size=chunk_size):
+        documents.append(definition.build_document(obj))
+        last_pk = obj.pk
+        if len(documents) >= chunk_size:
+            _send_chunk(index_name, documents, last_pk)
+            yield last_pk, len(documents)
+            documents = []
+
+    if documents:
+        _send_chunk(index_name, documents, last_pk)
+        yield last_pk, len(documents)
+
+
+def _send_chunk(index_name: str, documents: List[Dict[str, Any]], last_pk: int):
+    if not search_client.add_documents(index_name, documents):
+        raise RuntimeError(f"MeiliSearch rejected {index_name} chunk ending at pk {last_pk}")
@@ -0,0 +1,136 @@
+"""
+Streaming ZIP archives for Koroh platform.
+
+Archives are produced as a generator of byte chunks, suitable for a
+Django StreamingHttpResponse. Files are read and compressed one chunk at
+a time, so memory use is constant and nothing is written to disk.
+Already-compressed formats (images, archives, PDFs) are stored rather
+than deflated again.
+"""
+
+import hashlib
+import io
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional
+
+# Extensions whose content is already compressed; deflating them wastes CPU
+STORED_EXTENSIONS = frozenset({
+    '.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.ico',
+    '.zip', '.gz', '.pdf', '.woff', '.woff2', '.mp4', '.webm',
+})
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+
+class _ChunkBuffer(io.RawIOBase):
+    """
+    Write-only, non-seekable sink collecting what ZipFile writes.
+
+    ZipFile detects that it can't seek and writes data descriptors after
+    each member, which is what makes single-pass streaming possible.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+class ZipEntry:
+    """One file to add to a streamed archive."""
+
+    def __init__(self, path: Path, arcname: str, stored: Optional[bool] = None):
+        self.path = Path(path)
+        self.arcname = arcname
+        self.stored = self.path.suffix.lower() in STORED_EXTENSIONS if stored is None else stored
+
+    def zip_info(self) -> zipfile.ZipInfo:
+        stat = self.path.stat()
+        info = zipfile.ZipInfo(
+            self.arcname, date_time=datetime.fromtimestamp(stat.st_mtime).timetuple()[:6]
+        )
+        info.compress_type = zipfile.ZIP_STORED if self.stored else zipfile.ZIP_DEFLATED
+        # Lets ZipFile decide on ZIP64 headers before the data is written
+        info.file_size = stat.st_size
+        info.external_attr = 0o644 << 16
+        return info
+
+
+def directory_entries(root: Path) -> List[ZipEntry]:
+    """Entries for every file under root, in a stable order."""
+    root = Path(root)
+    return [
+        ZipEntry(path, path.relative_to(root).as_posix())
+        for path in sorted(root.rglob('*'))
+        if path.is_file()
+    ]
+
+
+def stream_zip(entries: Iterable[ZipEntry], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[bytes]:
+    """
+    Yield a ZIP archive of the given entries as byte chunks.
+
+    Args:
+        entries: Files to include
+        chunk_size: Bytes read from each file at a time
+
+    Yields:
+        Consecutive pieces of the archive
+    """
+    buffer = _ChunkBuffer()
+    with zipfile.ZipFile(buffer, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for entry in entries:
+            with open(entry.path, 'rb') as source, archive.open(entry.zip_info(), 'w') as member:
+                while True:
+                    chunk = source.read(chunk_size)
+                    if not chunk:
+                        break
+                    member.write(chunk)
+                    data = buffer.drain()
+                    if data:
+                        yield data
+            data = buffer.drain()
+            if data:
+                yield data
+    # Central directory, written when the archive is closed
+    data = buffer.drain()
+    if data:
+        yield data
+
+
+def entries_fingerprint(entries: Iterable[ZipEntry]) -> str:
+    """Cheap change detector: hash of each entry's name, size and mtime."""
+    hasher = hashlib.sha256()
+    for entry in entries:
+        stat = entry.path.stat()
+        hasher.update(f'{entry.arcname}\0{stat.st_size}\0{stat.st_mtime_ns}\n'.encode())
+    return hasher.hexdigest()
+
+
+def entries_content_hash(entries: Iterable[ZipEntry], chunk_size: int = DEFAULT_CHUNK_SIZE) -> str:
+    """SHA-256 over every entry's name and content."""
+    hasher = hashlib.sha256()
+    for entry in entries:
+        hasher.update(entry.arcname.encode() + b'\0')
+        with open(entry.path, 'rb') as source:
+            for chunk in iter(lambda: source.read(chunk_size), b''):
+                hasher.update(chunk)
+        hasher.update(b'\0')
+    return hasher.hexdigest()
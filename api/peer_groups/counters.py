@@ -0,0 +1,235 @@
+"""
+Write-coalescing buffer for peer group counters and activity timestamps.
+
+Saving a post, comment or membership used to issue several extra UPDATEs
+(group post count, membership counters, last-activity timestamps, member
+recounts, activity scores). Those side effects are now recorded in a Redis hash, where
+repeated updates to the same row merge into one field, and a periodic
+Celery task flushes the hash with a few grouped F() updates.
+
+Updates are recorded only once the transaction that caused them
+commits, so a rolled-back save leaves no delta behind and a flush never
+applies a delta whose row change it can't see yet. When Redis is
+unavailable the updates are applied to the database at that point
+instead, so counters never depend on the buffer being up.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from koroh_platform.utils.search_indexing import enqueue_search_update
+
+from .models import GroupMembership, GroupPost, PeerGroup
+from .scoring import ACTIVITY_POINTS, refresh_scores
+
+logger = logging.getLogger(__name__)
+
+BUFFER_KEY = 'koroh:peer_groups:counter_buffer'
+
+# Buffer field kinds: counter deltas, latest timestamps, groups to recount,
+# and activity points for the group's decayed score
+INCREMENT = 'inc'
+TIMESTAMP = 'ts'
+RECOUNT = 'recount'
+ACTIVITY = 'activity'
+
+# Kinds whose values add up in the buffer
+ADDITIVE_KINDS = (INCREMENT, ACTIVITY)
+
+
+def _redis():
+    """Redis connection behind the default cache, or None when unavailable."""
+    try:
+        from django_redis import get_redis_connection
+        return get_redis_connection('default')
+    except Exception:
+        return None
+
+
+def _field(kind: str, target: str, key: str, name: str) -> str:
+    return f"{kind}|{target}|{key}|{name}"
+
+
+def _parse_field(field: str) -> Tuple[str, str, str, str]:
+    kind, target, key, name = field.split('|')
+    return kind, target, key, name
+
+
+def _record(kind: str, target: str, key: str, name: str, value) -> None:
+    """Add one update to the buffer once the current transaction commits."""
+    transaction.on_commit(partial(_write, kind, _field(kind, target, key, name), value))
+
+
+def _write(kind: str, field: str, value) -> None:
+    """Write one update to the buffer, or apply it now if Redis is down."""
+    redis_conn = _redis()
+    if redis_conn is not None:
+        try:
+            if kind in ADDITIVE_KINDS:
+                redis_conn.hincrby(BUFFER_KEY, field, value)
+            else:
+                redis_conn.hset(BUFFER_KEY, field, value)
+            return
+        except Exception as e:
+            logger.warning(f"Counter buffer unavailable, applying update directly: {e}")
+    apply_updates({field: value})
+
+
+def increment(target: str, key, name: str, delta: int = 1) -> None:
+    """
+    Buffer a counter change.
+
+    Args:
+        target: 'group', 'post' or 'membership'
+        key: Row key; a pk, or 'group_id:user_id' for memberships
+        name: Counter field to change
+        delta: Amount to add
+    """
+    _record(INCREMENT, target, str(key), name, delta)
+
+
+def touch(target: str, key, name: str = 'last_activity', when: Optional[datetime] = None) -> None:
+    """Buffer a timestamp update; the latest write before a flush wins."""
+    _record(TIMESTAMP, target, str(key), name, (when or timezone.now()).isoformat())
+
+
+def recount_members(group_id: int) -> None:
+    """Buffer a recount of a group's member_count."""
+    _record(RECOUNT, 'group', str(group_id), 'member_count', 1)
+
+
+def add_activity(group_id: int, event: str) -> None:
+    """Buffer activity points for a post, comment or join in a group."""
+    _record(ACTIVITY, 'group', str(group_id), 'decayed_activity', ACTIVITY_POINTS[event])
+
+
+def membership_key(group_id: int, user_id: int) -> str:
+    """Buffer key of a membership, so callers don't need to look it up."""
+    return f"{group_id}:{user_id}"
+
+
+def _membership_filter(keys: Iterable[str]) -> Q:
+    query = Q()
+    for key in keys:
+        group_id, user_id = key.split(':')
+        query |= Q(group_id=int(group_id), user_id=int(user_id))
+    return query
+
+
+def _queryset(target: str, keys: Iterable[str]):
+    if target == 'group':
+        return PeerGroup.objects.filter(pk__in=[int(k) for k in keys])
+    if target == 'post':
+        return GroupPost.objects.filter(pk__in=[int(k) for k in keys])
+    if target == 'membership':
+        return GroupMembership.objects.filter(_membership_filter(keys))
+    raise ValueError(f"Unknown counter target: {target}")
+
+
+def apply_updates(updates: Dict[Any, Any]) -> Dict[str, int]:
+    """
+    Apply buffered updates to the database.
+
+    Rows sharing the same change are updated together, so a flush costs a
+    handful of UPDATEs however many saves it covers.
+
+    Args:
+        updates: Buffer fields mapped to their values
+
+    Returns:
+        Number of updates applied per kind
+    """
+    increments = defaultdict(list)   # (target, name, delta) -> keys
+    timestamps = defaultdict(list)   # (target, name, value) -> keys
+    recount_groups = set()
+    activity_points = {}             # group id -> points
+
+    for field, value in updates.items():
+        if isinstance(field, bytes):
+            field = field.decode()
+        if isinstance(value, bytes):
+            value = value.decode()
+        kind, target, key, name = _parse_field(field)
+        if kind == INCREMENT:
+            if int(value):
+                increments[(target, name, int(value))].append(key)
+        elif kind == TIMESTAMP:
+            timestamps[(target, name, value)].append(key)
+        elif kind == RECOUNT:
+            recount_groups.add(int(key))
+        elif kind == ACTIVITY:
+            activity_points[int(key)] = int(value)
+
+    with transaction.atomic():
+        for (target, name, delta), keys in increments.items():
+            _queryset(target, keys).update(**{name: F(name) + delta})
+        for (target, name, value), keys in timestamps.items():
+            _queryset(target, keys).update(**{name: datetime.fromisoformat(value)})
+        if recount_groups:
+            member_counts = GroupMembership.objects.filter(
+                group=OuterRef('pk')
+            ).values('group').annotate(total=Count('pk')).values('total')
+            PeerGroup.objects.filter(pk__in=recount_groups).update(
+                member_count=Coalesce(Subquery(member_counts), Value(0))
+            )
+            # member_count is indexed, and update() skips the post_save hook
+            enqueue_search_update('peer_groups', recount_groups, ['member_count'])
+        # Scores depend on activity and member count; rescore only those groups
+        scored = refresh_scores(recount_groups, activity_points)
+
+    return {
+        'increments': sum(len(keys) for keys in increments.values()),
+        'timestamps': sum(len(keys) for keys in timestamps.values()),
+        'recounts': len(recount_groups),
+        'scores': scored,
+    }
+
+
+def flush() -> Dict[str, int]:
+    """
+    Drain the buffer into the database.
+
+    The buffer is read and cleared in one Redis transaction, so updates
+    recorded during the flush land in the next one. If the database write
+    fails the drained updates are merged back.
+
+    Returns:
+        Number of updates applied per kind
+    """
+    redis_conn = _redis()
+    if redis_conn is None:
+        return {}
+
+    pipe = redis_conn.pipeline(transaction=True)
+    pipe.hgetall(BUFFER_KEY)
+    pipe.delete(BUFFER_KEY)
+    updates, _ = pipe.execute()
+    if not updates:
+        return {}
+
+    try:
+        return apply_updates(updates)
+    except Exception:
+        _restore(redis_conn, updates)
+        raise
+
+
+def _restore(redis_conn, updates: Dict) -> None:
+    """Merge drained updates back into the buffer after a failed flush."""
+    pipe = redis_conn.pipeline(transaction=True)
+    for field, value in updates.items():
+        kind = _parse_field(field.decode() if isinstance(field, bytes) else field)[0]
+        if kind in ADDITIVE_KINDS:
+            pipe.hincrby(BUFFER_KEY, field, int(value))
+        else:
+            # A newer timestamp may have been buffered since the drain
+            pipe.hsetnx(BUFFER_KEY, field, value)
+    pipe.execute()
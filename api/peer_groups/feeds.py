@@ -0,0 +1,267 @@
+"""
+Materialized activity feeds for peer groups.
+
+Posts, comments and new active memberships are written once to the
+group's timeline (GroupActivity) when they are saved. Posts and comments
+are also fanned out to every active member's timeline (UserFeedEntry) by
+a Celery task. Feed reads are a single range scan over one timeline,
+paginated with an opaque (timestamp, id) cursor.
+"""
+
+import base64
+import logging
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+
+from .models import GroupActivity, GroupComment, GroupMembership, GroupPost, UserFeedEntry
+
+logger = logging.getLogger(__name__)
+
+# Activity types copied into members' personal feeds
+FAN_OUT_TYPES = ('post', 'comment')
+
+FAN_OUT_BATCH_SIZE = 1000
+
+
+def _user_data(user) -> Dict[str, Any]:
+    """Rendered actor of a feed item."""
+    return {
+        'id': user.id,
+        'name': user.get_full_name(),
+        'email': user.email,
+        'profile_picture': user.profile_picture.url if user.profile_picture else None
+    }
+
+
+def _excerpt(text: str, length: int) -> str:
+    return text[:length] + '...' if len(text) > length else text
+
+
+def _record(activity_type: str, object_id: int, group_id: int, actor, occurred_at, content,
+            fan_out_new: bool = True) -> None:
+    """Write or refresh an activity; new ones are fanned out after commit."""
+    activity, created = GroupActivity.objects.update_or_create(
+        activity_type=activity_type,
+        object_id=object_id,
+        defaults={
+            'group_id': group_id,
+            'actor': actor,
+            'occurred_at': occurred_at,
+            'data': {'user': _user_data(actor), 'content': content},
+        }
+    )
+    if created and fan_out_new and activity_type in FAN_OUT_TYPES:
+        from .tasks import fan_out_group_activity
+
+        transaction.on_commit(lambda: fan_out_group_activity.delay(activity.id))
+
+
+def record_post(post: GroupPost, fan_out_new: bool = True) -> None:
+    """Add or refresh a post in its group's feed."""
+    _record('post', post.id, post.group_id, post.author, post.created_at, {
+        'title': post.title,
+        'content': _excerpt(post.content, 200),
+        'post_type': post.post_type,
+    }, fan_out_new)
+
+
+def record_comment(comment: GroupComment, fan_out_new: bool = True) -> None:
+    """Add or refresh a comment in its post's group feed."""
+    _record('comment', comment.id, comment.post.group_id, comment.author, comment.created_at, {
+        'comment': _excerpt(comment.content, 150),
+        'post_title': comment.post.title,
+        'post_id': comment.post_id,
+    }, fan_out_new)
+
+
+def record_member_joined(membership: GroupMembership) -> None:
+    """Add a member's arrival to the group feed and backfill their own feed."""
+    _record('member_joined', membership.id, membership.group_id, membership.user, membership.joined_at, {
+        'message': "joined the group"
+    })
+    backfill_user_feed(membership.user_id, membership.group_id)
+
+
+def remove_activity(activity_type: str, object_id: int) -> None:
+    """Remove an activity from its group feed and every member's feed."""
+    GroupActivity.objects.filter(activity_type=activity_type, object_id=object_id).delete()
+
+
+def remove_member(membership: GroupMembership) -> None:
+    """Drop a departed member's arrival and the group's items from their feed."""
+    remove_activity('member_joined', membership.id)
+    UserFeedEntry.objects.filter(user_id=membership.user_id, group_id=membership.group_id).delete()
+
+
+def fan_out(activity: GroupActivity) -> int:
+    """
+    Copy an activity into the feed of every active member of its group.
+
+    Returns:
+        Number of feed entries written
+    """
+    member_ids = GroupMembership.objects.filter(
+        group_id=activity.group_id, status='active'
+    ).values_list('user_id', flat=True).order_by('user_id')
+
+    written = 0
+    batch = []
+    for user_id in member_ids.iterator(chunk_size=FAN_OUT_BATCH_SIZE):
+        batch.append(UserFeedEntry(
+            user_id=user_id, activity=activity, group_id=activity.group_id, occurred_at=activity.occurred_at
+        ))
+        if len(batch) >= FAN_OUT_BATCH_SIZE:
+            UserFeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+            written += len(batch)
+            batch = []
+    if batch:
+        UserFeedEntry.objects.bulk_create(batch, ignore_conflicts=True)
+        written += len(batch)
+    return written
+
+
+def backfill_user_feed(user_id: int, group_id: int) -> None:
+    """Copy a group's recent activity into a new member's feed."""
+    backfill_size = getattr(settings, 'PEER_GROUP_FEED_BACKFILL_SIZE', 50)
+    activities = GroupActivity.objects.filter(
+        group_id=group_id, activity_type__in=FAN_OUT_TYPES
+    ).order_by('-occurred_at', '-id').values_list('id', 'occurred_at')[:backfill_size]
+
+    UserFeedEntry.objects.bulk_create([
+        UserFeedEntry(user_id=user_id, activity_id=activity_id, group_id=group_id, occurred_at=occurred_at)
+        for activity_id, occurred_at in activities
+    ], ignore_conflicts=True)
+
+
+def encode_cursor(occurred_at: datetime, item_id: int) -> str:
+    """Opaque cursor pointing just after the given item."""
+    return base64.urlsafe_b64encode(f"{occurred_at.isoformat()}|{item_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Parse a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        occurred_at, item_id = base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        return datetime.fromisoformat(occurred_at), int(item_id)
+    except (TypeError, UnicodeDecodeError, ValueError) as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _page(queryset, id_field: str, cursor: Optional[str], limit: int) -> Tuple[list, Optional[str]]:
+    """Read one page of a timeline ordered by (occurred_at, id) descending."""
+    if cursor:
+        occurred_at, item_id = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(occurred_at__lt=occurred_at) | Q(occurred_at=occurred_at, **{f'{id_field}__lt': item_id})
+        )
+    rows = list(queryset.order_by('-occurred_at', f'-{id_field}')[:limit + 1])
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].occurred_at, getattr(rows[-1], id_field))
+
+
+def _with_live_counts(activities: List[GroupActivity]) -> None:
+    """Add current like and comment counts, which change too often to store."""
+    post_ids = [a.object_id for a in activities if a.activity_type == 'post']
+    comment_ids = [a.object_id for a in activities if a.activity_type == 'comment']
+    post_counts = {
+        pk: (likes, comments) for pk, likes, comments in
+        GroupPost.objects.filter(id__in=post_ids).values_list('id', 'like_count', 'comment_count')
+    } if post_ids else {}
+    comment_counts = dict(
+        GroupComment.objects.filter(id__in=comment_ids).values_list('id', 'like_count')
+    ) if comment_ids else {}
+
+    for activity in activities:
+        if activity.activity_type == 'post':
+            like_count, comment_count = post_counts.get(activity.object_id, (0, 0))
+            activity.data['content'].update(like_count=like_count, comment_count=comment_count)
+        elif activity.activity_type == 'comment':
+            activity.data['content']['like_count'] = comment_counts.get(activity.object_id, 0)
+
+
+def _feed_item(activity: GroupActivity, include_group: bool = False) -> Dict[str, Any]:
+    item = {
+        'type': activity.activity_type,
+        'id': f"member_{activity.object_id}" if activity.activity_type == 'member_joined' else activity.object_id,
+        'timestamp': activity.occurred_at,
+        'user': activity.data.get('user', {}),
+        'content': activity.data.get('content', {}),
+    }
+    if include_group:
+        item['group'] = {
+            'id': activity.group.id,
+            'name': activity.group.name,
+            'slug': activity.group.slug
+        }
+    return item
+
+
+def get_group_feed(group_id: int, cursor: Optional[str] = None, limit: int = 20) -> Dict[str, Any]:
+    """
+    Read a page of a group's activity feed, most recent first.
+
+    Returns:
+        Dictionary with 'activity' items and the 'next_cursor' (None on the last page)
+    """
+    activities, next_cursor = _page(GroupActivity.objects.filter(group_id=group_id), 'id', cursor, limit)
+    _with_live_counts(activities)
+    return {
+        'activity': [_feed_item(activity) for activity in activities],
+        'next_cursor': next_cursor
+    }
+
+
+def get_user_feed(user_id: int, cursor: Optional[str] = None, limit: int = 25) -> Dict[str, Any]:
+    """
+    Read a page of a user's personal feed across all their groups.
+
+    Returns:
+        Dictionary with 'activity' items and the 'next_cursor' (None on the last page)
+    """
+    entries, next_cursor = _page(
+        UserFeedEntry.objects.filter(user_id=user_id).select_related('activity', 'activity__group'),
+        'activity_id', cursor, limit
+    )
+    activities = [entry.activity for entry in entries]
+    _with_live_counts(activities)
+    return {
+        'activity': [_feed_item(activity, include_group=True) for activity in activities],
+        'next_cursor': next_cursor
+    }
+
+
+def rebuild_group_feed(group) -> int:
+    """
+    Rebuild a group's feed and its members' copies from the source rows.
+
+    Only needed for data written before feeds were materialized.
+
+    Returns:
+        Number of activities written
+    """
+    count = 0
+    for post in GroupPost.objects.filter(group=group).select_related('author'):
+        record_post(post, fan_out_new=False)
+        count += 1
+    for comment in GroupComment.objects.filter(post__group=group).select_related('author', 'post'):
+        record_comment(comment, fan_out_new=False)
+        count += 1
+    for membership in GroupMembership.objects.filter(group=group, status='active').select_related('user'):
+        _record('member_joined', membership.id, group.id, membership.user, membership.joined_at, {
+            'message': "joined the group"
+        })
+        count += 1
+    for activity in GroupActivity.objects.filter(group=group, activity_type__in=FAN_OUT_TYPES):
+        fan_out(activity)
+    return count
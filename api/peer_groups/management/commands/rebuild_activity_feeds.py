@@ -0,0 +1,39 @@
+"""
+Django management command to rebuild peer group activity feeds.
+
+Regenerates each group's feed from its posts, comments and active
+memberships and copies posts and comments into members' feeds. Only
+needed for activity written before feeds were materialized.
+
+Usage: python manage.py rebuild_activity_feeds [group_slug ...]
+"""
+
+from django.core.management.base import BaseCommand
+
+from peer_groups.feeds import rebuild_group_feed
+from peer_groups.models import PeerGroup
+
+
+class Command(BaseCommand):
+    help = 'Rebuild peer group activity feeds from posts, comments and memberships'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'group_slugs',
+            nargs='*',
+            help='Groups to rebuild (default: every group)'
+        )
+
+    def handle(self, *args, **options):
+        """Handle the rebuild command."""
+        groups = PeerGroup.objects.all()
+        if options['group_slugs']:
+            groups = groups.filter(slug__in=options['group_slugs'])
+
+        total = 0
+        for group in groups.iterator():
+            count = rebuild_group_feed(group)
+            total += count
+            self.stdout.write(f'{group.slug}: {count} activities')
+
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {total} activities'))
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.7 on 2026-10-16 21:19
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('peer_groups', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GroupActivity',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('activity_type', models.CharField(choices=[('post', 'Post'), ('comment', 'Comment'), ('member_joined', 'Member Joined')], max_length=20, verbose_name='activity type')),
+                ('object_id', models.PositiveIntegerField(help_text='ID of the post, comment or membership', verbose_name='object id')),
+                ('occurred_at', models.DateTimeField(verbose_name='occurred at')),
+                ('data', models.JSONField(default=dict, help_text='Rendered user and content of the feed item', verbose_name='data')),
+                ('actor', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='group_activities', to=settings.AUTH_USER_MODEL, verbose_name='actor')),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='activities', to='peer_groups.peergroup', verbose_name='group')),
+            ],
+            options={
+                'verbose_name': 'Group Activity',
+                'verbose_name_plural': 'Group Activities',
+                'ordering': ['-occurred_at', '-id'],
+            },
+        ),
+        migrations.CreateModel(
+            name='UserFeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('occurred_at', models.DateTimeField(verbose_name='occurred at')),
+                ('activity', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='peer_groups.groupactivity', verbose_name='activity')),
+                ('group', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='peer_groups.peergroup', verbose_name='group')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to=settings.AUTH_USER_MODEL, verbose_name='user')),
+            ],
+            options={
+                'verbose_name': 'User Feed Entry',
+                'verbose_name_plural': 'User Feed Entries',
+                'ordering': ['-occurred_at', '-activity_id'],
+                'indexes': [models.Index(fields=['user', '-occurred_at', '-activity'], name='user_feed_timeline'), models.Index(fields=['user', 'group'], name='user_feed_group')],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='userfeedentry',
+            constraint=models.UniqueConstraint(fields=('user', 'activity'), name='unique_user_feed_entry'),
+        ),
+        migrations.AddIndex(
+            model_name='groupactivity',
+            index=models.Index(fields=['group', '-occurred_at', '-id'], name='group_activity_timeline'),
+        ),
+        migrations.AddConstraint(
+            model_name='groupactivity',
+            constraint=models.UniqueConstraint(fields=('activity_type', 'object_id'), name='unique_group_activity'),
+        ),
+    ]
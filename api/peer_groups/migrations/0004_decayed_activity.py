@@ -0,0 +1,36 @@
+# Generated by Django 4.2.7 on 2026-10-16 22:05
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def seed_decayed_activity(apps, schema_editor):
+    """Start each group's decayed activity from its current score."""
+    PeerGroup = apps.get_model('peer_groups', 'PeerGroup')
+    now = timezone.now()
+    groups = list(PeerGroup.objects.only('id', 'activity_score', 'member_count'))
+    for group in groups:
+        group.decayed_activity = max(group.activity_score - group.member_count * 0.1, 0.0)
+        group.activity_decayed_at = now
+    PeerGroup.objects.bulk_update(groups, ['decayed_activity', 'activity_decayed_at'], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('peer_groups', '0003_likes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='peergroup',
+            name='decayed_activity',
+            field=models.FloatField(default=0.0, help_text='Exponentially decayed activity points (see peer_groups.scoring)', verbose_name='decayed activity'),
+        ),
+        migrations.AddField(
+            model_name='peergroup',
+            name='activity_decayed_at',
+            field=models.DateTimeField(blank=True, help_text='When decayed_activity was last brought up to date', null=True, verbose_name='activity decayed at'),
+        ),
+        migrations.RunPython(seed_decayed_activity, migrations.RunPython.noop),
+    ]
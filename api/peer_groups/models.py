@@ -6,7 +6,8 @@ professional networking, group management, and communication features.
 """
 
 import os
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
 from django.contrib.auth import get_user_model
 from django.utils.translation import gettext_lazy as _
 from django.urls import reverse
@@ -195,6 +196,17 @@ class PeerGroup(models.Model):
         default=0.0,
         help_text=_('Group activity score for recommendations')
     )
+    decayed_activity = models.FloatField(
+        _('decayed activity'),
+        default=0.0,
+        help_text=_('Exponentially decayed activity points (see peer_groups.scoring)')
+    )
+    activity_decayed_at = models.DateTimeField(
+        _('activity decayed at'),
+        blank=True,
+        null=True,
+        help_text=_('When decayed_activity was last brought up to date')
+    )
     
     # Timestamps
     created_at = models.DateTimeField(_('created at'), auto_now_add=True)
@@ -265,19 +277,11 @@ class PeerGroup(models.Model):
         self.save(update_fields=['member_count'])
     
     def update_activity_score(self):
-        """Update the group activity score based on recent activity."""
-        from django.utils import timezone
-        from datetime import timedelta
+        """Bring the group activity score up to date with its decayed activity."""
+        from .scoring import refresh_scores
         
-        # Calculate activity score based on recent posts and member interactions
-        recent_date = timezone.now() - timedelta(days=30)
-        recent_posts = self.posts.filter(created_at__gte=recent_date).count()
-        recent_members = self.groupmembership_set.filter(joined_at__gte=recent_date).count()
-        
-        # Simple activity score calculation
-        activity_score = (recent_posts * 2) + recent_members + (self.member_count * 0.1)
-        self.activity_score = min(activity_score, 100.0)  # Cap at 100
-        self.save(update_fields=['activity_score'])
+        refresh_scores([self.pk])
+        self.refresh_from_db(fields=['activity_score', 'decayed_activity', 'activity_decayed_at'])
     
     def update_last_activity(self):
         """Update the last activity timestamp."""
@@ -438,23 +442,33 @@ class GroupMembership(models.Model):
         is_new = self.pk is None
         old_status = None
         if not is_new:
-            old_status = GroupMembership.objects.get(pk=self.pk).status
+            old_status = getattr(self, '_loaded_status', None)
+            if old_status is None:
+                old_status = GroupMembership.objects.get(pk=self.pk).status
         
         super().save(*args, **kwargs)
+        self._loaded_status = self.status
         
-        # Update group member count if status changed
+        # The member count itself is recounted by the post_save signal
         if is_new or old_status != self.status:
-            self.group.update_member_count()
-            
             # Send real-time notification for new active members
             if is_new and self.status == 'active':
                 self._send_realtime_member_joined_notification()
-    
-    def delete(self, *args, **kwargs):
-        """Override delete to update group member count."""
-        group = self.group
-        super().delete(*args, **kwargs)
-        group.update_member_count()
+            
+            # Keep the activity feeds in step with membership
+            from .feeds import record_member_joined, remove_member
+            if self.status == 'active':
+                record_member_joined(self)
+            elif old_status == 'active':
+                remove_member(self)
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        """Remember the loaded status so save() can detect changes without a query."""
+        instance = super().from_db(db, field_names, values)
+        if 'status' in field_names:
+            instance._loaded_status = instance.status
+        return instance
     
     def update_activity(self):
         """Update the last activity timestamp."""
@@ -465,13 +479,13 @@ class GroupMembership(models.Model):
     
     def increment_post_count(self):
         """Increment the post count for this member."""
-        self.post_count += 1
-        self.save(update_fields=['post_count'])
+        GroupMembership.objects.filter(pk=self.pk).update(post_count=F('post_count') + 1)
+        self.refresh_from_db(fields=['post_count'])
     
     def increment_comment_count(self):
         """Increment the comment count for this member."""
-        self.comment_count += 1
-        self.save(update_fields=['comment_count'])
+        GroupMembership.objects.filter(pk=self.pk).update(comment_count=F('comment_count') + 1)
+        self.refresh_from_db(fields=['comment_count'])
     
     @property
     def is_active(self):
@@ -700,36 +714,52 @@ class GroupPost(models.Model):
         super().save(*args, **kwargs)
         
         if is_new:
-            self.group.post_count += 1
-            self.group.save(update_fields=['post_count'])
-            self.group.update_last_activity()
-            
-            # Update member post count
-            membership = GroupMembership.objects.filter(
-                user=self.author, 
-                group=self.group
-            ).first()
-            if membership:
-                membership.increment_post_count()
+            # Group and member counters are buffered and flushed in batches
+            from . import counters
+            counters.increment('group', self.group_id, 'post_count')
+            counters.increment(
+                'membership', counters.membership_key(self.group_id, self.author_id), 'post_count'
+            )
             
             # Send real-time notification
             self._send_realtime_post_notification()
     
     def increment_view_count(self):
         """Increment the view count."""
-        self.view_count += 1
-        self.save(update_fields=['view_count'])
+        GroupPost.objects.filter(pk=self.pk).update(view_count=F('view_count') + 1)
+        self.refresh_from_db(fields=['view_count'])
     
     def increment_like_count(self):
         """Increment the like count."""
-        self.like_count += 1
-        self.save(update_fields=['like_count'])
+        GroupPost.objects.filter(pk=self.pk).update(like_count=F('like_count') + 1)
+        self.refresh_from_db(fields=['like_count'])
     
     def decrement_like_count(self):
         """Decrement the like count."""
-        if self.like_count > 0:
-            self.like_count -= 1
-            self.save(update_fields=['like_count'])
+        GroupPost.objects.filter(pk=self.pk, like_count__gt=0).update(like_count=F('like_count') - 1)
+        self.refresh_from_db(fields=['like_count'])
+    
+    def add_like(self, user):
+        """
+        Record that a user likes the post.
+        
+        Returns:
+            True if the like is new, False if the user already liked the post
+        """
+        return _add_like(PostLike, self, user, post=self)
+    
+    def remove_like(self, user):
+        """
+        Remove a user's like from the post.
+        
+        Returns:
+            True if a like was removed, False if the user hadn't liked the post
+        """
+        return _remove_like(PostLike, self, user, post=self)
+    
+    def is_liked_by(self, user):
+        """Check if a user has liked the post."""
+        return PostLike.objects.filter(post=self, user=user).exists()
     
     def add_tag(self, tag):
         """Add a tag to the post."""
@@ -831,30 +861,47 @@ class GroupComment(models.Model):
         super().save(*args, **kwargs)
         
         if is_new:
-            self.post.comment_count += 1
-            self.post.save(update_fields=['comment_count'])
-            
-            # Update member comment count
-            membership = GroupMembership.objects.filter(
-                user=self.author, 
-                group=self.post.group
-            ).first()
-            if membership:
-                membership.increment_comment_count()
+            # Post and member counters are buffered and flushed in batches
+            from . import counters
+            counters.increment('post', self.post_id, 'comment_count')
+            counters.increment(
+                'membership', counters.membership_key(self.post.group_id, self.author_id), 'comment_count'
+            )
             
             # Send real-time notification
             self._send_realtime_comment_notification()
     
     def increment_like_count(self):
         """Increment the like count."""
-        self.like_count += 1
-        self.save(update_fields=['like_count'])
+        GroupComment.objects.filter(pk=self.pk).update(like_count=F('like_count') + 1)
+        self.refresh_from_db(fields=['like_count'])
     
     def decrement_like_count(self):
         """Decrement the like count."""
-        if self.like_count > 0:
-            self.like_count -= 1
-            self.save(update_fields=['like_count'])
+        GroupComment.objects.filter(pk=self.pk, like_count__gt=0).update(like_count=F('like_count') - 1)
+        self.refresh_from_db(fields=['like_count'])
+    
+    def add_like(self, user):
+        """
+        Record that a user likes the comment.
+        
+        Returns:
+            True if the like is new, False if the user already liked the comment
+        """
+        return _add_like(CommentLike, self, user, comment=self)
+    
+    def remove_like(self, user):
+        """
+        Remove a user's like from the comment.
+        
+        Returns:
+            True if a like was removed, False if the user hadn't liked the comment
+        """
+        return _remove_like(CommentLike, self, user, comment=self)
+    
+    def is_liked_by(self, user):
+        """Check if a user has liked the comment."""
+        return CommentLike.objects.filter(comment=self, user=user).exists()
     
     @property
     def is_reply(self):
@@ -885,4 +932,213 @@ class GroupComment(models.Model):
         except Exception as e:
             import logging
             logger = logging.getLogger('koroh_platform')
-            logger.error(f"Failed to send real-time comment notification: {e}")
\ No newline at end of file
+            logger.error(f"Failed to send real-time comment notification: {e}")
+
+def _add_like(like_model, target, user, **lookup):
+    """
+    Insert a like row and bump the target's counter in one transaction.
+    
+    The unique constraint on the like model decides which of several
+    concurrent requests wins; the counter is updated with F() so no
+    increment is lost.
+    """
+    try:
+        with transaction.atomic():
+            like_model.objects.create(user=user, **lookup)
+            type(target).objects.filter(pk=target.pk).update(like_count=F('like_count') + 1)
+    except IntegrityError:
+        return False
+    target.refresh_from_db(fields=['like_count'])
+    return True
+
+
+def _remove_like(like_model, target, user, **lookup):
+    """Delete a like row and lower the target's counter in one transaction."""
+    with transaction.atomic():
+        deleted, _ = like_model.objects.filter(user=user, **lookup).delete()
+        if deleted:
+            type(target).objects.filter(pk=target.pk, like_count__gt=0).update(
+                like_count=F('like_count') - 1
+            )
+    target.refresh_from_db(fields=['like_count'])
+    return bool(deleted)
+
+
+class PostLike(models.Model):
+    """
+    A user's like on a group post.
+    
+    One row per user and post; GroupPost.like_count is the cached total.
+    """
+    
+    post = models.ForeignKey(
+        GroupPost,
+        on_delete=models.CASCADE,
+        related_name='likes',
+        verbose_name=_('post')
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='group_post_likes',
+        verbose_name=_('user')
+    )
+    created_at = models.DateTimeField(_('created at'), auto_now_add=True)
+    
+    class Meta:
+        verbose_name = _('Post Like')
+        verbose_name_plural = _('Post Likes')
+        constraints = [
+            models.UniqueConstraint(fields=['post', 'user'], name='unique_post_like'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='post_like_user_created'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id} likes post {self.post_id}"
+
+
+class CommentLike(models.Model):
+    """
+    A user's like on a group comment.
+    
+    One row per user and comment; GroupComment.like_count is the cached total.
+    """
+    
+    comment = models.ForeignKey(
+        GroupComment,
+        on_delete=models.CASCADE,
+        related_name='likes',
+        verbose_name=_('comment')
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='group_comment_likes',
+        verbose_name=_('user')
+    )
+    created_at = models.DateTimeField(_('created at'), auto_now_add=True)
+    
+    class Meta:
+        verbose_name = _('Comment Like')
+        verbose_name_plural = _('Comment Likes')
+        constraints = [
+            models.UniqueConstraint(fields=['comment', 'user'], name='unique_comment_like'),
+        ]
+        indexes = [
+            models.Index(fields=['user', 'created_at'], name='comment_like_user_created'),
+        ]
+    
+    def __str__(self):
+        return f"{self.user_id} likes comment {self.comment_id}"
+
+
+class GroupActivity(models.Model):
+    """
+    Entry in a group's materialized activity feed.
+    
+    Written when a post, comment or active membership is saved (see
+    peer_groups.feeds), with the actor and content already rendered, so
+    reading a group feed is a single range scan.
+    """
+    
+    ACTIVITY_TYPES = [
+        ('post', _('Post')),
+        ('comment', _('Comment')),
+        ('member_joined', _('Member Joined')),
+    ]
+    
+    group = models.ForeignKey(
+        PeerGroup,
+        on_delete=models.CASCADE,
+        related_name='activities',
+        verbose_name=_('group')
+    )
+    activity_type = models.CharField(
+        _('activity type'),
+        max_length=20,
+        choices=ACTIVITY_TYPES
+    )
+    object_id = models.PositiveIntegerField(
+        _('object id'),
+        help_text=_('ID of the post, comment or membership')
+    )
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='group_activities',
+        verbose_name=_('actor')
+    )
+    occurred_at = models.DateTimeField(_('occurred at'))
+    data = models.JSONField(
+        _('data'),
+        default=dict,
+        help_text=_('Rendered user and content of the feed item')
+    )
+    
+    class Meta:
+        verbose_name = _('Group Activity')
+        verbose_name_plural = _('Group Activities')
+        ordering = ['-occurred_at', '-id']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['activity_type', 'object_id'],
+                name='unique_group_activity'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['group', '-occurred_at', '-id'], name='group_activity_timeline'),
+        ]
+    
+    def __str__(self):
+        return f"{self.activity_type} {self.object_id} in {self.group_id}"
+
+
+class UserFeedEntry(models.Model):
+    """
+    A group activity copied into one member's personal feed.
+    
+    Activities are fanned out to the timelines of the group's active
+    members when written, so a user's feed across all their groups is a
+    single range scan instead of a join over every group.
+    """
+    
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        verbose_name=_('user')
+    )
+    activity = models.ForeignKey(
+        GroupActivity,
+        on_delete=models.CASCADE,
+        related_name='feed_entries',
+        verbose_name=_('activity')
+    )
+    # Denormalized from the activity, for ordering and removal on leave
+    group = models.ForeignKey(
+        PeerGroup,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name=_('group')
+    )
+    occurred_at = models.DateTimeField(_('occurred at'))
+    
+    class Meta:
+        verbose_name = _('User Feed Entry')
+        verbose_name_plural = _('User Feed Entries')
+        ordering = ['-occurred_at', '-activity_id']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'activity'],
+                name='unique_user_feed_entry'
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-occurred_at', '-activity'], name='user_feed_timeline'),
+            models.Index(fields=['user', 'group'], name='user_feed_group'),
+        ]
+    
+    def __str__(self):
+        return f"{self.activity_id} for {self.user_id}"
@@ -0,0 +1,110 @@
+"""
+Incremental activity scoring for peer groups.
+
+Each group keeps an exponentially decayed count of activity points
+(posts, comments and joins), together with the time it was last
+decayed. New points are added when the counter buffer is flushed (see
+peer_groups.counters), and a periodic task decays every group. Both
+paths are a single UPDATE in the database, so neither has to count a
+group's recent posts or members.
+
+    activity_score = min(decayed points + 0.1 * member_count, 100)
+"""
+
+from datetime import timezone as dt_timezone
+from typing import Dict, Iterable, Optional
+
+from django.conf import settings
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Cast, Coalesce, Extract, Least, Power
+from django.utils import timezone
+
+from .models import PeerGroup
+
+# Points added to a group's decayed activity per event
+ACTIVITY_POINTS = {
+    'post': 2,
+    'comment': 1,
+    'member_joined': 1,
+}
+
+MEMBER_WEIGHT = 0.1
+MAX_SCORE = 100.0
+
+# Below this the decayed activity is indistinguishable from none
+DECAY_FLOOR = 0.01
+
+
+def half_life_seconds() -> float:
+    return getattr(settings, 'PEER_GROUP_ACTIVITY_HALF_LIFE_DAYS', 15) * 86400
+
+
+def _decayed_activity(now, points: Optional[Dict[int, int]] = None):
+    """
+    SQL expression for a group's activity decayed to `now`, plus new points.
+
+    Groups that were never decayed count from their creation.
+    """
+    decayed_at = Cast(
+        Extract(Coalesce('activity_decayed_at', 'created_at'), 'epoch', tzinfo=dt_timezone.utc),
+        FloatField()
+    )
+    elapsed = Value(now.timestamp()) - decayed_at
+    decayed = F('decayed_activity') * Power(Value(0.5), elapsed / Value(half_life_seconds()))
+    if points:
+        decayed = decayed + Case(
+            *[When(pk=group_id, then=Value(float(p))) for group_id, p in points.items()],
+            default=Value(0.0),
+            output_field=FloatField()
+        )
+    return decayed
+
+
+def _score(decayed):
+    return Least(
+        decayed + Cast('member_count', FloatField()) * Value(MEMBER_WEIGHT),
+        Value(MAX_SCORE),
+        output_field=FloatField()
+    )
+
+
+def refresh_scores(group_ids: Iterable[int], points: Optional[Dict[int, int]] = None) -> int:
+    """
+    Decay the given groups, add their new points and rewrite their scores.
+
+    Args:
+        group_ids: Groups whose activity or member count changed
+        points: New activity points per group id
+
+    Returns:
+        Number of groups updated
+    """
+    group_ids = set(group_ids) | set(points or ())
+    if not group_ids:
+        return 0
+
+    now = timezone.now()
+    decayed = _decayed_activity(now, points)
+    return PeerGroup.objects.filter(pk__in=group_ids).update(
+        decayed_activity=decayed,
+        activity_score=_score(decayed),
+        activity_decayed_at=Value(now)
+    )
+
+
+def decay_all_scores() -> int:
+    """
+    Decay every group that still has measurable activity.
+
+    Returns:
+        Number of groups updated
+    """
+    now = timezone.now()
+    decayed = _decayed_activity(now)
+    return PeerGroup.objects.filter(
+        is_active=True, decayed_activity__gt=DECAY_FLOOR
+    ).update(
+        decayed_activity=decayed,
+        activity_score=_score(decayed),
+        activity_decayed_at=Value(now)
+    )
@@ -474,32 +474,9 @@ class GroupMatchingService:
         Returns:
             List of trending groups
         """
-        from django.utils import timezone
-        from datetime import timedelta
+        from .trending import get_trending_groups
         
-        # Groups with recent activity and growth
-        recent_date = timezone.now() - timedelta(days=7)
-        
-        trending_groups = PeerGroup.objects.filter(
-            is_active=True,
-            last_activity__gte=recent_date
-        ).annotate(
-            recent_members=Count(
-                'members',
-                filter=Q(
-                    groupmembership__status='active',
-                    groupmembership__joined_at__gte=recent_date
-                )
-            ),
-            active_member_count=Count(
-                'members',
-                filter=Q(groupmembership__status='active')
-            )
-        ).filter(
-            recent_members__gt=0
-        ).order_by('-recent_members', '-activity_score', '-active_member_count')[:limit]
-        
-        return list(trending_groups)
+        return get_trending_groups(limit=limit)
     
     def search_groups(
         self, 
@@ -5,48 +5,102 @@ This module defines Django signals for peer group models to handle
 automatic updates and notifications.
 """
 
+import logging
+
 from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
 from django.utils import timezone
 
-from .models import GroupMembership, GroupPost, GroupComment
+from koroh_platform.utils.search_indexing import enqueue_search_update
+
+from . import counters, feeds
+from .models import PeerGroup, GroupMembership, GroupPost, GroupComment
 from .notifications import notification_service
 
+logger = logging.getLogger(__name__)
+
+# Fields shown in feed items; saves touching only counters leave the feed alone
+POST_FEED_FIELDS = {'title', 'content', 'post_type'}
+COMMENT_FEED_FIELDS = {'content'}
 
+
+# Counter, timestamp and activity score signals; the updates are buffered
+# (see counters.py) and applied when the buffer is flushed
 @receiver(post_save, sender=GroupMembership)
-def update_group_member_count_on_save(sender, instance, created, **kwargs):
+def update_group_member_count_on_save(sender, instance, created, update_fields=None, **kwargs):
     """Update group member count when membership is saved."""
+    if update_fields is not None and 'status' not in update_fields:
+        return
     if created or instance.status in ['active', 'left', 'banned']:
-        instance.group.update_member_count()
+        counters.recount_members(instance.group_id)
+    if created and instance.status == 'active':
+        counters.add_activity(instance.group_id, 'member_joined')
 
 
 @receiver(post_delete, sender=GroupMembership)
 def update_group_member_count_on_delete(sender, instance, **kwargs):
     """Update group member count when membership is deleted."""
-    instance.group.update_member_count()
+    counters.recount_members(instance.group_id)
 
 
 @receiver(post_save, sender=GroupPost)
 def update_group_activity_on_post(sender, instance, created, **kwargs):
     """Update group activity when a post is created."""
     if created:
-        instance.group.update_last_activity()
-        instance.group.update_activity_score()
+        counters.touch('group', instance.group_id)
+        counters.add_activity(instance.group_id, 'post')
 
 
 @receiver(post_save, sender=GroupComment)
 def update_group_activity_on_comment(sender, instance, created, **kwargs):
     """Update group activity when a comment is created."""
     if created:
-        instance.post.group.update_last_activity()
-        instance.post.group.update_activity_score()
+        counters.touch('group', instance.post.group_id)
+        counters.add_activity(instance.post.group_id, 'comment')
 
 
 @receiver(post_save, sender=GroupMembership)
-def update_member_activity(sender, instance, **kwargs):
+def update_member_activity(sender, instance, update_fields=None, **kwargs):
     """Update member's last activity timestamp."""
+    if update_fields is not None and set(update_fields) <= {'last_activity'}:
+        return
+    if instance.status == 'active':
+        counters.touch('membership', counters.membership_key(instance.group_id, instance.user_id))
+        counters.touch('group', instance.group_id)
+
+
+# Activity feed signals
+@receiver(post_save, sender=GroupPost)
+def record_post_activity(sender, instance, created, update_fields=None, **kwargs):
+    """Add or refresh the post in the group's activity feed."""
+    if created or update_fields is None or POST_FEED_FIELDS.intersection(update_fields):
+        feeds.record_post(instance)
+
+
+@receiver(post_delete, sender=GroupMembership)
+def remove_member_activity(sender, instance, **kwargs):
+    """Drop a deleted active membership from activity feeds."""
     if instance.status == 'active':
-        instance.update_activity()
+        feeds.remove_member(instance)
+
+
+@receiver(post_delete, sender=GroupPost)
+def remove_post_activity(sender, instance, **kwargs):
+    """Remove the post from activity feeds."""
+    feeds.remove_activity('post', instance.id)
+
+
+@receiver(post_save, sender=GroupComment)
+def record_comment_activity(sender, instance, created, update_fields=None, **kwargs):
+    """Add or refresh the comment in the group's activity feed."""
+    if created or update_fields is None or COMMENT_FEED_FIELDS.intersection(update_fields):
+        feeds.record_comment(instance)
+
+
+@receiver(post_delete, sender=GroupComment)
+def remove_comment_activity(sender, instance, **kwargs):
+    """Remove the comment from activity feeds."""
+    feeds.remove_activity('comment', instance.id)
 
 
 # Notification signals
@@ -81,4 +135,22 @@ def send_new_post_notifications(sender, instance, created, **kwargs):
 def send_new_comment_notifications(sender, instance, created, **kwargs):
     """Send notifications for new comments."""
     if created:
-        notification_service.notify_new_comment(instance)
\ No newline at end of file
+        notification_service.notify_new_comment(instance)
+
+
+@receiver(post_save, sender=PeerGroup)
+def queue_group_search_index_update(sender, instance, update_fields=None, **kwargs):
+    """Queue the group for MeiliSearch indexing."""
+    try:
+        enqueue_search_update('peer_groups', [instance.pk], update_fields)
+    except Exception as e:
+        logger.error(f"Error queueing search index update for peer group {instance.pk}: {e}")
+
+
+@receiver(post_delete, sender=PeerGroup)
+def queue_group_search_index_removal(sender, instance, **kwargs):
+    """Queue the group for removal from MeiliSearch."""
+    try:
+        enqueue_search_update('peer_groups', [instance.pk])
+    except Exception as e:
+        logger.error(f"Error queueing search index removal for peer group {instance.pk}: {e}")
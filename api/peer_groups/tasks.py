@@ -0,0 +1,68 @@
+"""
+Celery tasks for Peer Groups app.
+"""
+
+import logging
+from celery import shared_task
+from .counters import flush
+from .feeds import fan_out
+from .models import GroupActivity
+from .trending import refresh_leaderboards
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(bind=True, max_retries=3)
+def fan_out_group_activity(self, activity_id):
+    """
+    Background task to copy a group activity into its members' feeds.
+    
+    Args:
+        activity_id: ID of the GroupActivity to fan out
+    """
+    try:
+        activity = GroupActivity.objects.get(id=activity_id)
+        written = fan_out(activity)
+        
+        logger.info(f"Fanned out activity {activity_id} to {written} feeds")
+        return {'success': True, 'feed_entries': written}
+        
+    except GroupActivity.DoesNotExist:
+        # Deleted before the fan-out ran
+        return {'success': False, 'error': 'Activity not found'}
+    except Exception as e:
+        logger.error(f"Error fanning out activity {activity_id}: {e}")
+        
+        # Entries are written with ignore_conflicts, so a retry is safe
+        if self.request.retries < self.max_retries:
+            raise self.retry(countdown=60 * (2 ** self.request.retries))
+        
+        return {'success': False, 'error': str(e)}
+
+
+@shared_task
+def flush_counter_buffer():
+    """Apply buffered peer group counter and activity updates in batches."""
+    try:
+        result = flush()
+        if result:
+            logger.info(f"Flushed peer group counter buffer: {result}")
+        return result
+        
+    except Exception as e:
+        logger.error(f"Failed to flush peer group counter buffer: {e}")
+        return {'error': str(e)}
+
+
+@shared_task
+def refresh_trending_groups():
+    """Recompute the trending peer group leaderboards."""
+    try:
+        result = refresh_leaderboards()
+        
+        logger.info(f"Refreshed trending group leaderboards: {result}")
+        return result
+        
+    except Exception as e:
+        logger.error(f"Failed to refresh trending group leaderboards: {e}")
+        return {'error': str(e)}
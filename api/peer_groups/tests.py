@@ -6,6 +6,8 @@ services, and functionality including group creation, membership management,
 recommendation systems, communication features, and notifications.
 """
 
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import IntegrityError, transaction
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from django.urls import reverse
@@ -15,7 +17,11 @@ from unittest.mock import patch, MagicMock
 from django.utils import timezone
 from datetime import timedelta
 
-from .models import PeerGroup, GroupMembership, GroupAdminship, GroupPost, GroupComment
+from . import counters
+from .feeds import fan_out, get_group_feed, get_user_feed
+from .models import PeerGroup, GroupMembership, GroupAdminship, GroupPost, GroupComment, GroupActivity, PostLike
+from .scoring import decay_all_scores
+from .trending import get_trending_groups, refresh_leaderboards
 from .services import PeerGroupRecommendationService, GroupMatchingService
 from .notifications import GroupNotificationService
 
@@ -325,6 +331,25 @@ class GroupPostModelTest(TestCase):
         # Test decrement doesn't go below 0
         post.decrement_like_count()
         self.assertEqual(post.like_count, 0)
+    
+    def test_post_like_is_counted_once_per_user(self):
+        """Test that repeated likes from one user count once."""
+        post = GroupPost.objects.create(
+            group=self.group,
+            author=self.user,
+            title='Test Post',
+            content='This is a test post content.'
+        )
+        
+        self.assertTrue(post.add_like(self.user))
+        self.assertFalse(post.add_like(self.user))
+        self.assertEqual(post.like_count, 1)
+        self.assertTrue(post.is_liked_by(self.user))
+        
+        self.assertTrue(post.remove_like(self.user))
+        self.assertFalse(post.remove_like(self.user))
+        self.assertEqual(post.like_count, 0)
+        self.assertFalse(PostLike.objects.filter(post=post).exists())
 
 
 class GroupCommentModelTest(TestCase):
@@ -561,6 +586,22 @@ class GroupMatchingServiceTest(TestCase):
         
         self.assertGreater(len(trending_groups), 0)
     
+    def test_trending_groups_read_leaderboard(self):
+        """Test that trending groups follow the precomputed leaderboard."""
+        # group2 has fewer points but a recent join, which outranks them
+        GroupMembership.objects.create(user=self.user, group=self.group2, status='active')
+        PeerGroup.objects.filter(pk=self.group1.pk).update(member_count=1, activity_score=75.0)
+        PeerGroup.objects.filter(pk=self.group2.pk).update(member_count=1, activity_score=70.0)
+        GroupMembership.objects.filter(group=self.group2).update(joined_at=timezone.now() - timedelta(days=1))
+        
+        with patch('peer_groups.trending.cache', LocMemCache('trending-test', {})):
+            refresh_leaderboards()
+            trending_groups = self.service.get_trending_groups(user=self.user, limit=10)
+            industry_groups = get_trending_groups(limit=1, industry='technology')
+        
+        self.assertEqual([g.id for g in trending_groups], [self.group2.id, self.group1.id])
+        self.assertEqual([g.id for g in industry_groups], [self.group2.id])
+    
     def test_search_groups(self):
         """Test group search functionality."""
         search_results = self.service.search_groups(
@@ -897,6 +938,10 @@ class GroupPostAPITest(APITestCase):
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(response.data['like_count'], 1)
         
+        # Liking again doesn't count twice
+        response = self.client.post(f"{url}like/", {'action': 'like'})
+        self.assertEqual(response.data['like_count'], 1)
+        
         # Test unliking
         response = self.client.post(f"{url}like/", {'action': 'unlike'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -1003,6 +1048,223 @@ class GroupCommentAPITest(APITestCase):
         self.assertEqual(response.data['like_count'], 0)
 
 
+class ActivityFeedTest(TestCase):
+    """Test cases for the materialized peer group activity feeds."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.author = User.objects.create_user(
+            email='author@example.com',
+            password='testpass123',
+            first_name='Post',
+            last_name='Author'
+        )
+        self.member = User.objects.create_user(
+            email='member@example.com',
+            password='testpass123',
+            first_name='Group',
+            last_name='Member'
+        )
+        
+        self.group = PeerGroup.objects.create(
+            name='Feed Group',
+            description='A group with an activity feed',
+            created_by=self.author
+        )
+        GroupMembership.objects.create(user=self.author, group=self.group, status='active')
+    
+    def test_group_feed_is_paginated_by_cursor(self):
+        """Test that group feed pages follow each other without overlap."""
+        for i in range(5):
+            GroupPost.objects.create(
+                group=self.group,
+                author=self.author,
+                title=f'Post {i}',
+                content='Post content'
+            )
+        
+        first = get_group_feed(self.group.id, limit=3)
+        self.assertEqual(len(first['activity']), 3)
+        self.assertIsNotNone(first['next_cursor'])
+        
+        second = get_group_feed(self.group.id, cursor=first['next_cursor'], limit=3)
+        self.assertIsNone(second['next_cursor'])
+        
+        # 5 posts plus the author's membership
+        items = first['activity'] + second['activity']
+        self.assertEqual(len(items), 6)
+        self.assertEqual(len({(item['type'], item['id']) for item in items}), 6)
+    
+    def test_invalid_cursor_raises(self):
+        """Test that a malformed cursor is rejected."""
+        with self.assertRaises(ValueError):
+            get_group_feed(self.group.id, cursor='not-a-cursor')
+    
+    def test_post_is_fanned_out_to_members(self):
+        """Test that posts reach the personal feeds of active members."""
+        GroupMembership.objects.create(user=self.member, group=self.group, status='active')
+        post = GroupPost.objects.create(
+            group=self.group,
+            author=self.author,
+            title='Fanned out',
+            content='Post content'
+        )
+        
+        fan_out(GroupActivity.objects.get(activity_type='post', object_id=post.id))
+        
+        feed = get_user_feed(self.member.id)
+        self.assertEqual([item['id'] for item in feed['activity']], [post.id])
+        self.assertEqual(feed['activity'][0]['group']['slug'], self.group.slug)
+    
+    def test_new_member_feed_is_backfilled_and_cleared_on_leave(self):
+        """Test that joining copies recent posts and leaving removes them."""
+        post = GroupPost.objects.create(
+            group=self.group,
+            author=self.author,
+            title='Before joining',
+            content='Post content'
+        )
+        
+        membership = GroupMembership.objects.create(user=self.member, group=self.group, status='active')
+        self.assertEqual([item['id'] for item in get_user_feed(self.member.id)['activity']], [post.id])
+        
+        membership.status = 'left'
+        membership.save()
+        self.assertEqual(get_user_feed(self.member.id)['activity'], [])
+    
+    def test_queryset_delete_clears_member_feed(self):
+        """Test that bulk-deleted memberships leave no feed rows behind."""
+        GroupPost.objects.create(
+            group=self.group,
+            author=self.author,
+            title='Before removal',
+            content='Post content'
+        )
+        membership = GroupMembership.objects.create(user=self.member, group=self.group, status='active')
+        self.assertNotEqual(get_user_feed(self.member.id)['activity'], [])
+        
+        GroupMembership.objects.filter(pk=membership.pk).delete()
+        
+        self.assertEqual(get_user_feed(self.member.id)['activity'], [])
+        self.assertFalse(
+            GroupActivity.objects.filter(activity_type='member_joined', object_id=membership.pk).exists()
+        )
+    
+    def test_deleted_post_leaves_feeds(self):
+        """Test that deleting a post removes it from the group feed."""
+        post = GroupPost.objects.create(
+            group=self.group,
+            author=self.author,
+            title='Short lived',
+            content='Post content'
+        )
+        post.delete()
+        
+        self.assertFalse(GroupActivity.objects.filter(activity_type='post', object_id=post.id).exists())
+
+
+class CounterBufferTest(TestCase):
+    """Test cases for the buffered peer group counters."""
+    
+    def setUp(self):
+        """Set up test data."""
+        self.user = User.objects.create_user(
+            email='counter@example.com',
+            password='testpass123',
+            first_name='Counter',
+            last_name='User'
+        )
+        self.group = PeerGroup.objects.create(
+            name='Counter Group',
+            description='A group for counter tests',
+            created_by=self.user
+        )
+    
+    @patch('peer_groups.counters._redis', return_value=None)
+    def test_updates_apply_directly_without_redis(self, mock_redis):
+        """Test that counters stay correct when the buffer is unavailable."""
+        with self.captureOnCommitCallbacks(execute=True):
+            membership = GroupMembership.objects.create(user=self.user, group=self.group, status='active')
+            post = GroupPost.objects.create(
+                group=self.group,
+                author=self.user,
+                title='Counted',
+                content='Post content'
+            )
+            GroupComment.objects.create(post=post, author=self.user, content='Counted comment')
+        
+        self.group.refresh_from_db()
+        membership.refresh_from_db()
+        post.refresh_from_db()
+        self.assertEqual(self.group.member_count, 1)
+        self.assertEqual(self.group.post_count, 1)
+        self.assertIsNotNone(self.group.last_activity)
+        self.assertEqual(membership.post_count, 1)
+        self.assertEqual(membership.comment_count, 1)
+        self.assertEqual(post.comment_count, 1)
+    
+    @patch('peer_groups.counters._redis', return_value=None)
+    def test_rolled_back_save_records_nothing(self, mock_redis):
+        """Test that counter updates wait for the transaction to commit."""
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    GroupPost.objects.create(
+                        group=self.group,
+                        author=self.user,
+                        title='Rolled back',
+                        content='Post content'
+                    )
+                    raise IntegrityError('rollback')
+            except IntegrityError:
+                pass
+        
+        self.group.refresh_from_db()
+        self.assertEqual(callbacks, [])
+        self.assertEqual(self.group.post_count, 0)
+    
+    def test_apply_updates_merges_rows(self):
+        """Test that buffered deltas and recounts are applied in one pass."""
+        GroupMembership.objects.create(user=self.user, group=self.group, status='active')
+        PeerGroup.objects.filter(pk=self.group.pk).update(member_count=0, post_count=0)
+        
+        result = counters.apply_updates({
+            f'inc|group|{self.group.pk}|post_count': b'3',
+            f'recount|group|{self.group.pk}|member_count': b'1',
+            f'inc|membership|{self.group.pk}:{self.user.pk}|post_count': b'3',
+        })
+        
+        self.group.refresh_from_db()
+        self.assertEqual(self.group.post_count, 3)
+        self.assertEqual(self.group.member_count, 1)
+        self.assertEqual(GroupMembership.objects.get(group=self.group, user=self.user).post_count, 3)
+        self.assertEqual(result['scores'], 1)
+    
+    def test_activity_points_raise_score(self):
+        """Test that buffered activity points are added to the decayed score."""
+        counters.apply_updates({f'activity|group|{self.group.pk}|decayed_activity': b'4'})
+        
+        self.group.refresh_from_db()
+        self.assertAlmostEqual(self.group.decayed_activity, 4.0, places=2)
+        self.assertAlmostEqual(self.group.activity_score, 4.0, places=2)
+        self.assertIsNotNone(self.group.activity_decayed_at)
+    
+    def test_idle_group_score_decays(self):
+        """Test that activity loses half its weight after one half-life."""
+        PeerGroup.objects.filter(pk=self.group.pk).update(
+            decayed_activity=10.0,
+            activity_score=10.0,
+            activity_decayed_at=timezone.now() - timedelta(days=15)
+        )
+        
+        with self.settings(PEER_GROUP_ACTIVITY_HALF_LIFE_DAYS=15):
+            decay_all_scores()
+        
+        self.group.refresh_from_db()
+        self.assertAlmostEqual(self.group.decayed_activity, 5.0, places=1)
+        self.assertAlmostEqual(self.group.activity_score, 5.0, places=1)
+
+
 class GroupIntegrationTest(TestCase):
     """Integration tests for complete group workflows."""
     
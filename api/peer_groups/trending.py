@@ -0,0 +1,114 @@
+"""
+Precomputed trending peer groups.
+
+A scheduled task ranks every active group once, by recent join velocity
+plus activity score, and stores the ranked group ids in the cache: one
+list overall, one per group type and one per industry. Readers slice a
+list and load that many groups, so a trending request costs O(limit)
+whatever the number of groups. Until the first refresh, readers fall
+back to ordering by the cached activity score and member count.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from django.utils import timezone
+
+from .models import GroupMembership, PeerGroup
+
+logger = logging.getLogger(__name__)
+
+CACHE_PREFIX = 'peer_groups:trending'
+
+# Leaderboards outlive a few missed refreshes before readers fall back
+CACHE_TIMEOUT = 3600
+
+# Score added per active member who joined within the window
+JOIN_WEIGHT = 10.0
+
+
+def _key(group_type: Optional[str] = None, industry: Optional[str] = None) -> str:
+    if group_type:
+        return f"{CACHE_PREFIX}:type:{group_type}"
+    if industry:
+        return f"{CACHE_PREFIX}:industry:{industry.lower()}"
+    return f"{CACHE_PREFIX}:all"
+
+
+def refresh_leaderboards() -> Dict[str, int]:
+    """
+    Rank all active groups and store the leaderboards.
+
+    Returns:
+        Number of groups ranked and of leaderboards written
+    """
+    window_days = getattr(settings, 'PEER_GROUP_TRENDING_WINDOW_DAYS', 7)
+    size = getattr(settings, 'PEER_GROUP_TRENDING_SIZE', 100)
+    since = timezone.now() - timedelta(days=window_days)
+
+    recent_joins = dict(
+        GroupMembership.objects.filter(
+            status='active', joined_at__gte=since, group__is_active=True
+        ).values('group_id').annotate(joins=Count('id')).values_list('group_id', 'joins')
+    )
+    groups = PeerGroup.objects.filter(
+        is_active=True, member_count__gt=0
+    ).values_list('id', 'group_type', 'industry', 'activity_score', 'member_count')
+
+    ranked = sorted(
+        groups,
+        key=lambda g: (JOIN_WEIGHT * recent_joins.get(g[0], 0) + g[3], g[4]),
+        reverse=True
+    )
+
+    leaderboards = defaultdict(list)
+    for group_id, group_type, industry, _, _ in ranked:
+        keys = [_key()]
+        if group_type:
+            keys.append(_key(group_type=group_type))
+        if industry:
+            keys.append(_key(industry=industry))
+        for key in keys:
+            if len(leaderboards[key]) < size:
+                leaderboards[key].append(group_id)
+
+    # Replace lists for types and industries that no longer have groups
+    stale = set(cache.get(f"{CACHE_PREFIX}:keys") or ()) - set(leaderboards)
+    if stale:
+        cache.delete_many(list(stale))
+    cache.set_many(dict(leaderboards), CACHE_TIMEOUT)
+    cache.set(f"{CACHE_PREFIX}:keys", list(leaderboards), CACHE_TIMEOUT)
+
+    return {'groups': len(ranked), 'leaderboards': len(leaderboards)}
+
+
+def get_trending_groups(
+    limit: int = 10,
+    group_type: Optional[str] = None,
+    industry: Optional[str] = None
+) -> List[PeerGroup]:
+    """
+    Read the top trending groups, optionally for one group type or industry.
+
+    Returns:
+        Up to `limit` active groups, most trending first
+    """
+    queryset = PeerGroup.objects.filter(is_active=True).select_related('created_by')
+
+    ranked_ids = cache.get(_key(group_type, industry))
+    if ranked_ids is None:
+        # Cold leaderboard: rank by cached columns, without joining memberships
+        if group_type:
+            queryset = queryset.filter(group_type=group_type)
+        elif industry:
+            queryset = queryset.filter(industry__iexact=industry)
+        return list(queryset.order_by('-activity_score', '-member_count')[:limit])
+
+    ranked_ids = ranked_ids[:limit]
+    groups = queryset.in_bulk(ranked_ids)
+    return [groups[group_id] for group_id in ranked_ids if group_id in groups]
@@ -25,6 +25,7 @@ from koroh_platform.permissions import (
 
 logger = logging.getLogger('koroh_platform.security')
 
+from .feeds import get_group_feed, get_user_feed
 from .models import (
     PeerGroup, GroupMembership, GroupAdminship,
     GroupPost, GroupComment
@@ -36,6 +37,7 @@ from .serializers import (
     GroupCommentSerializer, GroupJoinRequestSerializer,
     GroupInviteSerializer, GroupMemberActionSerializer
 )
+from .trending import get_trending_groups
 
 User = get_user_model()
 
@@ -494,51 +496,26 @@ class PeerGroupViewSet(ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def trending(self, request):
-        """Get trending/popular groups."""
+        """
+        Get trending/popular groups.
+        
+        Reads the precomputed leaderboard (see peer_groups.trending),
+        optionally narrowed with the 'group_type' or 'industry' query parameter.
+        """
         try:
-            from django.utils import timezone
-            from datetime import timedelta
-            
-            # Allow unauthenticated users to see trending groups
             limit = int(request.query_params.get('limit', 10))
-            
-            # Groups with recent activity (last 7 days)
-            recent_date = timezone.now() - timedelta(days=7)
-            
-            trending_groups = self.get_queryset().filter(
-                is_active=True,
-                last_activity__gte=recent_date
-            ).annotate(
-                recent_members=Count(
-                    'members',
-                    filter=Q(
-                        groupmembership__status='active',
-                        groupmembership__joined_at__gte=recent_date
-                    )
-                ),
-                total_members=Count(
-                    'members',
-                    filter=Q(groupmembership__status='active')
-                )
-            ).filter(
-                total_members__gt=0  # Only groups with members
-            ).order_by('-recent_members', '-activity_score', '-total_members')[:limit]
-            
-            serializer = PeerGroupListSerializer(trending_groups, many=True, context={'request': request})
-            return Response(serializer.data)
-            
-        except Exception as e:
-            logger.error(f"Error getting trending groups: {e}")
-            
-            # Fallback to most popular groups
-            trending_groups = self.get_queryset().filter(
-                is_active=True
-            ).annotate(
-                total_members=Count('members', filter=Q(groupmembership__status='active'))
-            ).order_by('-total_members', '-activity_score')[:limit]
-            
-            serializer = PeerGroupListSerializer(trending_groups, many=True, context={'request': request})
-            return Response(serializer.data)
+        except ValueError:
+            limit = 10
+        
+        # Allow unauthenticated users to see trending groups
+        trending_groups = get_trending_groups(
+            limit=max(1, min(limit, 100)),
+            group_type=request.query_params.get('group_type'),
+            industry=request.query_params.get('industry')
+        )
+        
+        serializer = PeerGroupListSerializer(trending_groups, many=True, context={'request': request})
+        return Response(serializer.data)
     
     @action(detail=True, methods=['get'])
     def similar(self, request, slug=None):
@@ -606,7 +583,12 @@ class PeerGroupViewSet(ModelViewSet):
     
     @action(detail=True, methods=['get'])
     def activity_feed(self, request, slug=None):
-        """Get activity feed for a specific group."""
+        """
+        Get activity feed for a specific group.
+        
+        Paginated with the 'cursor' and 'limit' query parameters; pass the
+        returned next_cursor to get the following page.
+        """
         group = self.get_object()
         
         # Check if user can view group activity
@@ -616,87 +598,15 @@ class PeerGroupViewSet(ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Get recent posts and comments
-        recent_posts = GroupPost.objects.filter(
-            group=group
-        ).select_related('author').order_by('-created_at')[:10]
-        
-        recent_comments = GroupComment.objects.filter(
-            post__group=group
-        ).select_related('author', 'post').order_by('-created_at')[:10]
-        
-        # Get recent member joins
-        recent_members = GroupMembership.objects.filter(
-            group=group,
-            status='active'
-        ).select_related('user').order_by('-joined_at')[:5]
-        
-        # Combine and format activity items
-        activity_items = []
-        
-        # Add posts
-        for post in recent_posts:
-            activity_items.append({
-                'type': 'post',
-                'id': post.id,
-                'timestamp': post.created_at,
-                'user': {
-                    'id': post.author.id,
-                    'name': post.author.get_full_name(),
-                    'email': post.author.email,
-                    'profile_picture': post.author.profile_picture.url if post.author.profile_picture else None
-                },
-                'content': {
-                    'title': post.title,
-                    'content': post.content[:200] + '...' if len(post.content) > 200 else post.content,
-                    'post_type': post.post_type,
-                    'like_count': post.like_count,
-                    'comment_count': post.comment_count
-                }
-            })
-        
-        # Add comments
-        for comment in recent_comments:
-            activity_items.append({
-                'type': 'comment',
-                'id': comment.id,
-                'timestamp': comment.created_at,
-                'user': {
-                    'id': comment.author.id,
-                    'name': comment.author.get_full_name(),
-                    'email': comment.author.email,
-                    'profile_picture': comment.author.profile_picture.url if comment.author.profile_picture else None
-                },
-                'content': {
-                    'comment': comment.content[:150] + '...' if len(comment.content) > 150 else comment.content,
-                    'post_title': comment.post.title,
-                    'post_id': comment.post.id,
-                    'like_count': comment.like_count
-                }
-            })
-        
-        # Add member joins
-        for membership in recent_members:
-            activity_items.append({
-                'type': 'member_joined',
-                'id': f"member_{membership.id}",
-                'timestamp': membership.joined_at,
-                'user': {
-                    'id': membership.user.id,
-                    'name': membership.user.get_full_name(),
-                    'email': membership.user.email,
-                    'profile_picture': membership.user.profile_picture.url if membership.user.profile_picture else None
-                },
-                'content': {
-                    'message': f"joined the group"
-                }
-            })
-        
-        # Sort by timestamp (most recent first)
-        activity_items.sort(key=lambda x: x['timestamp'], reverse=True)
+        try:
+            feed = get_group_feed(
+                group.id, request.query_params.get('cursor'), self._feed_limit(request, 20)
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         return Response({
-            'activity': activity_items[:20],  # Limit to 20 most recent items
+            **feed,
             'group': {
                 'id': group.id,
                 'name': group.name,
@@ -706,7 +616,11 @@ class PeerGroupViewSet(ModelViewSet):
     
     @action(detail=False, methods=['get'])
     def my_activity_feed(self, request):
-        """Get activity feed for all groups the user is a member of."""
+        """
+        Get activity feed for all groups the user is a member of.
+        
+        Paginated like activity_feed.
+        """
         user = request.user
         if not user.is_authenticated:
             return Response(
@@ -714,87 +628,32 @@ class PeerGroupViewSet(ModelViewSet):
                 status=status.HTTP_401_UNAUTHORIZED
             )
         
-        # Get user's groups
-        user_groups = user.peer_groups.filter(
-            groupmembership__status='active'
-        ).values_list('id', flat=True)
-        
-        if not user_groups:
+        groups_count = GroupMembership.objects.filter(user=user, status='active').count()
+        if not groups_count:
             return Response({
                 'activity': [],
                 'message': 'No group activity found. Join some groups to see activity!'
             })
         
-        # Get recent activity from user's groups
-        recent_posts = GroupPost.objects.filter(
-            group_id__in=user_groups
-        ).select_related('author', 'group').order_by('-created_at')[:15]
-        
-        recent_comments = GroupComment.objects.filter(
-            post__group_id__in=user_groups
-        ).select_related('author', 'post', 'post__group').order_by('-created_at')[:15]
-        
-        # Combine and format activity items
-        activity_items = []
-        
-        # Add posts
-        for post in recent_posts:
-            activity_items.append({
-                'type': 'post',
-                'id': post.id,
-                'timestamp': post.created_at,
-                'group': {
-                    'id': post.group.id,
-                    'name': post.group.name,
-                    'slug': post.group.slug
-                },
-                'user': {
-                    'id': post.author.id,
-                    'name': post.author.get_full_name(),
-                    'email': post.author.email,
-                    'profile_picture': post.author.profile_picture.url if post.author.profile_picture else None
-                },
-                'content': {
-                    'title': post.title,
-                    'content': post.content[:200] + '...' if len(post.content) > 200 else post.content,
-                    'post_type': post.post_type,
-                    'like_count': post.like_count,
-                    'comment_count': post.comment_count
-                }
-            })
-        
-        # Add comments
-        for comment in recent_comments:
-            activity_items.append({
-                'type': 'comment',
-                'id': comment.id,
-                'timestamp': comment.created_at,
-                'group': {
-                    'id': comment.post.group.id,
-                    'name': comment.post.group.name,
-                    'slug': comment.post.group.slug
-                },
-                'user': {
-                    'id': comment.author.id,
-                    'name': comment.author.get_full_name(),
-                    'email': comment.author.email,
-                    'profile_picture': comment.author.profile_picture.url if comment.author.profile_picture else None
-                },
-                'content': {
-                    'comment': comment.content[:150] + '...' if len(comment.content) > 150 else comment.content,
-                    'post_title': comment.post.title,
-                    'post_id': comment.post.id,
-                    'like_count': comment.like_count
-                }
-            })
-        
-        # Sort by timestamp (most recent first)
-        activity_items.sort(key=lambda x: x['timestamp'], reverse=True)
+        try:
+            feed = get_user_feed(
+                user.id, request.query_params.get('cursor'), self._feed_limit(request, 25)
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
         return Response({
-            'activity': activity_items[:25],  # Limit to 25 most recent items
-            'groups_count': len(user_groups)
+            **feed,
+            'groups_count': groups_count
         })
+    
+    @staticmethod
+    def _feed_limit(request, default):
+        """Page size from the 'limit' query parameter, capped at 100."""
+        try:
+            return max(1, min(int(request.query_params.get('limit', default)), 100))
+        except ValueError:
+            return default
 
 
 class GroupPostViewSet(ModelViewSet):
@@ -865,20 +724,13 @@ class GroupPostViewSet(ModelViewSet):
         post = self.get_object()
         user = request.user
         
-        # For now, we'll use a simple approach without a separate Like model
-        # In a production system, you'd want a proper Like model to track individual likes
-        
-        # Check if user has already liked (this is a simplified check)
-        # In reality, you'd check a Like model or use a JSONField to track likes
-        
-        # For demonstration, we'll just increment/decrement the like count
         action_taken = request.data.get('action', 'like')  # 'like' or 'unlike'
         
         if action_taken == 'like':
-            post.increment_like_count()
+            post.add_like(user)
             message = 'Post liked successfully.'
         elif action_taken == 'unlike':
-            post.decrement_like_count()
+            post.remove_like(user)
             message = 'Post unliked successfully.'
         else:
             return Response(
@@ -889,6 +741,7 @@ class GroupPostViewSet(ModelViewSet):
         return Response({
             'message': message,
             'like_count': post.like_count,
+            'liked': action_taken == 'like',
             'action': action_taken
         })
     
@@ -1017,14 +870,13 @@ class GroupCommentViewSet(ModelViewSet):
         comment = self.get_object()
         user = request.user
         
-        # Simple like/unlike functionality
         action_taken = request.data.get('action', 'like')  # 'like' or 'unlike'
         
         if action_taken == 'like':
-            comment.increment_like_count()
+            comment.add_like(user)
             message = 'Comment liked successfully.'
         elif action_taken == 'unlike':
-            comment.decrement_like_count()
+            comment.remove_like(user)
             message = 'Comment unliked successfully.'
         else:
             return Response(
@@ -1035,5 +887,6 @@ class GroupCommentViewSet(ModelViewSet):
         return Response({
             'message': message,
             'like_count': comment.like_count,
+            'liked': action_taken == 'like',
             'action': action_taken
         })
\ No newline at end of file
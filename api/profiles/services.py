@@ -6,17 +6,30 @@ storage management, and metadata extraction.
 """
 
 import os
+import re
 import mimetypes
 import hashlib
-from typing import Dict, Any, Optional
+import zipfile
+from io import BytesIO
+from typing import Dict, Any, Iterator, Optional
+from xml.etree import ElementTree
+from django.conf import settings
 from django.core.files.uploadedfile import UploadedFile
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 import logging
 
+from koroh_platform.utils.performance import CacheManager
+from .utils import inspect_file, validate_file_security
+
 logger = logging.getLogger(__name__)
 
 
+class CVExtractionError(Exception):
+    """Raised when text cannot be extracted from a CV file."""
+    pass
+
+
 class CVProcessingService:
     """
     Service for processing CV files including validation,
@@ -44,6 +57,9 @@ class CVProcessingService:
         """
         Validate uploaded CV file for security and format compliance.
         
+        The file content is read once (see utils.inspect_file) for the
+        hash, signature check and security scan.
+        
         Args:
             file: The uploaded file to validate
             
@@ -96,8 +112,18 @@ class CVProcessingService:
                     f'"{file_extension}" files: {", ".join(allowed_mime_types)}'
                 )
             
-            # Generate file hash for duplicate detection
-            file_hash = self._generate_file_hash(file)
+            # Hash, sniff and scan the content in one pass
+            inspection = inspect_file(file)
+            file_hash = inspection['hashes']['sha256']
+            
+            detected_type = inspection['detected_type']
+            if detected_type and detected_type != file_extension:
+                validation_result['warnings'].append(
+                    f'File content looks like "{detected_type}" but the extension is "{file_extension}"'
+                )
+            
+            security = validate_file_security(file, inspection)
+            validation_result['warnings'].extend(security['warnings'])
             
             # Extract basic metadata
             validation_result['metadata'] = {
@@ -106,6 +132,7 @@ class CVProcessingService:
                 'file_extension': file_extension,
                 'mime_type': mime_type,
                 'file_hash': file_hash,
+                'content_signature': detected_type,
                 'uploaded_at': timezone.now().isoformat(),
             }
             
@@ -120,16 +147,16 @@ class CVProcessingService:
             validation_result['errors'].append(f'Validation error: {str(e)}')
             return validation_result
     
-    def extract_cv_metadata(self, file: UploadedFile) -> Dict[str, Any]:
+    def extract_cv_metadata(self, file: UploadedFile, file_hash: Optional[str] = None) -> Dict[str, Any]:
         """
         Extract metadata from CV file.
         
-        This is a basic implementation that extracts file-level metadata.
-        In a full implementation, this would use document parsing libraries
-        to extract content-based metadata.
+        Extracts the CV text (see extract_cv_text) to record page and word
+        counts. Structured data is filled in later by AI analysis.
         
         Args:
             file: The uploaded CV file
+            file_hash: SHA-256 of the content, computed if not given
             
         Returns:
             Dict containing extracted metadata
@@ -158,10 +185,23 @@ class CVProcessingService:
                 },
                 'processing_notes': [
                     'Basic metadata extraction completed',
-                    'Advanced content analysis requires AI integration'
                 ]
             }
             
+            try:
+                extraction = self.extract_cv_text(file, file_hash)
+                metadata['content_analysis'].update({
+                    'text_extracted': True,
+                    'page_count': extraction['page_count'],
+                    'word_count': extraction['word_count'],
+                    'token_estimate': extraction['token_estimate'],
+                    'truncated': extraction['truncated'],
+                })
+                if extraction['truncated']:
+                    metadata['processing_notes'].append('CV text truncated to the analysis token budget')
+            except CVExtractionError as e:
+                metadata['processing_notes'].append(f'Text extraction failed: {e}')
+            
             # Add file-specific metadata based on extension
             file_extension = self._get_file_extension(file.name)
             
@@ -208,8 +248,8 @@ class CVProcessingService:
                     'message': 'CV validation failed'
                 }
             
-            # Extract metadata
-            metadata = self.extract_cv_metadata(file)
+            # Extract metadata, reusing the hash from validation
+            metadata = self.extract_cv_metadata(file, validation_result['metadata']['file_hash'])
             
             # Combine validation metadata with extracted metadata
             combined_metadata = {
@@ -234,6 +274,37 @@ class CVProcessingService:
                 'message': 'CV processing failed'
             }
     
+    def extract_cv_text(self, file, file_hash: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Extract CV text, reusing the cached extraction for identical content.
+        
+        Results are cached under the file's SHA-256 hash via
+        CacheManager.get_cv_analysis/set_cv_analysis. The AI analysis of the
+        same content is stored separately (see cv_analysis_store).
+        
+        Args:
+            file: Uploaded or stored CV file
+            file_hash: SHA-256 of the content, computed if not given
+            
+        Returns:
+            Extraction dict from CVTextExtractor.extract
+            
+        Raises:
+            CVExtractionError: If no text can be extracted
+        """
+        file_hash = file_hash or self._generate_file_hash(file)
+        cached = CacheManager.get_cv_analysis(file_hash) or {}
+        if cached.get('extraction'):
+            return cached['extraction']
+        
+        file.seek(0)
+        content = file.read()
+        file.seek(0)
+        
+        extraction = CVTextExtractor().extract(content, self._get_file_extension(file.name))
+        CacheManager.set_cv_analysis(file_hash, {**cached, 'extraction': extraction})
+        return extraction
+    
     def _get_file_extension(self, filename: str) -> Optional[str]:
         """Extract file extension from filename."""
         if not filename:
@@ -269,6 +340,186 @@ class CVProcessingService:
         return hasher.hexdigest()
 
 
+class CVTextExtractor:
+    """
+    Extract analysable text from PDF, DOCX and Markdown CVs.
+    
+    Pages are read one at a time. Boilerplate (references, declarations,
+    repeated headers/footers and page numbers) is dropped, and text is
+    kept only up to a token budget so oversized CVs don't inflate the
+    Bedrock prompt. Page and word counts cover the whole document.
+    """
+    
+    # Roughly four characters per token for English text
+    CHARS_PER_TOKEN = 4
+    DEFAULT_MAX_TOKENS = 6000
+    
+    # Section headings whose content is never useful for analysis
+    BOILERPLATE_HEADINGS = {
+        'references', 'referees', 'references available upon request',
+        'references available on request', 'declaration', 'disclaimer',
+        'consent', 'gdpr consent', 'data protection',
+    }
+    
+    # Headings that end a skipped boilerplate section
+    SECTION_HEADINGS = {
+        'summary', 'profile', 'professional summary', 'about', 'about me', 'objective',
+        'experience', 'work experience', 'professional experience', 'employment',
+        'employment history', 'career history', 'education', 'skills', 'technical skills',
+        'core competencies', 'projects', 'certifications', 'certificates', 'licenses',
+        'languages', 'interests', 'hobbies', 'awards', 'achievements', 'publications',
+        'volunteer experience', 'volunteering', 'contact',
+    }
+    
+    PAGE_NUMBER_PATTERN = re.compile(r'^(page\s+)?\d+(\s*(of|/)\s*\d+)?$', re.IGNORECASE)
+    
+    # Lines at the top and bottom of each page checked for running headers/footers
+    EDGE_LINES = 2
+    
+    WORD_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+    
+    def __init__(self, max_tokens: Optional[int] = None):
+        """Initialize the extractor with a token budget."""
+        self.max_tokens = max_tokens or getattr(
+            settings, 'CV_EXTRACTION_MAX_TOKENS', self.DEFAULT_MAX_TOKENS
+        )
+        self.logger = logging.getLogger(__name__)
+    
+    def extract(self, content: bytes, file_extension: str) -> Dict[str, Any]:
+        """
+        Extract text and document statistics from CV file content.
+        
+        Args:
+            content: Raw file bytes
+            file_extension: File extension without the dot (pdf, docx, md)
+            
+        Returns:
+            Dict with text, page_count, word_count, token_estimate,
+            truncated and dropped_sections
+            
+        Raises:
+            CVExtractionError: If the format is unsupported or unreadable
+        """
+        readers = {
+            'pdf': self._iter_pdf_pages,
+            'docx': self._iter_docx_pages,
+            'md': self._iter_text_pages,
+        }
+        reader = readers.get((file_extension or '').lower())
+        if reader is None:
+            raise CVExtractionError(f'Text extraction is not supported for "{file_extension}" files')
+        
+        budget = self.max_tokens * self.CHARS_PER_TOKEN
+        kept_lines = []
+        kept_chars = 0
+        page_count = 0
+        word_count = 0
+        truncated = False
+        skipping = False
+        dropped_sections = []
+        edge_lines_seen = set()
+        
+        try:
+            for page_text in reader(content):
+                page_count += 1
+                lines = [line.strip() for line in page_text.splitlines()]
+                lines = [line for line in lines if line]
+                edges = set(lines[:self.EDGE_LINES] + lines[-self.EDGE_LINES:])
+                
+                for line in lines:
+                    word_count += len(line.split())
+                    
+                    if self.PAGE_NUMBER_PATTERN.match(line):
+                        continue
+                    if line in edges and line in edge_lines_seen:
+                        continue  # Running header or footer repeated from an earlier page
+                    
+                    heading = self._normalize_heading(line)
+                    if heading in self.BOILERPLATE_HEADINGS:
+                        skipping = True
+                        dropped_sections.append(heading)
+                        continue
+                    if skipping:
+                        if heading not in self.SECTION_HEADINGS:
+                            continue
+                        skipping = False
+                    
+                    if truncated:
+                        continue
+                    if kept_chars + len(line) + 1 > budget:
+                        truncated = True
+                        continue
+                    kept_lines.append(line)
+                    kept_chars += len(line) + 1
+                
+                edge_lines_seen.update(edges)
+        except CVExtractionError:
+            raise
+        except Exception as e:
+            raise CVExtractionError(f'Could not read {file_extension} file: {e}') from e
+        
+        text = '\n'.join(kept_lines)
+        if not text.strip():
+            raise CVExtractionError('No text could be extracted from the CV')
+        
+        return {
+            'text': text,
+            'format': file_extension.lower(),
+            'page_count': page_count,
+            'word_count': word_count,
+            'token_estimate': -(-len(text) // self.CHARS_PER_TOKEN),
+            'truncated': truncated,
+            'dropped_sections': dropped_sections,
+        }
+    
+    def _normalize_heading(self, line: str) -> Optional[str]:
+        """Return a comparable heading for short lines, else None."""
+        if len(line) > 40:
+            return None
+        return line.strip('#*_-=: \t').lower() or None
+    
+    def _iter_pdf_pages(self, content: bytes) -> Iterator[str]:
+        """Yield the text of each PDF page."""
+        import fitz  # PyMuPDF
+        
+        with fitz.open(stream=content, filetype='pdf') as document:
+            for page in document:
+                yield page.get_text()
+    
+    def _iter_docx_pages(self, content: bytes) -> Iterator[str]:
+        """
+        Yield DOCX text, one chunk per explicit page break.
+        
+        Paragraphs are streamed from word/document.xml so large documents
+        are never fully materialised.
+        """
+        paragraph_tag = f'{self.WORD_NAMESPACE}p'
+        text_tag = f'{self.WORD_NAMESPACE}t'
+        break_tag = f'{self.WORD_NAMESPACE}br'
+        type_attr = f'{self.WORD_NAMESPACE}type'
+        
+        with zipfile.ZipFile(BytesIO(content)) as archive:
+            with archive.open('word/document.xml') as document_xml:
+                paragraphs = []
+                for _, element in ElementTree.iterparse(document_xml, events=('end',)):
+                    if element.tag != paragraph_tag:
+                        continue
+                    paragraphs.append(''.join(node.text or '' for node in element.iter(text_tag)))
+                    page_break = any(
+                        node.get(type_attr) == 'page' for node in element.iter(break_tag)
+                    )
+                    element.clear()
+                    if page_break:
+                        yield '\n'.join(paragraphs)
+                        paragraphs = []
+                if paragraphs:
+                    yield '\n'.join(paragraphs)
+    
+    def _iter_text_pages(self, content: bytes) -> Iterator[str]:
+        """Markdown is a single page."""
+        yield content.decode('utf-8', errors='replace')
+
+
 class CVStorageService:
     """
     Service for managing CV file storage and organization.
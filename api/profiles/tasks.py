@@ -3,43 +3,60 @@ Celery tasks for Profiles app.
 """
 
 import logging
+from dataclasses import asdict
 from celery import shared_task
 from django.contrib.auth import get_user_model
 from django.core.files.storage import default_storage
 from django.conf import settings
-from django.utils import timezone
 from .models import Profile
+from .services import CVExtractionError, CVProcessingService
 from koroh_platform.utils.cv_analysis_service import CVAnalysisService
-from koroh_platform.utils.portfolio_generation_service import PortfolioGenerationService
+from koroh_platform.utils.cv_analysis_store import (
+    load_cv_analysis, load_profile_cv_analysis, save_cv_analysis
+)
+from koroh_platform.utils.portfolio_generation_service import (
+    PortfolioGenerationOptions, PortfolioGenerationService, PortfolioStyle, PortfolioTemplate
+)
 
 User = get_user_model()
 logger = logging.getLogger(__name__)
 
 
 @shared_task(bind=True, max_retries=3)
-def analyze_cv_async(self, profile_id, cv_file_path):
+def analyze_cv_async(self, profile_id, cv_file_path, portfolio_options=None):
     """
     Background task to analyze uploaded CV using AWS Bedrock.
     
+    Text extraction is cached and the full analysis stored (see
+    koroh_platform.utils.cv_analysis_store) by the SHA-256 of the file, so
+    re-uploading an identical CV skips both.
+    
     Args:
         profile_id: ID of the profile to update
         cv_file_path: Path to the uploaded CV file
+        portfolio_options: Template and style of a portfolio requested
+            before the CV was analyzed; it is generated once analysis is done
     """
     try:
         profile = Profile.objects.get(id=profile_id)
         
-        # Read CV file content
-        if default_storage.exists(cv_file_path):
-            with default_storage.open(cv_file_path, 'r') as cv_file:
-                cv_content = cv_file.read()
-        else:
+        if not default_storage.exists(cv_file_path):
             raise FileNotFoundError(f"CV file not found: {cv_file_path}")
         
-        # Initialize CV analysis service
+        cv_processor = CVProcessingService()
         cv_service = CVAnalysisService()
         
-        # Analyze CV content
-        analysis_result = cv_service.analyze_cv(cv_content)
+        with default_storage.open(cv_file_path, 'rb') as cv_file:
+            file_hash = cv_processor._generate_file_hash(cv_file)
+            analysis_result = load_cv_analysis(file_hash)
+            
+            if analysis_result is not None:
+                logger.info(f"Reusing stored CV analysis for profile {profile_id}")
+            else:
+                # Extract text (cached at upload time) and analyze it
+                extraction = cv_processor.extract_cv_text(cv_file, file_hash)
+                analysis_result = cv_service.analyze_cv(extraction['text'])
+                save_cv_analysis(file_hash, analysis_result)
         
         # Update profile with extracted information
         if analysis_result.professional_summary:
@@ -73,9 +90,11 @@ def analyze_cv_async(self, profile_id, cv_file_path):
         else:
             profile.experience_level = "Executive Level"
         
-        # Store analysis results in preferences for later use
+        # Store an analysis summary in preferences; the full result is
+        # loaded from the CV analysis store by cv_hash when needed
         profile.preferences = profile.preferences or {}
         profile.preferences['cv_analysis'] = {
+            'cv_hash': file_hash,
             'analysis_confidence': analysis_result.analysis_confidence,
             'extracted_sections': analysis_result.extracted_sections,
             'processing_notes': analysis_result.processing_notes,
@@ -87,7 +106,9 @@ def analyze_cv_async(self, profile_id, cv_file_path):
         logger.info(f"CV analysis completed for profile {profile_id}")
         
         # Trigger portfolio generation if requested
-        if profile.preferences.get('auto_generate_portfolio', True):
+        if portfolio_options is not None:
+            generate_portfolio_async.delay(profile_id, **portfolio_options)
+        elif profile.preferences.get('auto_generate_portfolio', True):
             generate_portfolio_async.delay(profile_id)
         
         return {
@@ -100,6 +121,10 @@ def analyze_cv_async(self, profile_id, cv_file_path):
     except Profile.DoesNotExist:
         logger.error(f"Profile with ID {profile_id} not found")
         return {'success': False, 'error': 'Profile not found'}
+    except CVExtractionError as e:
+        # Retrying won't make an unreadable file readable
+        logger.error(f"CV text extraction failed for profile {profile_id}: {e}")
+        return {'success': False, 'error': str(e)}
     except Exception as e:
         logger.error(f"CV analysis failed for profile {profile_id}: {e}")
         
@@ -115,6 +140,10 @@ def generate_portfolio_async(self, profile_id, template="professional", style="f
     """
     Background task to generate portfolio from CV analysis.
     
+    Profiles whose CV has no stored analysis yet (e.g. analyzed before the
+    analysis store existed) get the analysis queued instead; it generates
+    the portfolio when it finishes.
+    
     Args:
         profile_id: ID of the profile to generate portfolio for
         template: Portfolio template to use
@@ -123,40 +152,30 @@ def generate_portfolio_async(self, profile_id, template="professional", style="f
     try:
         profile = Profile.objects.get(id=profile_id)
         
-        # Check if we have CV analysis data
-        cv_analysis_data = profile.preferences.get('cv_analysis')
-        if not cv_analysis_data:
-            raise ValueError("No CV analysis data found. Please analyze CV first.")
-        
-        # For now, we'll create a simplified portfolio generation
-        # In a full implementation, you'd reconstruct the CVAnalysisResult from stored data
-        # or re-analyze the CV
+        # Generate from the stored analysis of the profile's CV
+        cv_data = load_profile_cv_analysis(profile)
+        if cv_data is None:
+            if not profile.cv_file:
+                logger.warning(f"Profile {profile_id} has no CV to generate a portfolio from")
+                return {'success': False, 'error': 'No CV uploaded'}
+            
+            analyze_cv_async.delay(
+                profile.id, profile.cv_file.name,
+                portfolio_options={'template': template, 'style': style}
+            )
+            logger.info(f"Queued CV analysis before portfolio generation for profile {profile_id}")
+            return {'success': True, 'portfolio_generated': False, 'analysis_queued': True}
         
         portfolio_service = PortfolioGenerationService()
-        
-        # Create a basic portfolio content structure
-        # This is simplified - in production you'd want to store and retrieve full CV analysis
+        portfolio = portfolio_service.generate_portfolio(
+            cv_data,
+            PortfolioGenerationOptions(
+                template=PortfolioTemplate(template),
+                style=PortfolioStyle(style)
+            )
+        )
         portfolio_content = {
-            'hero_section': {
-                'headline': f"{profile.user.first_name} {profile.user.last_name}",
-                'subheadline': profile.headline or "Professional",
-                'value_proposition': profile.summary or "Experienced professional ready to make an impact",
-                'call_to_action': "Let's connect"
-            },
-            'about_section': {
-                'main_content': profile.summary or "Professional with expertise in various domains.",
-                'key_highlights': profile.skills[:3] if profile.skills else [],
-                'personal_touch': "Passionate about delivering excellent results."
-            },
-            'skills_section': {
-                'top_skills': profile.skills[:10] if profile.skills else [],
-                'skills_summary': f"Skilled in {', '.join(profile.skills[:5])}" if profile.skills else "Diverse skill set"
-            },
-            'contact_section': {
-                'email': profile.user.email,
-                'location': profile.location,
-                'call_to_action': "Ready to discuss opportunities and collaborations."
-            }
+            key: value for key, value in asdict(portfolio).items() if key.endswith('_section')
         }
         
         # Store portfolio content in profile preferences
@@ -165,8 +184,8 @@ def generate_portfolio_async(self, profile_id, template="professional", style="f
             'content': portfolio_content,
             'template': template,
             'style': style,
-            'generated_at': timezone.now().isoformat(),
-            'quality_score': 0.8  # Default score
+            'generated_at': portfolio.generated_at,
+            'quality_score': portfolio.content_quality_score
         }
         
         # Generate portfolio URL (simplified)
@@ -176,7 +195,9 @@ def generate_portfolio_async(self, profile_id, template="professional", style="f
         profile.save()
         
         # Send portfolio completion email
-        send_portfolio_completion_email.delay(profile.user.id, portfolio_url, 85)
+        send_portfolio_completion_email.delay(
+            profile.user.id, portfolio_url, round(portfolio.content_quality_score * 100)
+        )
         
         logger.info(f"Portfolio generated for profile {profile_id}")
         
@@ -5,19 +5,32 @@ This module contains tests for Profile model, API endpoints,
 CV upload functionality, and related services.
 """
 
+import hashlib
+import io
+import json
 import os
+import shutil
 import tempfile
+import threading
+import zipfile
+from unittest import mock
+
 from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
-from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile, TemporaryUploadedFile
 from django.urls import reverse
 from rest_framework.test import APITestCase
 from rest_framework import status
 from rest_framework_simplejwt.tokens import RefreshToken
 
 from .models import Profile
-from .services import CVProcessingService, CVStorageService
-from .utils import sanitize_filename, is_safe_filename, get_file_info
+from .services import CVExtractionError, CVProcessingService, CVStorageService, CVTextExtractor
+from .utils import (
+    FileTypeDetector, get_file_info, inspect_file, is_safe_filename,
+    sanitize_filename, validate_file_security
+)
 
 User = get_user_model()
 
@@ -294,6 +307,189 @@ class CVProcessingServiceTest(TestCase):
         self.assertEqual(metadata['file_info']['file_extension'], 'pdf')
 
 
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class CVTextExtractionTest(TestCase):
+    """Test cases for CV text extraction and the content-hash cache."""
+    
+    def setUp(self):
+        from django.core.cache import cache
+        cache.clear()
+        self.cv_processor = CVProcessingService()
+    
+    def _pdf(self, pages):
+        import fitz
+        document = fitz.open()
+        for text in pages:
+            document.new_page().insert_text((72, 72), text)
+        content = document.tobytes()
+        document.close()
+        return content
+    
+    def _docx(self, paragraphs):
+        namespace = 'http://schemas.openxmlformats.org/wordprocessingml/2006/main'
+        body = ''.join(f'<w:p><w:r><w:t>{text}</w:t></w:r></w:p>' for text in paragraphs)
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, 'w') as archive:
+            archive.writestr(
+                'word/document.xml',
+                f'<w:document xmlns:w="{namespace}"><w:body>{body}</w:body></w:document>'
+            )
+        return buffer.getvalue()
+    
+    def test_extract_pdf_pages_drops_boilerplate(self):
+        """PDF pages are counted and headers, page numbers and references dropped."""
+        content = self._pdf([
+            'Ada Lovelace CV\nExperience\nEngineer at Acme\n1',
+            'Ada Lovelace CV\nReferences\nDr Smith, smith@example.com\nSkills\nPython\n2',
+        ])
+        
+        extraction = CVTextExtractor().extract(content, 'pdf')
+        
+        self.assertEqual(extraction['page_count'], 2)
+        self.assertEqual(extraction['text'].count('Ada Lovelace CV'), 1)
+        self.assertIn('Engineer at Acme', extraction['text'])
+        self.assertIn('Python', extraction['text'])
+        self.assertNotIn('Dr Smith', extraction['text'])
+        self.assertEqual(extraction['dropped_sections'], ['references'])
+    
+    def test_extract_docx_and_token_budget(self):
+        """DOCX paragraphs are read and text beyond the budget is cut."""
+        paragraphs = ['Summary'] + [f'Line {i} ' + 'word ' * 10 for i in range(50)]
+        
+        extraction = CVTextExtractor(max_tokens=50).extract(self._docx(paragraphs), 'docx')
+        
+        self.assertTrue(extraction['truncated'])
+        self.assertLessEqual(len(extraction['text']), 50 * CVTextExtractor.CHARS_PER_TOKEN)
+        self.assertEqual(extraction['word_count'], 1 + 50 * 12)
+        self.assertTrue(extraction['text'].startswith('Summary'))
+    
+    def test_unsupported_format(self):
+        """Legacy .doc files are rejected rather than sent as binary."""
+        with self.assertRaises(CVExtractionError):
+            CVTextExtractor().extract(b'\xd0\xcf\x11\xe0', 'doc')
+    
+    def test_metadata_records_counts_and_caches_extraction(self):
+        """Metadata extraction fills counts and reuses cached text for identical files."""
+        content = b'# Ada Lovelace\n\nExperience\n\nEngineer at Acme'
+        metadata = self.cv_processor.extract_cv_metadata(
+            SimpleUploadedFile('cv.md', content, content_type='text/markdown')
+        )
+        
+        self.assertTrue(metadata['content_analysis']['text_extracted'])
+        self.assertEqual(metadata['content_analysis']['page_count'], 1)
+        self.assertEqual(metadata['content_analysis']['word_count'], 7)
+        
+        with mock.patch.object(CVTextExtractor, 'extract') as extract:
+            self.cv_processor.extract_cv_text(SimpleUploadedFile('copy.md', content))
+        extract.assert_not_called()
+    
+    def test_analyze_cv_async_skips_analysis_for_identical_cv(self):
+        """Re-analysing an identical CV uses the cached Bedrock result."""
+        from koroh_platform.utils.cv_analysis_service import CVAnalysisResult, PersonalInfo
+        from .tasks import analyze_cv_async
+        
+        user = User.objects.create_user(email='cv@example.com', password='testpass123')
+        content = b'# Ada Lovelace\n\nSkills\n\nPython'
+        path = default_storage.save('cvs/test/identical_cv.md', ContentFile(content))
+        self.addCleanup(default_storage.delete, path)
+        result = CVAnalysisResult(
+            personal_info=PersonalInfo(name='Ada Lovelace'), skills=['Python']
+        )
+        
+        with mock.patch('profiles.tasks.CVAnalysisService') as service_class, \
+                mock.patch('profiles.tasks.generate_portfolio_async'):
+            service = service_class.return_value
+            service.analyze_cv.return_value = result
+            service._estimate_experience_years.return_value = 1
+            analyze_cv_async.apply(args=(user.profile.id, path))
+            analyze_cv_async.apply(args=(user.profile.id, path))
+        
+        service.analyze_cv.assert_called_once()
+        self.assertIn('Ada Lovelace', service.analyze_cv.call_args.args[0])
+        user.profile.refresh_from_db()
+        self.assertEqual(user.profile.skills, ['Python'])
+
+
+class CVAnalysisStoreTest(TestCase):
+    """Test the persisted CV analysis and its reuse by portfolio generation."""
+    
+    def setUp(self):
+        from koroh_platform.utils.cv_analysis_service import (
+            CVAnalysisResult, PersonalInfo, WorkExperience
+        )
+        
+        self.result = CVAnalysisResult(
+            personal_info=PersonalInfo(name='Ada Lovelace', email='ada@example.com'),
+            skills=['Python'],
+            work_experience=[WorkExperience(company='Acme', achievements=['Shipped'])],
+            analysis_confidence=0.75
+        )
+    
+    def test_round_trip_is_compact(self):
+        """The stored form rebuilds the full dataclass tree and is smaller than JSON."""
+        from koroh_platform.utils.cv_analysis_store import (
+            deserialize_analysis, load_cv_analysis, save_cv_analysis, serialize_analysis
+        )
+        
+        payload = serialize_analysis(self.result)
+        self.assertLess(len(payload), len(json.dumps(self.result.to_dict())))
+        self.assertEqual(deserialize_analysis(payload).to_dict(), self.result.to_dict())
+        
+        save_cv_analysis('a' * 64, self.result)
+        save_cv_analysis('a' * 64, self.result)
+        loaded = load_cv_analysis('a' * 64)
+        self.assertEqual(loaded.work_experience[0].achievements, ['Shipped'])
+        self.assertIsNone(load_cv_analysis('b' * 64))
+    
+    def test_generate_portfolio_async_uses_stored_analysis(self):
+        """Portfolio generation loads the stored analysis instead of a profile stub."""
+        from koroh_platform.utils.cv_analysis_store import save_cv_analysis
+        from koroh_platform.utils.portfolio_generation_service import (
+            PortfolioContent, PortfolioGenerationService
+        )
+        from .tasks import generate_portfolio_async
+        
+        user = User.objects.create_user(email='store@example.com', password='testpass123')
+        profile = user.profile
+        profile.preferences = {'cv_analysis': {'cv_hash': 'c' * 64}}
+        profile.save()
+        save_cv_analysis('c' * 64, self.result)
+        
+        portfolio = PortfolioContent(hero_section={'headline': 'Ada'}, content_quality_score=0.9)
+        with mock.patch('koroh_platform.utils.portfolio_generation_service.ContentGenerationService'), \
+                mock.patch.object(
+                    PortfolioGenerationService, 'generate_portfolio', return_value=portfolio
+                ) as generate, \
+                mock.patch('profiles.tasks.send_portfolio_completion_email'):
+            outcome = generate_portfolio_async.apply(args=(profile.id,)).get()
+        
+        self.assertTrue(outcome['success'])
+        self.assertEqual(generate.call_args.args[0].personal_info.name, 'Ada Lovelace')
+        profile.refresh_from_db()
+        self.assertEqual(profile.preferences['portfolio']['content']['hero_section'], {'headline': 'Ada'})
+        self.assertEqual(profile.preferences['portfolio']['quality_score'], 0.9)
+    
+    def test_generate_portfolio_async_queues_missing_analysis(self):
+        """A CV analyzed before the store existed is analyzed again instead of failing."""
+        from .tasks import generate_portfolio_async
+        
+        user = User.objects.create_user(email='legacy@example.com', password='testpass123')
+        profile = user.profile
+        profile.cv_file.name = 'cvs/legacy/cv.pdf'
+        profile.preferences = {'cv_analysis': {'analysis_confidence': 0.8}}
+        profile.save()
+        
+        with mock.patch('profiles.tasks.analyze_cv_async') as analyze:
+            outcome = generate_portfolio_async.apply(args=(profile.id, 'modern', 'conversational')).get()
+        
+        self.assertTrue(outcome['analysis_queued'])
+        analyze.delay.assert_called_once_with(
+            profile.id, 'cvs/legacy/cv.pdf',
+            portfolio_options={'template': 'modern', 'style': 'conversational'}
+        )
+
+
 class CVStorageServiceTest(TestCase):
     """Test cases for CV storage service."""
     
@@ -365,6 +561,42 @@ class UtilsTest(TestCase):
         self.assertIn('hash_sha256', info)
         self.assertIn('hash_md5', info)
         self.assertTrue(info['is_safe_filename'])
+    
+    def test_inspect_file_single_pass(self):
+        """Hashes, signature and scanners come from one streaming read."""
+        content = b'%PDF-1.4\n' + b'x' * 100 + b'/JavaScript' + b'y' * 100
+        test_file = TemporaryUploadedFile('test.pdf', 'application/pdf', len(content), None)
+        test_file.write(content)
+        test_file.seek(0)
+        self.addCleanup(test_file.close)
+        
+        with mock.patch.object(test_file, 'chunks', wraps=test_file.chunks) as chunks:
+            # Small chunks so the pattern straddles a chunk boundary
+            chunks.side_effect = lambda: TemporaryUploadedFile.chunks(test_file, chunk_size=16)
+            inspection = inspect_file(test_file)
+            security = validate_file_security(test_file, inspection)
+            info = get_file_info(test_file, inspection)
+        
+        chunks.assert_called_once()
+        self.assertEqual(inspection['size'], len(content))
+        self.assertEqual(info['hash_sha256'], hashlib.sha256(content).hexdigest())
+        self.assertEqual(info['hash_md5'], hashlib.md5(content).hexdigest())
+        self.assertEqual(FileTypeDetector.detect_file_type(test_file, inspection), 'pdf')
+        self.assertIn('PDF contains embedded JavaScript', security['warnings'])
+        self.assertFalse(security['is_safe'])
+    
+    def test_cv_validation_reads_file_once(self):
+        """CV validation hashes and scans the upload in a single pass."""
+        content = b'%PDF-1.4\nThis is a test PDF content'
+        test_file = SimpleUploadedFile('test.pdf', content, content_type='application/pdf')
+        
+        with mock.patch.object(test_file, 'chunks', wraps=test_file.chunks) as chunks:
+            result = CVProcessingService().validate_cv_file(test_file)
+        
+        chunks.assert_called_once()
+        self.assertTrue(result['is_valid'])
+        self.assertEqual(result['metadata']['file_hash'], hashlib.sha256(content).hexdigest())
+        self.assertEqual(result['metadata']['content_signature'], 'pdf')
 
 
 class ProfileManagementSecurityTest(APITestCase):
@@ -761,4 +993,422 @@ class ProfileManagementFunctionalTest(APITestCase):
         # Verify metadata is from the second upload
         latest_hash = response.data['cv_metadata']['file_hash']
         second_hash = response2.data['cv_metadata']['file_hash']
-        self.assertEqual(latest_hash, second_hash)
\ No newline at end of file
+        self.assertEqual(latest_hash, second_hash)
+
+class PortfolioGenerationModeTest(TestCase):
+    """Test concurrent and combined portfolio section generation."""
+    
+    def setUp(self):
+        from koroh_platform.utils.cv_analysis_service import (
+            CVAnalysisResult, PersonalInfo, WorkExperience
+        )
+        from koroh_platform.utils.portfolio_generation_service import (
+            ContentSection, PortfolioGenerationService
+        )
+        
+        with mock.patch('koroh_platform.utils.portfolio_generation_service.ContentGenerationService'):
+            self.service = PortfolioGenerationService()
+        self.service.content_service._extract_response_text.side_effect = lambda response: response
+        
+        self.cv_data = CVAnalysisResult(
+            personal_info=PersonalInfo(name='Ada Lovelace', email='ada@example.com'),
+            professional_summary='Engineer',
+            skills=['Python'], technical_skills=['Python'], soft_skills=['Writing'],
+            work_experience=[
+                WorkExperience(company='Acme', position='Engineer', description='Built things'),
+                WorkExperience(company='Initech', position='Developer', description='Fixed things'),
+            ],
+            education=[], certifications=[], projects=[], interests=[]
+        )
+        self.sections = [
+            ContentSection.HERO, ContentSection.ABOUT, ContentSection.EXPERIENCE,
+            ContentSection.SKILLS, ContentSection.CONTACT
+        ]
+        self.responses = {
+            'hero': '{"headline": "Hi"}',
+            'about': '{"main_content": "About"}',
+            'skills': '{"top_skills": ["Python"]}',
+            'experience': '{"enhanced_description": "Did things"}',
+            'cta': 'Get in touch',
+        }
+    
+    def _options(self, mode, **kwargs):
+        from koroh_platform.utils.portfolio_generation_service import PortfolioGenerationOptions
+        return PortfolioGenerationOptions(include_sections=self.sections, generation_mode=mode, **kwargs)
+    
+    @staticmethod
+    def _section_of(prompt):
+        if 'several sections' in prompt:
+            return 'combined'
+        for marker, section in (('hero section', 'hero'), ('"About" section', 'about'),
+                                ('skills section', 'skills'), ('work experience entry', 'experience'),
+                                ('call-to-action', 'cta')):
+            if marker in prompt:
+                return section
+        raise AssertionError(f'Unexpected prompt: {prompt}')
+    
+    def test_concurrent_mode_runs_sections_in_parallel(self):
+        """Hero and about only finish if they are in flight at the same time."""
+        from koroh_platform.utils.portfolio_generation_service import GenerationMode
+        barrier = threading.Barrier(2, timeout=5)
+        
+        def invoke(prompt):
+            section = self._section_of(prompt)
+            if section in ('hero', 'about'):
+                barrier.wait()
+            return self.responses[section]
+        
+        self.service.content_service._invoke_model_with_retry.side_effect = invoke
+        portfolio = self.service.generate_portfolio(self.cv_data, self._options(GenerationMode.CONCURRENT))
+        
+        self.assertEqual(portfolio.hero_section, {'headline': 'Hi'})
+        self.assertEqual(portfolio.about_section, {'main_content': 'About'})
+        self.assertEqual(
+            [entry['company'] for entry in portfolio.experience_section], ['Acme', 'Initech']
+        )
+        self.assertEqual(portfolio.contact_section['call_to_action'], 'Get in touch')
+    
+    def test_concurrent_mode_returns_partial_results(self):
+        """A failing section and a timed-out section leave the rest intact."""
+        from koroh_platform.utils.portfolio_generation_service import GenerationMode
+        release = threading.Event()
+        
+        def invoke(prompt):
+            section = self._section_of(prompt)
+            if section == 'skills':
+                raise RuntimeError('model unavailable')
+            if section == 'about':
+                release.wait(5)
+            return self.responses[section]
+        
+        self.service.content_service._invoke_model_with_retry.side_effect = invoke
+        try:
+            portfolio = self.service.generate_portfolio(
+                self.cv_data, self._options(GenerationMode.CONCURRENT, generation_timeout=0.5)
+            )
+        finally:
+            release.set()
+        
+        self.assertEqual(portfolio.skills_section, {})
+        self.assertEqual(portfolio.about_section, {})
+        self.assertEqual(portfolio.hero_section, {'headline': 'Hi'})
+        self.assertEqual(len(portfolio.experience_section), 2)
+    
+    def test_combined_mode_uses_one_prompt(self):
+        """All sections come from a single JSON response."""
+        from koroh_platform.utils.portfolio_generation_service import GenerationMode
+        document = {
+            'hero': {'headline': 'Hi'},
+            'about': {'main_content': 'About'},
+            'skills': {'top_skills': ['Python']},
+            'experience': [{'enhanced_description': 'A'}, {'enhanced_description': 'B'}],
+            'call_to_action': 'Get in touch',
+        }
+        invoke = self.service.content_service._invoke_model_with_retry
+        invoke.return_value = f'Here you go:\n{json.dumps(document)}'
+        
+        portfolio = self.service.generate_portfolio(self.cv_data, self._options(GenerationMode.COMBINED))
+        
+        self.assertEqual(invoke.call_count, 1)
+        self.assertEqual(portfolio.skills_section, {'top_skills': ['Python']})
+        self.assertEqual(portfolio.experience_section[1]['company'], 'Initech')
+        self.assertEqual(portfolio.experience_section[1]['enhanced_description'], 'B')
+        self.assertEqual(portfolio.contact_section['email'], 'ada@example.com')
+        self.assertEqual(portfolio.contact_section['call_to_action'], 'Get in touch')
+    
+    def test_combined_mode_regenerates_missing_sections(self):
+        """Sections absent from the combined response are generated on their own."""
+        from koroh_platform.utils.portfolio_generation_service import GenerationMode
+        document = {
+            'hero': {'headline': 'Hi'},
+            'about': {'main_content': 'About'},
+            'experience': [{'enhanced_description': 'A'}, {'enhanced_description': 'B'}],
+            'call_to_action': 'Get in touch',
+        }
+        
+        def invoke(prompt):
+            section = self._section_of(prompt)
+            return json.dumps(document) if section == 'combined' else self.responses[section]
+        
+        self.service.content_service._invoke_model_with_retry.side_effect = invoke
+        portfolio = self.service.generate_portfolio(self.cv_data, self._options(GenerationMode.COMBINED))
+        
+        prompts = [
+            self._section_of(call.args[0])
+            for call in self.service.content_service._invoke_model_with_retry.call_args_list
+        ]
+        self.assertEqual(prompts, ['combined', 'skills'])
+        self.assertEqual(portfolio.skills_section, {'top_skills': ['Python']})
+    
+    def test_combined_mode_validates_sections_like_individual_calls(self):
+        """Combined sections without any expected key are regenerated; unknown keys are dropped."""
+        from koroh_platform.utils.portfolio_generation_service import GenerationMode
+        document = {
+            'hero': {'headline': 'Hi', 'script': '<script>'},
+            'about': {'text': 'Wrong shape'},
+            'skills': ['Python'],
+            'experience': [{'enhanced_description': 'A'}, {'enhanced_description': 'B'}],
+            'call_to_action': 'Get in touch',
+        }
+        
+        def invoke(prompt):
+            section = self._section_of(prompt)
+            return json.dumps(document) if section == 'combined' else self.responses[section]
+        
+        self.service.content_service._invoke_model_with_retry.side_effect = invoke
+        portfolio = self.service.generate_portfolio(self.cv_data, self._options(GenerationMode.COMBINED))
+        
+        prompts = sorted(
+            self._section_of(call.args[0])
+            for call in self.service.content_service._invoke_model_with_retry.call_args_list
+        )
+        self.assertEqual(prompts, ['about', 'combined', 'skills'])
+        self.assertEqual(portfolio.hero_section, {'headline': 'Hi'})
+        self.assertEqual(portfolio.about_section, {'main_content': 'About'})
+        self.assertEqual(portfolio.skills_section, {'top_skills': ['Python']})
+
+
+class CVSectionedExtractionTest(TestCase):
+    """Test section-by-section CV extraction and its per-section cache."""
+    
+    CV_TEXT = (
+        "Ada Lovelace\nada@example.com\n\n"
+        "WORK EXPERIENCE\nAcme Corp - Engineer\nBuilt the analytical engine.\n\n"
+        "Education\nUniversity of London, BSc Mathematics\n\n"
+        "Skills:\nPython, Mathematics\n"
+    )
+    
+    def setUp(self):
+        from django.core.cache import cache
+        from koroh_platform.utils.cv_analysis_service import CVAnalysisService
+        
+        cache.clear()
+        with mock.patch('koroh_platform.utils.cv_analysis_service.TextAnalysisService'):
+            self.service = CVAnalysisService()
+        self.service.text_service.config.model_type.value = 'test-model'
+        self.service.text_service._extract_response_text.side_effect = lambda response: response
+        self.service.text_service._parse_json_response.side_effect = json.loads
+        self.prompts = []
+        self.service.text_service._invoke_model_with_retry.side_effect = self._respond
+    
+    def _respond(self, prompt):
+        self.prompts.append(prompt)
+        if '"work_experience"' in prompt:
+            return json.dumps({'work_experience': [{'company': 'Acme Corp', 'position': 'Engineer'}]})
+        if '"education"' in prompt:
+            return json.dumps({'education': [{'institution': 'University of London'}]})
+        if '"skills"' in prompt:
+            return json.dumps({'skills': {'technical_skills': ['Python'], 'all_skills': ['Python']}})
+        return json.dumps({
+            'personal_info': {'name': 'Ada Lovelace', 'email': 'ada@example.com'},
+            'professional_summary': None,
+            'skills': {'all_skills': ['Ignored']},
+        })
+    
+    def test_segment_sections_splits_on_headings(self):
+        """Headings start sections and the text before them is the header."""
+        segments = self.service._segment_sections(self.CV_TEXT)
+        
+        self.assertEqual(list(segments), ['header', 'experience', 'education', 'skills'])
+        self.assertIn('Built the analytical engine.', segments['experience'])
+        self.assertIsNone(self.service._classify_heading('Worked on the analytical engine at Acme.'))
+        self.assertEqual(self.service._classify_heading('Volunteer Experience'), 'volunteer')
+    
+    def test_section_nouns_outrank_modifiers(self):
+        """Qualifying words like personal, academic and career don't decide a heading."""
+        headings = {
+            'Personal Projects': 'projects',
+            'Personal Interests': 'interests',
+            'Academic Projects': 'projects',
+            'Career Summary': 'summary',
+            'Career Objective': 'summary',
+            'PUBLICATIONS': 'publications',
+            'Personal Information': 'personal_info',
+            'Academic Background': 'education',
+            'Career History': 'experience',
+            'Work Experience': 'experience',
+        }
+        for heading, section in headings.items():
+            with self.subTest(heading=heading):
+                self.assertEqual(self.service._classify_heading(heading), section)
+    
+    def test_qualified_headings_keep_their_content(self):
+        """Projects under a qualified heading are extracted with the projects schema."""
+        cv_text = self.CV_TEXT + "\nPersonal Projects\nDifference engine emulator\n"
+        
+        segments = self.service._segment_sections(cv_text)
+        
+        self.assertIn('Difference engine emulator', segments['projects'])
+        self.assertNotIn('Difference engine emulator', segments['skills'])
+    
+    def test_sections_extracted_separately_and_merged(self):
+        """Each section gets its own sub-schema prompt and results are merged."""
+        data = self.service._extract_structured_data(self.CV_TEXT, {'extraction_mode': 'sectioned'})
+        
+        self.assertEqual(len(self.prompts), 4)
+        self.assertTrue(all('"certifications"' not in prompt for prompt in self.prompts))
+        self.assertEqual(data['personal_info']['name'], 'Ada Lovelace')
+        self.assertEqual(data['work_experience'][0]['company'], 'Acme Corp')
+        self.assertEqual(data['education'][0]['institution'], 'University of London')
+        # Keys outside a section's sub-schema are dropped
+        self.assertEqual(data['skills']['all_skills'], ['Python'])
+    
+    def test_edited_cv_only_reextracts_changed_section(self):
+        """Unchanged sections are served from the section cache."""
+        self.service._extract_structured_data(self.CV_TEXT, {'extraction_mode': 'sectioned'})
+        self.prompts.clear()
+        
+        edited = self.CV_TEXT.replace('BSc Mathematics', 'MSc Mathematics')
+        self.service._extract_structured_data(edited, {'extraction_mode': 'sectioned'})
+        
+        self.assertEqual(len(self.prompts), 1)
+        self.assertIn('MSc Mathematics', self.prompts[0])
+    
+    def test_unstructured_cv_uses_single_prompt(self):
+        """Text without recognisable headings falls back to one full prompt."""
+        self.service._extract_structured_data('Ada Lovelace, engineer.', {'extraction_mode': 'sectioned'})
+        
+        self.assertEqual(len(self.prompts), 1)
+        self.assertIn('"certifications"', self.prompts[0])
+
+
+class UserDataManifestTest(TestCase):
+    """Test the manifest index kept by UserDataManager."""
+    
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        
+        from koroh_platform.services.user_data_manager import UserDataManager
+        self.user = User.objects.create_user(email='data@example.com', password='testpass123')
+        self.manager = UserDataManager(user=self.user)
+        self.analysis = {'cv_analysis': {'overall_score': 80, 'strengths': ['a']}}
+    
+    def _store_portfolio(self):
+        upload = self.manager.store_cv_upload(SimpleUploadedFile('cv.md', b'# CV'))
+        self.manager.store_cv_analysis(upload['cv_session_id'], self.analysis)
+        portfolio = self.manager.store_portfolio(
+            upload['cv_session_id'], {'hero': {}}, {'index.html': '<html></html>'}, self.analysis
+        )
+        return upload, portfolio
+    
+    def test_listings_and_stats_come_from_manifest(self):
+        """Listings and stats don't touch the filesystem."""
+        upload, portfolio = self._store_portfolio()
+        
+        with mock.patch('pathlib.Path.rglob') as rglob, mock.patch('pathlib.Path.iterdir') as iterdir, \
+                self.assertNumQueries(4):
+            cvs = self.manager.get_user_cvs()
+            portfolios = self.manager.get_user_portfolios()
+            history = self.manager.get_analysis_history()
+            stats = self.manager.get_user_storage_stats()
+        rglob.assert_not_called()
+        iterdir.assert_not_called()
+        
+        self.assertEqual(cvs[0]['cv_session_id'], upload['cv_session_id'])
+        self.assertEqual(cvs[0]['analysis_status'], 'completed')
+        self.assertEqual(portfolios[0]['portfolio_id'], portfolio['portfolio_id'])
+        self.assertEqual(history[0]['portfolio_id'], portfolio['portfolio_id'])
+        self.assertEqual(stats['cvs_count'], 1)
+        self.assertEqual(stats['portfolios_count'], 1)
+        self.assertEqual(stats['analysis_sessions_count'], 1)
+        self.assertIsNotNone(stats['last_activity'])
+        
+        disk_size = sum(
+            item.stat().st_size for item in self.manager.user_path.rglob('*') if item.is_file()
+        )
+        self.assertEqual(stats['total_size'], disk_size)
+    
+    def test_all_users_stats_and_rebuild(self):
+        """The all-users report is one query and rebuild restores a lost manifest."""
+        from koroh_platform.models import UserDataManifestEntry
+        from koroh_platform.services.user_data_manager import UserDataManagerFactory
+        self._store_portfolio()
+        expected = self.manager.get_user_storage_stats()
+        
+        with self.assertNumQueries(1):
+            report = UserDataManagerFactory.get_all_users_stats()
+        self.assertEqual(report, [expected])
+        
+        UserDataManifestEntry.objects.all().delete()
+        self.assertEqual(self.manager.get_user_cvs(), [])
+        
+        self.assertEqual(self.manager.rebuild_manifest(), 3)
+        rebuilt = self.manager.get_user_storage_stats()
+        self.assertEqual(rebuilt['total_size'], expected['total_size'])
+        self.assertEqual(rebuilt['cvs_count'], 1)
+        self.assertEqual(rebuilt['analysis_sessions_count'], 1)
+
+
+class PortfolioExportTest(TestCase):
+    """Test streamed portfolio ZIP exports."""
+    
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        
+        from koroh_platform.services.user_data_manager import UserDataManager
+        self.user = User.objects.create_user(email='export@example.com', password='testpass123')
+        self.manager = UserDataManager(user=self.user)
+        self.image = os.urandom(200 * 1024)
+        self.portfolio_id = self.manager.store_portfolio(
+            'cv_1', {'hero': {}},
+            {'index.html': '<html>' + 'hello ' * 1000 + '</html>', 'photo.png': self.image},
+            {}
+        )['portfolio_id']
+    
+    def _get(self, **headers):
+        from rest_framework.test import APIRequestFactory, force_authenticate
+        from .views import export_portfolio
+        request = APIRequestFactory().get('/export/', **headers)
+        force_authenticate(request, user=self.user)
+        return export_portfolio(request, portfolio_id=self.portfolio_id)
+    
+    def test_stream_is_valid_zip_with_stored_images(self):
+        """The streamed archive unzips, deflates text and stores images."""
+        chunks = list(self.manager.stream_portfolio_export(self.portfolio_id))
+        
+        self.assertGreater(len(chunks), 1)
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(archive.read('website/photo.png'), self.image)
+        self.assertEqual(archive.getinfo('website/photo.png').compress_type, zipfile.ZIP_STORED)
+        html = archive.getinfo('website/index.html')
+        self.assertEqual(html.compress_type, zipfile.ZIP_DEFLATED)
+        self.assertLess(html.compress_size, html.file_size)
+        self.assertEqual(list(self.manager.exports_path.iterdir()), [])
+    
+    def test_export_view_etag_and_not_modified(self):
+        """Unchanged portfolios return 304; changed ones get a new ETag."""
+        response = self._get()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        etag = response['ETag']
+        body = b''.join(response.streaming_content)
+        self.assertIn('website/photo.png', zipfile.ZipFile(io.BytesIO(body)).namelist())
+        
+        with mock.patch('koroh_platform.services.user_data_manager.entries_content_hash') as content_hash:
+            response = self._get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        content_hash.assert_not_called()  # Unchanged files aren't re-read
+        
+        # The cached hash isn't part of the metadata listed to clients
+        listed = self.manager.get_user_portfolios()[0]
+        self.assertNotIn('export_fingerprint', listed)
+        self.assertNotIn('export_content_hash', listed)
+        
+        (self.manager.portfolios_path / self.portfolio_id / 'website' / 'index.html').write_text('<html>new</html>')
+        response = self._get(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+    
+    def test_export_rejects_unknown_or_traversing_ids(self):
+        """Only the user's own portfolio directories can be exported."""
+        self.assertIsNone(self.manager.stream_portfolio_export('..'))
+        self.assertIsNone(self.manager.get_portfolio_etag('portfolio_missing'))
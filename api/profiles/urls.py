@@ -36,4 +36,5 @@ urlpatterns = [
     path('generate-portfolio/', views.generate_portfolio, name='generate-portfolio'),
     path('portfolios/', views.list_portfolios, name='list-portfolios'),
     path('portfolios/<str:portfolio_id>/', views.update_portfolio, name='update-portfolio'),
+    path('portfolios/<str:portfolio_id>/export/', views.export_portfolio, name='export-portfolio'),
 ]
\ No newline at end of file
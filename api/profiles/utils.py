@@ -7,7 +7,7 @@ validation, and security operations.
 
 import os
 import hashlib
-from typing import List, Dict, Any, Optional
+from typing import Iterable, List, Dict, Any, Optional
 from django.core.files.uploadedfile import UploadedFile
 from django.conf import settings
 from django.utils import timezone
@@ -133,35 +133,125 @@ def calculate_file_hash(file: UploadedFile, algorithm: str = 'sha256') -> str:
     return hasher.hexdigest()
 
 
-def get_file_info(file: UploadedFile) -> Dict[str, Any]:
+class FileInspector:
+    """
+    Single-pass file inspector.
+    
+    Each chunk is fed to every hasher, the signature sniffer and the
+    content scanners, so adding a check doesn't add another read of the
+    file. Only the header and a few trailing bytes are kept in memory.
+    """
+    
+    DEFAULT_ALGORITHMS = ('sha256', 'md5')
+    
+    # Bytes kept for signature detection
+    HEADER_SIZE = 512
+    
+    # Byte patterns indicating active content in a document
+    SUSPICIOUS_PATTERNS = {
+        b'/JavaScript': 'PDF contains embedded JavaScript',
+        b'/Launch': 'PDF contains a launch action',
+        b'/EmbeddedFile': 'PDF contains embedded files',
+        b'vbaProject.bin': 'Document contains macros',
+        b'<script': 'File contains script tags',
+    }
+    
+    def __init__(self, algorithms: Iterable[str] = DEFAULT_ALGORITHMS):
+        self.hashers = {algorithm: hashlib.new(algorithm) for algorithm in algorithms}
+        self.size = 0
+        self.header = b''
+        self.threats = []
+        self._found = set()
+        # Patterns split across chunks are matched against the previous chunk's tail
+        self._overlap = max(len(pattern) for pattern in self.SUSPICIOUS_PATTERNS) - 1
+        self._tail = b''
+    
+    def feed(self, chunk: bytes):
+        """Process the next chunk of the file."""
+        self.size += len(chunk)
+        for hasher in self.hashers.values():
+            hasher.update(chunk)
+        
+        if len(self.header) < self.HEADER_SIZE:
+            self.header += chunk[:self.HEADER_SIZE - len(self.header)]
+        
+        boundary = self._tail + chunk[:self._overlap]
+        for pattern, message in self.SUSPICIOUS_PATTERNS.items():
+            if pattern not in self._found and (pattern in chunk or pattern in boundary):
+                self._found.add(pattern)
+                self.threats.append(message)
+        if len(chunk) >= self._overlap:
+            self._tail = chunk[-self._overlap:]
+        else:
+            self._tail = (self._tail + chunk)[-self._overlap:]
+    
+    def result(self) -> Dict[str, Any]:
+        """Return hashes, size, header, detected type and scanner findings."""
+        return {
+            'size': self.size,
+            'hashes': {algorithm: hasher.hexdigest() for algorithm, hasher in self.hashers.items()},
+            'header': self.header,
+            'detected_type': FileTypeDetector.match_signature(self.header),
+            'threats': list(self.threats),
+        }
+
+
+def inspect_file(file: UploadedFile, algorithms: Iterable[str] = FileInspector.DEFAULT_ALGORITHMS) -> Dict[str, Any]:
+    """
+    Read a file once and run every inspection over it.
+    
+    Uses file.chunks(), so a TemporaryUploadedFile is streamed from disk
+    rather than loaded into memory.
+    
+    Args:
+        file: The uploaded file
+        algorithms: Hash algorithms to compute
+        
+    Returns:
+        FileInspector.result() for the file
+    """
+    inspector = FileInspector(algorithms)
+    
+    file.seek(0)
+    for chunk in file.chunks():
+        inspector.feed(chunk)
+    file.seek(0)
+    
+    return inspector.result()
+
+
+def get_file_info(file: UploadedFile, inspection: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Get comprehensive file information.
     
     Args:
         file: The uploaded file
+        inspection: Result of inspect_file, computed if not given
         
     Returns:
         Dictionary containing file information
     """
+    inspection = inspection or inspect_file(file)
     return {
         'name': file.name,
         'size': file.size,
         'content_type': getattr(file, 'content_type', None),
         'charset': getattr(file, 'charset', None),
-        'hash_sha256': calculate_file_hash(file, 'sha256'),
-        'hash_md5': calculate_file_hash(file, 'md5'),
+        'hash_sha256': inspection['hashes']['sha256'],
+        'hash_md5': inspection['hashes']['md5'],
         'is_safe_filename': is_safe_filename(file.name),
         'sanitized_filename': sanitize_filename(file.name),
         'timestamp': timezone.now().isoformat(),
     }
 
 
-def validate_file_security(file: UploadedFile) -> Dict[str, Any]:
+def validate_file_security(file: UploadedFile, inspection: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     """
     Perform security validation on uploaded file.
     
     Args:
         file: The uploaded file
+        inspection: Result of inspect_file, computed if not given
         
     Returns:
         Dictionary containing security validation results
@@ -192,6 +282,13 @@ def validate_file_security(file: UploadedFile) -> Dict[str, Any]:
         validation_result['errors'].append('Empty file not allowed')
         validation_result['is_safe'] = False
     
+    # Scan content for active elements
+    validation_result['checks_performed'].append('content_scan')
+    inspection = inspection or inspect_file(file)
+    if inspection['threats']:
+        validation_result['warnings'].extend(inspection['threats'])
+        validation_result['is_safe'] = False
+    
     return validation_result
 
 
@@ -209,21 +306,30 @@ class FileTypeDetector:
     }
     
     @classmethod
-    def detect_file_type(cls, file: UploadedFile) -> Optional[str]:
+    def detect_file_type(cls, file: UploadedFile, inspection: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """
         Detect file type based on content signature.
         
         Args:
             file: The uploaded file
+            inspection: Result of inspect_file; if given the file isn't read
             
         Returns:
             Detected file type or None
         """
+        if inspection is not None:
+            return inspection['detected_type']
+        
         # Read first 512 bytes for signature detection
         file.seek(0)
-        header = file.read(512)
+        header = file.read(FileInspector.HEADER_SIZE)
         file.seek(0)
         
+        return cls.match_signature(header)
+    
+    @classmethod
+    def match_signature(cls, header: bytes) -> Optional[str]:
+        """Return the file type whose signature starts the header, if any."""
         for file_type, signatures in cls.FILE_SIGNATURES.items():
             if not signatures:  # Skip types without signatures (like markdown)
                 continue
@@ -235,18 +341,24 @@ class FileTypeDetector:
         return None
     
     @classmethod
-    def validate_file_type(cls, file: UploadedFile, expected_types: List[str]) -> bool:
+    def validate_file_type(
+        cls,
+        file: UploadedFile,
+        expected_types: List[str],
+        inspection: Optional[Dict[str, Any]] = None
+    ) -> bool:
         """
         Validate that file matches one of the expected types.
         
         Args:
             file: The uploaded file
             expected_types: List of expected file types
+            inspection: Result of inspect_file; if given the file isn't read
             
         Returns:
             True if file type is valid, False otherwise
         """
-        detected_type = cls.detect_file_type(file)
+        detected_type = cls.detect_file_type(file, inspection)
         
         # For files without signatures (like markdown), fall back to extension
         if not detected_type:
@@ -9,7 +9,9 @@ from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser, JSONParser
+from django.http import HttpResponseNotModified, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
+from django.utils.http import parse_etags
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 import logging
@@ -23,6 +25,7 @@ from .serializers import (
     ProfilePublicSerializer
 )
 from .services import CVProcessingService, CVStorageService
+from koroh_platform.services.user_data_manager import UserDataManager
 from koroh_platform.permissions import (
     IsProfileOwner,
     SecureFileUploadPermission,
@@ -533,4 +536,37 @@ def update_portfolio(request, portfolio_id):
                 'details': str(e)
             },
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
\ No newline at end of file
+        )
+
+
+@api_view(['GET'])
+@permission_classes([IsProfileOwner])
+def export_portfolio(request, portfolio_id):
+    """
+    Download a generated portfolio website as a ZIP archive.
+    
+    The archive is streamed while it is built. Responses carry a content-hash
+    ETag, and a matching If-None-Match returns 304 without building it.
+    """
+    manager = UserDataManager(user=request.user)
+    
+    etag = manager.get_portfolio_etag(portfolio_id)
+    if etag is None:
+        return Response(
+            {'error': 'Portfolio not found'},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    if_none_match = parse_etags(request.META.get('HTTP_IF_NONE_MATCH', ''))
+    if etag in if_none_match or '*' in if_none_match:
+        response = HttpResponseNotModified()
+    else:
+        response = StreamingHttpResponse(
+            manager.stream_portfolio_export(portfolio_id),
+            content_type='application/zip'
+        )
+        response['Content-Disposition'] = f'attachment; filename="{portfolio_id}.zip"'
+    
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response